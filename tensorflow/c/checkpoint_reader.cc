@@ -18,6 +18,8 @@ limitations under the License.
 #include <unordered_set>
 #include <utility>
 
+#include "tensorflow/core/framework/types.h"
+#include "tensorflow/core/lib/core/errors.h"
 #include "tensorflow/core/lib/core/status.h"
 #include "tensorflow/core/lib/core/stringpiece.h"
 #include "tensorflow/core/platform/env.h"
@@ -107,6 +109,41 @@ void CheckpointReader::GetTensor(
   }
 }
 
+void CheckpointReader::GetTensorLocation(const string& name,
+                                         string* data_filename, int64* offset,
+                                         int64* size,
+                                         TF_Status* out_status) const {
+  Status status;
+  if (reader_ != nullptr) {
+    status = errors::Unimplemented(
+        "Tensor locations are only available for V2 checkpoints");
+  } else {
+    tensorflow::DataType dtype;
+    tensorflow::TensorShape shape;
+    int32 shard_id;
+    status = v2_reader_->LookupDtypeAndShape(name, &dtype, &shape);
+    if (status.ok()) {
+      status = v2_reader_->LookupDataLocation(name, &shard_id, offset, size);
+    }
+    if (status.ok()) {
+      if (!DataTypeCanUseMemcpy(dtype)) {
+        status = errors::Unimplemented("Tensor ", name, " of type ",
+                                       DataTypeString(dtype),
+                                       " is not stored as a flat buffer");
+      } else if (*size != shape.num_elements() * DataTypeSize(dtype)) {
+        // Partitioned tensors are stored as separate slices.
+        status = errors::Unimplemented("Tensor ", name,
+                                       " is not stored as a single entry");
+      } else {
+        *data_filename = v2_reader_->DataFilenameForShard(shard_id);
+      }
+    }
+  }
+  if (!status.ok()) {
+    Set_TF_Status_from_Status(out_status, status);
+  }
+}
+
 std::pair<std::unique_ptr<TensorSliceReader::VarToShapeMap>,
           std::unique_ptr<TensorSliceReader::VarToDataTypeMap>>
 CheckpointReader::BuildV2VarMaps() {
@@ -58,6 +58,18 @@ class CheckpointReader {
                  std::unique_ptr<tensorflow::Tensor>* out_tensor,
                  TF_Status* out_status) const;
 
+  // Looks up where the contents of the tensor named "name" are stored, so that
+  // callers can map or range-read them directly instead of going through
+  // GetTensor().  The contents are the "size" bytes starting at "offset" in
+  // "data_filename", laid out in row-major order and host byte order.
+  //
+  // Only supported for V2 checkpoints, and for tensors that are stored whole
+  // and have a fixed-size data type; sets an Unimplemented status otherwise.
+  // Reading the contents this way does not verify their checksum.
+  void GetTensorLocation(const string& name, string* data_filename,
+                         int64* offset, int64* size,
+                         TF_Status* out_status) const;
+
  private:
   // Uses "v2_reader_" to build "var name -> shape" and "var name -> data type"
   // maps; both owned by caller.
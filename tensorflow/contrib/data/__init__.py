@@ -48,13 +48,16 @@ See @{$guide/datasets$Importing Data} for an overview.
 
 @@map_and_batch
 @@padded_batch_and_drop_remainder
+@@parallel_from_generator
 @@parallel_interleave
+@@persistent_cache
 @@prefetch_to_device
 @@read_batch_features
 @@rejection_resample
 @@sample_from_datasets
 @@scan
 @@shuffle_and_repeat
+@@shuffled_tfrecords
 @@sliding_window_batch
 @@sloppy_interleave
 @@unbatch
@@ -73,9 +76,11 @@ from tensorflow.contrib.data.python.ops.batching import dense_to_sparse_batch
 from tensorflow.contrib.data.python.ops.batching import map_and_batch
 from tensorflow.contrib.data.python.ops.batching import padded_batch_and_drop_remainder
 from tensorflow.contrib.data.python.ops.batching import unbatch
+from tensorflow.contrib.data.python.ops.caching import persistent_cache
 from tensorflow.contrib.data.python.ops.counter import Counter
 from tensorflow.contrib.data.python.ops.enumerate_ops import enumerate_dataset
 from tensorflow.contrib.data.python.ops.error_ops import ignore_errors
+from tensorflow.contrib.data.python.ops.generator_ops import parallel_from_generator
 from tensorflow.contrib.data.python.ops.get_single_element import get_single_element
 from tensorflow.contrib.data.python.ops.grouping import bucket_by_sequence_length
 from tensorflow.contrib.data.python.ops.grouping import group_by_reducer
@@ -98,6 +103,7 @@ from tensorflow.contrib.data.python.ops.readers import SqlDataset
 from tensorflow.contrib.data.python.ops.resampling import rejection_resample
 from tensorflow.contrib.data.python.ops.scan_ops import scan
 from tensorflow.contrib.data.python.ops.shuffle_ops import shuffle_and_repeat
+from tensorflow.contrib.data.python.ops.shuffle_ops import shuffled_tfrecords
 from tensorflow.contrib.data.python.ops.sliding import sliding_window_batch
 from tensorflow.contrib.data.python.ops.unique import unique
 from tensorflow.contrib.data.python.ops.writers import TFRecordWriter
@@ -103,8 +103,35 @@ class CSVDatasetOp : public DatasetOpKernel {
         ctx, select_cols.empty() || select_cols.front() >= 0,
         errors::InvalidArgument("select_cols should be non-negative indices"));
 
-    *output = new Dataset(ctx, std::move(filenames), header, buffer_size,
-                          output_types_, output_shapes_,
+    const Tensor* byte_ranges_tensor;
+    OP_REQUIRES_OK(ctx, ctx->input("byte_ranges", &byte_ranges_tensor));
+    std::vector<std::pair<int64, int64>> byte_ranges;
+    if (byte_ranges_tensor->NumElements() > 0) {
+      OP_REQUIRES(
+          ctx,
+          byte_ranges_tensor->dims() == 2 &&
+              byte_ranges_tensor->dim_size(0) ==
+                  filenames_tensor->NumElements() &&
+              byte_ranges_tensor->dim_size(1) == 2,
+          errors::InvalidArgument(
+              "`byte_ranges` must have shape [", filenames.size(),
+              ", 2], but has shape ",
+              byte_ranges_tensor->shape().DebugString()));
+      auto byte_ranges_matrix = byte_ranges_tensor->matrix<int64>();
+      byte_ranges.reserve(filenames.size());
+      for (int i = 0; i < filenames.size(); ++i) {
+        const int64 start = byte_ranges_matrix(i, 0);
+        const int64 end = byte_ranges_matrix(i, 1);
+        OP_REQUIRES(ctx, 0 <= start && start <= end,
+                    errors::InvalidArgument("Invalid byte range [", start,
+                                            ", ", end, ") for file ",
+                                            filenames[i]));
+        byte_ranges.emplace_back(start, end);
+      }
+    }
+
+    *output = new Dataset(ctx, std::move(filenames), std::move(byte_ranges),
+                          header, buffer_size, output_types_, output_shapes_,
                           std::move(record_defaults), std::move(select_cols),
                           use_quote_delim, delim[0], std::move(na_value));
   }
@@ -112,13 +139,15 @@ class CSVDatasetOp : public DatasetOpKernel {
  private:
   class Dataset : public GraphDatasetBase {
    public:
-    Dataset(OpKernelContext* ctx, std::vector<string> filenames, bool header,
+    Dataset(OpKernelContext* ctx, std::vector<string> filenames,
+            std::vector<std::pair<int64, int64>> byte_ranges, bool header,
             int64 buffer_size, const DataTypeVector& output_types,
             const std::vector<PartialTensorShape>& output_shapes,
             std::vector<Tensor> record_defaults, std::vector<int64> select_cols,
             bool use_quote_delim, char delim, string na_value)
         : GraphDatasetBase(ctx),
           filenames_(std::move(filenames)),
+          byte_ranges_(std::move(byte_ranges)),
           header_(header),
           buffer_size_(buffer_size),
           out_type_(output_types),
@@ -166,8 +195,15 @@ class CSVDatasetOp : public DatasetOpKernel {
         do {
           // We are currently processing a file, so try to read the next record
           if (input_stream_) {
-            Status s = ReadRecord(ctx, out_tensors, select_all,
-                                  dataset()->select_cols_);
+            Status s;
+            if (end_offset_ >= 0 &&
+                buffer_offset_ + static_cast<int64>(pos_) >= end_offset_) {
+              // The next record starts after the end of the byte range.
+              s = errors::OutOfRange("End of byte range");
+            } else {
+              s = ReadRecord(ctx, out_tensors, select_all,
+                             dataset()->select_cols_);
+            }
             if (s.ok()) {
               // Validate output
               if (out_tensors->size() != dataset()->out_type_.size()) {
@@ -250,11 +286,81 @@ class CSVDatasetOp : public DatasetOpKernel {
 
           num_parsed++;
           if (include) num_selected_parsed++;
+          if (!select_all && !end_of_record &&
+              num_selected_parsed == selected.size()) {
+            // The remaining fields are not selected, so they are skipped
+            // without being unescaped or converted.
+            result.Update(SkipRestOfRecord());
+            break;
+          }
         }
 
         return result;
       }
 
+      // Advances pos_ past the end of the current record, starting from the
+      // first character of a field. Unlike ParseOneField, this does not
+      // validate the skipped fields.
+      Status SkipRestOfRecord() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        bool in_quotes = false;
+        // A quote only starts a quoted field at the beginning of the field,
+        // or escapes another quote just after a closing quote.
+        bool quote_allowed = true;
+        while (true) {
+          if (pos_ >= buffer_.size()) {
+            Status s = FillBuffer(&buffer_);
+            pos_ = 0;
+            if (errors::IsOutOfRange(s)) {
+              // EOF terminates the last record.
+              return in_quotes ? errors::InvalidArgument(
+                                     "Reached end of file without closing "
+                                     "quoted field in record")
+                               : Status::OK();
+            } else if (!s.ok()) {
+              return s;
+            }
+          }
+          const char ch = buffer_[pos_++];
+          if (in_quotes) {
+            if (ch == '"') {
+              in_quotes = false;
+              quote_allowed = true;
+            }
+            continue;
+          }
+          if (ch == '"' && dataset()->use_quote_delim_ && quote_allowed) {
+            in_quotes = true;
+            continue;
+          }
+          if (ch == '\n') return Status::OK();
+          if (ch == '\r') {
+            SkipNewLineIfNecessary();
+            return Status::OK();
+          }
+          quote_allowed = ch == dataset()->delim_;
+        }
+      }
+
+      // Advances pos_ past the next line break. This is used to find the
+      // first record of a byte range that does not start at the beginning of
+      // a file, so it assumes that quoted fields do not contain line breaks.
+      Status SkipToNextLine() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        while (true) {
+          if (pos_ >= buffer_.size()) {
+            Status s = FillBuffer(&buffer_);
+            pos_ = 0;
+            if (errors::IsOutOfRange(s)) return Status::OK();
+            if (!s.ok()) return s;
+          }
+          const char ch = buffer_[pos_++];
+          if (ch == '\n') return Status::OK();
+          if (ch == '\r') {
+            SkipNewLineIfNecessary();
+            return Status::OK();
+          }
+        }
+      }
+
       // Parses one field from position pos_ in the buffer. Fields are
       // delimited by delim, CRLF, or EOF. Advances pos_ to the first char of
       // the next field.
@@ -510,6 +616,7 @@ class CSVDatasetOp : public DatasetOpKernel {
 
       Status FillBuffer(string* result) EXCLUSIVE_LOCKS_REQUIRED(mu_) {
         result->clear();
+        buffer_offset_ = input_stream_->Tell();
         Status s = input_stream_->ReadNBytes(dataset()->buffer_size_, result);
 
         if (errors::IsOutOfRange(s) && !result->empty()) {
@@ -679,6 +786,20 @@ class CSVDatasetOp : public DatasetOpKernel {
             new io::RandomAccessInputStream(file_.get(), false));
         buffer_.clear();
         pos_ = 0;
+        buffer_offset_ = 0;
+        end_offset_ = -1;
+        if (!dataset()->byte_ranges_.empty()) {
+          const auto& byte_range =
+              dataset()->byte_ranges_[current_file_index_];
+          end_offset_ = byte_range.second;
+          if (byte_range.first > 0) {
+            // Skip the record that spans the start of the range, which
+            // belongs to the previous range. Starting one byte early keeps a
+            // record that begins exactly at the start of the range.
+            TF_RETURN_IF_ERROR(input_stream_->Seek(byte_range.first - 1));
+            return SkipToNextLine();
+          }
+        }
         if (dataset()->header_) {
           // Read one line, but don't include it. Pass nullptrs as dummy
           // pointers to objects that shouldn't be invoked anyway
@@ -707,11 +828,20 @@ class CSVDatasetOp : public DatasetOpKernel {
       std::unique_ptr<io::RandomAccessInputStream> input_stream_
           GUARDED_BY(mu_);
       size_t current_file_index_ GUARDED_BY(mu_) = 0;
+      // The offset in the current file of the first character of buffer_.
+      int64 buffer_offset_ GUARDED_BY(mu_) = 0;
+      // The end of the byte range of the current file, or -1 to read the
+      // whole file.
+      int64 end_offset_ GUARDED_BY(mu_) = -1;
       std::unique_ptr<RandomAccessFile> file_
           GUARDED_BY(mu_);  // must outlive input_stream_
     };                      // class Iterator
 
     const std::vector<string> filenames_;
+    // If not empty, the `[start, end)` byte range of each file in
+    // `filenames_` whose records are read. A record belongs to the range in
+    // which it starts.
+    const std::vector<std::pair<int64, int64>> byte_ranges_;
     const bool header_;
     const int64 buffer_size_;
     const DataTypeVector out_type_;
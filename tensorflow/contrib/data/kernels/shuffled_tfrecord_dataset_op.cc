@@ -0,0 +1,284 @@
+/* Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include <algorithm>
+#include <cstring>
+#include <vector>
+
+#include "tensorflow/core/framework/dataset.h"
+#include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/tensor.h"
+#include "tensorflow/core/lib/core/coding.h"
+#include "tensorflow/core/lib/hash/crc32c.h"
+#include "tensorflow/core/lib/io/inputbuffer.h"
+#include "tensorflow/core/lib/random/philox_random.h"
+#include "tensorflow/core/lib/random/random.h"
+#include "tensorflow/core/lib/random/random_distributions.h"
+
+namespace tensorflow {
+namespace {
+
+// See documentation in ../ops/dataset_ops.cc for a high-level
+// description of the following op.
+
+// The size of the length and length checksum that precede each TFRecord.
+constexpr size_t kRecordHeaderSize = sizeof(uint64) + sizeof(uint32);
+// The size of the data checksum that follows each TFRecord.
+constexpr size_t kRecordFooterSize = sizeof(uint32);
+// The size of the buffer through which the record headers are scanned.
+constexpr size_t kIndexBufferSize = 256 << 10;
+
+class ShuffledTFRecordDatasetOp : public DatasetOpKernel {
+ public:
+  using DatasetOpKernel::DatasetOpKernel;
+
+  void MakeDataset(OpKernelContext* ctx, DatasetBase** output) override {
+    const Tensor* filenames_tensor;
+    OP_REQUIRES_OK(ctx, ctx->input("filenames", &filenames_tensor));
+    OP_REQUIRES(
+        ctx, filenames_tensor->dims() <= 1,
+        errors::InvalidArgument("`filenames` must be a scalar or a vector."));
+
+    std::vector<string> filenames;
+    filenames.reserve(filenames_tensor->NumElements());
+    for (int i = 0; i < filenames_tensor->NumElements(); ++i) {
+      filenames.push_back(filenames_tensor->flat<string>()(i));
+    }
+
+    int64 seed;
+    OP_REQUIRES_OK(ctx, ParseScalarArgument<int64>(ctx, "seed", &seed));
+    int64 seed2;
+    OP_REQUIRES_OK(ctx, ParseScalarArgument<int64>(ctx, "seed2", &seed2));
+
+    // By TensorFlow convention, passing 0 for both seeds indicates
+    // that the shuffling should be seeded non-deterministically.
+    if (seed == 0 && seed2 == 0) {
+      seed = random::New64();
+      seed2 = random::New64();
+    }
+
+    *output = new Dataset(ctx, std::move(filenames), seed, seed2);
+  }
+
+ private:
+  class Dataset : public GraphDatasetBase {
+   public:
+    Dataset(OpKernelContext* ctx, std::vector<string> filenames, int64 seed,
+            int64 seed2)
+        : GraphDatasetBase(ctx),
+          filenames_(std::move(filenames)),
+          seed_(seed),
+          seed2_(seed2) {}
+
+    std::unique_ptr<IteratorBase> MakeIteratorInternal(
+        const string& prefix) const override {
+      return std::unique_ptr<IteratorBase>(
+          new Iterator({this, strings::StrCat(prefix, "::ShuffledTFRecord")}));
+    }
+
+    const DataTypeVector& output_dtypes() const override {
+      static DataTypeVector* dtypes = new DataTypeVector({DT_STRING});
+      return *dtypes;
+    }
+
+    const std::vector<PartialTensorShape>& output_shapes() const override {
+      static std::vector<PartialTensorShape>* shapes =
+          new std::vector<PartialTensorShape>({{}});
+      return *shapes;
+    }
+
+    string DebugString() const override {
+      return "ShuffledTFRecordDatasetOp::Dataset";
+    }
+
+   protected:
+    Status AsGraphDefInternal(DatasetGraphDefBuilder* b,
+                              Node** output) const override {
+      Node* filenames = nullptr;
+      TF_RETURN_IF_ERROR(b->AddVector(filenames_, &filenames));
+      Node* seed = nullptr;
+      TF_RETURN_IF_ERROR(b->AddScalar(seed_, &seed));
+      Node* seed2 = nullptr;
+      TF_RETURN_IF_ERROR(b->AddScalar(seed2_, &seed2));
+      TF_RETURN_IF_ERROR(b->AddDataset(this, {filenames, seed, seed2}, output));
+      return Status::OK();
+    }
+
+   private:
+    class Iterator : public DatasetIterator<Dataset> {
+     public:
+      explicit Iterator(const Params& params)
+          : DatasetIterator<Dataset>(params) {}
+
+      Status GetNextInternal(IteratorContext* ctx,
+                             std::vector<Tensor>* out_tensors,
+                             bool* end_of_sequence) override {
+        mutex_lock l(mu_);
+        if (!initialized_) {
+          TF_RETURN_IF_ERROR(InitializeLocked(ctx->env()));
+        }
+        if (next_record_ == records_.size()) {
+          *end_of_sequence = true;
+          return Status::OK();
+        }
+        Tensor result_tensor(ctx->allocator({}), DT_STRING, {});
+        TF_RETURN_IF_ERROR(ReadRecordLocked(records_[next_record_],
+                                            &result_tensor.scalar<string>()()));
+        out_tensors->emplace_back(std::move(result_tensor));
+        ++next_record_;
+        *end_of_sequence = false;
+        return Status::OK();
+      }
+
+     protected:
+      Status SaveInternal(IteratorStateWriter* writer) override {
+        mutex_lock l(mu_);
+        // The order of the records only depends on the files and the seeds,
+        // so the position in that order is sufficient to restore the
+        // iterator.
+        TF_RETURN_IF_ERROR(
+            writer->WriteScalar(full_name("next_record"), next_record_));
+        return Status::OK();
+      }
+
+      Status RestoreInternal(IteratorContext* ctx,
+                             IteratorStateReader* reader) override {
+        mutex_lock l(mu_);
+        int64 next_record;
+        TF_RETURN_IF_ERROR(
+            reader->ReadScalar(full_name("next_record"), &next_record));
+        TF_RETURN_IF_ERROR(InitializeLocked(ctx->env()));
+        if (next_record < 0 ||
+            static_cast<size_t>(next_record) > records_.size()) {
+          return errors::FailedPrecondition(
+              "Cannot restore a ShuffledTFRecordDataset iterator at record ",
+              next_record, " of ", records_.size(),
+              ": the files have changed.");
+        }
+        next_record_ = next_record;
+        return Status::OK();
+      }
+
+     private:
+      // The location of a record in the files of the dataset.
+      struct Record {
+        int32 file_index;
+        uint64 offset;
+        uint64 length;
+      };
+
+      // Opens all files, finds the offsets of their records, and shuffles
+      // them. Only the record headers are read, so the memory used is
+      // proportional to the number of records rather than to their size.
+      Status InitializeLocked(Env* env) EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        files_.clear();
+        records_.clear();
+        next_record_ = 0;
+        for (int32 i = 0; i < dataset()->filenames_.size(); ++i) {
+          std::unique_ptr<RandomAccessFile> file;
+          TF_RETURN_IF_ERROR(
+              env->NewRandomAccessFile(dataset()->filenames_[i], &file));
+          TF_RETURN_IF_ERROR(IndexFile(dataset()->filenames_[i], file.get(),
+                                       i, &records_));
+          files_.push_back(std::move(file));
+        }
+        random::PhiloxRandom parent_generator(dataset()->seed_,
+                                              dataset()->seed2_);
+        random::SingleSampleAdapter<random::PhiloxRandom> generator(
+            &parent_generator);
+        for (size_t i = records_.size(); i > 1; --i) {
+          std::swap(records_[i - 1], records_[generator() % i]);
+        }
+        initialized_ = true;
+        return Status::OK();
+      }
+
+      // Appends the locations of the records in `file` to `records`.
+      static Status IndexFile(const string& filename, RandomAccessFile* file,
+                              int32 file_index, std::vector<Record>* records) {
+        // Scans the headers through a buffer, so that small records do not
+        // cost one read each.
+        io::InputBuffer input(file, kIndexBufferSize);
+        string header;
+        while (true) {
+          const uint64 offset = input.Tell();
+          Status s = input.ReadNBytes(kRecordHeaderSize, &header);
+          if (!s.ok() && !errors::IsOutOfRange(s)) return s;
+          if (header.empty()) return Status::OK();
+          if (header.size() != kRecordHeaderSize) {
+            return errors::DataLoss("Truncated record header at offset ",
+                                    offset, " in ", filename);
+          }
+          const uint32 masked_crc =
+              core::DecodeFixed32(header.data() + sizeof(uint64));
+          if (crc32c::Unmask(masked_crc) !=
+              crc32c::Value(header.data(), sizeof(uint64))) {
+            return errors::DataLoss("Corrupted record header at offset ",
+                                    offset, " in ", filename);
+          }
+          const uint64 length = core::DecodeFixed64(header.data());
+          records->push_back({file_index, offset, length});
+          // A truncated last record is reported when it is read.
+          s = input.SkipNBytes(length + kRecordFooterSize);
+          if (!s.ok() && !errors::IsOutOfRange(s)) return s;
+        }
+      }
+
+      // Reads the data of `record` into `*data`, and verifies its checksum.
+      Status ReadRecordLocked(const Record& record, string* data)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        const size_t n = record.length + kRecordFooterSize;
+        data->resize(n);
+        StringPiece result;
+        Status s = files_[record.file_index]->Read(
+            record.offset + kRecordHeaderSize, n, &result, &(*data)[0]);
+        if (!s.ok() && !errors::IsOutOfRange(s)) return s;
+        const string& filename = dataset()->filenames_[record.file_index];
+        if (result.size() != n) {
+          return errors::DataLoss("Truncated record at offset ", record.offset,
+                                  " in ", filename);
+        }
+        if (result.data() != data->data()) {
+          // Some file systems return a pointer to their own buffer.
+          memmove(&(*data)[0], result.data(), n);
+        }
+        const uint32 masked_crc =
+            core::DecodeFixed32(data->data() + record.length);
+        if (crc32c::Unmask(masked_crc) !=
+            crc32c::Value(data->data(), record.length)) {
+          return errors::DataLoss("Corrupted record at offset ", record.offset,
+                                  " in ", filename);
+        }
+        data->resize(record.length);
+        return Status::OK();
+      }
+
+      mutex mu_;
+      bool initialized_ GUARDED_BY(mu_) = false;
+      std::vector<Record> records_ GUARDED_BY(mu_);
+      size_t next_record_ GUARDED_BY(mu_) = 0;
+      std::vector<std::unique_ptr<RandomAccessFile>> files_ GUARDED_BY(mu_);
+    };
+
+    const std::vector<string> filenames_;
+    const int64 seed_;
+    const int64 seed2_;
+  };
+};
+
+REGISTER_KERNEL_BUILDER(Name("ShuffledTFRecordDataset").Device(DEVICE_CPU),
+                        ShuffledTFRecordDatasetOp);
+
+}  // namespace
+}  // namespace tensorflow
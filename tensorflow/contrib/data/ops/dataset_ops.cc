@@ -42,6 +42,7 @@ REGISTER_OP("CSVDataset")
     .Input("use_quote_delim: bool")
     .Input("na_value: string")
     .Input("select_cols: int64")
+    .Input("byte_ranges: int64")
     .Input("record_defaults: output_types")
     .Output("handle: variant")
     .Attr("output_types: list({float,double,int32,int64,string}) >= 1")
@@ -61,13 +62,46 @@ REGISTER_OP("CSVDataset")
       TF_RETURN_IF_ERROR(c->WithRank(c->input(5), 0, &unused));
       // `select_cols` must be a vector
       TF_RETURN_IF_ERROR(c->WithRank(c->input(6), 1, &unused));
+      // `byte_ranges` must be a matrix, or empty
+      TF_RETURN_IF_ERROR(c->WithRankAtMost(c->input(7), 2, &unused));
       // `record_defaults` must be a list of scalars...?
-      for (size_t i = 7; i < c->num_inputs(); ++i) {
+      for (size_t i = 8; i < c->num_inputs(); ++i) {
         TF_RETURN_IF_ERROR(c->WithRank(c->input(i), 1, &unused));
       }
       return shape_inference::ScalarShape(c);
     });
 
+REGISTER_OP("ShuffledTFRecordDataset")
+    .Input("filenames: string")
+    .Input("seed: int64")
+    .Input("seed2: int64")
+    .Output("handle: variant")
+    .SetIsStateful()  // TODO(b/65524810): Source dataset ops must be marked
+                      // stateful to inhibit constant folding.
+    .SetShapeFn([](shape_inference::InferenceContext* c) {
+      shape_inference::ShapeHandle unused;
+      // `filenames` must be a scalar or a vector.
+      TF_RETURN_IF_ERROR(c->WithRankAtMost(c->input(0), 1, &unused));
+      // `seed` and `seed2` must be scalars.
+      TF_RETURN_IF_ERROR(c->WithRank(c->input(1), 0, &unused));
+      TF_RETURN_IF_ERROR(c->WithRank(c->input(2), 0, &unused));
+      return shape_inference::ScalarShape(c);
+    })
+    .Doc(R"doc(
+Creates a dataset that emits the records of TFRecord files in a random order.
+
+The offsets of all records in `filenames` are read when the iterator is first
+used, and the records are then read in a random permutation of those offsets.
+Only uncompressed files are supported.
+
+filenames: A scalar or vector containing the name(s) of the file(s) to be
+  read.
+seed: A scalar seed for the random number generator. If either seed or
+  seed2 is set to be non-zero, the random number generator is seeded
+  by the given seed. Otherwise, a random seed is used.
+seed2: A second scalar seed to avoid seed collision.
+)doc");
+
 REGISTER_OP("IgnoreErrorsDataset")
     .Input("input_dataset: variant")
     .Output("handle: variant")
@@ -432,6 +432,8 @@ class BatchDatasetTest(test.TestCase, parameterized.TestCase):
       ("sequential_calls", 1, None),
       ("parallel_calls", 2, None),
       ("parallel_batches", None, 10),
+      ("autotune_calls", -1, None),
+      ("autotune_batches", None, -1),
   )
   def testMapAndBatch(self, num_parallel_calls, num_parallel_batches):
     """Test a dataset that maps a TF function across its input elements."""
@@ -0,0 +1,193 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the experimental persistent cache transformation."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+
+from tensorflow.contrib.data.python.ops import caching
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import script_ops
+from tensorflow.python.platform import test
+
+
+class PersistentCacheTest(test.TestCase):
+
+  def setUp(self):
+    self.cache_dir = os.path.join(self.get_temp_dir(), "cache")
+    self.num_calls = 0
+
+  def _countingPipeline(self, num_elements, multiplier=2):
+
+    def count(x):
+      self.num_calls += 1
+      return x
+
+    return dataset_ops.Dataset.range(num_elements).map(
+        lambda x: script_ops.py_func(count, [x], dtypes.int64) * multiplier)
+
+  def _getAll(self, dataset, max_elements=None):
+    get_next = dataset.make_one_shot_iterator().get_next()
+    results = []
+    with self.test_session(graph=get_next.graph) as sess:
+      while max_elements is None or len(results) < max_elements:
+        try:
+          results.append(sess.run(get_next))
+        except errors.OutOfRangeError:
+          break
+    return results
+
+  def _cacheDirs(self):
+    return sorted(os.listdir(self.cache_dir))
+
+  def testFingerprint(self):
+
+    def fingerprint(make_dataset):
+      with ops.Graph().as_default():
+        # Unrelated ops change the names of the dataset ops.
+        math_ops.add(1, 2)
+        return caching._fingerprint_tensor(make_dataset()._as_variant_tensor())  # pylint: disable=protected-access
+
+    make_dataset = lambda: dataset_ops.Dataset.range(10).map(lambda x: x * 2)
+    self.assertEqual(fingerprint(make_dataset), fingerprint(make_dataset))
+    self.assertNotEqual(
+        fingerprint(make_dataset),
+        fingerprint(lambda: dataset_ops.Dataset.range(10).map(lambda x: x * 3)))
+    self.assertNotEqual(
+        fingerprint(make_dataset),
+        fingerprint(lambda: dataset_ops.Dataset.range(11).map(lambda x: x * 2)))
+
+  def testFingerprintDatasetDoesNotAddOps(self):
+    with ops.Graph().as_default() as g:
+      dataset = dataset_ops.Dataset.range(10).map(lambda x: x * 2)
+      num_ops = len(g.get_operations())
+      fingerprint = caching._fingerprint_dataset(dataset)  # pylint: disable=protected-access
+      self.assertEqual(num_ops, len(g.get_operations()))
+      # Tensors captured from the default graph are still fingerprinted.
+      self.assertEqual(
+          fingerprint,
+          caching._fingerprint_tensor(dataset._as_variant_tensor()))  # pylint: disable=protected-access
+      self.assertNotEqual(
+          fingerprint,
+          caching._fingerprint_dataset(  # pylint: disable=protected-access
+              dataset_ops.Dataset.range(11).map(lambda x: x * 2)))
+
+  def testPopulateAndRead(self):
+    with ops.Graph().as_default():
+      dataset = self._countingPipeline(25).apply(
+          caching.persistent_cache(self.cache_dir, shard_size=10))
+      self.assertEqual([x * 2 for x in range(25)], self._getAll(dataset))
+    self.assertEqual(25, self.num_calls)
+    cache_dir = os.path.join(self.cache_dir, self._cacheDirs()[0])
+    self.assertEqual("3", open(os.path.join(cache_dir, "COMPLETE")).read())
+
+    # A new graph with the same pipeline reads the cache without evaluating
+    # the input.
+    with ops.Graph().as_default():
+      dataset = self._countingPipeline(25).apply(
+          caching.persistent_cache(self.cache_dir, shard_size=10)).repeat(2)
+      self.assertEqual([x * 2 for x in range(25)] * 2, self._getAll(dataset))
+    self.assertEqual(25, self.num_calls)
+    self.assertEqual(1, len(self._cacheDirs()))
+
+  def testRepeatReadsShardsCompletedByEarlierEpochs(self):
+    with ops.Graph().as_default():
+      dataset = self._countingPipeline(25).apply(
+          caching.persistent_cache(self.cache_dir, shard_size=10)).repeat(3)
+      self.assertEqual([x * 2 for x in range(25)] * 3, self._getAll(dataset))
+    # Only the first epoch evaluates the input.
+    self.assertEqual(25, self.num_calls)
+    cache_dir = os.path.join(self.cache_dir, self._cacheDirs()[0])
+    self.assertEqual("3", open(os.path.join(cache_dir, "COMPLETE")).read())
+    self.assertFalse(os.path.exists(os.path.join(cache_dir, "POPULATING")))
+
+  def testCacheLockedByAnotherProcess(self):
+    with ops.Graph().as_default():
+      dataset = self._countingPipeline(5).apply(
+          caching.persistent_cache(self.cache_dir, shard_size=2))
+      cache_dir = os.path.join(self.cache_dir, self._cacheDirs()[0])
+      with open(os.path.join(cache_dir, "POPULATING"), "w") as f:
+        f.write("another-host:1")
+      self.assertEqual([0, 2, 4, 6, 8], self._getAll(dataset))
+    self.assertEqual(5, self.num_calls)
+    self.assertEqual(["LAST_ACCESS", "POPULATING"], sorted(
+        os.listdir(cache_dir)))
+
+  def testChangedPipelineUsesNewCache(self):
+    with ops.Graph().as_default():
+      dataset = self._countingPipeline(5).apply(
+          caching.persistent_cache(self.cache_dir))
+      self.assertEqual([0, 2, 4, 6, 8], self._getAll(dataset))
+    with ops.Graph().as_default():
+      dataset = self._countingPipeline(5, multiplier=3).apply(
+          caching.persistent_cache(self.cache_dir))
+      self.assertEqual([0, 3, 6, 9, 12], self._getAll(dataset))
+    self.assertEqual(2, len(self._cacheDirs()))
+
+  def testResumePopulation(self):
+    with ops.Graph().as_default():
+      dataset = self._countingPipeline(25).apply(
+          caching.persistent_cache(self.cache_dir, shard_size=10))
+      self.assertEqual([x * 2 for x in range(15)],
+                       self._getAll(dataset, max_elements=15))
+    cache_dir = os.path.join(self.cache_dir, self._cacheDirs()[0])
+    self.assertFalse(os.path.exists(os.path.join(cache_dir, "COMPLETE")))
+    self.assertTrue(
+        os.path.exists(os.path.join(cache_dir, "shard-00000.index")))
+    self.assertFalse(
+        os.path.exists(os.path.join(cache_dir, "shard-00001.index")))
+
+    # The completed shard is read from its file, and the input is only
+    # evaluated to skip its elements.
+    self.num_calls = 0
+    with ops.Graph().as_default():
+      dataset = self._countingPipeline(25).apply(
+          caching.persistent_cache(self.cache_dir, shard_size=10))
+      self.assertEqual([x * 2 for x in range(25)], self._getAll(dataset))
+    self.assertEqual(25, self.num_calls)
+    self.assertEqual("3", open(os.path.join(cache_dir, "COMPLETE")).read())
+
+  def testEviction(self):
+    for multiplier in [1, 2, 3]:
+      with ops.Graph().as_default():
+        dataset = self._countingPipeline(5, multiplier).apply(
+            caching.persistent_cache(self.cache_dir, max_caches=2))
+        self.assertEqual([x * multiplier for x in range(5)],
+                         self._getAll(dataset))
+    self.assertEqual(2, len(self._cacheDirs()))
+
+    # The least recently used cache (`multiplier=1`) was evicted.
+    self.num_calls = 0
+    with ops.Graph().as_default():
+      dataset = self._countingPipeline(5, 2).apply(
+          caching.persistent_cache(self.cache_dir, max_caches=2))
+      self.assertEqual([0, 2, 4, 6, 8], self._getAll(dataset))
+    self.assertEqual(0, self.num_calls)
+
+  def testInvalidArguments(self):
+    with self.assertRaises(ValueError):
+      caching.persistent_cache(self.cache_dir, shard_size=0)
+    with self.assertRaises(ValueError):
+      caching.persistent_cache(self.cache_dir, max_caches=0)
+
+
+if __name__ == "__main__":
+  test.main()
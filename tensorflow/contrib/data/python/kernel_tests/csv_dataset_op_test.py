@@ -26,8 +26,10 @@ import time
 import numpy as np
 
 from tensorflow.contrib.data.python.ops import error_ops
+from tensorflow.contrib.data.python.ops import interleave_ops
 from tensorflow.contrib.data.python.ops import readers
 from tensorflow.python.client import session
+from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.ops import readers as core_readers
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
@@ -397,6 +399,62 @@ class CsvDatasetOpTest(test.TestCase):
         record_defaults=record_defaults,
         select_cols=[0])
 
+  def testCsvDataset_withSelectColsSkipsRestOfRecord(self):
+    record_defaults = [[''], ['']]
+    inputs = [['a,b,"c,""d""\ne",f', 'g,h,i"j', 'k,l']]
+    self._test_dataset(
+        inputs,
+        expected_output=[['a', 'b'], ['g', 'h'], ['k', 'l']],
+        record_defaults=record_defaults,
+        select_cols=[0, 1])
+
+  def testCsvDataset_withByteRanges(self):
+    record_defaults = [[0], ['']]
+    records = ['0,a', '1,bc', '3,"d,e"', '4,f']
+    expected = [[0, 'a'], [1, 'bc'], [3, 'd,e'], [4, 'f']]
+    for linebreak in ['\n', '\r', '\r\n']:
+      filenames = self.setup_files([records], linebreak)
+      size = os.path.getsize(filenames[0])
+      # Every split of the file into two ranges reads each record once.
+      for split in range(size + 1):
+        with ops.Graph().as_default() as g:
+          with self.test_session(graph=g) as sess:
+            dataset = readers.CsvDataset(
+                filenames * 2,
+                record_defaults=record_defaults,
+                byte_ranges=[[0, split], [split, size]],
+                buffer_size=3)
+            self._verify_output_or_err(sess, dataset, expected)
+
+  def testCsvDataset_withByteRangesAndHeader(self):
+    record_defaults = [[0]] * 2
+    filenames = self.setup_files([['x,y', '1,2', '3,4', '5,6']])
+    with ops.Graph().as_default() as g:
+      with self.test_session(graph=g) as sess:
+        # The header is only skipped by the range at the start of the file.
+        dataset = readers.CsvDataset(
+            filenames * 3,
+            record_defaults=record_defaults,
+            header=True,
+            byte_ranges=[[0, 5], [5, 9], [9, 100]])
+        self._verify_output_or_err(sess, dataset, [[1, 2], [3, 4], [5, 6]])
+
+  def testCsvDataset_errorWithInvalidByteRanges(self):
+    record_defaults = [[0]] * 2
+    filenames = self.setup_files([['1,2']])
+    with ops.Graph().as_default() as g:
+      with self.test_session(graph=g) as sess:
+        dataset = readers.CsvDataset(
+            filenames, record_defaults=record_defaults, byte_ranges=[[3, 2]])
+        self._verify_output_or_err(
+            sess, dataset, expected_err_re='Invalid byte range')
+        dataset = readers.CsvDataset(
+            filenames * 2,
+            record_defaults=record_defaults,
+            byte_ranges=[[0, 2]])
+        self._verify_output_or_err(
+            sess, dataset, expected_err_re='`byte_ranges` must have shape')
+
   def testCsvDataset_withMultipleNewLines(self):
     # In this case, we expect it to behave differently from
     # TextLineDataset->map(decode_csv) since that flow has bugs
@@ -605,6 +663,35 @@ class CsvDatasetBenchmark(test.Benchmark):
       self._runBenchmark(dataset, num_cols, 'csv_float_fused_dataset')
     self._tearDown()
 
+  def benchmarkCsvDatasetWithSelectCols(self):
+    self._setUp(self.FLOAT_VAL)
+    for i in range(len(self._filenames)):
+      num_cols = self._num_cols[i]
+      # Selects the first 8% of the columns.
+      select_cols = list(range(max(num_cols // 12, 1)))
+      dataset = readers.CsvDataset(
+          self._filenames[i], [[0.0]] * len(select_cols),
+          select_cols=select_cols).repeat()
+      self._runBenchmark(dataset, num_cols, 'csv_float_select_cols_dataset')
+    self._tearDown()
+
+  def benchmarkCsvDatasetWithByteRanges(self):
+    self._setUp(self.FLOAT_VAL)
+    for i in range(len(self._filenames)):
+      num_cols = self._num_cols[i]
+      size = os.path.getsize(self._filenames[i])
+      split_size = size // 4 + 1
+      filenames = [self._filenames[i]] * 4
+      byte_ranges = [[j * split_size, (j + 1) * split_size] for j in range(4)]
+      dataset = dataset_ops.Dataset.from_tensor_slices(
+          (filenames, byte_ranges)).apply(
+              interleave_ops.parallel_interleave(
+                  lambda f, r: readers.CsvDataset(  # pylint: disable=g-long-lambda
+                      f, [[0.0]] * num_cols, byte_ranges=[r]),  # pylint: disable=cell-var-from-loop
+                  cycle_length=4)).repeat()
+      self._runBenchmark(dataset, num_cols, 'csv_float_byte_ranges_dataset')
+    self._tearDown()
+
   def benchmarkCsvDatasetWithStrings(self):
     self._setUp(self.STR_VAL)
     for i in range(len(self._filenames)):
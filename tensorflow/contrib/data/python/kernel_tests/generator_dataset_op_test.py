@@ -0,0 +1,185 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the experimental multi-process generator dataset."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+
+from tensorflow.contrib.data.python.ops import generator_ops
+from tensorflow.python.client import session
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import tensor_shape
+from tensorflow.python.platform import test
+
+
+def _generator(shard, num_elements):
+  for i in range(num_elements):
+    yield shard * 100 + i, [i] * (i % 3 + 1)
+
+
+def _large_generator(shard):
+  for i in range(3):
+    yield np.full([1000], shard * 100 + i, dtype=np.float32)
+
+
+def _string_generator(shard):
+  for i in range(3):
+    yield "%d-%d" % (shard, i)
+
+
+def _failing_generator(shard):
+  yield shard
+  raise ValueError("Failing shard %d" % shard)
+
+
+def _parse_generator(shard):
+  for i in range(200):
+    # Simulates per-element Python parsing work.
+    yield sum(j * i for j in range(shard, shard + 2000))
+
+
+class ParallelFromGeneratorTest(test.TestCase):
+
+  def _getAll(self, dataset):
+    get_next = dataset.make_one_shot_iterator().get_next()
+    results = []
+    with self.test_session() as sess:
+      while True:
+        try:
+          results.append(sess.run(get_next))
+        except errors.OutOfRangeError:
+          break
+    return results
+
+  def _makeDataset(self, args, **kwargs):
+    return generator_ops.parallel_from_generator(
+        _generator, (dtypes.int64, dtypes.int64),
+        (tensor_shape.scalar(), tensor_shape.TensorShape([None])),
+        args=args, **kwargs)
+
+  def testDeterministicOrder(self):
+    args = [(0, 3), (1, 5), (2, 1), (3, 4)]
+    results = self._getAll(
+        self._makeDataset(args, num_workers=2, deterministic=True))
+    # Worker 0 runs shards 0 and 2, worker 1 runs shards 1 and 3, and their
+    # elements are interleaved one at a time.
+    expected = [0, 100, 1, 101, 2, 102, 200, 103, 104, 300, 301, 302, 303]
+    self.assertEqual(expected, [x for x, _ in results])
+    for x, y in results:
+      i = x % 100
+      self.assertAllEqual([i] * (i % 3 + 1), y)
+
+  def testNonDeterministicOrder(self):
+    args = [(shard, 10) for shard in range(6)]
+    results = self._getAll(
+        self._makeDataset(args, num_workers=3, deterministic=False))
+    expected = [shard * 100 + i for shard in range(6) for i in range(10)]
+    self.assertEqual(sorted(expected), sorted(x for x, _ in results))
+
+  def testRepeat(self):
+    dataset = self._makeDataset([(0, 2), (1, 2)], num_workers=2).repeat(2)
+    self.assertEqual([0, 100, 1, 101] * 2,
+                     [x for x, _ in self._getAll(dataset)])
+
+  def testElementsLargerThanSlab(self):
+    dataset = generator_ops.parallel_from_generator(
+        _large_generator, dtypes.float32, tensor_shape.TensorShape([1000]),
+        args=[0, 1], num_workers=2, max_element_size=1024)
+    results = self._getAll(dataset)
+    self.assertEqual(6, len(results))
+    for result, x in zip(results, [0, 100, 1, 101, 2, 102]):
+      self.assertAllEqual(np.full([1000], x, dtype=np.float32), result)
+
+  def testStrings(self):
+    dataset = generator_ops.parallel_from_generator(
+        _string_generator, dtypes.string, tensor_shape.scalar(), args=[0, 1],
+        num_workers=2)
+    self.assertEqual([b"0-0", b"1-0", b"0-1", b"1-1", b"0-2", b"1-2"],
+                     self._getAll(dataset))
+
+  def testGeneratorError(self):
+    dataset = generator_ops.parallel_from_generator(
+        _failing_generator, dtypes.int64, args=[0, 1], num_workers=2)
+    get_next = dataset.make_one_shot_iterator().get_next()
+    with self.test_session() as sess:
+      self.assertEqual(0, sess.run(get_next))
+      self.assertEqual(1, sess.run(get_next))
+      with self.assertRaisesOpError("Failing shard 0"):
+        sess.run(get_next)
+
+  def testWorkersAreNotForked(self):
+    context = generator_ops._get_context()  # pylint: disable=protected-access
+    if hasattr(context, "get_start_method"):
+      self.assertNotEqual("fork", context.get_start_method())
+
+  def testInvalidArguments(self):
+    with self.assertRaises(TypeError):
+      generator_ops.parallel_from_generator(0, dtypes.int64, args=[0])
+    with self.assertRaises(ValueError):
+      generator_ops.parallel_from_generator(_generator, dtypes.int64, args=[])
+    with self.assertRaises(ValueError):
+      generator_ops.parallel_from_generator(
+          _generator, dtypes.int64, args=[0], num_workers=0)
+    with self.assertRaises(ValueError):
+      generator_ops.parallel_from_generator(
+          _generator, dtypes.int64, args=[0], buffer_size=0)
+
+
+class ParallelFromGeneratorBenchmark(test.Benchmark):
+
+  def _benchmark(self, dataset, name, num_elements):
+    get_next = dataset.make_one_shot_iterator().get_next()
+    with session.Session() as sess:
+      sess.run(get_next)
+      start = time.time()
+      for _ in range(num_elements - 1):
+        sess.run(get_next)
+      wall_time = (time.time() - start) / (num_elements - 1)
+    print("%s: %f us per element" % (name, wall_time * 1e6))
+    self.report_benchmark(
+        iters=num_elements - 1, wall_time=wall_time, name=name)
+
+  def benchmarkParallelFromGenerator(self):
+    num_shards = 16
+    num_elements = num_shards * 200
+
+    def single_generator():
+      for shard in range(num_shards):
+        for value in _parse_generator(shard):
+          yield value
+
+    self._benchmark(
+        dataset_ops.Dataset.from_generator(single_generator, dtypes.int64,
+                                           tensor_shape.scalar()),
+        "from_generator", num_elements)
+    for num_workers in [2, 4, 8]:
+      for deterministic in [True, False]:
+        dataset = generator_ops.parallel_from_generator(
+            _parse_generator, dtypes.int64, tensor_shape.scalar(),
+            args=list(range(num_shards)), num_workers=num_workers,
+            deterministic=deterministic)
+        self._benchmark(
+            dataset, "parallel_from_generator_workers_%d_deterministic_%s" %
+            (num_workers, deterministic), num_elements)
+
+
+if __name__ == "__main__":
+  test.main()
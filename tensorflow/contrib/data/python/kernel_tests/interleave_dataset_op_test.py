@@ -619,6 +619,24 @@ class ParallelInterleaveDatasetTest(test.TestCase):
   def testTooManyReadersSloppy(self):
     self._testTooManyReaders(sloppy=True)
 
+  def testAutotuneCycleLength(self):
+    dataset = dataset_ops.Dataset.range(1, 6).apply(
+        interleave_ops.parallel_interleave(
+            lambda x: dataset_ops.Dataset.from_tensors(x).repeat(x),
+            cycle_length=-1))
+    get_next = dataset.make_one_shot_iterator().get_next()
+
+    with self.test_session() as sess:
+      output_values = []
+      for _ in range(15):
+        output_values.append(sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+    # The interleaving order depends on the number of CPUs.
+    self.assertItemsEqual([x for x in range(1, 6) for _ in range(x)],
+                          output_values)
+
   def testSparse(self):
     def _map_fn(i):
       return sparse_tensor.SparseTensor(
@@ -17,10 +17,21 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import time
+
+import numpy as np
+
 from tensorflow.contrib.data.python.ops import optimization
 from tensorflow.core.framework import graph_pb2
+from tensorflow.python.client import session
 from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import constant_op
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import parsing_ops
+from tensorflow.python.ops import script_ops
 from tensorflow.python.platform import test
 
 
@@ -76,6 +87,103 @@ class OptimizeDatasetTest(test.TestCase):
                                    "Function .* is not defined."):
         sess.run(get_next)
 
+  def _getAll(self, dataset):
+    get_next = dataset.make_one_shot_iterator().get_next()
+    results = []
+    with self.test_session() as sess:
+      while True:
+        try:
+          results.append(sess.run(get_next))
+        except errors.OutOfRangeError:
+          break
+    return results
+
+  def _assertVectorized(self, dataset, vectorized):
+    # pylint: disable=protected-access
+    dataset = dataset._input_dataset
+    if vectorized:
+      self.assertIsInstance(dataset, dataset_ops.MapDataset)
+      self.assertIsInstance(dataset._input_dataset, dataset_ops.BatchDataset)
+    else:
+      self.assertIsInstance(dataset, dataset_ops.BatchDataset)
+      self.assertIsInstance(dataset._input_dataset, dataset_ops.MapDataset)
+
+  def testMapVectorization(self):
+    dataset = dataset_ops.Dataset.range(10).map(lambda x: x * 2 + 1).batch(
+        4).apply(optimization.optimize(["map_vectorization"]))
+    self._assertVectorized(dataset, True)
+    self.assertEqual([None], dataset.output_shapes.as_list())
+    results = self._getAll(dataset)
+    self.assertEqual(3, len(results))
+    self.assertAllEqual([1, 3, 5, 7], results[0])
+    self.assertAllEqual([9, 11, 13, 15], results[1])
+    self.assertAllEqual([17, 19], results[2])
+
+  def testMapVectorizationStructureAndCapture(self):
+    scale = constant_op.constant(3, dtype=dtypes.int64)
+    dataset = dataset_ops.Dataset.range(6).map(
+        lambda x: {"a": x * scale, "b": array_ops.stack([x, x + 1])},
+        num_parallel_calls=2).batch(3, drop_remainder=True).repeat(2).apply(
+            optimization.optimize(["map_vectorization"]))
+    self._assertVectorized(dataset._input_dataset, True)  # pylint: disable=protected-access
+    self.assertEqual([3], dataset.output_shapes["a"].as_list())
+    self.assertEqual([3, 2], dataset.output_shapes["b"].as_list())
+    results = self._getAll(dataset)
+    self.assertEqual(4, len(results))
+    for i, result in enumerate(results):
+      start = i % 2 * 3
+      self.assertAllEqual([x * 3 for x in range(start, start + 3)],
+                          result["a"])
+      self.assertAllEqual([[x, x + 1] for x in range(start, start + 3)],
+                          result["b"])
+
+  def testMapVectorizationFallback(self):
+
+    def double(x):
+      return x * 2
+
+    dataset = dataset_ops.Dataset.range(5).map(
+        lambda x: script_ops.py_func(double, [x], dtypes.int64)).batch(
+            5).apply(optimization.optimize(["map_vectorization"]))
+    self._assertVectorized(dataset, False)
+    results = self._getAll(dataset)
+    self.assertEqual(1, len(results))
+    self.assertAllEqual([0, 2, 4, 6, 8], results[0])
+
+
+class MapVectorizationBenchmark(test.Benchmark):
+
+  def _benchmark(self, dataset, name, num_iters):
+    get_next = dataset.make_one_shot_iterator().get_next()
+    with session.Session() as sess:
+      sess.run(get_next)
+      start = time.time()
+      for _ in range(num_iters):
+        sess.run(get_next)
+      wall_time = (time.time() - start) / num_iters
+    print("%s: %f us per batch" % (name, wall_time * 1e6))
+    self.report_benchmark(iters=num_iters, wall_time=wall_time, name=name)
+
+  def benchmarkParseAndNormalize(self):
+    num_columns = 16
+    line = ",".join("%f" % x for x in np.random.rand(num_columns))
+    mean = np.random.rand(num_columns).astype(np.float32)
+    stddev = np.random.rand(num_columns).astype(np.float32) + 1.0
+
+    def parse_and_normalize(line):
+      columns = parsing_ops.decode_csv(line, [[0.0]] * num_columns)
+      return math_ops.divide(array_ops.stack(columns) - mean, stddev)
+
+    for batch_size in [16, 128, 1024]:
+      for optimizations in [[], ["map_vectorization"]]:
+        dataset = dataset_ops.Dataset.from_tensors(line).repeat().map(
+            parse_and_normalize).batch(batch_size).apply(
+                optimization.optimize(optimizations))
+        self._benchmark(
+            dataset, "parse_and_normalize_batch_%d_%s" %
+            (batch_size, "vectorized" if optimizations else "unoptimized"),
+            num_iters=100)
+
 
 if __name__ == "__main__":
   test.main()
@@ -248,6 +248,7 @@ class MakeCsvDatasetTest(test.TestCase):
       shuffle_seed=None,
       header=True,
       na_value="",
+      split_size=None,
   ):
     return readers.make_csv_dataset(
         filenames,
@@ -261,6 +262,7 @@ class MakeCsvDatasetTest(test.TestCase):
         header=header,
         na_value=na_value,
         select_columns=select_cols,
+        split_size=split_size,
     )
 
   def _next_actual_batch(self, file_indices, batch_size, num_epochs, defaults):
@@ -344,6 +346,18 @@ class MakeCsvDatasetTest(test.TestCase):
         self._verify_records(
             sess, dataset, range(self._num_files), batch_size=2, num_epochs=10)
 
+  def testMakeCSVDataset_withSplitSize(self):
+    defaults = self.DEFAULTS
+
+    for split_size in [1, 7, 100, 10000]:
+      with ops.Graph().as_default() as g:
+        with self.test_session(graph=g) as sess:
+          dataset = self._make_csv_dataset(
+              self._test_filenames, defaults, split_size=split_size)
+          self._verify_records(sess, dataset, range(self._num_files))
+    with self.assertRaises(ValueError):
+      self._make_csv_dataset(self._test_filenames, defaults, split_size=0)
+
   def testMakeCSVDataset_withBadColumns(self):
     """Tests that exception is raised when input is malformed.
     """
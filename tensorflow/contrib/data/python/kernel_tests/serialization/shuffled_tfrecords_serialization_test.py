@@ -0,0 +1,44 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for the ShuffledTFRecordDataset serialization."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+from tensorflow.contrib.data.python.kernel_tests import reader_dataset_ops_test_base
+from tensorflow.contrib.data.python.kernel_tests.serialization import dataset_serialization_test_base
+from tensorflow.contrib.data.python.ops import shuffle_ops
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.platform import test
+
+
+class ShuffledTFRecordsSerializationTest(
+    reader_dataset_ops_test_base.TFRecordDatasetTestBase,
+    dataset_serialization_test_base.DatasetSerializationTestBase):
+
+  def _build_dataset(self, num_epochs, seed=7):
+    return dataset_ops.Dataset.from_tensor_slices(
+        self.test_filenames).repeat(num_epochs).apply(
+            shuffle_ops.shuffled_tfrecords(
+                files_per_shard=1, cycle_length=2, seed=seed))
+
+  def testShuffledTFRecordsCore(self):
+    num_outputs = 3 * self._num_files * self._num_records
+    self.run_core_tests(lambda: self._build_dataset(3),
+                        lambda: self._build_dataset(3, seed=8), num_outputs)
+
+
+if __name__ == "__main__":
+  test.main()
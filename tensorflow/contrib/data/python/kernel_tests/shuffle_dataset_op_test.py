@@ -17,8 +17,11 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+
 import numpy as np
 
+from tensorflow.contrib.data.python.kernel_tests import reader_dataset_ops_test_base
 from tensorflow.contrib.data.python.ops import shuffle_ops
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.framework import errors
@@ -110,5 +113,78 @@ class ShuffleAndRepeatTest(test.TestCase):
         sess.run(get_next_op)
 
 
+class ShuffledTFRecordsTest(
+    reader_dataset_ops_test_base.TFRecordDatasetTestBase):
+
+  def setUp(self):
+    super(ShuffledTFRecordsTest, self).setUp()
+    self._num_files = 5
+    self._num_records = 10
+    self.test_filenames = self._createFiles()
+
+  def _allRecords(self):
+    return [
+        self._record(f, r)
+        for f in range(self._num_files)
+        for r in range(self._num_records)
+    ]
+
+  def _gen_outputs(self, dataset):
+    get_next = dataset.make_one_shot_iterator().get_next()
+    outputs = []
+    with self.test_session() as sess:
+      while True:
+        try:
+          outputs.append(sess.run(get_next))
+        except errors.OutOfRangeError:
+          break
+    return outputs
+
+  def _build_ds(self, seed, num_epochs=1, files_per_shard=2):
+    return dataset_ops.Dataset.from_tensor_slices(self.test_filenames).shuffle(
+        self._num_files, seed=seed).repeat(num_epochs).apply(
+            shuffle_ops.shuffled_tfrecords(
+                files_per_shard=files_per_shard, cycle_length=2, seed=seed))
+
+  def testCorrectOutput(self):
+    output = self._gen_outputs(self._build_ds(10))
+    self.assertNotEqual(self._allRecords(), output)
+    self.assertEqual(sorted(self._allRecords()), sorted(output))
+
+  def testShardsAreShuffledTogether(self):
+    # With a single shard, every record may appear at any position.
+    output = self._gen_outputs(self._build_ds(10, files_per_shard=5))
+    self.assertEqual(sorted(self._allRecords()), sorted(output))
+    self.assertNotEqual(sorted(output[:self._num_records]),
+                        sorted(self._allRecords()[:self._num_records]))
+
+  def testMultipleEpochs(self):
+    output = self._gen_outputs(self._build_ds(10, num_epochs=3))
+    self.assertEqual(sorted(self._allRecords() * 3), sorted(output))
+    counts = collections.Counter(output)
+    self.assertEqual(set([3]), set(counts.values()))
+
+  def testSameOrderForSameSeeds(self):
+    output1 = self._gen_outputs(self._build_ds(10))
+    output2 = self._gen_outputs(self._build_ds(10))
+    self.assertEqual(output1, output2)
+
+  def testDifferentOrderForDifferentSeeds(self):
+    output1 = self._gen_outputs(self._build_ds(10))
+    output2 = self._gen_outputs(self._build_ds(20))
+    self.assertNotEqual(output1, output2)
+    self.assertEqual(sorted(output1), sorted(output2))
+
+  def testTruncatedFile(self):
+    with open(self.test_filenames[0], "rb") as f:
+      contents = f.read()
+    with open(self.test_filenames[0], "wb") as f:
+      f.write(contents[:-2])
+    dataset = dataset_ops.Dataset.from_tensors(self.test_filenames[0]).apply(
+        shuffle_ops.shuffled_tfrecords())
+    with self.assertRaisesRegexp(errors.DataLossError, "Truncated record"):
+      self._gen_outputs(dataset)
+
+
 if __name__ == "__main__":
   test.main()
@@ -17,15 +17,19 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import time
+
 import numpy as np
 
 from tensorflow.contrib.data.python.kernel_tests import reader_dataset_ops_test_base
 from tensorflow.contrib.data.python.ops import stats_ops
 from tensorflow.core.framework import summary_pb2
 from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import ops
 from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import script_ops
 from tensorflow.python.platform import test
 
 
@@ -196,6 +200,99 @@ class StatsDatasetTest(StatsDatasetTestBase):
       self._assertSummaryHasCount(sess.run(summary_t), "record_latency", 200.0)
 
 
+class PipelineProfileTest(StatsDatasetTestBase):
+
+  def testProfiling(self):
+
+    def slow_identity(x):
+      time.sleep(0.001)
+      return x
+
+    stats_aggregator = stats_ops.StatsAggregator(profile=True)
+    dataset = dataset_ops.Dataset.range(100).map(
+        lambda x: script_ops.py_func(slow_identity, [x], dtypes.int64)).batch(
+            10).prefetch(1).apply(
+                stats_ops.set_stats_aggregator(stats_aggregator))
+    iterator = dataset.make_initializable_iterator()
+    next_element = iterator.get_next()
+    summary_t = stats_aggregator.get_summary()
+
+    with self.test_session() as sess:
+      sess.run(iterator.initializer)
+      for _ in range(10):
+        sess.run(next_element)
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(next_element)
+      summary_str = sess.run(summary_t)
+
+    prefix = "Iterator::SetStatsAggregator::Prefetch"
+    self._assertSummaryHasCount(summary_str, prefix + "::total_time", 10.0)
+    self._assertSummaryHasCount(summary_str,
+                                prefix + "::Batch::Map::total_time", 100.0)
+    self._assertSummaryHasCount(
+        summary_str, prefix + "::Batch::Map::Range::self_time", 100.0)
+
+    profile = stats_ops.PipelineProfile(summary_str)
+    self.assertEqual([prefix, prefix + "::Batch", prefix + "::Batch::Map",
+                      prefix + "::Batch::Map::Range"],
+                     [t.name for t in profile.transformations])
+    self.assertEqual([10, 10, 100, 100],
+                     [t.num_elements for t in profile.transformations])
+    self.assertIsNotNone(profile.transformations[0].buffer_utilization)
+    self.assertEqual(prefix + "::Batch::Map", profile.bottleneck)
+    self.assertGreaterEqual(profile.transformations[2].own_time, 0.1)
+    self.assertIn("Bottleneck: " + prefix + "::Batch::Map", str(profile))
+
+  def testNotProfiling(self):
+    stats_aggregator = stats_ops.StatsAggregator()
+    dataset = dataset_ops.Dataset.range(10).apply(
+        stats_ops.set_stats_aggregator(stats_aggregator))
+    next_element = dataset.make_one_shot_iterator().get_next()
+    summary_t = stats_aggregator.get_summary()
+
+    with self.test_session() as sess:
+      for _ in range(10):
+        sess.run(next_element)
+      profile = stats_ops.PipelineProfile(sess.run(summary_t))
+    self.assertEqual([], profile.transformations)
+    self.assertIsNone(profile.bottleneck)
+
+  def testAsynchronousTransformation(self):
+    summary = summary_pb2.Summary()
+
+    def add_histogram(tag, values):
+      value = summary.value.add(tag=tag)
+      value.histo.num = len(values)
+      value.histo.sum = sum(values)
+
+    add_histogram("Iterator::ParallelMap::self_time", [1000.0] * 4)
+    add_histogram("Iterator::ParallelMap::total_time", [1000.0] * 4)
+    add_histogram("Iterator::ParallelMap::processing_time", [4000.0] * 4)
+    add_histogram("Iterator::ParallelMap::parallelism", [2.0] * 4)
+    add_histogram("Iterator::ParallelMap::buffer_utilization", [0.0, 0.5])
+    add_histogram("Iterator::ParallelMap::Range::self_time", [1000.0] * 4)
+    add_histogram("Iterator::ParallelMap::Range::total_time", [3000.0] * 4)
+    summary.value.add(tag="unrelated", simple_value=1.0)
+
+    profile = stats_ops.PipelineProfile(summary)
+    parallel_map, range_ = profile.transformations
+    self.assertEqual(
+        stats_ops.TransformationProfile(
+            name="Iterator::ParallelMap",
+            num_elements=4,
+            own_time=0.008,
+            wait_time=0.004,
+            buffer_utilization=0.25), parallel_map)
+    self.assertEqual(
+        stats_ops.TransformationProfile(
+            name="Iterator::ParallelMap::Range",
+            num_elements=4,
+            own_time=0.004,
+            wait_time=0.008,
+            buffer_utilization=None), range_)
+    self.assertEqual("Iterator::ParallelMap", profile.bottleneck)
+
+
 class FeatureStatsDatasetTest(
     StatsDatasetTestBase,
     reader_dataset_ops_test_base.ReadBatchFeaturesTestBase):
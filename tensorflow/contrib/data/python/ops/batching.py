@@ -797,14 +797,16 @@ def map_and_batch(map_func,
     num_parallel_batches: (Optional.) A `tf.int64` scalar `tf.Tensor`,
       representing the number of batches to create in parallel. On one hand,
       higher values can help mitigate the effect of stragglers. On the other
-      hand, higher values can increase contention if CPU is scarce.
+      hand, higher values can increase contention if CPU is scarce. If
+      `tf.contrib.data.AUTOTUNE`, the number is tuned at runtime.
     drop_remainder: (Optional.) A `tf.bool` scalar `tf.Tensor`, representing
       whether the last batch should be dropped in case its size is smaller than
       desired; the default behavior is not to drop the smaller batch.
     num_parallel_calls: (Optional.) A `tf.int32` scalar `tf.Tensor`,
         representing the number of elements to process in parallel. If not
         specified, `batch_size * num_parallel_batches` elements will be
-        processed in parallel.
+        processed in parallel. If `tf.contrib.data.AUTOTUNE`, the number is
+        tuned at runtime, in multiples of `batch_size`.
 
   Returns:
     A `Dataset` transformation function, which can be passed to
@@ -817,6 +819,8 @@ def map_and_batch(map_func,
 
   if num_parallel_batches is None and num_parallel_calls is None:
     num_parallel_calls = batch_size
+  elif num_parallel_batches == -1 and num_parallel_calls is None:
+    num_parallel_calls = -1  # tf.contrib.data.AUTOTUNE
   elif num_parallel_batches is not None and num_parallel_calls is None:
     num_parallel_calls = batch_size * num_parallel_batches
   elif num_parallel_batches is not None and num_parallel_calls is not None:
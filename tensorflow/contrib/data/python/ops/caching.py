@@ -0,0 +1,476 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Persistent, fingerprinted caching of datasets."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import errno
+import hashlib
+import os
+import socket
+import time
+
+import numpy as np
+
+from tensorflow.contrib.data.python.ops import enumerate_ops
+from tensorflow.contrib.data.python.ops import grouping
+from tensorflow.core.framework import attr_value_pb2
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import errors
+from tensorflow.python.framework import function
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import script_ops
+from tensorflow.python.ops import string_ops
+from tensorflow.python.platform import gfile
+from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.util import compat
+
+# Written to a cache directory once every shard has been populated. Contains
+# the number of shards.
+_COMPLETE_FILENAME = "COMPLETE"
+# Contains the time at which the cache was last used, for eviction.
+_LAST_ACCESS_FILENAME = "LAST_ACCESS"
+# Held by the process that is populating a cache. Contains the host name and
+# process ID of that process, and is rewritten whenever a shard is completed.
+_LOCK_FILENAME = "POPULATING"
+# A lock that has not been rewritten for this long was left behind by a
+# process that stopped populating the cache, and may be taken over. A lock
+# held by a process on the same host that no longer exists is taken over
+# immediately.
+_LOCK_TIMEOUT_SECS = 30 * 60
+_SHARD_PREFIX = "shard-"
+_SHARD_WIDTH = 5
+
+# How an iterator over a persistent cache uses the cache directory.
+_READ = 0
+_POPULATE = 1
+_PASS_THROUGH = 2
+
+# Attributes that hold per-process state rather than describing the
+# computation, so they are left out of the fingerprint.
+_IGNORED_ATTRS = {
+    "PyFunc": ["token"],
+    "PyFuncStateless": ["token"],
+    "EagerPyFunc": ["token"],
+}
+
+
+def _fingerprint_attr(graph, attr_value, function_fingerprints):
+  """Returns the serialized `attr_value` with function names fingerprinted."""
+  copy = attr_value_pb2.AttrValue()
+  copy.CopyFrom(attr_value)
+  attr_value = copy
+  funcs = []
+  if attr_value.HasField("func"):
+    funcs.append(attr_value.func)
+  if attr_value.HasField("list"):
+    funcs.extend(attr_value.list.func)
+  for func in funcs:
+    func.name = _fingerprint_function(graph, func.name, function_fingerprints)
+  return attr_value.SerializeToString(deterministic=True)
+
+
+def _fingerprint_node(graph, op_type, attrs, function_fingerprints):
+  """Returns a hasher over the type and attributes of a node."""
+  hasher = hashlib.sha256(compat.as_bytes(op_type))
+  ignored = _IGNORED_ATTRS.get(op_type, [])
+  for key in sorted(attrs):
+    # Attributes starting with "_" (e.g. "_class") are not semantic.
+    if key.startswith("_") or key in ignored:
+      continue
+    hasher.update(compat.as_bytes(key))
+    hasher.update(
+        _fingerprint_attr(graph, attrs[key], function_fingerprints))
+  return hasher
+
+
+def _fingerprint_function(graph, name, function_fingerprints):
+  """Returns a fingerprint of the function called `name` in `graph`."""
+  if name in function_fingerprints:
+    return function_fingerprints[name]
+  function = graph._get_function(name)  # pylint: disable=protected-access
+  if function is None:
+    # Not a function defined in this graph (e.g. a built-in op name).
+    function_fingerprints[name] = name
+    return name
+  fdef = function.definition
+  hasher = hashlib.sha256()
+  # The name of the function includes a hash of its definition, which covers
+  # any `py_func` tokens, so the arguments, body and return values are hashed
+  # instead.
+  for arg in list(fdef.signature.input_arg) + list(fdef.signature.output_arg):
+    hasher.update(compat.as_bytes(arg.name))
+    hasher.update(compat.as_bytes(str(arg.type)))
+  for node in sorted(fdef.node_def, key=lambda node: node.name):
+    hasher.update(compat.as_bytes(node.name))
+    hasher.update(compat.as_bytes(",".join(node.input)))
+    hasher.update(
+        _fingerprint_node(graph, node.op, node.attr,
+                          function_fingerprints).digest())
+  for key in sorted(fdef.ret):
+    hasher.update(compat.as_bytes("%s=%s" % (key, fdef.ret[key])))
+  function_fingerprints[name] = hasher.hexdigest()
+  return function_fingerprints[name]
+
+
+def _fingerprint_tensor(tensor, captures=None):
+  """Returns a fingerprint of the computation that produces `tensor`.
+
+  The fingerprint covers the types and attributes of every op that `tensor`
+  depends on (including constant values and the definitions of functions
+  such as those created by `StructuredFunctionWrapper`) and how these ops are
+  connected. It does not depend on op names, so the same pipeline built in
+  different graphs or processes has the same fingerprint.
+
+  Args:
+    tensor: A `tf.Tensor`.
+    captures: (Optional.) A dictionary mapping placeholder ops in the graph of
+      `tensor` to the tensors of another graph that they stand for. The
+      placeholders are fingerprinted as those tensors.
+  """
+  graph = tensor.graph
+  captures = captures or {}
+  function_fingerprints = {}
+  op_fingerprints = {}
+  stack = [(tensor.op, False)]
+  while stack:
+    op, inputs_done = stack.pop()
+    if op in op_fingerprints:
+      continue
+    if op in captures:
+      op_fingerprints[op] = _fingerprint_tensor(captures[op])
+      continue
+    dependencies = [t.op for t in op.inputs] + list(op.control_inputs)
+    if not inputs_done:
+      stack.append((op, True))
+      stack.extend((dependency, False) for dependency in dependencies
+                   if dependency not in op_fingerprints)
+      continue
+    hasher = _fingerprint_node(graph, op.type, op.node_def.attr,
+                               function_fingerprints)
+    for t in op.inputs:
+      hasher.update(compat.as_bytes(op_fingerprints[t.op]))
+      hasher.update(compat.as_bytes(str(t.value_index)))
+    for control_input in op.control_inputs:
+      hasher.update(b"^" + compat.as_bytes(op_fingerprints[control_input]))
+    op_fingerprints[op] = hasher.hexdigest()
+  hasher = hashlib.sha256(compat.as_bytes(op_fingerprints[tensor.op]))
+  hasher.update(compat.as_bytes(str(tensor.value_index)))
+  return hasher.hexdigest()
+
+
+def _fingerprint_dataset(dataset):
+  """Returns a fingerprint of `dataset` without adding ops to its graph."""
+  # The dataset is built in a throwaway graph. Tensors that it captures from
+  # the default graph are replaced by placeholders, which are fingerprinted
+  # by walking the default graph instead of copying those tensors.
+  graph = function._FuncGraph("persistent_cache_fingerprint", False)  # pylint: disable=protected-access
+  with graph.as_default():
+    variant = dataset._as_variant_tensor()  # pylint: disable=protected-access
+  captures = {
+      placeholder.op: tensor
+      for tensor, placeholder in graph._captured.items()  # pylint: disable=protected-access
+  }
+  return _fingerprint_tensor(variant, captures)
+
+
+def _shard_filename(cache_dir, shard):
+  """Returns the cache filename of `shard`, a scalar `tf.int64` tensor."""
+  return string_ops.string_join([
+      os.path.join(cache_dir, _SHARD_PREFIX),
+      string_ops.as_string(shard, width=_SHARD_WIDTH, fill="0")
+  ])
+
+
+def _directory_size(dirname):
+  size = 0
+  for root, _, filenames in gfile.Walk(dirname):
+    for filename in filenames:
+      size += gfile.Stat(os.path.join(root, filename)).length
+  return size
+
+
+def _last_access_time(cache_dir):
+  try:
+    return float(
+        gfile.GFile(os.path.join(cache_dir, _LAST_ACCESS_FILENAME)).read())
+  except (errors.NotFoundError, ValueError):
+    return 0.
+
+
+def _lock_token():
+  return "%s:%d" % (socket.gethostname(), os.getpid())
+
+
+def _is_dead_local_process(token):
+  """Returns whether `token` names a process on this host that has exited."""
+  host, _, pid = token.rpartition(":")
+  if host != socket.gethostname() or not pid.isdigit():
+    return False
+  try:
+    os.kill(int(pid), 0)
+  except OSError as e:
+    return e.errno == errno.ESRCH
+  return False
+
+
+def _try_lock(cache_dir):
+  """Returns whether this process holds the lock on `cache_dir`.
+
+  The lock is acquired if it is not held or is stale, and refreshed if it is
+  already held by this process. File systems accessed through `gfile` do not
+  support exclusive creation, so two processes that find the lock free at the
+  same time may both acquire it; each re-reads the lock to narrow this window.
+  """
+  token = _lock_token()
+  lock_filename = os.path.join(cache_dir, _LOCK_FILENAME)
+  try:
+    holder = compat.as_str(gfile.GFile(lock_filename).read())
+    age = time.time() - gfile.Stat(lock_filename).mtime_nanos / 1e9
+  except errors.NotFoundError:
+    holder, age = None, None
+  if holder is not None and holder != token:
+    if age < _LOCK_TIMEOUT_SECS and not _is_dead_local_process(holder):
+      return False
+    logging.warning("Taking over the cache %s from %s, which stopped "
+                    "populating it.", cache_dir, holder)
+  with gfile.GFile(lock_filename, "w") as f:
+    f.write(token)
+  return compat.as_str(gfile.GFile(lock_filename).read()) == token
+
+
+def _unlock(cache_dir):
+  lock_filename = os.path.join(cache_dir, _LOCK_FILENAME)
+  try:
+    if compat.as_str(gfile.GFile(lock_filename).read()) == _lock_token():
+      gfile.Remove(lock_filename)
+  except errors.NotFoundError:
+    pass
+
+
+def _num_completed_shards(cache_dir):
+  """Returns the number of leading shards that have been completely written."""
+  # Shards are written in order, and `Dataset.cache()` only writes the
+  # ".index" file of a shard once all of its elements have been written.
+  num_shards = 0
+  while gfile.Exists(
+      os.path.join(cache_dir, "%s%0*d.index" % (_SHARD_PREFIX, _SHARD_WIDTH,
+                                                 num_shards))):
+    num_shards += 1
+  return num_shards
+
+
+def _remove_incomplete_shards(cache_dir, first_shard):
+  """Removes the files of the shards from `first_shard` onwards."""
+  # These are temporary files and lockfiles that `Dataset.cache()` left behind
+  # when a previous run was interrupted while writing a shard. They must be
+  # removed before the shard is written again.
+  prefix_length = len(_SHARD_PREFIX)
+  for filename in gfile.Glob(os.path.join(cache_dir, _SHARD_PREFIX + "*")):
+    shard = os.path.basename(filename)[prefix_length:][:_SHARD_WIDTH]
+    if shard.isdigit() and int(shard) >= first_shard:
+      gfile.Remove(filename)
+
+
+def _count_if(predicate):
+  """Returns a `take()` count of all elements if `predicate`, else none."""
+  return array_ops.where(predicate, np.int64(-1), np.int64(0))
+
+
+def _empty_with_side_effect(dataset, fn):
+  """Returns an empty dataset, like `dataset`, that calls `fn` when reached.
+
+  Args:
+    dataset: A `Dataset` whose structure the result has. It is not evaluated.
+    fn: A Python function that takes no arguments and returns an `np.int64`.
+  """
+  return dataset_ops.Dataset.from_tensors(0).map(
+      lambda _: script_ops.py_func(fn, [], dtypes.int64)).filter(
+          lambda _: False).flat_map(lambda _: dataset.take(0))
+
+
+def _evict(directory, current, max_cache_bytes, max_caches):
+  """Deletes least recently used caches in `directory` beyond the limits."""
+  caches = []
+  for name in gfile.ListDirectory(directory):
+    cache_dir = os.path.join(directory, compat.as_str(name).rstrip("/"))
+    if cache_dir != current and gfile.IsDirectory(cache_dir):
+      caches.append((_last_access_time(cache_dir), cache_dir))
+  caches.sort()
+  total_size = _directory_size(current) if max_cache_bytes is not None else 0
+  sizes = {}
+  if max_cache_bytes is not None:
+    for _, cache_dir in caches:
+      sizes[cache_dir] = _directory_size(cache_dir)
+      total_size += sizes[cache_dir]
+  num_caches = len(caches) + 1
+  for _, cache_dir in caches:
+    over_size = max_cache_bytes is not None and total_size > max_cache_bytes
+    over_count = max_caches is not None and num_caches > max_caches
+    if not (over_size or over_count):
+      break
+    logging.info("Evicting dataset cache %s.", cache_dir)
+    gfile.DeleteRecursively(cache_dir)
+    total_size -= sizes.get(cache_dir, 0)
+    num_caches -= 1
+
+
+def persistent_cache(directory,
+                     shard_size=1024,
+                     max_cache_bytes=None,
+                     max_caches=None):
+  """A transformation that caches a dataset on disk, keyed by its definition.
+
+  Unlike @{tf.data.Dataset.cache}, which reuses the files at a given path even
+  if the input pipeline has changed, this transformation stores the cache in
+  a subdirectory of `directory` named after a fingerprint of the input
+  dataset's graph, including the functions passed to transformations such as
+  `map()` and constant values such as filenames. Changing the pipeline
+  therefore starts a new cache instead of silently reading a stale one.
+
+  The cache is written as one file per `shard_size` consecutive elements.
+  Each time an iterator is initialized (for example, at the start of every
+  epoch of a `repeat()`), the shards that have been completed are read from
+  their files without evaluating the input dataset, and only the remaining
+  shards are computed and written. If the input is not fully consumed (for
+  example, the job is preempted), the next run therefore only writes the
+  shards that are missing. Any number of readers can share a completed cache.
+
+  For example:
+
+  ```python
+  dataset = tf.data.TFRecordDataset(filenames).map(expensive_decode)
+  dataset = dataset.apply(tf.contrib.data.persistent_cache(
+      "/tmp/cache", max_cache_bytes=100 * 2**30))
+  ```
+
+  NOTE: Only one process populates a cache at a time: it holds a lock file in
+  the cache directory, and other processes that use the cache before it is
+  complete read the input dataset without caching it. A lock that has not been
+  refreshed for 30 minutes, or whose process has exited, is taken over. When
+  populating resumes, the input dataset is evaluated (and discarded) up to the
+  first missing shard, and up to `shard_size` elements are buffered in memory.
+  Values fed to placeholders and the bodies of Python functions called via
+  `tf.py_func()` or `Dataset.from_generator()` are not part of the
+  fingerprint.
+
+  Args:
+    directory: A Python string, the directory in which caches are stored.
+    shard_size: (Optional.) A Python integer, the number of elements per
+      cache shard.
+    max_cache_bytes: (Optional.) If set, the least recently used caches in
+      `directory` are deleted until the total size of the caches is at most
+      this many bytes. The cache being created is never deleted.
+    max_caches: (Optional.) If set, the least recently used caches in
+      `directory` are deleted until at most this many remain.
+
+  Returns:
+    A `Dataset` transformation function, which can be passed to
+    @{tf.data.Dataset.apply}.
+
+  Raises:
+    ValueError: If `shard_size` or `max_caches` is not positive.
+  """
+  if shard_size <= 0:
+    raise ValueError("`shard_size` must be positive, got %d." % shard_size)
+  if max_caches is not None and max_caches <= 0:
+    raise ValueError("`max_caches` must be positive, got %d." % max_caches)
+
+  def _apply_fn(dataset):
+    """Function from `Dataset` to `Dataset` that applies the transformation."""
+    hasher = hashlib.sha256(compat.as_bytes(_fingerprint_dataset(dataset)))
+    hasher.update(compat.as_bytes(str(shard_size)))
+    cache_dir = os.path.join(directory, hasher.hexdigest()[:32])
+
+    gfile.MakeDirs(cache_dir)
+    with gfile.GFile(os.path.join(cache_dir, _LAST_ACCESS_FILENAME), "w") as f:
+      f.write(str(time.time()))
+    if max_cache_bytes is not None or max_caches is not None:
+      _evict(directory, cache_dir, max_cache_bytes, max_caches)
+
+    complete_filename = os.path.join(cache_dir, _COMPLETE_FILENAME)
+
+    def plan():
+      """Decides how a new iterator uses the cache."""
+      if gfile.Exists(complete_filename):
+        num_shards = int(gfile.GFile(complete_filename).read())
+        return np.int64(_READ), np.int64(num_shards)
+      if not _try_lock(cache_dir):
+        logging.info("The cache %s is being populated by another process, so "
+                     "the input dataset is used without caching.", cache_dir)
+        return np.int64(_PASS_THROUGH), np.int64(0)
+      num_shards = _num_completed_shards(cache_dir)
+      _remove_incomplete_shards(cache_dir, num_shards)
+      return np.int64(_POPULATE), np.int64(num_shards)
+
+    def heartbeat():
+      _try_lock(cache_dir)
+      return np.int64(0)
+
+    def mark_complete():
+      num_shards = _num_completed_shards(cache_dir)
+      with gfile.GFile(complete_filename, "w") as f:
+        f.write(str(num_shards))
+      _unlock(cache_dir)
+      return np.int64(num_shards)
+
+    def write_shard(shard, window):
+      return window.map(lambda _, x: x).cache(
+          _shard_filename(cache_dir, shard)).concatenate(
+              _empty_with_side_effect(dataset, heartbeat))
+
+    def make_dataset(mode, num_completed_shards):
+      """Returns the elements of `dataset` for an iterator in `mode`."""
+      # Completed shards are read from their files. `Dataset.cache()` only
+      # evaluates its input when the file does not exist, and the input is
+      # empty regardless, so the input dataset is not evaluated for them.
+      completed = dataset_ops.Dataset.range(num_completed_shards).flat_map(
+          lambda shard: dataset.take(0).cache(
+              _shard_filename(cache_dir, shard)))
+      # The remaining shards are written from the window of elements that
+      # `group_by_window()` buffered. A `take()` of 0 elements does not
+      # evaluate its input, so the input is skipped only when populating.
+      populate = dataset.skip(num_completed_shards * shard_size).take(
+          _count_if(math_ops.equal(mode, _POPULATE)))
+      populate = populate.apply(enumerate_ops.enumerate_dataset()).apply(
+          grouping.group_by_window(
+              lambda index, _: num_completed_shards + index // shard_size,
+              write_shard,
+              window_size=shard_size))
+      finish = dataset_ops.Dataset.from_tensors(mode).filter(
+          lambda mode: math_ops.equal(mode, _POPULATE)).flat_map(
+              lambda _: _empty_with_side_effect(dataset, mark_complete))
+      pass_through = dataset.take(
+          _count_if(math_ops.equal(mode, _PASS_THROUGH)))
+      return completed.concatenate(populate).concatenate(finish).concatenate(
+          pass_through)
+
+    def plan_fn(_):
+      mode, num_completed_shards = script_ops.py_func(
+          plan, [], [dtypes.int64, dtypes.int64])
+      mode.set_shape([])
+      num_completed_shards.set_shape([])
+      return mode, num_completed_shards
+
+    # `plan()` runs whenever an iterator is initialized, for example at the
+    # start of each epoch of a `repeat()`, so a cache that was completed by
+    # an earlier epoch or another process is read instead of populated again.
+    return dataset_ops.Dataset.from_tensors(0).map(plan_fn).flat_map(
+        make_dataset)
+
+  return _apply_fn
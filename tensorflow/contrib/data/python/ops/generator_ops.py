@@ -0,0 +1,326 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Multi-process generator datasets."""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import multiprocessing
+import traceback
+
+import numpy as np
+from six.moves import queue as Queue
+
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.data.util import nest
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import tensor_shape
+
+# Offsets of arrays written to a shared-memory slab are aligned to this many
+# bytes, so that the views handed back to the consumer are well aligned.
+_SLAB_ALIGNMENT = 64
+
+# Message tags sent from the worker processes to the consumer.
+_SLAB = 0
+_PICKLED = 1
+_DONE = 2
+_ERROR = 3
+
+# How often the consumer checks that the workers it waits for are still alive.
+_POLL_INTERVAL_SECS = 1.0
+
+
+def _get_context():
+  """Returns the `multiprocessing` context in which workers are started.
+
+  Workers are started from a `py_func`, while other threads of the TensorFlow
+  runtime may hold locks, so they are not `fork()`ed from this process.
+  Python 2 has no start methods, so its workers are always forked.
+  """
+  if not hasattr(multiprocessing, "get_context"):
+    return multiprocessing
+  if "forkserver" in multiprocessing.get_all_start_methods():
+    return multiprocessing.get_context("forkserver")
+  return multiprocessing.get_context("spawn")
+
+
+def _aligned(offset):
+  return (offset + _SLAB_ALIGNMENT - 1) // _SLAB_ALIGNMENT * _SLAB_ALIGNMENT
+
+
+def _write_to_slab(slab, arrays):
+  """Copies `arrays` into `slab`, returning their layout or `None`.
+
+  `None` is returned when the arrays do not fit in `slab`, or when one of them
+  has an `object` dtype (e.g. strings) that cannot be stored as raw bytes.
+  """
+  layout = []
+  offset = 0
+  for array in arrays:
+    if array.dtype.hasobject:
+      return None
+    offset = _aligned(offset)
+    layout.append((array.dtype.str, array.shape, offset))
+    offset += array.nbytes
+  if offset > len(slab):
+    return None
+  buf = np.frombuffer(slab, dtype=np.uint8)
+  for array, (_, _, offset) in zip(arrays, layout):
+    buf[offset:offset + array.nbytes] = np.ascontiguousarray(array).view(
+        np.uint8).reshape(-1)
+  return layout
+
+
+def _read_from_slab(slab, layout):
+  """Returns copies of the arrays described by `layout` in `slab`."""
+  arrays = []
+  for dtype, shape, offset in layout:
+    dtype = np.dtype(dtype)
+    count = int(np.prod(shape)) if shape else 1
+    arrays.append(
+        np.frombuffer(slab, dtype=dtype, count=count,
+                      offset=offset).reshape(shape).copy())
+  return arrays
+
+
+def _worker_loop(worker_id, generator, shard_args, output_types, slabs,
+                 free_slabs, output_queue):
+  """Runs `generator` over `shard_args`, streaming elements to the consumer."""
+  try:
+    flattened_types = [
+        dtypes.as_dtype(dt).as_numpy_dtype for dt in nest.flatten(output_types)
+    ]
+    for args in shard_args:
+      for values in generator(*args):
+        try:
+          flattened_values = nest.flatten_up_to(output_types, values)
+        except (TypeError, ValueError):
+          raise TypeError(
+              "`generator` yielded an element that did not match the expected "
+              "structure. The expected structure was %s, but the yielded "
+              "element was %s." % (output_types, values))
+        arrays = [
+            np.asarray(value, dtype=dtype)
+            for value, dtype in zip(flattened_values, flattened_types)
+        ]
+        slab_index = free_slabs.get()
+        layout = _write_to_slab(slabs[slab_index], arrays)
+        if layout is None:
+          # The slab is still handed to the consumer, which returns it once it
+          # has received the element, so that pickled elements count towards
+          # `buffer_size` too.
+          output_queue.put((_PICKLED, worker_id, (slab_index, arrays)))
+        else:
+          output_queue.put((_SLAB, worker_id, (slab_index, layout)))
+    output_queue.put((_DONE, worker_id, None))
+  except Exception:  # pylint: disable=broad-except
+    output_queue.put((_ERROR, worker_id, traceback.format_exc()))
+
+
+class _ParallelGeneratorState(object):
+  """Worker processes and shared memory for one pass over the generators."""
+
+  def __init__(self, generator, args, output_types, num_workers, deterministic,
+               buffer_size, max_element_size):
+    context = _get_context()
+    self._deterministic = deterministic
+    self._slabs = []
+    self._free_slabs = []
+    self._processes = []
+    if deterministic:
+      self._queues = [context.Queue() for _ in range(num_workers)]
+    else:
+      self._queues = [context.Queue()] * num_workers
+    for worker_id in range(num_workers):
+      slabs = [
+          context.RawArray("b", max_element_size) for _ in range(buffer_size)
+      ]
+      free_slabs = context.Queue()
+      for slab_index in range(buffer_size):
+        free_slabs.put(slab_index)
+      self._slabs.append(slabs)
+      self._free_slabs.append(free_slabs)
+      process = context.Process(
+          target=_worker_loop,
+          args=(worker_id, generator, args[worker_id::num_workers],
+                output_types, slabs, free_slabs, self._queues[worker_id]))
+      process.daemon = True
+      self._processes.append(process)
+    for process in self._processes:
+      process.start()
+
+  def _get(self, queue, worker_ids):
+    """Returns the next message on `queue`, sent by one of `worker_ids`."""
+    while True:
+      try:
+        return queue.get(timeout=_POLL_INTERVAL_SECS)
+      except Queue.Empty:
+        pass
+      for worker_id in worker_ids:
+        process = self._processes[worker_id]
+        if not process.is_alive():
+          # Picks up the messages the worker sent just before exiting.
+          try:
+            return queue.get(timeout=_POLL_INTERVAL_SECS)
+          except Queue.Empty:
+            raise RuntimeError(
+                "Worker %d exited with code %s before it finished." %
+                (worker_id, process.exitcode))
+
+  def _receive(self, queue, worker_ids):
+    """Returns `(worker_id, arrays)`, or `(worker_id, None)` when done."""
+    tag, worker_id, payload = self._get(queue, worker_ids)
+    if tag == _SLAB:
+      slab_index, layout = payload
+      arrays = _read_from_slab(self._slabs[worker_id][slab_index], layout)
+      self._free_slabs[worker_id].put(slab_index)
+      return worker_id, arrays
+    elif tag == _PICKLED:
+      slab_index, arrays = payload
+      self._free_slabs[worker_id].put(slab_index)
+      return worker_id, arrays
+    elif tag == _DONE:
+      return worker_id, None
+    raise RuntimeError(
+        "`generator` raised an exception in worker %d:\n%s" % (worker_id,
+                                                              payload))
+
+  def __iter__(self):
+    active = list(range(len(self._processes)))
+    if self._deterministic:
+      # Take one element from each worker in turn, dropping workers from the
+      # cycle as they run out of elements.
+      while active:
+        for worker_id in list(active):
+          _, arrays = self._receive(self._queues[worker_id], [worker_id])
+          if arrays is None:
+            active.remove(worker_id)
+          else:
+            yield arrays
+    else:
+      while active:
+        worker_id, arrays = self._receive(self._queues[0], active)
+        if arrays is None:
+          active.remove(worker_id)
+        else:
+          yield arrays
+
+  def close(self):
+    for process in self._processes:
+      if process.is_alive():
+        process.terminate()
+      process.join()
+    self._processes = []
+
+
+def parallel_from_generator(generator,
+                            output_types,
+                            output_shapes=None,
+                            args=None,
+                            num_workers=None,
+                            deterministic=True,
+                            buffer_size=8,
+                            max_element_size=1 << 20):
+  """Creates a `Dataset` from `generator` invocations run in worker processes.
+
+  Unlike @{tf.data.Dataset.from_generator}, which runs a single Python
+  generator under the GIL, this function calls `generator(*a)` for each tuple
+  `a` in `args` and distributes those calls across `num_workers` processes.
+  Worker `i` handles `args[i]`, `args[i + num_workers]`, ... in order. Each
+  worker converts the elements that it generates to NumPy arrays and copies
+  them into one of `buffer_size` shared-memory slabs of `max_element_size`
+  bytes. The consumer only copies the arrays back out. Elements that do not
+  fit in a slab, or that contain strings, are pickled instead.
+
+  For example:
+
+  ```python
+  def parse_file(filename):
+    with open(filename) as f:
+      for line in f:
+        yield [float(x) for x in line.split(",")]
+
+  dataset = tf.contrib.data.parallel_from_generator(
+      parse_file, tf.float32, tf.TensorShape([None]),
+      args=[(f,) for f in filenames], num_workers=8)
+  ```
+
+  NOTE: The workers are started with the "forkserver" (or, where it is not
+  available, "spawn") method of `multiprocessing`, rather than forked from the
+  multithreaded TensorFlow process. `generator` and the values in `args` are
+  therefore pickled and sent to the workers, so they must be picklable:
+  `generator` should be a module-level function rather than a lambda or a
+  nested function. Each pass over the returned dataset starts a new set of
+  workers.
+
+  Args:
+    generator: A callable that takes the arguments in one entry of `args` and
+      returns an object that supports the `iter()` protocol.
+    output_types: A nested structure of `tf.DType` objects corresponding to
+      each component of an element yielded by `generator`.
+    output_shapes: (Optional.) A nested structure of `tf.TensorShape`
+      objects corresponding to each component of an element yielded by
+      `generator`.
+    args: A list of argument tuples, one per invocation of `generator`. An
+      entry that is not a tuple is passed as a single argument.
+    num_workers: (Optional.) The number of worker processes. Defaults to the
+      number of CPUs, and never exceeds the number of entries in `args`.
+    deterministic: (Optional.) If `True` (the default), elements are produced
+      by taking one element from each worker in turn. If `False`, elements
+      are produced in the order in which the workers generate them, so a
+      slow worker does not hold back the others.
+    buffer_size: (Optional.) The number of elements that each worker can
+      produce ahead of the consumer.
+    max_element_size: (Optional.) The size in bytes of each shared-memory
+      slab.
+
+  Returns:
+    Dataset: A `Dataset`.
+
+  Raises:
+    TypeError: If `generator` is not callable.
+    ValueError: If `args` is empty or any of the sizes is not positive.
+  """
+  if not callable(generator):
+    raise TypeError("`generator` must be callable.")
+  if not args:
+    raise ValueError("`args` must contain at least one argument tuple.")
+  args = [a if isinstance(a, tuple) else (a,) for a in args]
+  if num_workers is None:
+    num_workers = multiprocessing.cpu_count()
+  num_workers = min(num_workers, len(args))
+  if num_workers <= 0:
+    raise ValueError("`num_workers` must be positive, got %d." % num_workers)
+  if buffer_size <= 0:
+    raise ValueError("`buffer_size` must be positive, got %d." % buffer_size)
+  if max_element_size <= 0:
+    raise ValueError(
+        "`max_element_size` must be positive, got %d." % max_element_size)
+  if output_shapes is not None:
+    output_shapes = nest.map_structure_up_to(
+        output_types, tensor_shape.as_shape, output_shapes)
+
+  def parallel_generator():
+    state = _ParallelGeneratorState(generator, args, output_types, num_workers,
+                                    deterministic, buffer_size,
+                                    max_element_size)
+    try:
+      for arrays in state:
+        yield nest.pack_sequence_as(output_types, arrays)
+    finally:
+      state.close()
+
+  return dataset_ops.Dataset.from_generator(parallel_generator, output_types,
+                                            output_shapes)
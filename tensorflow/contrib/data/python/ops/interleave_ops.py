@@ -66,6 +66,7 @@ def parallel_interleave(map_func,
   Args:
     map_func: A function mapping a nested structure of tensors to a `Dataset`.
     cycle_length: The number of input `Dataset`s to interleave from in parallel.
+      If `tf.contrib.data.AUTOTUNE`, the number of schedulable CPUs is used.
     block_length: The number of consecutive elements to pull from an input
       `Dataset` before advancing to the next input `Dataset`.
     sloppy: If false, elements are produced in deterministic order. Otherwise,
@@ -75,7 +76,8 @@ def parallel_interleave(map_func,
       interleaved should buffer (similar to the `.prefetch()` transformation for
       each interleaved iterator).
     prefetch_input_elements: The number of input elements to transform to
-      iterators before they are needed for interleaving.
+      iterators before they are needed for interleaving. Defaults to
+      `2 * cycle_length`.
 
   Returns:
     A `Dataset` transformation function, which can be passed to
@@ -17,11 +17,24 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import copy
+
 from tensorflow.contrib.data.python.ops import contrib_op_loader  # pylint: disable=unused-import
 from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.data.util import nest
+from tensorflow.python.data.util import sparse
 from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import function_def_to_graph
+from tensorflow.python.framework import importer
 from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import gen_dataset_ops
+from tensorflow.python.ops.parallel_for import control_flow_ops as pfor_ops
+from tensorflow.python.platform import tf_logging as logging
+
+# The name of the optimization that is applied in Python, by rewriting the
+# input `Dataset` objects, rather than by the `OptimizeDataset` kernel.
+_MAP_VECTORIZATION = "map_vectorization"
 
 
 def optimize(optimizations=None):
@@ -32,6 +45,15 @@ def optimize(optimizations=None):
       optimizations to use. If not specified, the default set of optimizations
       is applied.
 
+  In addition to the optimizations implemented by the `OptimizeDataset`
+  kernel, a Python list of names may contain `"map_vectorization"`. This
+  rewrites every `map(f).batch(n)` in the input pipeline to
+  `batch(n).map(vectorized_f)`, where `vectorized_f` is derived from `f` using
+  `pfor`, so that `f` is invoked once per batch rather than once per element.
+  If `f` cannot be vectorized (e.g. because it contains stateful ops such as
+  `tf.py_func`, or ops that have no `pfor` converter), or if the elements
+  contain `tf.SparseTensor` components, the pipeline is left unchanged.
+
   Returns:
     A `Dataset` transformation function, which can be passed to
     @{tf.data.Dataset.apply}.
@@ -50,9 +72,13 @@ class _OptimizeDataset(dataset_ops.Dataset):
   def __init__(self, input_dataset, optimizations):
     """See `optimize()` for details."""
     super(_OptimizeDataset, self).__init__()
-    self._input_dataset = input_dataset
     if optimizations is None:
       optimizations = []
+    if (isinstance(optimizations, (list, tuple)) and
+        _MAP_VECTORIZATION in optimizations):
+      input_dataset = _vectorize_maps(input_dataset)
+      optimizations = [o for o in optimizations if o != _MAP_VECTORIZATION]
+    self._input_dataset = input_dataset
     self._optimizations = ops.convert_to_tensor(
         optimizations, dtype=dtypes.string, name="optimizations")
 
@@ -73,3 +99,89 @@ class _OptimizeDataset(dataset_ops.Dataset):
   @property
   def output_types(self):
     return self._input_dataset.output_types
+
+
+def _vectorize_maps(dataset):
+  """Returns `dataset` with every vectorizable `map(f).batch(n)` rewritten.
+
+  The datasets between the root and a rewritten node are shallow-copied, so
+  the original `dataset` is not modified.
+  """
+  # pylint: disable=protected-access
+  input_dataset = getattr(dataset, "_input_dataset", None)
+  if not isinstance(input_dataset, dataset_ops.Dataset):
+    return dataset
+  new_input_dataset = _vectorize_maps(input_dataset)
+  if new_input_dataset is not input_dataset:
+    dataset = copy.copy(dataset)
+    dataset._input_dataset = new_input_dataset
+  if (isinstance(dataset, dataset_ops.BatchDataset) and
+      isinstance(dataset._input_dataset, dataset_ops.MapDataset)):
+    vectorized = _vectorize_map_and_batch(dataset)
+    if vectorized is not None:
+      return vectorized
+  return dataset
+
+
+def _vectorize_map_and_batch(batch_dataset):
+  """Rewrites `map(f).batch(n)` to `batch(n).map(vectorized_f)`.
+
+  Args:
+    batch_dataset: A `BatchDataset` whose input is a `MapDataset`.
+
+  Returns:
+    The rewritten `Dataset`, or `None` if `f` cannot be vectorized.
+  """
+  # pylint: disable=protected-access
+  map_dataset = batch_dataset._input_dataset
+  input_dataset = map_dataset._input_dataset
+  if (sparse.any_sparse(input_dataset.output_classes) or
+      sparse.any_sparse(map_dataset.output_classes)):
+    return None
+  map_func = map_dataset._map_func
+  output_types = map_dataset.output_types
+  output_shapes = nest.flatten(batch_dataset.output_shapes)
+
+  def vectorized_func(*args):
+    """Applies the body of `map_func` to each element of a batch."""
+    components = nest.flatten(args)
+    fdef = map_func.definition
+    graph_def, tensor_names = function_def_to_graph.function_def_to_graph_def(
+        fdef)
+    inputs = components + list(map_func.captured_inputs)
+    if len(inputs) != len(fdef.signature.input_arg):
+      raise ValueError("Unexpected number of arguments to %s." %
+                       fdef.signature.name)
+
+    def loop_fn(i):
+      input_map = {}
+      for j, (arg, t) in enumerate(zip(fdef.signature.input_arg, inputs)):
+        # Captured inputs are shared by all elements of the batch.
+        if j < len(components):
+          t = array_ops.gather(t, i)
+        input_map[tensor_names[arg.name]] = t
+      return importer.import_graph_def(
+          graph_def,
+          input_map=input_map,
+          return_elements=[
+              tensor_names[fdef.ret[arg.name]]
+              for arg in fdef.signature.output_arg
+          ],
+          name="vectorized")
+
+    outputs = pfor_ops.pfor(loop_fn, array_ops.shape(components[0])[0])
+    for output, shape in zip(outputs, output_shapes):
+      output.set_shape(shape)
+    return nest.pack_sequence_as(output_types, outputs)
+
+  try:
+    dataset = dataset_ops.BatchDataset(input_dataset,
+                                       batch_dataset._batch_size,
+                                       batch_dataset._drop_remainder)
+    if isinstance(map_dataset, dataset_ops.ParallelMapDataset):
+      return dataset_ops.ParallelMapDataset(dataset, vectorized_func,
+                                            map_dataset._num_parallel_calls)
+    return dataset_ops.MapDataset(dataset, vectorized_func)
+  except Exception as e:  # pylint: disable=broad-except
+    logging.info("Not vectorizing %s: %s", map_func.name, e)
+    return None
@@ -200,6 +200,22 @@ def _get_sorted_col_indices(select_columns, column_names):
   return result
 
 
+def _split_files(filenames, split_size):
+  """Splits `filenames` into `[start, end)` byte ranges of `split_size` bytes.
+
+  Returns:
+    A tuple of the filename of each range, and a list of `[start, end]` pairs.
+  """
+  split_filenames = []
+  byte_ranges = []
+  for filename in filenames:
+    length = gfile.Stat(filename).length
+    for start in range(0, max(length, 1), split_size):
+      split_filenames.append(filename)
+      byte_ranges.append([start, min(start + split_size, length)])
+  return split_filenames, byte_ranges
+
+
 def _maybe_shuffle_and_repeat(
     dataset, num_epochs, shuffle, shuffle_buffer_size, shuffle_seed):
   """Optionally shuffle and repeat dataset, as requested."""
@@ -326,6 +342,7 @@ def make_csv_dataset(
     num_parallel_parser_calls=2,
     sloppy=False,
     num_rows_for_inference=100,
+    split_size=None,
 ):
   """Reads CSV files into a dataset.
 
@@ -399,6 +416,12 @@ def make_csv_dataset(
     num_rows_for_inference: Number of rows of a file to use for type inference
       if record_defaults is not provided. If None, reads all the rows of all
       the files. Defaults to 100.
+    split_size: (Optional.) If set, each file is divided into byte ranges of
+      `split_size` bytes, which are read in parallel like separate files when
+      `num_parallel_reads > 1`, so that a single large file can be parsed by
+      several threads. Each record is read by the range in which it starts.
+      This requires that quoted fields do not contain line breaks. Defaults
+      to reading each file as a whole.
 
   Returns:
     A dataset, where each element is a (features, labels) tuple that corresponds
@@ -412,9 +435,18 @@ def make_csv_dataset(
   """
   # Create dataset of all matching filenames
   filenames = _get_file_names(file_pattern, False)
-  dataset = dataset_ops.Dataset.from_tensor_slices(filenames)
+  if split_size is None:
+    dataset = dataset_ops.Dataset.from_tensor_slices(filenames)
+    num_splits = len(filenames)
+  else:
+    if split_size <= 0:
+      raise ValueError("`split_size` must be positive, got %d." % split_size)
+    split_filenames, byte_ranges = _split_files(filenames, split_size)
+    dataset = dataset_ops.Dataset.from_tensor_slices(
+        (split_filenames, constant_op.constant(byte_ranges, dtypes.int64)))
+    num_splits = len(split_filenames)
   if shuffle:
-    dataset = dataset.shuffle(len(filenames), shuffle_seed)
+    dataset = dataset.shuffle(num_splits, shuffle_seed)
 
   # Clean arguments; figure out column names and defaults
 
@@ -453,7 +485,7 @@ def make_csv_dataset(
   if label_name is not None and label_name not in column_names:
     raise ValueError("`label_name` provided must be one of the columns.")
 
-  def filename_to_dataset(filename):
+  def filename_to_dataset(filename, byte_range=None):
     return CsvDataset(
         filename,
         record_defaults=column_defaults,
@@ -461,7 +493,8 @@ def make_csv_dataset(
         use_quote_delim=use_quote_delim,
         na_value=na_value,
         select_cols=select_columns,
-        header=header)
+        header=header,
+        byte_ranges=None if byte_range is None else [byte_range])
 
   def map_fn(*columns):
     """Organizes columns into a features dictionary.
@@ -510,7 +543,8 @@ class CsvDataset(dataset_ops.Dataset):
                field_delim=",",
                use_quote_delim=True,
                na_value="",
-               select_cols=None):
+               select_cols=None,
+               byte_ranges=None):
     """Creates a `CsvDataset` by reading and decoding CSV files.
 
     The elements of this dataset correspond to records from the file(s).
@@ -576,7 +610,14 @@ class CsvDataset(dataset_ops.Dataset):
         be treated as NA/NaN.
       select_cols: (Optional.) A sorted list of column indices to select from
         the input data. If specified, only this subset of columns will be
-        parsed. Defaults to parsing all columns.
+        parsed, and the fields after the last selected column of each record
+        are skipped without being validated. Defaults to parsing all columns.
+      byte_ranges: (Optional.) A `tf.int64` tensor of shape `[N, 2]`, where
+        `N` is the number of filenames, containing a `[start, end)` range of
+        byte offsets for each file. If specified, only the records that start
+        in the range are read, and only a range that starts at offset 0 has a
+        header. This requires that quoted fields do not contain line breaks.
+        Defaults to reading whole files.
     """
     super(CsvDataset, self).__init__()
     self._filenames = ops.convert_to_tensor(
@@ -603,6 +644,12 @@ class CsvDataset(dataset_ops.Dataset):
         argument_default=[],
         argument_dtype=dtypes.int64,
     )
+    self._byte_ranges = convert.optional_param_to_tensor(
+        "byte_ranges",
+        byte_ranges,
+        argument_default=[],
+        argument_dtype=dtypes.int64,
+    )
     self._output_shapes = tuple(
         tensor_shape.scalar() for _ in range(len(record_defaults)))
     self._output_types = tuple(d.dtype for d in self._record_defaults)
@@ -621,6 +668,7 @@ class CsvDataset(dataset_ops.Dataset):
         use_quote_delim=self._use_quote_delim,
         na_value=self._na_value,
         select_cols=self._select_cols,
+        byte_ranges=self._byte_ranges,
     )
 
   @property
@@ -17,12 +17,19 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+from tensorflow.contrib.data.python.ops import contrib_op_loader  # pylint: disable=unused-import
+from tensorflow.contrib.data.python.ops import enumerate_ops
+from tensorflow.contrib.data.python.ops import gen_dataset_ops as contrib_gen_dataset_ops
+from tensorflow.contrib.data.python.ops import interleave_ops
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.data.util import random_seed
 from tensorflow.python.framework import constant_op
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
+from tensorflow.python.framework import tensor_shape
+from tensorflow.python.ops import array_ops
 from tensorflow.python.ops import gen_dataset_ops
+from tensorflow.python.ops import math_ops
 
 
 class _ShuffleAndRepeatDataset(dataset_ops.Dataset):
@@ -103,3 +110,96 @@ def shuffle_and_repeat(buffer_size, count=None, seed=None):
     return _ShuffleAndRepeatDataset(dataset, buffer_size, count, seed)
 
   return _apply_fn
+
+
+class _ShuffledTFRecordDataset(dataset_ops.Dataset):
+  """A `Dataset` of the records of TFRecord files, in a random order."""
+
+  def __init__(self, filenames, seed, seed2):
+    """See `shuffled_tfrecords()` for details."""
+    super(_ShuffledTFRecordDataset, self).__init__()
+    self._filenames = ops.convert_to_tensor(
+        filenames, dtype=dtypes.string, name="filenames")
+    self._seed = seed
+    self._seed2 = seed2
+
+  def _as_variant_tensor(self):
+    return contrib_gen_dataset_ops.shuffled_tf_record_dataset(
+        self._filenames, self._seed, self._seed2)
+
+  @property
+  def output_classes(self):
+    return ops.Tensor
+
+  @property
+  def output_shapes(self):
+    return tensor_shape.TensorShape([])
+
+  @property
+  def output_types(self):
+    return dtypes.string
+
+
+def shuffled_tfrecords(files_per_shard=16, cycle_length=2, seed=None):
+  """Reads the TFRecord files in a `Dataset` of filenames in a random order.
+
+  This transformation shuffles records in two levels, without buffering the
+  records themselves. The input filenames are grouped into shards of
+  `files_per_shard` consecutive files. The offsets of all records in a shard
+  are read, and the records are then read in a random permutation of those
+  offsets. Records from `cycle_length` shards are interleaved, and the offsets
+  of the next shards are read in the background, so that there is no stall
+  between shards or epochs. For example:
+
+  ```python
+  filenames = tf.data.Dataset.list_files("/path/to/data-*.tfrecord",
+                                         shuffle=True).repeat(num_epochs)
+  dataset = filenames.apply(tf.contrib.data.shuffled_tfrecords(
+      files_per_shard=16, cycle_length=4))
+  ```
+
+  Every record of a shard is equally likely to appear at any position of the
+  shard's output, so the quality of the shuffle is controlled by
+  `files_per_shard` and by how well the input filenames are shuffled, e.g. by
+  `tf.data.Dataset.list_files(..., shuffle=True)`, which produces a new order
+  each epoch. Repeating the filenames rather than the records lets shards span
+  epoch boundaries. The memory used is a few tens of bytes per record of the
+  shards being read, instead of `buffer_size` records for
+  @{tf.data.Dataset.shuffle}.
+
+  NOTE: The files must be uncompressed, because the records are read at
+  random offsets.
+
+  Args:
+    files_per_shard: (Optional.) The number of files whose records are
+      shuffled together.
+    cycle_length: (Optional.) The number of shards that are read, and
+      interleaved, concurrently.
+    seed: (Optional.) A `tf.int64` scalar `tf.Tensor`, representing the
+      random seed that will be used to create the distribution. See
+      @{tf.set_random_seed} for behavior.
+
+  Returns:
+    A `Dataset` transformation function, which can be passed to
+    @{tf.data.Dataset.apply}.
+  """
+
+  def _apply_fn(dataset):  # pylint: disable=missing-docstring
+    shard_seed, shard_seed2 = random_seed.get_seed(seed)
+    non_deterministic = math_ops.logical_and(
+        math_ops.equal(shard_seed, 0), math_ops.equal(shard_seed2, 0))
+
+    def shard_to_dataset(index, filenames):
+      # Use a different permutation for each shard, unless both seeds are 0,
+      # which already requests a new random seed for each shard.
+      seed2 = array_ops.where(non_deterministic, shard_seed2,
+                              shard_seed2 + index)
+      return _ShuffledTFRecordDataset(filenames, shard_seed, seed2)
+
+    shards = dataset.batch(files_per_shard).apply(
+        enumerate_ops.enumerate_dataset())
+    return shards.apply(
+        interleave_ops.parallel_interleave(
+            shard_to_dataset, cycle_length=cycle_length))
+
+  return _apply_fn
@@ -17,6 +17,9 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+
+from tensorflow.core.framework import summary_pb2
 from tensorflow.python.data.ops import dataset_ops
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
@@ -64,14 +67,24 @@ class StatsAggregator(object):
   tf.add_to_collection(tf.GraphKeys.SUMMARIES, stats_summary)
   ```
 
+  To find out which transformation limits the throughput of a pipeline,
+  create the `StatsAggregator` with `profile=True`. Every transformation of
+  the associated iterators then records the time that it spends producing
+  elements, which `PipelineProfile` breaks down by transformation.
+
   Note: This interface is experimental and expected to change. In particular,
   we expect to add other implementations of `StatsAggregator` that provide
   different ways of exporting statistics, and add more types of statistics.
   """
 
-  def __init__(self):
-    """Creates a `StatsAggregator`."""
-    self._resource = gen_dataset_ops.stats_aggregator_handle()
+  def __init__(self, profile=False):
+    """Creates a `StatsAggregator`.
+
+    Args:
+      profile: (Optional.) If `True`, every transformation of the associated
+        iterators records profiling statistics; see `PipelineProfile`.
+    """
+    self._resource = gen_dataset_ops.stats_aggregator_handle(profile=profile)
 
   def get_summary(self):
     """Returns a string @{tf.Tensor} that summarizes the aggregated statistics.
@@ -227,3 +240,138 @@ class _StatsDataset(dataset_ops.Dataset):
   @property
   def output_classes(self):
     return self._input_dataset.output_classes
+
+
+# The statistics recorded for each transformation by a profiling
+# `StatsAggregator`, as "<iterator prefix>::<statistic>" histograms.
+_PROFILE_STATISTICS = ("self_time", "total_time", "processing_time",
+                       "parallelism", "buffer_utilization")
+
+
+class TransformationProfile(
+    collections.namedtuple("TransformationProfile", [
+        "name", "num_elements", "own_time", "wait_time", "buffer_utilization"
+    ])):
+  """The profile of a single transformation in an input pipeline.
+
+  Attributes:
+    name: The iterator prefix of the transformation, e.g.
+      "Iterator::Prefetch::ParallelMap".
+    num_elements: The number of elements produced.
+    own_time: The time in seconds spent by the transformation itself. For
+      asynchronous transformations this is the time spent on their background
+      threads, divided by their average parallelism.
+    wait_time: The time in seconds spent waiting for input elements, or, for
+      asynchronous transformations, for their buffer to be filled.
+    buffer_utilization: The average fraction of the buffer of an asynchronous
+      transformation that was ready when an element was requested, or `None`.
+  """
+
+
+# TODO(b/38416882): Properly export in the `tf.contrib.data` API when stable
+# or make private / remove.
+class PipelineProfile(object):
+  """A per-transformation breakdown of the time spent in an input pipeline.
+
+  For example:
+
+  ```python
+  stats_aggregator = stats_ops.StatsAggregator(profile=True)
+  dataset = ...
+  dataset = dataset.apply(stats_ops.set_stats_aggregator(stats_aggregator))
+  next_element = dataset.make_one_shot_iterator().get_next()
+  summary = stats_aggregator.get_summary()
+
+  with tf.Session() as sess:
+    for _ in range(1000):
+      sess.run(next_element)
+    profile = stats_ops.PipelineProfile(sess.run(summary))
+  print(profile)
+  print("Bottleneck: %s" % profile.bottleneck)
+  ```
+
+  Transformations are identified by their iterator prefix. The inputs of a
+  transformation have its prefix followed by "::<input name>", and the
+  per-element iterators of transformations such as `flat_map()` are
+  aggregated under "[*]".
+  """
+
+  def __init__(self, summary):
+    """Creates a `PipelineProfile`.
+
+    Args:
+      summary: A `tf.summary.Summary` protocol buffer, or its serialization,
+        obtained from the `get_summary()` tensor of a `StatsAggregator` created
+        with `profile=True`.
+    """
+    if not isinstance(summary, summary_pb2.Summary):
+      summary_proto = summary_pb2.Summary()
+      summary_proto.ParseFromString(summary)
+      summary = summary_proto
+    statistics = collections.defaultdict(dict)
+    for value in summary.value:
+      name, _, statistic = value.tag.rpartition("::")
+      if name and statistic in _PROFILE_STATISTICS and value.HasField("histo"):
+        statistics[name][statistic] = value.histo
+    self._transformations = [
+        _make_transformation_profile(name, statistics[name])
+        for name in sorted(statistics)
+    ]
+
+  @property
+  def transformations(self):
+    """A list of `TransformationProfile`s, ordered by name."""
+    return self._transformations
+
+  @property
+  def bottleneck(self):
+    """The name of the transformation with the largest `own_time`, or `None`."""
+    if not self._transformations:
+      return None
+    return max(self._transformations, key=lambda t: t.own_time).name
+
+  def __str__(self):
+    lines = ["%-60s %10s %12s %12s %8s" % ("Transformation", "Elements",
+                                           "Own (ms)", "Waiting (ms)",
+                                           "Buffer")]
+    for t in self._transformations:
+      if t.buffer_utilization is None:
+        buffer_utilization = "-"
+      else:
+        buffer_utilization = "%.0f%%" % (t.buffer_utilization * 100)
+      lines.append("%-60s %10d %12.1f %12.1f %8s" %
+                   (t.name, t.num_elements, t.own_time * 1e3,
+                    t.wait_time * 1e3, buffer_utilization))
+    lines.append("Bottleneck: %s" % self.bottleneck)
+    return "\n".join(lines)
+
+
+def _mean(histo):
+  return histo.sum / histo.num if histo.num else 0.0
+
+
+def _make_transformation_profile(name, statistics):
+  """Builds a `TransformationProfile` from the histograms of `name`."""
+  self_time = statistics.get("self_time", summary_pb2.HistogramProto())
+  total_time = statistics.get("total_time", summary_pb2.HistogramProto())
+  if "buffer_utilization" in statistics:
+    # The consumer of an asynchronous transformation only waits for its buffer,
+    # while the work is done on background threads.
+    processing_time = statistics.get("processing_time",
+                                     summary_pb2.HistogramProto()).sum
+    parallelism = statistics.get("parallelism")
+    if parallelism is not None:
+      processing_time /= max(_mean(parallelism), 1.0)
+    own_time = processing_time
+    wait_time = self_time.sum
+    buffer_utilization = _mean(statistics["buffer_utilization"])
+  else:
+    own_time = self_time.sum
+    wait_time = total_time.sum - self_time.sum
+    buffer_utilization = None
+  return TransformationProfile(
+      name=name,
+      num_elements=int(total_time.num),
+      own_time=own_time / 1e6,
+      wait_time=wait_time / 1e6,
+      buffer_utilization=buffer_utilization)
@@ -71,6 +71,9 @@ class DatasetVariantWrapper {
   DatasetBase* const dataset_;  // Owns one reference.
 };
 
+// The innermost `GetNext()` call being profiled on the current thread.
+thread_local GetNextProfiler* current_get_next_profiler = nullptr;
+
 }  // namespace
 
 Status GraphDefBuilderWrapper::AddDataset(
@@ -266,6 +269,53 @@ void BinaryDatasetOpKernel::MakeDataset(OpKernelContext* ctx,
   MakeDataset(ctx, input, another_input, output);
 }
 
+GetNextProfiler::GetNextProfiler(
+    Env* env, std::shared_ptr<StatsAggregator> stats_aggregator,
+    const string& prefix)
+    : env_(env),
+      stats_aggregator_(std::move(stats_aggregator)),
+      prefix_(prefix),
+      parent_(current_get_next_profiler),
+      start_micros_(env->NowMicros()) {
+  current_get_next_profiler = this;
+}
+
+GetNextProfiler::~GetNextProfiler() {
+  const uint64 total_micros = env_->NowMicros() - start_micros_;
+  current_get_next_profiler = parent_;
+  if (parent_) {
+    parent_->nested_micros_ += total_micros;
+  }
+  if (produced_element_) {
+    const uint64 self_micros =
+        total_micros > nested_micros_ ? total_micros - nested_micros_ : 0;
+    stats_aggregator_->AddToHistogram(StatsName(prefix_, "self_time"),
+                                      {static_cast<double>(self_micros)});
+    stats_aggregator_->AddToHistogram(StatsName(prefix_, "total_time"),
+                                      {static_cast<double>(total_micros)});
+  }
+}
+
+// static
+string GetNextProfiler::StatsName(StringPiece prefix, StringPiece name) {
+  string result;
+  result.reserve(prefix.size() + name.size() + 2);
+  bool in_index = false;
+  for (char c : prefix) {
+    if (in_index) {
+      if (c == ']') {
+        strings::StrAppend(&result, "*]");
+        in_index = false;
+      }
+    } else {
+      result.push_back(c);
+      in_index = c == '[';
+    }
+  }
+  strings::StrAppend(&result, "::", name);
+  return result;
+}
+
 const char GraphDatasetBase::kDatasetGraphKey[] = "_DATASET_GRAPH";
 const char GraphDatasetBase::kDatasetGraphOutputNodeKey[] =
     "_DATASET_GRAPH_OUTPUT_NODE";
@@ -25,6 +25,7 @@ limitations under the License.
 #include "tensorflow/core/framework/node_def.pb.h"
 #include "tensorflow/core/framework/op_kernel.h"
 #include "tensorflow/core/framework/register_types.h"
+#include "tensorflow/core/framework/stats_aggregator.h"
 #include "tensorflow/core/framework/types.pb.h"
 #include "tensorflow/core/framework/variant_encode_decode.h"
 #include "tensorflow/core/framework/variant_tensor_data.h"
@@ -497,6 +498,45 @@ class GraphDatasetBase : public DatasetBase {
   const string op_name_;
 };
 
+// Records the time spent in a `DatasetIterator::GetNext()` call, when the
+// `StatsAggregator` of the iterator context has profiling enabled.
+//
+// The "self time" of a call excludes the time spent in the `GetNext()` calls
+// that it makes on the same thread, i.e. the time that it waits for its
+// synchronous inputs. Asynchronous transformations record the time spent on
+// their background threads as "processing time" instead (see
+// `DatasetIterator::RecordProfile()`).
+class GetNextProfiler {
+ public:
+  GetNextProfiler(Env* env, std::shared_ptr<StatsAggregator> stats_aggregator,
+                  const string& prefix);
+
+  // Records the statistics of the call if it produced an element.
+  ~GetNextProfiler();
+
+  void set_produced_element(bool produced_element) {
+    produced_element_ = produced_element;
+  }
+
+  // Returns the name under which statistics for the iterator with the given
+  // `prefix` are recorded. Element indices (e.g. "FlatMap[3]") are replaced
+  // with "[*]", so that the number of statistics does not grow with the
+  // number of elements.
+  static string StatsName(StringPiece prefix, StringPiece name);
+
+ private:
+  Env* const env_;
+  const std::shared_ptr<StatsAggregator> stats_aggregator_;
+  const string& prefix_;
+  // The enclosing `GetNext()` call on the same thread, if any.
+  GetNextProfiler* const parent_;
+  const uint64 start_micros_;
+  uint64 nested_micros_ = 0;
+  bool produced_element_ = false;
+
+  TF_DISALLOW_COPY_AND_ASSIGN(GetNextProfiler);
+};
+
 // Represents an iterator that is associated with a particular parent dataset.
 template <class DatasetType>
 class DatasetIterator : public IteratorBase {
@@ -532,7 +572,16 @@ class DatasetIterator : public IteratorBase {
   Status GetNext(IteratorContext* ctx, std::vector<Tensor>* out_tensors,
                  bool* end_of_sequence) final {
     tracing::ScopedActivity activity(params_.prefix);
-    Status s = GetNextInternal(ctx, out_tensors, end_of_sequence);
+    Status s;
+    std::shared_ptr<StatsAggregator> stats_aggregator = ctx->stats_aggregator();
+    if (TF_PREDICT_FALSE(stats_aggregator && stats_aggregator->profiling())) {
+      GetNextProfiler profiler(ctx->env(), std::move(stats_aggregator),
+                               params_.prefix);
+      s = GetNextInternal(ctx, out_tensors, end_of_sequence);
+      profiler.set_produced_element(s.ok() && !*end_of_sequence);
+    } else {
+      s = GetNextInternal(ctx, out_tensors, end_of_sequence);
+    }
     if (TF_PREDICT_FALSE(errors::IsOutOfRange(s) && !*end_of_sequence)) {
       s = errors::Internal(
           "Iterator \"", params_.prefix,
@@ -559,6 +608,25 @@ class DatasetIterator : public IteratorBase {
     return strings::StrCat(prefix(), ":", name);
   }
 
+  // Returns true if the `StatsAggregator` of `ctx` has profiling enabled.
+  static bool IsProfiling(IteratorContext* ctx) {
+    std::shared_ptr<StatsAggregator> stats_aggregator = ctx->stats_aggregator();
+    return stats_aggregator && stats_aggregator->profiling();
+  }
+
+  // Adds `value` to the profiling statistic `name` of this iterator, if the
+  // `StatsAggregator` of `ctx` has profiling enabled. Asynchronous
+  // transformations use this to record the "processing_time" (in
+  // microseconds) of work done on their background threads, their
+  // "parallelism", and the "buffer_utilization" seen by `GetNext()`.
+  void RecordProfile(IteratorContext* ctx, StringPiece name, double value) {
+    std::shared_ptr<StatsAggregator> stats_aggregator = ctx->stats_aggregator();
+    if (stats_aggregator && stats_aggregator->profiling()) {
+      stats_aggregator->AddToHistogram(
+          GetNextProfiler::StatsName(params_.prefix, name), {value});
+    }
+  }
+
  private:
   Params params_;
 };
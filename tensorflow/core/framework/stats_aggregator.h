@@ -61,6 +61,11 @@ class StatsAggregator {
   // Increment the `label` cell of metrics mapped with `name` by given `value`.
   virtual void IncrementCounter(const string& name, const string& label,
                                 int64 val) = 0;
+
+  // Returns true if every iterator that records statistics to this
+  // `StatsAggregator` should also record the time that it spends producing
+  // elements (see `GetNextProfiler` in "dataset.h").
+  virtual bool profiling() const { return false; }
 };
 
 // A `StatsAggregatorResource` wraps a shareable `StatsAggregator` as a resource
@@ -18,9 +18,11 @@ limitations under the License.
 
 #include "tensorflow/core/common_runtime/function.h"
 #include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/stats_aggregator.h"
 #include "tensorflow/core/framework/tensor.h"
 #include "tensorflow/core/kernels/data/captured_function.h"
 #include "tensorflow/core/kernels/data/dataset.h"
+#include "tensorflow/core/kernels/data/parallelism_autotuner.h"
 #include "tensorflow/core/kernels/inplace_ops_functor.h"
 #include "tensorflow/core/lib/core/blocking_counter.h"
 #include "tensorflow/core/lib/gtl/cleanup.h"
@@ -69,17 +71,26 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
         int64 num_parallel_batches;
         OP_REQUIRES_OK(ctx, ParseScalarArgument(ctx, "num_parallel_batches",
                                                 &num_parallel_batches));
-        num_parallel_calls = num_parallel_batches * batch_size;
-        OP_REQUIRES(ctx, num_parallel_batches > 0,
-                    errors::InvalidArgument(
-                        "num_parallel_batches must be greater than zero."));
+        OP_REQUIRES(
+            ctx,
+            num_parallel_batches > 0 ||
+                num_parallel_batches == ParallelismAutotuner::kAutoTune,
+            errors::InvalidArgument(
+                "num_parallel_batches must be greater than zero."));
+        num_parallel_calls =
+            num_parallel_batches == ParallelismAutotuner::kAutoTune
+                ? ParallelismAutotuner::kAutoTune
+                : num_parallel_batches * batch_size;
         break;
       case 2:
         OP_REQUIRES_OK(ctx, ParseScalarArgument(ctx, "num_parallel_calls",
                                                 &num_parallel_calls));
-        OP_REQUIRES(ctx, num_parallel_calls > 0,
-                    errors::InvalidArgument(
-                        "num_parallel_calls must be greater than zero."));
+        OP_REQUIRES(
+            ctx,
+            num_parallel_calls > 0 ||
+                num_parallel_calls == ParallelismAutotuner::kAutoTune,
+            errors::InvalidArgument(
+                "num_parallel_calls must be greater than zero."));
         break;
       default:
         OP_REQUIRES(ctx, false,
@@ -189,7 +200,9 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
     class Iterator : public DatasetIterator<Dataset> {
      public:
       explicit Iterator(const Params& params)
-          : DatasetIterator<Dataset>(params) {}
+          : DatasetIterator<Dataset>(params),
+            autotuner_(params.dataset->num_parallel_calls_,
+                       params.dataset->batch_size_) {}
 
       ~Iterator() override {
         mutex_lock l(mu_);
@@ -213,6 +226,9 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
         {
           mutex_lock l(mu_);
           EnsureRunnerThreadStarted(ctx);
+          RecordConsumption(ctx, batch_results_.empty() ||
+                                     batch_results_.front()->num_calls > 0);
+          RecordBufferProfile(ctx);
           while (batch_results_.empty() ||
                  batch_results_.front()->num_calls > 0) {
             cond_var_.wait(l);
@@ -358,9 +374,17 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
                                    std::vector<Tensor> input_element) {
               std::shared_ptr<std::vector<Tensor>> return_values(
                   new std::vector<Tensor>());
+              const bool profiling = IsProfiling(ctx.get());
+              const uint64 start_micros =
+                  profiling ? ctx->env()->NowMicros() : 0;
               dataset()->captured_func_->RunAsync(
                   ctx.get(), std::move(input_element), return_values.get(),
-                  [this, ctx, result, return_values, offset](Status status) {
+                  [this, ctx, result, return_values, offset, profiling,
+                   start_micros](Status status) {
+                    if (profiling) {
+                      RecordProfile(ctx.get(), "processing_time",
+                                    ctx->env()->NowMicros() - start_micros);
+                    }
                     Callback(ctx, result, return_values, offset, status);
                   });
             },
@@ -420,10 +444,45 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
       }
 
       int MaxBatchResults() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
-        return (dataset()->num_parallel_calls_ + dataset()->batch_size_ - 1) /
+        return (autotuner_.limit() + dataset()->batch_size_ - 1) /
                dataset()->batch_size_;
       }
 
+      // Updates the autotuned level of parallelism, given whether the caller
+      // of `GetNext()` has to `wait` for the next batch.
+      void RecordConsumption(IteratorContext* ctx, bool wait)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        if (!autotuner_.RecordConsumption(wait)) {
+          return;
+        }
+        VLOG(1) << prefix() << ": autotuned num_parallel_calls to "
+                << autotuner_.limit();
+        auto stats_aggregator = ctx->stats_aggregator();
+        if (stats_aggregator) {
+          stats_aggregator->AddScalar(
+              strings::StrCat(prefix(), "::num_parallel_calls"),
+              static_cast<float>(autotuner_.limit()));
+        }
+      }
+
+      // Records the level of parallelism and the fraction of the buffered
+      // batches that are complete, if profiling is enabled.
+      void RecordBufferProfile(IteratorContext* ctx)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        if (!IsProfiling(ctx)) {
+          return;
+        }
+        int64 num_ready = 0;
+        for (const auto& result : batch_results_) {
+          if (result->num_calls == 0) {
+            num_ready++;
+          }
+        }
+        RecordProfile(ctx, "parallelism", autotuner_.limit());
+        RecordProfile(ctx, "buffer_utilization",
+                      static_cast<double>(num_ready) / MaxBatchResults());
+      }
+
       Status ProcessResult(IteratorContext* ctx,
                            const std::shared_ptr<BatchResult>& result,
                            std::vector<Tensor>* out_tensors,
@@ -472,12 +531,11 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
       void RunnerThread(const std::shared_ptr<IteratorContext>& ctx)
           LOCKS_EXCLUDED(mu_) {
         std::vector<std::pair<std::shared_ptr<BatchResult>, int64>> new_calls;
-        new_calls.reserve(dataset()->num_parallel_calls_);
         while (true) {
           {
             mutex_lock l(mu_);
             while (!cancelled_ &&
-                   (num_calls_ >= dataset()->num_parallel_calls_ ||
+                   (num_calls_ >= autotuner_.limit() ||
                     batch_results_.size() > MaxBatchResults() ||
                     (batch_results_.size() == MaxBatchResults() &&
                      call_counter_ % dataset()->batch_size_ == 0))) {
@@ -488,7 +546,7 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
               return;
             }
 
-            while (num_calls_ < dataset()->num_parallel_calls_ &&
+            while (num_calls_ < autotuner_.limit() &&
                    (batch_results_.size() < MaxBatchResults() ||
                     (batch_results_.size() == MaxBatchResults() &&
                      call_counter_ % dataset()->batch_size_ != 0))) {
@@ -500,6 +558,7 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
               new_calls.emplace_back(batch_results_.back(), offset);
               num_calls_++;
             }
+            autotuner_.RecordCalls(num_calls_);
           }
 
           for (const auto& call : new_calls) {
@@ -644,6 +703,10 @@ class MapAndBatchDatasetOp : public UnaryDatasetOpKernel {
       std::deque<std::shared_ptr<BatchResult>> batch_results_ GUARDED_BY(mu_);
       std::unique_ptr<Thread> runner_thread_ GUARDED_BY(mu_);
       bool cancelled_ GUARDED_BY(mu_) = false;
+      // Determines the number of parallel calls, which is fixed unless the
+      // dataset was created with `num_parallel_calls` equal to
+      // `ParallelismAutotuner::kAutoTune`.
+      ParallelismAutotuner autotuner_ GUARDED_BY(mu_);
     };
 
     const DatasetBase* const input_;
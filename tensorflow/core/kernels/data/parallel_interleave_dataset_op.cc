@@ -12,6 +12,7 @@ WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 See the License for the specific language governing permissions and
 limitations under the License.
 ==============================================================================*/
+#include <algorithm>
 #include <deque>
 
 #include "tensorflow/core/common_runtime/function.h"
@@ -20,9 +21,11 @@ limitations under the License.
 #include "tensorflow/core/kernels/data/captured_function.h"
 #include "tensorflow/core/kernels/data/dataset.h"
 #include "tensorflow/core/kernels/data/dataset_utils.h"
+#include "tensorflow/core/kernels/data/parallelism_autotuner.h"
 #include "tensorflow/core/lib/core/error_codes.pb.h"
 #include "tensorflow/core/lib/gtl/cleanup.h"
 #include "tensorflow/core/lib/random/random.h"
+#include "tensorflow/core/platform/cpu_info.h"
 
 namespace tensorflow {
 
@@ -54,6 +57,15 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
     int64 cycle_length = 0;
     OP_REQUIRES_OK(ctx,
                    ParseScalarArgument(ctx, "cycle_length", &cycle_length));
+    // The order of the output elements depends on `cycle_length`, so it
+    // cannot change during iteration. Instead, the autotuned value is the
+    // number of schedulable CPUs, which bounds the number of input iterators
+    // that can make progress concurrently.
+    if (cycle_length == ParallelismAutotuner::kAutoTune) {
+      cycle_length = std::max(port::NumSchedulableCPUs(), 1);
+      VLOG(1) << "Autotuned cycle_length of ParallelInterleaveDataset to "
+              << cycle_length;
+    }
     OP_REQUIRES(ctx, cycle_length > 0,
                 errors::InvalidArgument("`cycle_length` must be > 0"));
 
@@ -76,6 +88,9 @@ class ParallelInterleaveDatasetOp : public UnaryDatasetOpKernel {
     int64 prefetch_input_elements = 0;
     OP_REQUIRES_OK(ctx, ParseScalarArgument(ctx, "prefetch_input_elements",
                                             &prefetch_input_elements));
+    if (prefetch_input_elements == ParallelismAutotuner::kAutoTune) {
+      prefetch_input_elements = 2 * cycle_length;
+    }
     OP_REQUIRES(
         ctx, prefetch_input_elements >= 0,
         errors::InvalidArgument("`prefetch_input_elements` must be >= 0"));
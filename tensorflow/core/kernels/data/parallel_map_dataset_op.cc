@@ -16,9 +16,11 @@ limitations under the License.
 
 #include "tensorflow/core/common_runtime/function.h"
 #include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/stats_aggregator.h"
 #include "tensorflow/core/framework/tensor.h"
 #include "tensorflow/core/kernels/data/captured_function.h"
 #include "tensorflow/core/kernels/data/dataset.h"
+#include "tensorflow/core/kernels/data/parallelism_autotuner.h"
 #include "tensorflow/core/lib/core/error_codes.pb.h"
 #include "tensorflow/core/lib/random/random.h"
 
@@ -53,7 +55,9 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
     int32 num_parallel_calls;
     OP_REQUIRES_OK(ctx, ParseScalarArgument(ctx, "num_parallel_calls",
                                             &num_parallel_calls));
-    OP_REQUIRES(ctx, num_parallel_calls > 0,
+    OP_REQUIRES(ctx,
+                num_parallel_calls > 0 ||
+                    num_parallel_calls == ParallelismAutotuner::kAutoTune,
                 errors::InvalidArgument(
                     "num_parallel_calls must be greater than zero."));
 
@@ -151,7 +155,8 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
     class Iterator : public DatasetIterator<Dataset> {
      public:
       explicit Iterator(const Params& params)
-          : DatasetIterator<Dataset>(params) {}
+          : DatasetIterator<Dataset>(params),
+            autotuner_(params.dataset->num_parallel_calls_) {}
 
       ~Iterator() override {
         // TODO(mrry): Replace this cancellation logic with a
@@ -180,6 +185,11 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
         {
           mutex_lock l(mu_);
           EnsureRunnerThreadStarted(ctx);
+          RecordConsumption(
+              ctx, invocation_results_.empty() ||
+                       !invocation_results_.front()
+                            ->notification.HasBeenNotified());
+          RecordBufferProfile(ctx);
           while (invocation_results_.empty()) {
             cond_var_.wait(l);
           }
@@ -307,7 +317,14 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
         // Call `func_(input_element)`, store the result in
         // `result->return_values`, and notify `result->notification` to unblock
         // a consumer.
-        auto done = [this, result](Status status) {
+        const bool profiling = IsProfiling(ctx.get());
+        const uint64 start_micros = profiling ? ctx->env()->NowMicros() : 0;
+        auto done = [this, ctx, result, profiling,
+                     start_micros](Status status) {
+          if (profiling) {
+            RecordProfile(ctx.get(), "processing_time",
+                          ctx->env()->NowMicros() - start_micros);
+          }
           result->status.Update(status);
           CallCompleted(result);
         };
@@ -315,7 +332,44 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
                                             &result->return_values, done);
       }
 
-      int64 MaxInvocationResults() { return dataset()->num_parallel_calls_; }
+      int64 MaxInvocationResults() EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        return autotuner_.limit();
+      }
+
+      // Updates the autotuned level of parallelism, given whether the caller
+      // of `GetNext()` has to `wait` for the next element.
+      void RecordConsumption(IteratorContext* ctx, bool wait)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        if (!autotuner_.RecordConsumption(wait)) {
+          return;
+        }
+        VLOG(1) << prefix() << ": autotuned num_parallel_calls to "
+                << autotuner_.limit();
+        auto stats_aggregator = ctx->stats_aggregator();
+        if (stats_aggregator) {
+          stats_aggregator->AddScalar(
+              strings::StrCat(prefix(), "::num_parallel_calls"),
+              static_cast<float>(autotuner_.limit()));
+        }
+      }
+
+      // Records the level of parallelism and the fraction of the buffered
+      // invocation results that are ready, if profiling is enabled.
+      void RecordBufferProfile(IteratorContext* ctx)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        if (!IsProfiling(ctx)) {
+          return;
+        }
+        int64 num_ready = 0;
+        for (const auto& result : invocation_results_) {
+          if (result->notification.HasBeenNotified()) {
+            num_ready++;
+          }
+        }
+        RecordProfile(ctx, "parallelism", autotuner_.limit());
+        RecordProfile(ctx, "buffer_utilization",
+                      static_cast<double>(num_ready) / MaxInvocationResults());
+      }
 
       Status ProcessResult(const std::shared_ptr<InvocationResult>& result,
                            std::vector<Tensor>* out_tensors,
@@ -337,24 +391,24 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
 
       void RunnerThread(const std::shared_ptr<IteratorContext>& ctx) {
         std::vector<std::shared_ptr<InvocationResult>> new_calls;
-        new_calls.reserve(dataset()->num_parallel_calls_);
         while (true) {
           {
             mutex_lock l(mu_);
             while (!cancelled_ &&
-                   (num_calls_ >= dataset()->num_parallel_calls_ ||
+                   (num_calls_ >= autotuner_.limit() ||
                     invocation_results_.size() >= MaxInvocationResults())) {
               cond_var_.wait(l);
             }
             if (cancelled_) {
               return;
             }
-            while (num_calls_ < dataset()->num_parallel_calls_ &&
+            while (num_calls_ < autotuner_.limit() &&
                    invocation_results_.size() < MaxInvocationResults()) {
               invocation_results_.emplace_back(new InvocationResult());
               new_calls.push_back(invocation_results_.back());
               num_calls_++;
             }
+            autotuner_.RecordCalls(num_calls_);
           }
           cond_var_.notify_all();
           for (const auto& call : new_calls) {
@@ -419,6 +473,10 @@ class ParallelMapDatasetOp : public UnaryDatasetOpKernel {
           GUARDED_BY(mu_);
       std::unique_ptr<Thread> runner_thread_ GUARDED_BY(mu_);
       bool cancelled_ GUARDED_BY(mu_) = false;
+      // Determines the level of parallelism, which is fixed unless the
+      // dataset was created with `num_parallel_calls` equal to
+      // `ParallelismAutotuner::kAutoTune`.
+      ParallelismAutotuner autotuner_ GUARDED_BY(mu_);
     };
 
     const DatasetBase* const input_;
@@ -0,0 +1,51 @@
+/* Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include "tensorflow/core/kernels/data/parallelism_autotuner.h"
+
+#include <algorithm>
+
+#include "tensorflow/core/platform/cpu_info.h"
+
+namespace tensorflow {
+
+ParallelismAutotuner::ParallelismAutotuner(int64 initial_limit, int64 step)
+    : ParallelismAutotuner(initial_limit, step,
+                           step * std::max(port::NumSchedulableCPUs(), 1)) {}
+
+ParallelismAutotuner::ParallelismAutotuner(int64 initial_limit, int64 step,
+                                           int64 max_limit)
+    : limit_(initial_limit), step_(step), max_limit_(max_limit) {
+  if (initial_limit == kAutoTune) {
+    mode_ = Mode::kUnsaturated;
+    limit_ = step;
+  }
+}
+
+void ParallelismAutotuner::RecordCalls(int64 num_calls) {
+  if (mode_ == Mode::kUnsaturated && num_calls >= limit_) {
+    mode_ = Mode::kSaturated;
+  }
+}
+
+bool ParallelismAutotuner::RecordConsumption(bool wait) {
+  if (mode_ != Mode::kSaturated || !wait || limit_ >= max_limit_) {
+    return false;
+  }
+  limit_ = std::min(limit_ + step_, max_limit_);  // Increase the parallelism.
+  mode_ = Mode::kUnsaturated;
+  return true;
+}
+
+}  // namespace tensorflow
@@ -0,0 +1,80 @@
+/* Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#ifndef TENSORFLOW_CORE_KERNELS_DATA_PARALLELISM_AUTOTUNER_H_
+#define TENSORFLOW_CORE_KERNELS_DATA_PARALLELISM_AUTOTUNER_H_
+
+#include "tensorflow/core/platform/types.h"
+
+namespace tensorflow {
+
+// ParallelismAutotuner dynamically adjusts the number of concurrent calls made
+// by a parallel iterator (e.g. the function invocations of a parallel map).
+//
+// ParallelismAutotuner attempts to find the minimum level of parallelism such
+// that the downstream iterator does not have to wait for elements. The limit
+// starts at `step`, and is increased by `step` (up to `max_limit`) whenever
+// the downstream iterator waits for an element even though the iterator was
+// running `limit()` calls concurrently since the last increase. If the
+// iterator was not running at its limit, the waiting is caused by its input
+// or by the latency of individual calls, which more parallelism cannot fix.
+//
+// `max_limit` bounds the CPU usage of the iterator; by default it is
+// `step` times the number of schedulable CPUs.
+//
+// Note: like `PrefetchAutotuner`, we never decrease the limit().
+//
+// ParallelismAutotuner is NOT thread safe.
+class ParallelismAutotuner {
+ public:
+  static const int64 kAutoTune = -1;
+
+  // If `initial_limit` is `kAutoTune`, autotuning is enabled. Otherwise,
+  // `limit()` always returns `initial_limit`.
+  explicit ParallelismAutotuner(int64 initial_limit, int64 step = 1);
+  ParallelismAutotuner(int64 initial_limit, int64 step, int64 max_limit);
+
+  int64 limit() const { return limit_; }
+  bool enabled() const { return mode_ != Mode::kDisabled; }
+
+  // Records that the iterator is running `num_calls` calls concurrently.
+  void RecordCalls(int64 num_calls);
+
+  // Records that the downstream iterator consumed an element, and whether it
+  // had to `wait` for it. Returns true if `limit()` changed.
+  bool RecordConsumption(bool wait);
+
+ private:
+  enum class Mode {
+    // Disables the autotuning.
+    kDisabled,
+
+    // The iterator has not run `limit()` calls concurrently since the limit
+    // was last changed.
+    kUnsaturated,
+
+    // The iterator has run `limit()` calls concurrently. If the downstream
+    // iterator waits for an element, we should increase the limit.
+    kSaturated,
+  };
+
+  int64 limit_;
+  const int64 step_;
+  const int64 max_limit_;
+  Mode mode_ = Mode::kDisabled;
+};
+
+}  // namespace tensorflow
+
+#endif  // TENSORFLOW_CORE_KERNELS_DATA_PARALLELISM_AUTOTUNER_H_
@@ -0,0 +1,79 @@
+/* Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+
+Licensed under the Apache License, Version 2.0 (the "License");
+you may not use this file except in compliance with the License.
+You may obtain a copy of the License at
+
+    http://www.apache.org/licenses/LICENSE-2.0
+
+Unless required by applicable law or agreed to in writing, software
+distributed under the License is distributed on an "AS IS" BASIS,
+WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+See the License for the specific language governing permissions and
+limitations under the License.
+==============================================================================*/
+#include "tensorflow/core/kernels/data/parallelism_autotuner.h"
+
+#include "tensorflow/core/platform/test.h"
+
+namespace tensorflow {
+namespace {
+
+TEST(ParallelismAutotuner, Disabled) {
+  ParallelismAutotuner t(4);
+  EXPECT_FALSE(t.enabled());
+  EXPECT_EQ(4, t.limit());
+  t.RecordCalls(4);
+  EXPECT_FALSE(t.RecordConsumption(true));
+  t.RecordCalls(4);
+  EXPECT_FALSE(t.RecordConsumption(true));
+  EXPECT_EQ(4, t.limit());
+}
+
+TEST(ParallelismAutotuner, Enabled) {
+  ParallelismAutotuner t(ParallelismAutotuner::kAutoTune, 1, 3);
+  EXPECT_TRUE(t.enabled());
+  EXPECT_EQ(1, t.limit());
+  // Waiting before the limit was reached does not increase the limit.
+  EXPECT_FALSE(t.RecordConsumption(true));
+  EXPECT_EQ(1, t.limit());
+  t.RecordCalls(1);
+  // Not waiting does not increase the limit.
+  EXPECT_FALSE(t.RecordConsumption(false));
+  EXPECT_EQ(1, t.limit());
+  EXPECT_TRUE(t.RecordConsumption(true));  // Expect limit to increase.
+  EXPECT_EQ(2, t.limit());
+  t.RecordCalls(1);
+  EXPECT_FALSE(t.RecordConsumption(true));  // Not saturated at the new limit.
+  EXPECT_EQ(2, t.limit());
+  t.RecordCalls(2);
+  EXPECT_TRUE(t.RecordConsumption(true));  // Expect limit to increase.
+  EXPECT_EQ(3, t.limit());
+  t.RecordCalls(3);
+  EXPECT_FALSE(t.RecordConsumption(true));  // Expect limit to stay at max.
+  EXPECT_EQ(3, t.limit());
+}
+
+TEST(ParallelismAutotuner, EnabledWithStep) {
+  ParallelismAutotuner t(ParallelismAutotuner::kAutoTune, 8, 20);
+  EXPECT_EQ(8, t.limit());
+  t.RecordCalls(8);
+  EXPECT_TRUE(t.RecordConsumption(true));
+  EXPECT_EQ(16, t.limit());
+  t.RecordCalls(16);
+  EXPECT_TRUE(t.RecordConsumption(true));  // Expect limit to be capped.
+  EXPECT_EQ(20, t.limit());
+}
+
+TEST(ParallelismAutotuner, DefaultMaxLimit) {
+  ParallelismAutotuner t(ParallelismAutotuner::kAutoTune);
+  for (int i = 0; i < 1000; ++i) {
+    t.RecordCalls(t.limit());
+    t.RecordConsumption(true);
+  }
+  EXPECT_GE(t.limit(), 1);
+  EXPECT_LT(t.limit(), 1000);
+}
+
+}  // namespace
+}  // namespace tensorflow
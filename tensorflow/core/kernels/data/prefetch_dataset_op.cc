@@ -15,6 +15,7 @@ limitations under the License.
 #include <deque>
 
 #include "tensorflow/core/framework/partial_tensor_shape.h"
+#include "tensorflow/core/framework/stats_aggregator.h"
 #include "tensorflow/core/framework/tensor.h"
 #include "tensorflow/core/kernels/data/dataset.h"
 #include "tensorflow/core/kernels/data/prefetch_autotuner.h"
@@ -115,11 +116,20 @@ class PrefetchDatasetOp : public UnaryDatasetOpKernel {
         {
           mutex_lock l(mu_);
           TF_RETURN_IF_ERROR(EnsurePrefetchThreadStarted(ctx));
+          if (auto_tuner_.buffer_limit() > 0) {
+            RecordProfile(ctx, "buffer_utilization",
+                          static_cast<double>(buffer_.size()) /
+                              auto_tuner_.buffer_limit());
+          }
           // Wait until the next element in the buffer has been
           // produced, or we are shutting down.
           while (!cancelled_ && buffer_.empty() && !prefetch_thread_finished_ &&
                  auto_tuner_.buffer_limit() != 0) {
+            const int64 buffer_limit = auto_tuner_.buffer_limit();
             auto_tuner_.RecordEmpty();
+            if (auto_tuner_.buffer_limit() != buffer_limit) {
+              RecordBufferLimit(ctx);
+            }
             cond_var_.wait(l);
           }
 
@@ -220,6 +230,10 @@ class PrefetchDatasetOp : public UnaryDatasetOpKernel {
 
       Status Consume(std::vector<Tensor>* out_tensors, bool* end_of_sequence)
           EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        // Record the buffer size before consuming, so that the autotuner can
+        // tell whether the prefetch thread managed to fill the buffer.
+        auto_tuner_.RecordConsumption(buffer_.size());
+
         // A new element is available. Forward the status from computing it, and
         // (if we successfully got an element) the output values.
         Status s = buffer_.front().status;
@@ -238,6 +252,19 @@ class PrefetchDatasetOp : public UnaryDatasetOpKernel {
         return s;
       }
 
+      // Reports the autotuned buffer limit.
+      void RecordBufferLimit(IteratorContext* ctx)
+          EXCLUSIVE_LOCKS_REQUIRED(mu_) {
+        VLOG(1) << prefix() << ": autotuned buffer_size to "
+                << auto_tuner_.buffer_limit();
+        auto stats_aggregator = ctx->stats_aggregator();
+        if (stats_aggregator) {
+          stats_aggregator->AddScalar(
+              strings::StrCat(prefix(), "::buffer_size"),
+              static_cast<float>(auto_tuner_.buffer_limit()));
+        }
+      }
+
       Status EnsurePrefetchThreadStarted(IteratorContext* ctx)
           EXCLUSIVE_LOCKS_REQUIRED(mu_) {
         if (!prefetch_thread_) {
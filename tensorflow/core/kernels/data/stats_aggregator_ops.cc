@@ -41,7 +41,7 @@ static std::unordered_map<string, monitoring::Counter<1>*>* get_counters_map() {
 
 class StatsAggregatorImpl : public StatsAggregator {
  public:
-  StatsAggregatorImpl() {}
+  explicit StatsAggregatorImpl(bool profiling) : profiling_(profiling) {}
 
   void AddToHistogram(const string& name,
                       gtl::ArraySlice<double> values) override {
@@ -90,7 +90,10 @@ class StatsAggregatorImpl : public StatsAggregator {
     counters_map->at(name)->GetCell(label)->IncrementBy(val);
   }
 
+  bool profiling() const override { return profiling_; }
+
  private:
+  const bool profiling_;
   mutex mu_;
   std::unordered_map<string, histogram::Histogram> histograms_ GUARDED_BY(mu_);
   std::unordered_map<string, float> scalars_ GUARDED_BY(mu_);
@@ -101,19 +104,29 @@ class StatsAggregatorHandleOp
     : public ResourceOpKernel<StatsAggregatorResource> {
  public:
   explicit StatsAggregatorHandleOp(OpKernelConstruction* ctx)
-      : ResourceOpKernel<StatsAggregatorResource>(ctx) {}
+      : ResourceOpKernel<StatsAggregatorResource>(ctx) {
+    OP_REQUIRES_OK(ctx, ctx->GetAttr("profile", &profile_));
+  }
 
  private:
   Status CreateResource(StatsAggregatorResource** ret) override
       EXCLUSIVE_LOCKS_REQUIRED(mu_) {
     *ret = new StatsAggregatorResource(
-        std::unique_ptr<StatsAggregator>(new StatsAggregatorImpl));
+        std::unique_ptr<StatsAggregator>(new StatsAggregatorImpl(profile_)));
     return Status::OK();
   }
 
   Status VerifyResource(StatsAggregatorResource* resource) override {
+    if (resource->stats_aggregator()->profiling() != profile_) {
+      return errors::InvalidArgument(
+          "The shared StatsAggregator has `profile` set to ",
+          resource->stats_aggregator()->profiling(), ", but ", profile_,
+          " was requested.");
+    }
     return Status::OK();
   }
+
+  bool profile_;
 };
 
 class StatsAggregatorSummaryOp : public OpKernel {
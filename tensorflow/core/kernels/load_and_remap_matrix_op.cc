@@ -16,6 +16,7 @@ limitations under the License.
 #include <algorithm>
 #include <string>
 #include <unordered_map>
+#include <utility>
 #include <vector>
 
 #include "third_party/eigen3/unsupported/Eigen/CXX11/Tensor"
@@ -32,6 +33,10 @@ limitations under the License.
 namespace tensorflow {
 
 namespace {
+// Unneeded rows of the old tensor are read through instead of being skipped
+// when they take up fewer bytes than this.
+constexpr int64 kMaxSkippedBytes = 1 << 20;
+
 // Returning a Status instead of using OP_REQUIRES directly since that doesn't
 // seem to work outside the main OpKernel functions.
 Status RemapVectorToMap(const TTypes<const int64>::Vec& remapping,
@@ -82,21 +87,6 @@ class LoadAndRemapMatrixOp : public OpKernel {
     OP_REQUIRES_OK(context, RemapVectorToMap(row_remapping, &row_id_present,
                                              &old_row_to_new_row_map));
 
-    // Calculates the min/max old row ID that we need to read, to save us from
-    // reading some unnecessary slices of the old tensor.
-    int64 min_old_row = -1;
-    int64 max_old_row = -1;
-    for (int i = 0; i < row_remapping.size(); ++i) {
-      if (min_old_row < 0 ||
-          (row_remapping(i) >= 0 && row_remapping(i) < min_old_row)) {
-        min_old_row = row_remapping(i);
-      }
-      if (max_old_row < 0 ||
-          (row_remapping(i) >= 0 && row_remapping(i) > max_old_row)) {
-        max_old_row = row_remapping(i);
-      }
-    }
-
     // Processes the remapping for columns.
     std::unordered_map<int64, int64> old_col_to_new_col_map;
     std::vector<bool> col_id_present;
@@ -164,27 +154,44 @@ class LoadAndRemapMatrixOp : public OpKernel {
                       " instead of being equal to num_cols=", num_cols_)));
     }
 
-    // Uses TensorSlice to potentially load the old tensor in chunks in case
-    // memory usage is a concern.
-    std::vector<TensorSlice> tensor_slices;
-    TensorSlice slice(tensor_shape.dims());
-    if (min_old_row >= 0 && max_old_row >= 0) {
-      int64 row_start = min_old_row;
-      // TODO(weiho): Given the list of old row IDs of interest (the keys of
-      // old_row_to_new_row_map), we could also try something smarter to
-      // find some minimal set of covering ranges for the list of old row IDs
-      // such that the size of each range is less than max_rows_in_memory_.
-      while (row_start <= max_old_row) {
-        const int64 slice_length =
-            max_rows_in_memory_ <= 0
-                // If max_rows_in_memory_ <= 0, we just load the entire chunk.
-                ? max_old_row - row_start + 1
-                : std::min(max_rows_in_memory_, max_old_row - row_start + 1);
-        slice.set_start(0, row_start);
-        slice.set_length(0, slice_length);
-        tensor_slices.push_back(slice);
-        row_start += slice_length;
+    // Sorts the old row IDs to load, so that they can be read in a few
+    // sequential ranges that skip long runs of rows that are not needed.
+    std::vector<int64> old_rows;
+    old_rows.reserve(old_row_to_new_row_map.size());
+    for (const auto& old_and_new_row : old_row_to_new_row_map) {
+      old_rows.push_back(old_and_new_row.first);
+    }
+    std::sort(old_rows.begin(), old_rows.end());
+    OP_REQUIRES(context,
+                old_rows.empty() || old_rows.back() < tensor_shape.dim_size(0),
+                errors::InvalidArgument(strings::StrCat(
+                    "row_remapping refers to old row ", old_rows.back(),
+                    ", but tensor ", old_tensor_name, " only has ",
+                    tensor_shape.dim_size(0), " rows.")));
+
+    // Rows that are not needed are read through rather than skipped when they
+    // take up less than kMaxSkippedBytes, since one larger read is cheaper
+    // than two smaller ones.
+    const int64 row_bytes =
+        std::max<int64>(1, tensor_shape.dim_size(1) * sizeof(float));
+    const int64 max_skipped_rows =
+        std::max<int64>(1, kMaxSkippedBytes / row_bytes);
+    std::vector<std::pair<int64, int64>> row_ranges;  // [start, limit)
+    for (const int64 old_row : old_rows) {
+      if (!row_ranges.empty()) {
+        auto& range = row_ranges.back();
+        const bool fits_in_memory = max_rows_in_memory_ <= 0 ||
+                                    old_row - range.first < max_rows_in_memory_;
+        if (old_row - range.second < max_skipped_rows && fits_in_memory) {
+          range.second = old_row + 1;
+          continue;
+        }
       }
+      row_ranges.emplace_back(old_row, old_row + 1);
+    }
+    int64 max_range_rows = 0;
+    for (const auto& range : row_ranges) {
+      max_range_rows = std::max(max_range_rows, range.second - range.first);
     }
 
     // Allocates the output matrix.
@@ -195,57 +202,48 @@ class LoadAndRemapMatrixOp : public OpKernel {
                                             &output_matrix_t));
     auto output_matrix = output_matrix_t->matrix<float>();
 
-    // Iterates through tensor slices and copies over values from the old tensor
-    // to the output matrix.
-    int64 row_index = min_old_row;
+    // Reads the ranges of rows from the old tensor, and copies over the rows
+    // that are needed to the output matrix.
     int64 rows_copied = 0;
-    Tensor loaded_tensor_t;
-    for (const TensorSlice& tensor_slice : tensor_slices) {
-      LOG(INFO) << "Loading slice " << tensor_slice.DebugString();
-      TensorShape slice_shape;
-      OP_REQUIRES_OK(context,
-                     tensor_slice.SliceTensorShape(tensor_shape, &slice_shape));
-      // Potentially re-allocates the tensor buffer since the last slice may
-      // have fewer rows than the other slices.
-      if (loaded_tensor_t.shape() != slice_shape) {
-        loaded_tensor_t = Tensor(DT_FLOAT, slice_shape);
-      }
-      OP_REQUIRES_OK(context, reader.LookupSlice(old_tensor_name, tensor_slice,
-                                                 &loaded_tensor_t));
+    auto old_row_it = old_rows.begin();
+    Tensor range_buffer_t(
+        DT_FLOAT, TensorShape({max_range_rows, tensor_shape.dim_size(1)}));
+    for (const auto& range : row_ranges) {
+      Tensor loaded_tensor_t =
+          range_buffer_t.Slice(0, range.second - range.first);
+      OP_REQUIRES_OK(context, reader.LookupRows(old_tensor_name, range.first,
+                                                &loaded_tensor_t));
+      const auto& loaded_tensor = loaded_tensor_t.matrix<float>();
 
-      // Iterates through the old loaded tensor slice row-by-row.
-      for (int row = 0; row < loaded_tensor_t.dim_size(0); ++row, ++row_index) {
-        if (row_index % 500000 == min_old_row) {
-          LOG(INFO) << "Processing old row " << row_index;
+      for (; old_row_it != old_rows.end() && *old_row_it < range.second;
+           ++old_row_it) {
+        const int64 row = *old_row_it - range.first;
+        const int64 new_row = old_row_to_new_row_map[*old_row_it];
+        if (++rows_copied % 500000 == 0) {
+          LOG(INFO) << "Copied " << rows_copied << " of " << old_rows.size()
+                    << " rows of " << old_tensor_name;
         }
 
-        // If the old row ID is not found in old_row_to_new_row_map, continue
-        // to the next row; otherwise, copy it to the output matrix.
-        const int64* new_row_ptr =
-            gtl::FindOrNull(old_row_to_new_row_map, row_index);
-        if (new_row_ptr == nullptr) {
+        if (!remap_cols) {
+          // Copies over the whole row at once.
+          std::copy_n(&loaded_tensor(row, 0), num_cols_,
+                      &output_matrix(new_row, 0));
           continue;
         }
-        ++rows_copied;
-        const int64 new_row = *new_row_ptr;
 
-        // Copies over the row element-by-element, in case remapping is needed
+        // Copies over the row element-by-element, since remapping is needed
         // along the column axis.
-        const auto& loaded_tensor = loaded_tensor_t.matrix<float>();
         for (int old_col = 0; old_col < loaded_tensor_t.dim_size(1);
              ++old_col) {
-          int64 new_col = old_col;
-          if (remap_cols) {
-            const int64* new_col_ptr =
-                gtl::FindOrNull(old_col_to_new_col_map, old_col);
-            if (new_col_ptr == nullptr) {
-              // Column remapping is specified, but this column is not found in
-              // old_col_to_new_col_map, so we leave it uninitialized, to be
-              // filled in with initializing_values later.
-              continue;
-            }
-            new_col = *new_col_ptr;
+          const int64* new_col_ptr =
+              gtl::FindOrNull(old_col_to_new_col_map, old_col);
+          if (new_col_ptr == nullptr) {
+            // Column remapping is specified, but this column is not found in
+            // old_col_to_new_col_map, so we leave it uninitialized, to be
+            // filled in with initializing_values later.
+            continue;
           }
+          const int64 new_col = *new_col_ptr;
 
           OP_REQUIRES(context,
                       new_row < num_rows_ && new_col < num_cols_ &&
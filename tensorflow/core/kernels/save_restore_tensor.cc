@@ -14,6 +14,7 @@ limitations under the License.
 ==============================================================================*/
 
 #include "tensorflow/core/kernels/save_restore_tensor.h"
+#include <algorithm>
 #include <numeric>
 #include <unordered_map>
 #include <utility>
@@ -23,10 +24,13 @@ limitations under the License.
 #include "tensorflow/core/framework/register_types.h"
 #include "tensorflow/core/framework/types.h"
 #include "tensorflow/core/kernels/bounds_check.h"
+#include "tensorflow/core/lib/core/blocking_counter.h"
+#include "tensorflow/core/lib/core/threadpool.h"
 #include "tensorflow/core/lib/gtl/array_slice.h"
 #include "tensorflow/core/lib/strings/strcat.h"
 #include "tensorflow/core/lib/strings/stringprintf.h"
 #include "tensorflow/core/platform/logging.h"
+#include "tensorflow/core/platform/mutex.h"
 #include "tensorflow/core/platform/types.h"
 #include "tensorflow/core/util/tensor_bundle/tensor_bundle.h"
 #include "tensorflow/core/util/tensor_slice_reader.h"
@@ -226,6 +230,39 @@ void RestoreTensor(OpKernelContext* context,
 #undef READER_COPY
 }
 
+namespace {
+
+// One tensor to read in RestoreTensorsV2, along with where its contents live
+// in the bundle.  Reads are grouped by data file shard and issued in offset
+// order, so that each shard is scanned front to back.
+struct RestoreRead {
+  size_t output_index;
+  int32 shard_id;
+  int64 offset;
+  bool is_slice;
+  TensorSlice slice;
+};
+
+// Reads "reads", in order, into the already allocated outputs of "context".
+Status RunRestoreReads(OpKernelContext* context, BundleReader* reader,
+                       const Tensor& tensor_names,
+                       const std::vector<RestoreRead>& reads) {
+  const auto& tensor_names_flat = tensor_names.flat<string>();
+  for (const RestoreRead& read : reads) {
+    const string& tensor_name = tensor_names_flat(read.output_index);
+    Tensor* restored_tensor = context->mutable_output(read.output_index);
+    if (read.is_slice) {
+      TF_RETURN_IF_ERROR(
+          reader->LookupSlice(tensor_name, read.slice, restored_tensor));
+    } else {
+      TF_RETURN_IF_ERROR(reader->Lookup(tensor_name, restored_tensor));
+    }
+  }
+  return Status::OK();
+}
+
+}  // namespace
+
 Status RestoreTensorsV2(OpKernelContext* context, const Tensor& prefix,
                         const Tensor& tensor_names,
                         const Tensor& shape_and_slices,
@@ -246,9 +283,11 @@ Status RestoreTensorsV2(OpKernelContext* context, const Tensor& prefix,
   BundleReader reader(Env::Default(), prefix_string);
   TF_RETURN_IF_ERROR(reader.status());
 
-  // TODO(zongheng): potential optimization: one Seek() in first lookup.
-  // TODO(zongheng): consider measuring speed and issuing concurrent lookups
-  // within a fixed memory budget.
+  // Plans the reads: validates the requested shapes, allocates every output
+  // and records which data file shard holds each tensor.  This only touches
+  // the index, which is scanned in key order.
+  std::vector<RestoreRead> reads;
+  reads.reserve(sorted_name_idx.size());
   TensorShape restored_full_shape;
   Tensor* restored_tensor = nullptr;
   for (auto i : sorted_name_idx) {
@@ -258,20 +297,25 @@ Status RestoreTensorsV2(OpKernelContext* context, const Tensor& prefix,
     TF_RETURN_IF_ERROR(
         reader.LookupTensorShape(tensor_name, &restored_full_shape));
 
-    if (shape_and_slice.empty()) {
+    RestoreRead read;
+    read.output_index = i;
+    int64 unused_size;
+    TF_RETURN_IF_ERROR(reader.LookupDataLocation(
+        tensor_name, &read.shard_id, &read.offset, &unused_size));
+    read.is_slice = !shape_and_slice.empty();
+
+    if (!read.is_slice) {
       // Lookup the full tensor.
       TF_RETURN_IF_ERROR(
           context->allocate_output(i, restored_full_shape, &restored_tensor));
-      TF_RETURN_IF_ERROR(reader.Lookup(tensor_name, restored_tensor));
     } else {
       // Lookup the slice.
       TensorShape parsed_full_shape;
-      TensorSlice parsed_slice;
       TensorShape parsed_slice_shape;
 
       TF_RETURN_IF_ERROR(
           checkpoint::ParseShapeAndSlice(shape_and_slice, &parsed_full_shape,
-                                         &parsed_slice, &parsed_slice_shape));
+                                         &read.slice, &parsed_slice_shape));
       if (!restored_full_shape.IsSameSize(parsed_full_shape)) {
         return errors::InvalidArgument(
             "tensor_name = ", tensor_name, "; shape in shape_and_slice spec ",
@@ -282,12 +326,70 @@ Status RestoreTensorsV2(OpKernelContext* context, const Tensor& prefix,
 
       TF_RETURN_IF_ERROR(
           context->allocate_output(i, parsed_slice_shape, &restored_tensor));
-      TF_RETURN_IF_ERROR(
-          reader.LookupSlice(tensor_name, parsed_slice, restored_tensor));
     }
+    reads.push_back(std::move(read));
+  }
+
+  // Groups the reads by data file shard and orders each group by offset, so
+  // that small tensors are served from one large buffered read.
+  std::stable_sort(reads.begin(), reads.end(),
+                   [](const RestoreRead& a, const RestoreRead& b) {
+                     if (a.shard_id != b.shard_id) {
+                       return a.shard_id < b.shard_id;
+                     }
+                     return a.offset < b.offset;
+                   });
+  std::vector<std::vector<RestoreRead>> per_shard_reads;
+  for (RestoreRead& read : reads) {
+    if (per_shard_reads.empty() ||
+        per_shard_reads.back().front().shard_id != read.shard_id) {
+      per_shard_reads.emplace_back();
+    }
+    per_shard_reads.back().push_back(std::move(read));
+  }
+
+  // Each shard is read by its own thread with its own BundleReader, since a
+  // reader must not be shared across threads.  The first shard is read on
+  // the calling thread, reusing the reader opened above.
+  auto* worker_threads = context->device()->tensorflow_cpu_worker_threads();
+  Status status;
+  if (per_shard_reads.size() > 1 && worker_threads != nullptr &&
+      worker_threads->workers != nullptr && worker_threads->num_threads > 1) {
+    mutex mu;
+    BlockingCounter counter(per_shard_reads.size() - 1);
+    for (size_t g = 1; g < per_shard_reads.size(); ++g) {
+      worker_threads->workers->Schedule([&, g]() {
+        BundleReader shard_reader(Env::Default(), prefix_string);
+        Status s = shard_reader.status();
+        if (s.ok()) {
+          s = RunRestoreReads(context, &shard_reader, tensor_names,
+                              per_shard_reads[g]);
+        }
+        if (!s.ok()) {
+          mutex_lock l(mu);
+          status.Update(s);
+        }
+        counter.DecrementCount();
+      });
+    }
+    Status s = RunRestoreReads(context, &reader, tensor_names,
+                               per_shard_reads.front());
+    counter.Wait();
+    mutex_lock l(mu);
+    status.Update(s);
+  } else {
+    for (const auto& shard_reads : per_shard_reads) {
+      status.Update(
+          RunRestoreReads(context, &reader, tensor_names, shard_reads));
+    }
+  }
+  TF_RETURN_IF_ERROR(status);
+
+  for (auto i : sorted_name_idx) {
+    restored_tensor = context->mutable_output(i);
     if (dtypes[i] != restored_tensor->dtype()) {
       return errors::InvalidArgument(
-          "tensor_name = ", tensor_name, "; expected dtype ",
+          "tensor_name = ", tensor_names_flat(i), "; expected dtype ",
           DataTypeString(dtypes[i]), " does not equal restored dtype ",
           DataTypeString(restored_tensor->dtype()));
     }
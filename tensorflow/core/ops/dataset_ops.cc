@@ -750,7 +750,8 @@ REGISTER_OP("StatsAggregatorHandle")
     .Output("handle: resource")
     .SetShapeFn(shape_inference::ScalarShape)
     .Attr("container: string = ''")
-    .Attr("shared_name: string = ''");
+    .Attr("shared_name: string = ''")
+    .Attr("profile: bool = false");
 
 REGISTER_OP("StatsAggregatorSummary")
     .Input("iterator: resource")
@@ -775,6 +775,22 @@ Status BundleReader::GetBundleEntryProto(StringPiece key,
   return Status::OK();
 }
 
+Status BundleReader::GetDataFile(int32 shard_id,
+                                 io::InputBuffer** buffered_file) {
+  // Open the data file if it has not been opened.
+  *buffered_file = data_[shard_id];
+  if (*buffered_file == nullptr) {
+    std::unique_ptr<RandomAccessFile> file = nullptr;
+    TF_RETURN_IF_ERROR(env_->NewRandomAccessFile(
+        DataFilename(prefix_, shard_id, num_shards_), &file));
+    *buffered_file = new io::InputBuffer(file.release(), kBufferSize);
+    // The InputBuffer and RandomAccessFile objects are both released in dtor.
+    data_[shard_id] = *buffered_file;
+  }
+  CHECK(*buffered_file != nullptr);
+  return Status::OK();
+}
+
 Status BundleReader::GetValue(const BundleEntryProto& entry, Tensor* val) {
   Tensor* ret = val;
   const TensorShape stored_shape(TensorShape(entry.shape()));
@@ -804,17 +820,8 @@ Status BundleReader::GetValue(const BundleEntryProto& entry, Tensor* val) {
     }
   }
 
-  // Open the data file if it has not been opened.
-  io::InputBuffer* buffered_file = data_[entry.shard_id()];
-  if (buffered_file == nullptr) {
-    std::unique_ptr<RandomAccessFile> file = nullptr;
-    TF_RETURN_IF_ERROR(env_->NewRandomAccessFile(
-        DataFilename(prefix_, entry.shard_id(), num_shards_), &file));
-    buffered_file = new io::InputBuffer(file.release(), kBufferSize);
-    // The InputBuffer and RandomAccessFile objects are both released in dtor.
-    data_[entry.shard_id()] = buffered_file;
-  }
-  CHECK(buffered_file != nullptr);
+  io::InputBuffer* buffered_file = nullptr;
+  TF_RETURN_IF_ERROR(GetDataFile(entry.shard_id(), &buffered_file));
 
   TF_RETURN_IF_ERROR(buffered_file->Seek(entry.offset()));
   uint32 actual_crc32c = 0;
@@ -858,6 +865,16 @@ Status BundleReader::GetValue(const BundleEntryProto& entry, Tensor* val) {
   return Status::OK();
 }
 
+Status BundleReader::LookupDataLocation(StringPiece key, int32* shard_id,
+                                        int64* offset, int64* size) {
+  BundleEntryProto entry;
+  TF_RETURN_IF_ERROR(GetBundleEntryProto(key, &entry));
+  *shard_id = entry.shard_id();
+  *offset = entry.offset();
+  *size = entry.size();
+  return Status::OK();
+}
+
 Status BundleReader::Lookup(StringPiece key, Tensor* val) {
   CHECK(val != nullptr);
   BundleEntryProto entry;
@@ -910,6 +927,61 @@ Status BundleReader::LookupSlice(StringPiece full_tensor_key,
   return GetSliceValue(full_tensor_key, entry, slice_spec, val);
 }
 
+Status BundleReader::LookupRows(StringPiece key, int64 start_row,
+                                Tensor* val) {
+  CHECK(val != nullptr);
+  BundleEntryProto entry;
+  TF_RETURN_IF_ERROR(GetBundleEntryProto(key, &entry));
+
+  const TensorShape full_shape(entry.shape());
+  bool valid_shape = full_shape.dims() > 0 && val->dims() == full_shape.dims();
+  for (int d = 1; valid_shape && d < full_shape.dims(); ++d) {
+    valid_shape = val->dim_size(d) == full_shape.dim_size(d);
+  }
+  if (!valid_shape || start_row < 0 ||
+      start_row + val->dim_size(0) > full_shape.dim_size(0)) {
+    return errors::InvalidArgument(
+        "Cannot read rows [", start_row, ", ", start_row + val->dim_size(0),
+        ") of shape ", val->shape().DebugString(), " from tensor ", key,
+        " of shape ", full_shape.DebugString());
+  }
+  if (val->dtype() != entry.dtype()) {
+    return errors::InvalidArgument("Tensor ", key, " has dtype ",
+                                   DataTypeString(entry.dtype()),
+                                   " but the rows are read into a tensor of "
+                                   "dtype ",
+                                   DataTypeString(val->dtype()));
+  }
+  if (val->NumElements() == 0) return Status::OK();
+  if (start_row == 0 && val->dim_size(0) == full_shape.dim_size(0) &&
+      entry.slices().empty()) {
+    return GetValue(entry, val);
+  }
+  if (!entry.slices().empty() || !DataTypeCanUseMemcpy(entry.dtype())) {
+    TensorSlice slice(full_shape.dims());
+    slice.set_start(0, start_row);
+    slice.set_length(0, val->dim_size(0));
+    return LookupSlice(key, slice, val);
+  }
+
+  io::InputBuffer* buffered_file = nullptr;
+  TF_RETURN_IF_ERROR(GetDataFile(entry.shard_id(), &buffered_file));
+  const int64 row_bytes = entry.size() / full_shape.dim_size(0);
+  const int64 num_bytes = val->dim_size(0) * row_bytes;
+  char* backing_buffer = const_cast<char*>(val->tensor_data().data());
+  StringPiece sp;
+  TF_RETURN_IF_ERROR(buffered_file->file()->Read(
+      entry.offset() + start_row * row_bytes, num_bytes, &sp, backing_buffer));
+  if (sp.size() != num_bytes) {
+    return errors::DataLoss("Requested ", num_bytes, " bytes of tensor ", key,
+                            " but read ", sp.size());
+  }
+  if (sp.data() != backing_buffer) {
+    memmove(backing_buffer, sp.data(), num_bytes);
+  }
+  return Status::OK();
+}
+
 Status BundleReader::GetSliceValue(StringPiece full_tensor_key,
                                    const BundleEntryProto& full_tensor_entry,
                                    const TensorSlice& slice_spec, Tensor* val) {
@@ -204,6 +204,19 @@ class BundleReader {
   Status LookupTensorShape(StringPiece key,
                            TensorShape* shape) TF_MUST_USE_RESULT;
 
+  // Looks up where the contents of the tensor keyed by "key" are stored: the
+  // data file shard, and the byte offset and size within that shard.  A
+  // partitioned tensor has no contents of its own and reports zeros; its
+  // slices are stored under separate keys.
+  // REQUIRES: status().ok()
+  Status LookupDataLocation(StringPiece key, int32* shard_id, int64* offset,
+                            int64* size) TF_MUST_USE_RESULT;
+
+  // Returns the name of the file that holds data file shard "shard_id".
+  string DataFilenameForShard(int32 shard_id) const {
+    return DataFilename(prefix_, shard_id, num_shards_);
+  }
+
   // Looks up the tensor keyed by "key".  If "key" refers to a partitioned
   // tensor, attempts to look up the full contents using all stored slices.
   //
@@ -243,6 +256,18 @@ class BundleReader {
   Status LookupSlice(StringPiece full_tensor_key, const TensorSlice& slice_spec,
                      Tensor* val) TF_MUST_USE_RESULT;
 
+  // Looks up the rows [start_row, start_row + val->dim_size(0)) of the tensor
+  // keyed by "key", that is the slice of its first dimension.  "val" must have
+  // the dtype of the tensor and its shape in all but the first dimension.
+  //
+  // For a tensor that is stored whole with a fixed-size dtype, only the bytes
+  // of the requested rows are read; unless all rows are requested, their
+  // checksum is not verified since it covers the whole tensor.  Other tensors
+  // are read as by LookupSlice().
+  // REQUIRES: status().ok()
+  Status LookupRows(StringPiece key, int64 start_row,
+                    Tensor* val) TF_MUST_USE_RESULT;
+
   // Seeks to the first position in the bundle whose key is no less than "key".
   // REQUIRES: status().ok()
   void Seek(StringPiece key) { return iter_->Seek(key); }
@@ -269,6 +294,11 @@ class BundleReader {
   Status GetBundleEntryProto(StringPiece key,
                              BundleEntryProto* entry) TF_MUST_USE_RESULT;
 
+  // Opens the data file of shard "shard_id" if it has not been opened yet, and
+  // returns it in "*buffered_file".
+  Status GetDataFile(int32 shard_id,
+                     io::InputBuffer** buffered_file) TF_MUST_USE_RESULT;
+
   // Reads the tensor value described by the metadata proto "entry".
   // Usage for "val" follows the comment of "Lookup()".
   Status GetValue(const BundleEntryProto& entry,
@@ -583,6 +583,79 @@ TEST(TensorBundleTest, DirectoryStructure) {
                           "merged.data-00001-of-00002"});
 }
 
+TEST(TensorBundleTest, DataLocation) {
+  Env* env = Env::Default();
+  const std::vector<string> kBundlePrefixes = {Prefix("location0"),
+                                               Prefix("location1")};
+  for (int i = 0; i < 2; ++i) {
+    BundleWriter writer(env, kBundlePrefixes[i]);
+    TF_EXPECT_OK(writer.Add(strings::StrCat("a", i), Constant_2x3<float>(0.)));
+    TF_EXPECT_OK(writer.Add(strings::StrCat("b", i), Constant_2x3<float>(1.)));
+    TF_ASSERT_OK(writer.Finish());
+  }
+  const string kMerged = Prefix("location_merged");
+  TF_ASSERT_OK(MergeBundles(env, kBundlePrefixes, kMerged));
+
+  BundleReader reader(env, kMerged);
+  TF_ASSERT_OK(reader.status());
+  const int64 kBytes = 2 * 3 * sizeof(float);
+  int32 shard_id;
+  int64 offset, size;
+  for (int i = 0; i < 2; ++i) {
+    TF_ASSERT_OK(reader.LookupDataLocation(strings::StrCat("a", i), &shard_id,
+                                           &offset, &size));
+    EXPECT_EQ(i, shard_id);
+    EXPECT_EQ(0, offset);
+    EXPECT_EQ(kBytes, size);
+    TF_ASSERT_OK(reader.LookupDataLocation(strings::StrCat("b", i), &shard_id,
+                                           &offset, &size));
+    EXPECT_EQ(i, shard_id);
+    EXPECT_EQ(kBytes, offset);
+    EXPECT_EQ(kBytes, size);
+    EXPECT_EQ(DataFilename(kMerged, i, 2), reader.DataFilenameForShard(i));
+  }
+  EXPECT_TRUE(errors::IsNotFound(
+      reader.LookupDataLocation("c", &shard_id, &offset, &size)));
+}
+
+TEST(TensorBundleTest, LookupRows) {
+  Tensor full(DT_FLOAT, TensorShape({5, 3}));
+  test::FillIota<float>(&full, 0);
+  {
+    BundleWriter writer(Env::Default(), Prefix("rows"));
+    TF_EXPECT_OK(writer.Add("whole", full));
+    TF_EXPECT_OK(writer.AddSlice("sliced", TensorShape({5, 3}),
+                                 TensorSlice::ParseOrDie("0,3:-"),
+                                 full.Slice(0, 3)));
+    TF_EXPECT_OK(writer.AddSlice("sliced", TensorShape({5, 3}),
+                                 TensorSlice::ParseOrDie("3,2:-"),
+                                 full.Slice(3, 5)));
+    TF_ASSERT_OK(writer.Finish());
+  }
+  BundleReader reader(Env::Default(), Prefix("rows"));
+  TF_ASSERT_OK(reader.status());
+
+  for (const string& key : {"whole", "sliced"}) {
+    Tensor rows(DT_FLOAT, TensorShape({2, 3}));
+    TF_ASSERT_OK(reader.LookupRows(key, 2, &rows));
+    test::ExpectTensorEqual<float>(
+        test::AsTensor<float>({6, 7, 8, 9, 10, 11}, TensorShape({2, 3})),
+        rows);
+
+    Tensor all_rows(DT_FLOAT, TensorShape({5, 3}));
+    TF_ASSERT_OK(reader.LookupRows(key, 0, &all_rows));
+    test::ExpectTensorEqual<float>(full, all_rows);
+
+    EXPECT_TRUE(errors::IsInvalidArgument(reader.LookupRows(key, 4, &rows)));
+    Tensor wrong_shape(DT_FLOAT, TensorShape({2, 2}));
+    EXPECT_TRUE(
+        errors::IsInvalidArgument(reader.LookupRows(key, 0, &wrong_shape)));
+    Tensor wrong_dtype(DT_DOUBLE, TensorShape({2, 3}));
+    EXPECT_TRUE(
+        errors::IsInvalidArgument(reader.LookupRows(key, 0, &wrong_dtype)));
+  }
+}
+
 TEST(TensorBundleTest, Error) {
   {  // Dup keys.
     BundleWriter writer(Env::Default(), Prefix("dup"));
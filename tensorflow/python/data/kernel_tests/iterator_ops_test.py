@@ -46,7 +46,9 @@ from tensorflow.python.ops import parsing_ops
 from tensorflow.python.ops import script_ops
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import test
+from tensorflow.python.training import saver as saver_lib
 from tensorflow.python.training import server_lib
+from tensorflow.python.training.checkpointable import util as checkpointable_utils
 from tensorflow.python.util import compat
 
 
@@ -787,6 +789,53 @@ class IteratorTest(test.TestCase):
         self.assertEqual(val, foo.numpy())
         val += 1
 
+  def testSaveRestoreWithSaver(self):
+    checkpoint_prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    iterator = dataset_ops.Dataset.range(20).shuffle(
+        10, seed=42).make_initializable_iterator()
+    get_next = iterator.get_next()
+    saver = saver_lib.Saver([iterator])
+
+    with self.test_session() as sess:
+      sess.run(iterator.initializer)
+      for _ in range(5):
+        sess.run(get_next)
+      save_path = saver.save(sess, checkpoint_prefix)
+      expected = [sess.run(get_next) for _ in range(15)]
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+      saver.restore(sess, save_path)
+      self.assertEqual(expected, [sess.run(get_next) for _ in range(15)])
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
+  def testSaveRestoreWithCheckpoint(self):
+    checkpoint_prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    iterator = dataset_ops.Dataset.range(10).make_one_shot_iterator()
+    get_next = iterator.get_next()
+    checkpoint = checkpointable_utils.Checkpoint(iterator=iterator)
+
+    with self.test_session() as sess:
+      self.assertEqual(0, sess.run(get_next))
+      save_path = checkpoint.save(checkpoint_prefix, session=sess)
+      self.assertEqual(1, sess.run(get_next))
+      self.assertEqual(2, sess.run(get_next))
+      checkpoint.restore(save_path).run_restore_ops(sess)
+      self.assertEqual(1, sess.run(get_next))
+
+  def testEagerIteratorSaveRestore(self):
+    checkpoint_prefix = os.path.join(self.get_temp_dir(), "ckpt")
+    with context.eager_mode():
+      iterator = iterator_ops.EagerIterator(dataset_ops.Dataset.range(10))
+      checkpoint = checkpointable_utils.Checkpoint(iterator=iterator)
+      self.assertEqual(0, iterator.get_next().numpy())
+      save_path = checkpoint.save(checkpoint_prefix)
+      self.assertEqual(1, iterator.get_next().numpy())
+      self.assertEqual(2, iterator.get_next().numpy())
+      checkpoint.restore(save_path)
+      self.assertEqual(1, iterator.get_next().numpy())
+
 
 if __name__ == "__main__":
   test.main()
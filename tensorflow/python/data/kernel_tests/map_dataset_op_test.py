@@ -205,6 +205,17 @@ class MapDatasetTest(test.TestCase):
       for _ in range(3):
         sess.run(get_next)
 
+  def testParallelMapAutotune(self):
+    dataset = dataset_ops.Dataset.range(100).map(
+        lambda x: x * x, num_parallel_calls=-1)
+    get_next = dataset.make_one_shot_iterator().get_next()
+
+    with self.test_session() as sess:
+      for i in range(100):
+        self.assertEqual(i * i, sess.run(get_next))
+      with self.assertRaises(errors.OutOfRangeError):
+        sess.run(get_next)
+
   def testParallelMapUnspecifiedOutputSize(self):
     components = np.array([1., 2., 3., np.nan, 5.]).astype(np.float32)
 
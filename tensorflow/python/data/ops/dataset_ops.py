@@ -608,6 +608,8 @@ class Dataset(object):
     Args:
       buffer_size: A `tf.int64` scalar `tf.Tensor`, representing the
         maximum number of elements that will be buffered when prefetching.
+        If -1 (`tf.contrib.data.AUTOTUNE`), the buffer size is tuned at
+        runtime.
 
     Returns:
       Dataset: A `Dataset`.
@@ -977,7 +979,9 @@ class Dataset(object):
        `self.output_types`) to another nested structure of tensors.
       num_parallel_calls: (Optional.) A `tf.int32` scalar `tf.Tensor`,
         representing the number elements to process in parallel. If not
-        specified, elements will be processed sequentially.
+        specified, elements will be processed sequentially. If -1
+        (`tf.contrib.data.AUTOTUNE`), the number is tuned at runtime, up to
+        the number of schedulable CPUs.
 
     Returns:
       Dataset: A `Dataset`.
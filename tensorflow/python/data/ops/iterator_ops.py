@@ -30,6 +30,8 @@ from tensorflow.python.framework import ops
 from tensorflow.python.framework import tensor_shape
 from tensorflow.python.ops import gen_dataset_ops
 from tensorflow.python.ops import resource_variable_ops
+from tensorflow.python.training import saveable_object
+from tensorflow.python.training.checkpointable import base as checkpointable
 from tensorflow.python.util.tf_export import tf_export
 
 
@@ -58,8 +60,26 @@ GLOBAL_ITERATORS = "iterators"
 
 
 @tf_export("data.Iterator")
-class Iterator(object):
-  """Represents the state of iterating through a `Dataset`."""
+class Iterator(checkpointable.CheckpointableBase):
+  """Represents the state of iterating through a `Dataset`.
+
+  An `Iterator` is checkpointable: its position can be saved and restored
+  along with the model by passing it to a `tf.train.Saver` or a
+  `tf.train.Checkpoint`. For example:
+
+  ```python
+  iterator = dataset.make_initializable_iterator()
+  saver = tf.train.Saver(tf.global_variables() + [iterator])
+  ```
+
+  Only the position of each transformation is saved (e.g. file offsets and
+  random number generator states), along with the contents of any buffers,
+  such as those of `Dataset.shuffle()` and `Dataset.prefetch()`.
+
+  Note: Restoring an iterator also restores the `Dataset` that it was created
+  from, so changes to the input pipeline made since the checkpoint was written
+  (e.g. a different number of shards) are discarded.
+  """
 
   def __init__(self, iterator_resource, initializer, output_types,
                output_shapes, output_classes):
@@ -457,6 +477,13 @@ class Iterator(object):
     """
     return self._output_types
 
+  def _gather_saveables_for_checkpoint(self):
+
+    def _saveable_factory(name=self._iterator_resource.op.name):
+      return _IteratorSaveable(self._iterator_resource, name)
+
+    return {"ITERATOR": _saveable_factory}
+
 
 _uid_counter = 0
 _uid_lock = threading.Lock()
@@ -470,7 +497,7 @@ def _generate_shared_name(prefix):
   return "{}{}".format(prefix, uid)
 
 
-class EagerIterator(object):
+class EagerIterator(checkpointable.CheckpointableBase):
   """An iterator producing tf.Tensor objects from a tf.data.Dataset."""
 
   def __init__(self, dataset):
@@ -602,3 +629,25 @@ class EagerIterator(object):
     """
     del name
     return self._next_internal()
+
+  def _gather_saveables_for_checkpoint(self):
+
+    def _saveable_factory(name):
+      return _IteratorSaveable(self._resource, name)
+
+    return {"ITERATOR": _saveable_factory}
+
+
+class _IteratorSaveable(saveable_object.SaveableObject):
+  """SaveableObject for saving/restoring iterator state."""
+
+  def __init__(self, iterator_resource, name):
+    serialized_iterator = gen_dataset_ops.serialize_iterator(iterator_resource)
+    specs = [
+        saveable_object.SaveSpec(serialized_iterator, "", name + "_STATE")
+    ]
+    super(_IteratorSaveable, self).__init__(iterator_resource, specs, name)
+
+  def restore(self, restored_tensors, restored_shapes):
+    with ops.colocate_with(self.op):
+      return gen_dataset_ops.deserialize_iterator(self.op, restored_tensors[0])
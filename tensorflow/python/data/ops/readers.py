@@ -132,10 +132,16 @@ class ParallelInterleaveDataset(dataset_ops.InterleaveDataset):
         "buffer_output_elements",
         buffer_output_elements,
         argument_default=2 * block_length)
+    # An autotuned `cycle_length` (-1) is resolved by the kernel, which then
+    # also picks the default `prefetch_input_elements`.
+    if isinstance(cycle_length, int) and cycle_length == -1:
+      default_prefetch_input_elements = -1
+    else:
+      default_prefetch_input_elements = 2 * cycle_length
     self._prefetch_input_elements = convert.optional_param_to_tensor(
         "prefetch_input_elements",
         prefetch_input_elements,
-        argument_default=2 * cycle_length)
+        argument_default=default_prefetch_input_elements)
 
   def _as_variant_tensor(self):
     # pylint: disable=protected-access
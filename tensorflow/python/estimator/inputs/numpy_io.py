@@ -23,7 +23,12 @@ import collections
 import numpy as np
 from six import string_types
 
-from tensorflow.python.estimator.inputs.queues import feeding_functions
+from tensorflow.python.data.ops import dataset_ops
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import tensor_shape
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import random_ops
+from tensorflow.python.ops import script_ops
 from tensorflow.python.util.tf_export import estimator_export
 
 # Key name to pack the target into dict of `features`. See
@@ -87,6 +92,79 @@ def _validate_and_convert_features(x):
   return ordered_dict_data
 
 
+def _make_batch_dataset(ordered_dict_data, batch_size, num_epochs, shuffle,
+                        queue_capacity, num_threads, vocabs=None):
+  """Returns a `Dataset` of batches of rows of the arrays in a dict.
+
+  Only row indices flow through the `Dataset`; the rows themselves are sliced
+  out of the arrays by a `py_func`, once per batch. When the rows of a batch
+  are contiguous (always the case without shuffling, except across an epoch
+  boundary) the slice is a view of the original array, which is aliased by
+  the output tensor rather than copied.
+
+  Args:
+    ordered_dict_data: OrderedDict of numpy arrays with the same length.
+    batch_size: Integer, size of batches to return.
+    num_epochs: Integer, number of epochs to iterate over data. If `None` will
+      run forever.
+    shuffle: Boolean, if True the rows are shuffled in each epoch.
+    queue_capacity: Integer, number of rows to prefetch.
+    num_threads: Integer, number of batches sliced in parallel.
+    vocabs: (Optional.) Dict from keys of `ordered_dict_data` whose arrays hold
+      integer ids to numpy arrays of the values that the ids stand for. The
+      ids are mapped to these values as the rows are sliced, so the
+      vocabularies are not embedded in the graph.
+
+  Returns:
+    A `Dataset` whose elements are tuples of tensors, one per array.
+  """
+  arrays = list(ordered_dict_data.values())
+  vocabs = vocabs or {}
+  array_vocabs = [vocabs.get(key) for key in ordered_dict_data]
+  num_rows = arrays[0].shape[0]
+
+  if shuffle:
+    # A fresh permutation of the row indices is drawn for each epoch, which
+    # only costs 8 bytes per row.
+    def permutation(_):
+      return dataset_ops.Dataset.from_tensor_slices(
+          random_ops.random_shuffle(
+              math_ops.range(num_rows, dtype=dtypes.int64)))
+
+    indices = dataset_ops.Dataset.from_tensors(0).repeat(num_epochs).flat_map(
+        permutation)
+  else:
+    indices = dataset_ops.Dataset.range(num_rows).repeat(num_epochs)
+  # Without `num_epochs` every batch is full, so its size is known statically.
+  indices = indices.batch(batch_size, drop_remainder=num_epochs is None)
+
+  def get_rows(batch_indices):
+    if (not shuffle and
+        batch_indices[-1] - batch_indices[0] == len(batch_indices) - 1):
+      rows = slice(batch_indices[0], batch_indices[-1] + 1)
+    else:
+      rows = batch_indices
+    return [
+        array[rows] if vocab is None else vocab.take(array[rows])
+        for array, vocab in zip(arrays, array_vocabs)
+    ]
+
+  def slice_arrays(batch_indices):
+    batch = script_ops.py_func(
+        get_rows, [batch_indices], [
+            dtypes.as_dtype(array.dtype if vocab is None else vocab.dtype)
+            for array, vocab in zip(arrays, array_vocabs)
+        ],
+        stateful=False)
+    for tensor, array in zip(batch, arrays):
+      tensor.set_shape(batch_indices.shape.concatenate(
+          tensor_shape.TensorShape(array.shape[1:])))
+    return tuple(batch)
+
+  dataset = indices.map(slice_arrays, num_parallel_calls=num_threads)
+  return dataset.prefetch(max(1, queue_capacity // batch_size))
+
+
 @estimator_export('estimator.inputs.numpy_input_fn')
 def numpy_input_fn(x,
                    y=None,
@@ -121,12 +199,11 @@ def numpy_input_fn(x,
     batch_size: Integer, size of batches to return.
     num_epochs: Integer, number of epochs to iterate over data. If `None` will
       run forever.
-    shuffle: Boolean, if True shuffles the queue. Avoid shuffle at prediction
-      time.
-    queue_capacity: Integer, size of queue to accumulate.
-    num_threads: Integer, number of threads used for reading and enqueueing. In
-      order to have predicted and repeatable order of reading and enqueueing,
-      such as in prediction and evaluation mode, `num_threads` should be 1.
+    shuffle: Boolean, if True shuffles the rows in each epoch. Avoid shuffle at
+      prediction time.
+    queue_capacity: Integer, number of rows to read ahead of the model.
+    num_threads: Integer, number of threads used for slicing batches out of the
+      arrays. The order of the batches does not depend on `num_threads`.
 
   Returns:
     Function, that has signature of ()->(dict of `features`, `targets`)
@@ -189,21 +266,9 @@ def numpy_input_fn(x,
                        'Shapes in x: {}\n'
                        'Shapes in y: {}\n'.format(shape_dict_of_x, shape_of_y))
 
-    queue = feeding_functions._enqueue_data(  # pylint: disable=protected-access
-        ordered_dict_data,
-        queue_capacity,
-        shuffle=shuffle,
-        num_threads=num_threads,
-        enqueue_size=batch_size,
-        num_epochs=num_epochs)
-
-    batch = (
-        queue.dequeue_many(batch_size)
-        if num_epochs is None else queue.dequeue_up_to(batch_size))
-
-    # Remove the first `Tensor` in `batch`, which is the row number.
-    if batch:
-      batch.pop(0)
+    dataset = _make_batch_dataset(ordered_dict_data, batch_size, num_epochs,
+                                  shuffle, queue_capacity, num_threads)
+    batch = dataset.make_one_shot_iterator().get_next()
 
     if isinstance(x, np.ndarray):
       # Return as the same type as original array.
@@ -18,10 +18,16 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+import time
+
 import numpy as np
 
+from tensorflow.python.client import session as session_lib
 from tensorflow.python.estimator.inputs import numpy_io
+from tensorflow.python.estimator.inputs.queues import feeding_functions
 from tensorflow.python.framework import errors
+from tensorflow.python.framework import ops
 from tensorflow.python.platform import test
 from tensorflow.python.training import coordinator
 from tensorflow.python.training import monitored_session
@@ -455,6 +461,140 @@ class NumpyIoTest(test.TestCase):
       self.assertAllEqual(res_arr[0], res_dict[0]['feature1'])
       self.assertAllEqual(res_arr[1], res_dict[1])
 
+  def testNumpyInputFnWithShuffleVisitsEachRowOncePerEpoch(self):
+    x = {'a': np.arange(10), 'b': np.arange(10) * 2.0}
+    y = np.arange(10) * 3
+
+    input_fn = numpy_io.numpy_input_fn(
+        x, y, batch_size=4, shuffle=True, num_epochs=2)
+    features, target = input_fn()
+
+    rows = []
+    with monitored_session.MonitoredSession() as session:
+      while not session.should_stop():
+        res = session.run([features, target])
+        rows.extend(zip(res[0]['a'], res[0]['b'], res[1]))
+
+    self.assertEqual(20, len(rows))
+    for a, b, t in rows:
+      # The rows of all arrays are shuffled together.
+      self.assertEqual(a * 2, b)
+      self.assertEqual(a * 3, t)
+    first_epoch = [row[0] for row in rows[:10]]
+    self.assertEqual(list(range(10)), sorted(first_epoch))
+    self.assertNotEqual(list(range(10)), first_epoch)
+    self.assertEqual(
+        set([2]), set(collections.Counter(row[0] for row in rows).values()))
+
+  def testNumpyInputFnWithMultipleThreadsKeepsOrder(self):
+    x = np.arange(100).reshape(50, 2)
+    y = np.arange(50)
+
+    input_fn = numpy_io.numpy_input_fn(
+        x, y, batch_size=3, shuffle=False, num_epochs=2, num_threads=4)
+    features, target = input_fn()
+
+    with monitored_session.MonitoredSession() as session:
+      for start in range(0, 100, 3):
+        indices = [i % 50 for i in range(start, min(start + 3, 100))]
+        res = session.run([features, target])
+        self.assertAllEqual(x[indices], res[0])
+        self.assertAllEqual(y[indices], res[1])
+      with self.assertRaises(errors.OutOfRangeError):
+        session.run([features, target])
+
+  def testNumpyInputFnWithoutNumEpochs(self):
+    x = {'a': np.arange(16).reshape(8, 2)}
+    y = np.arange(8)
+
+    input_fn = numpy_io.numpy_input_fn(
+        x, y, batch_size=3, shuffle=False, num_epochs=None)
+    features, target = input_fn()
+    self.assertEqual([3, 2], features['a'].shape.as_list())
+    self.assertEqual([3], target.shape.as_list())
+    # The rows are not fed through queues.
+    self.assertFalse(ops.get_collection(ops.GraphKeys.QUEUE_RUNNERS))
+
+    with monitored_session.MonitoredSession() as session:
+      targets = [session.run(target) for _ in range(4)]
+    self.assertAllEqual([0, 1, 2, 3, 4, 5, 6, 7, 0, 1, 2, 3],
+                        np.concatenate(targets))
+
+  def testNumpyInputFnReturnsSameRowsAsQueue(self):
+    x = {'a': np.arange(7) * 1.0, 'b': np.arange(14).reshape(7, 2)}
+    y = np.arange(-7, 0)
+
+    with self.test_session() as session:
+      input_fn = numpy_io.numpy_input_fn(
+          x, y, batch_size=3, shuffle=False, num_epochs=2)
+      features, target = input_fn()
+
+      queue = feeding_functions._enqueue_data(  # pylint: disable=protected-access
+          collections.OrderedDict([('a', x['a']), ('b', x['b']), ('y', y)]),
+          capacity=100,
+          enqueue_size=3,
+          num_epochs=2)
+      queue_batch = queue.dequeue_up_to(3)
+
+      coord = coordinator.Coordinator()
+      threads = queue_runner_impl.start_queue_runners(session, coord=coord)
+
+      for _ in range(5):
+        res, expected = session.run([(features, target), queue_batch])
+        self.assertAllEqual(expected[1], res[0]['a'])
+        self.assertAllEqual(expected[2], res[0]['b'])
+        self.assertAllEqual(expected[3], res[1])
+      with self.assertRaises(errors.OutOfRangeError):
+        session.run([features, target])
+
+      coord.request_stop()
+      coord.join(threads)
+
+
+class NumpyInputFnBenchmark(test.Benchmark):
+  """Compares `numpy_input_fn` with feeding the arrays through a queue."""
+
+  def _benchmark(self, features, target, name, num_batches):
+    with session_lib.Session() as session:
+      coord = coordinator.Coordinator()
+      threads = queue_runner_impl.start_queue_runners(session, coord=coord)
+      session.run([features, target])
+      start = time.time()
+      for _ in range(num_batches):
+        session.run([features, target])
+      wall_time = (time.time() - start) / num_batches
+      coord.request_stop()
+      coord.join(threads)
+    print('%s: %f us per batch' % (name, wall_time * 1e6))
+    self.report_benchmark(iters=num_batches, wall_time=wall_time, name=name)
+
+  def benchmarkNumpyInputFn(self):
+    num_rows = 100000
+    num_batches = 200
+    x = collections.OrderedDict([
+        ('dense', np.random.rand(num_rows, 32).astype(np.float32)),
+        ('ids', np.random.randint(1000, size=[num_rows, 4])),
+    ])
+    y = np.random.randint(2, size=[num_rows])
+    for batch_size in [32, 256]:
+      for shuffle in [False, True]:
+        with ops.Graph().as_default():
+          features, target = numpy_io.numpy_input_fn(
+              x, y, batch_size=batch_size, shuffle=shuffle, num_epochs=None)()
+          self._benchmark(
+              features, target, 'numpy_input_fn_batch_%d_shuffle_%s' %
+              (batch_size, shuffle), num_batches)
+
+        with ops.Graph().as_default():
+          data = collections.OrderedDict(x)
+          data['y'] = y
+          queue = feeding_functions._enqueue_data(  # pylint: disable=protected-access
+              data, 1000, shuffle=shuffle, enqueue_size=batch_size)
+          batch = queue.dequeue_many(batch_size)
+          self._benchmark(
+              batch[1:-1], batch[-1], 'enqueue_data_batch_%d_shuffle_%s' %
+              (batch_size, shuffle), num_batches)
+
 
 if __name__ == '__main__':
   test.main()
@@ -18,11 +18,12 @@
 from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
+import collections
 import six
 import uuid
 
 import numpy as np
-from tensorflow.python.estimator.inputs.queues import feeding_functions
+from tensorflow.python.estimator.inputs import numpy_io
 from tensorflow.python.util.tf_export import estimator_export
 
 try:
@@ -36,6 +37,13 @@ except IOError:
 except ImportError:
   HAS_PANDAS = False
 
+# String and categorical columns are only dictionary encoded if they have at
+# most this many distinct values per row, so that the vocabulary is much
+# smaller than the column.
+_MAX_VOCAB_FRACTION = 0.25
+# Upper bound on the number of rows read ahead when `queue_capacity` is `None`.
+_MAX_QUEUE_CAPACITY = 10000
+
 
 def _get_unique_target_key(features, target_column_name):
   """Returns a key that does not exist in the input DataFrame `features`.
@@ -53,6 +61,37 @@ def _get_unique_target_key(features, target_column_name):
   return target_column_name
 
 
+def _to_column_arrays(columns):
+  """Converts pandas columns to contiguous numpy arrays.
+
+  String and categorical columns with few distinct values are dictionary
+  encoded: they are replaced by an array of integer ids into a vocabulary of
+  their distinct values, so that batches are gathered from a numeric array
+  instead of an array of Python objects.
+
+  Args:
+    columns: OrderedDict of pandas `Series` with the same index.
+
+  Returns:
+    A tuple of an OrderedDict of numpy arrays with the same keys as `columns`,
+    and a dict from the keys of the dictionary encoded columns to numpy arrays
+    of their vocabularies.
+  """
+  arrays = collections.OrderedDict()
+  vocabs = {}
+  for name, column in columns.items():
+    if column.dtype == object or str(column.dtype) == 'category':
+      ids, vocab = pd.factorize(column)
+      # Missing values have id -1 and are left to the generic conversion.
+      if (len(ids) and ids.min() >= 0 and
+          len(vocab) <= _MAX_VOCAB_FRACTION * len(ids)):
+        arrays[name] = ids.astype(np.int64)
+        vocabs[name] = np.asarray(vocab)
+        continue
+    arrays[name] = np.ascontiguousarray(column.values)
+  return arrays, vocabs
+
+
 @estimator_export('estimator.inputs.pandas_input_fn')
 def pandas_input_fn(x,
                     y=None,
@@ -66,6 +105,12 @@ def pandas_input_fn(x,
 
   Note: `y`'s index must match `x`'s index.
 
+  The columns of `x` and `y` are converted once, when `pandas_input_fn` is
+  called, into contiguous numpy arrays from which batches are gathered. String
+  and categorical columns with few distinct values are stored as integer ids
+  into a vocabulary of their values, and mapped back to their values as each
+  batch is gathered.
+
   Args:
     x: pandas `DataFrame` object.
     y: pandas `Series` object or `DataFrame`. `None` if absent.
@@ -73,11 +118,10 @@ def pandas_input_fn(x,
     num_epochs: int, number of epochs to iterate over data. If not `None`,
       read attempts that would exceed this value will raise `OutOfRangeError`.
     shuffle: bool, whether to read the records in random order.
-    queue_capacity: int, size of the read queue. If `None`, it will be set
-      roughly to the size of `x`.
-    num_threads: Integer, number of threads used for reading and enqueueing. In
-      order to have predicted and repeatable order of reading and enqueueing,
-      such as in prediction and evaluation mode, `num_threads` should be 1.
+    queue_capacity: int, number of rows to read ahead of the model. If `None`,
+      it will be set to the size of `x`, up to 10000 rows.
+    num_threads: Integer, number of threads used for gathering batches. The
+      order of the batches does not depend on `num_threads`.
     target_column: str, name to give the target column `y`. This parameter
       is not used when `y` is a `DataFrame`.
 
@@ -101,7 +145,7 @@ def pandas_input_fn(x,
   if not isinstance(target_column, six.string_types):
     raise TypeError('target_column must be a string type')
 
-  x = x.copy()
+  columns = collections.OrderedDict((name, x[name]) for name in x.columns)
   if y is not None:
     if target_column in x:
       raise ValueError(
@@ -114,37 +158,22 @@ def pandas_input_fn(x,
       y_columns = [(column, _get_unique_target_key(x, column))
                    for column in list(y)]
       target_column = [v for _, v in y_columns]
-      x[target_column] = y
+      for column, key in y_columns:
+        columns[key] = y[column]
     else:
-      x[target_column] = y
+      columns[target_column] = y
 
-  # TODO(mdan): These are memory copies. We probably don't need 4x slack space.
-  # The sizes below are consistent with what I've seen elsewhere.
+  arrays, vocabs = _to_column_arrays(columns)
   if queue_capacity is None:
-    if shuffle:
-      queue_capacity = 4 * len(x)
-    else:
-      queue_capacity = len(x)
-  min_after_dequeue = max(queue_capacity / 4, 1)
+    queue_capacity = min(len(x), _MAX_QUEUE_CAPACITY)
 
   def input_fn():
     """Pandas input function."""
-    queue = feeding_functions._enqueue_data(  # pylint: disable=protected-access
-        x,
-        queue_capacity,
-        shuffle=shuffle,
-        min_after_dequeue=min_after_dequeue,
-        num_threads=num_threads,
-        enqueue_size=batch_size,
-        num_epochs=num_epochs)
-    if num_epochs is None:
-      features = queue.dequeue_many(batch_size)
-    else:
-      features = queue.dequeue_up_to(batch_size)
-    assert len(features) == len(x.columns) + 1, ('Features should have one '
-                                                 'extra element for the index.')
-    features = features[1:]
-    features = dict(zip(list(x.columns), features))
+    dataset = numpy_io._make_batch_dataset(  # pylint: disable=protected-access
+        arrays, batch_size, num_epochs, shuffle, queue_capacity, num_threads,
+        vocabs=vocabs)
+    batch = dataset.make_one_shot_iterator().get_next()
+    features = dict(zip(arrays, batch))
     if y is not None:
       if isinstance(target_column, list):
         keys = [k for k, _ in y_columns]
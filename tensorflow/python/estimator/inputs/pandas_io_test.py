@@ -18,6 +18,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
+
 import numpy as np
 
 from tensorflow.python.estimator.inputs import pandas_io
@@ -304,6 +306,101 @@ class PandasIoTest(test.TestCase):
       # Before the last batch, only one element of the epoch should remain.
       self.assertInputsCallableNTimes(input_fn, session, 2)
 
+  def testPandasInputFn_StringColumns(self):
+    if not HAS_PANDAS:
+      return
+    with self.test_session() as session:
+      index = np.arange(100, 105)
+      x = pd.DataFrame({
+          'a': np.arange(5),
+          'b': ['x', 'y', 'x', 'z', 'y'],
+          'c': pd.Categorical(['u', 'v', 'v', 'u', 'v']),
+      }, index=index)
+      y = pd.Series(['p', 'n', 'n', 'p', 'n'], index=index)
+      input_fn = pandas_io.pandas_input_fn(
+          x, y, batch_size=3, shuffle=False, num_epochs=1)
+
+      results = input_fn()
+
+      features, target = session.run(results)
+      self.assertAllEqual(features['a'], [0, 1, 2])
+      self.assertAllEqual(features['b'], [b'x', b'y', b'x'])
+      self.assertAllEqual(features['c'], [b'u', b'v', b'v'])
+      self.assertAllEqual(target, [b'p', b'n', b'n'])
+
+      features, target = session.run(results)
+      self.assertAllEqual(features['a'], [3, 4])
+      self.assertAllEqual(features['b'], [b'z', b'y'])
+      self.assertAllEqual(features['c'], [b'u', b'v'])
+      self.assertAllEqual(target, [b'p', b'n'])
+
+      with self.assertRaises(errors.OutOfRangeError):
+        session.run(results)
+
+  def testPandasInputFn_ShuffleKeepsRowsTogether(self):
+    if not HAS_PANDAS:
+      return
+    with self.test_session() as session:
+      a = np.arange(20)
+      x = pd.DataFrame({'a': a, 'b': ['s%d' % i for i in a]})
+      y = pd.Series(a * 2)
+      input_fn = pandas_io.pandas_input_fn(
+          x, y, batch_size=7, shuffle=True, num_epochs=1)
+
+      results = input_fn()
+
+      rows = []
+      for _ in range(3):
+        features, target = session.run(results)
+        rows.extend(zip(features['a'], features['b'], target))
+      with self.assertRaises(errors.OutOfRangeError):
+        session.run(results)
+
+      self.assertEqual(list(a), sorted(row[0] for row in rows))
+      for a_value, b_value, target_value in rows:
+        self.assertEqual(b's%d' % a_value, b_value)
+        self.assertEqual(a_value * 2, target_value)
+
+  def testToColumnArrays(self):
+    if not HAS_PANDAS:
+      return
+    x = pd.DataFrame({
+        'a': np.arange(8.0),
+        'b': ['x', 'y'] * 4,
+        'c': ['x', None] * 4,
+        'd': ['s%d' % i for i in range(8)],
+    })
+    arrays, vocabs = pandas_io._to_column_arrays(  # pylint: disable=protected-access
+        collections.OrderedDict((name, x[name]) for name in x.columns))
+
+    self.assertEqual(['a', 'b', 'c', 'd'], list(arrays))
+    self.assertAllEqual(np.arange(8.0), arrays['a'])
+    self.assertTrue(arrays['a'].flags.c_contiguous)
+    self.assertAllEqual([0, 1] * 4, arrays['b'])
+    self.assertAllEqual(['x', 'y'], vocabs['b'])
+    # Columns with missing values are not encoded.
+    self.assertNotIn('c', vocabs)
+    self.assertEqual(np.object, arrays['c'].dtype)
+    # Nor are columns with about as many distinct values as rows.
+    self.assertNotIn('d', vocabs)
+    self.assertEqual(np.object, arrays['d'].dtype)
+
+  def testPandasInputFn_EncodedColumnsAreNotGraphConstants(self):
+    if not HAS_PANDAS:
+      return
+    with self.test_session() as session:
+      x = pd.DataFrame({'a': ['value%d' % (i % 2) for i in range(12)]})
+      input_fn = pandas_io.pandas_input_fn(
+          x, batch_size=4, shuffle=False, num_epochs=1)
+
+      features = input_fn()
+
+      for op in session.graph.get_operations():
+        if op.type == 'Const':
+          self.assertNotIn(b'value0', op.get_attr('value').string_val)
+      self.assertAllEqual([b'value0', b'value1'] * 2,
+                          session.run(features)['a'])
+
   def testPandasInputFn_Idempotent(self):
     if not HAS_PANDAS:
       return
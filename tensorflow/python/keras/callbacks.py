@@ -83,6 +83,9 @@ class CallbackList(object):
     self._delta_t_batch = 0.
     self._delta_ts_batch_begin = deque([], maxlen=self.queue_length)
     self._delta_ts_batch_end = deque([], maxlen=self.queue_length)
+    # Everything between the end of the previous batch (or the start of the
+    # epoch) and `on_batch_begin` is time spent waiting for data.
+    self._t_exit_batch_callbacks = time.time()
 
   def on_epoch_end(self, epoch, logs=None):
     """Called at the end of an epoch.
@@ -104,6 +107,7 @@ class CallbackList(object):
     """
     logs = logs or {}
     t_before_callbacks = time.time()
+    self._t_before_batch_begin_callbacks = t_before_callbacks
     for callback in self.callbacks:
       callback.on_batch_begin(batch, logs)
     self._delta_ts_batch_begin.append(time.time() - t_before_callbacks)
@@ -129,13 +133,40 @@ class CallbackList(object):
     t_before_callbacks = time.time()
     for callback in self.callbacks:
       callback.on_batch_end(batch, logs)
-    self._delta_ts_batch_end.append(time.time() - t_before_callbacks)
+    t_after_callbacks = time.time()
+    self._delta_ts_batch_end.append(t_after_callbacks - t_before_callbacks)
     delta_t_median = np.median(self._delta_ts_batch_end)
     if (self._delta_t_batch > 0. and
         (delta_t_median > 0.95 * self._delta_t_batch and delta_t_median > 0.1)):
       logging.warning('Method on_batch_end() is slow compared '
                       'to the batch update (%f). Check your callbacks.',
                       delta_t_median)
+    self._record_batch_timing(batch, logs, t_before_callbacks,
+                              t_after_callbacks)
+
+  def _record_batch_timing(self, batch, logs, t_exit_batch,
+                           t_after_callbacks):
+    """Passes the timing of the batch that just ended to `BatchProfiler`s."""
+    profilers = [c for c in self.callbacks if isinstance(c, BatchProfiler)]
+    t_begin = getattr(self, '_t_before_batch_begin_callbacks', None)
+    t_data = getattr(self, '_t_exit_batch_callbacks', None)
+    self._t_before_batch_begin_callbacks = None
+    self._t_exit_batch_callbacks = t_after_callbacks
+    if not profilers or t_begin is None:
+      return
+    if t_data is None or t_data > t_begin:
+      t_data = t_begin
+    timing = {
+        'batch': batch,
+        'size': logs.get('size', 0),
+        'start_time': t_data,
+        'data_wait_time': t_begin - t_data,
+        'batch_begin_callback_time': self._t_enter_batch - t_begin,
+        'step_time': t_exit_batch - self._t_enter_batch,
+        'batch_end_callback_time': t_after_callbacks - t_exit_batch,
+    }
+    for profiler in profilers:
+      profiler._record_batch(timing)  # pylint: disable=protected-access
 
   def on_train_begin(self, logs=None):
     """Called at the beginning of training.
@@ -1053,6 +1084,217 @@ class CSVLogger(Callback):
     self.writer = None
 
 
+@tf_export('keras.callbacks.EnqueuerMonitor')
+class EnqueuerMonitor(Callback):
+  """Callback that reports input queue statistics of `fit_generator`.
+
+  At the end of every epoch, the following per-epoch quantities from the
+  `GeneratorEnqueuer` or `OrderedEnqueuer` feeding the model are added to the
+  logs (and hence recorded by `History`, `CSVLogger`, etc.):
+
+      queue_occupancy: average fraction of the queue that was filled
+          when a batch was consumed.
+      producer_stall_time: seconds the producers spent waiting for a free
+          slot in a full queue (summed over the generator workers).
+      consumer_stall_time: seconds the training loop spent waiting for
+          a batch from an empty queue.
+      batches_per_second: number of batches consumed per second.
+
+  A high `consumer_stall_time` (and low `queue_occupancy`) means the input
+  pipeline is the bottleneck, a high `producer_stall_time` (and a full
+  queue) means the model is.
+
+  Nothing is reported when `fit_generator` is called with `workers=0`, or
+  by `fit` and `train_on_batch`.
+
+  Example:
+
+  ```python
+  monitor = EnqueuerMonitor(verbose=1)
+  history = model.fit_generator(generator, steps_per_epoch=100,
+                                callbacks=[monitor])
+  print(history.history['consumer_stall_time'])
+  ```
+
+  Arguments:
+      verbose: verbosity mode, 0 or 1. If 1, the statistics are printed
+          at the end of every epoch.
+  """
+
+  def __init__(self, verbose=0):
+    super(EnqueuerMonitor, self).__init__()
+    self.verbose = verbose
+    self.enqueuer = None
+    self._epoch_start_stats = None
+    self._epoch_start_time = None
+
+  def set_enqueuer(self, enqueuer):
+    self.enqueuer = enqueuer
+
+  def _get_stats(self):
+    if self.enqueuer is None or not hasattr(self.enqueuer, 'get_stats'):
+      return None
+    return self.enqueuer.get_stats()
+
+  def on_epoch_begin(self, epoch, logs=None):
+    self._epoch_start_stats = self._get_stats()
+    self._epoch_start_time = time.time()
+
+  def on_epoch_end(self, epoch, logs=None):
+    stats = self._get_stats()
+    start_stats = self._epoch_start_stats
+    if stats is None or start_stats is None:
+      return
+    logs = logs if logs is not None else {}
+    batches = stats['batches'] - start_stats['batches']
+    occupancy = (
+        stats['mean_queue_occupancy'] * stats['batches'] -
+        start_stats['mean_queue_occupancy'] * start_stats['batches'])
+    elapsed = time.time() - self._epoch_start_time
+    logs['queue_occupancy'] = occupancy / batches if batches else 0.
+    logs['producer_stall_time'] = (
+        stats['producer_stall_time'] - start_stats['producer_stall_time'])
+    logs['consumer_stall_time'] = (
+        stats['consumer_stall_time'] - start_stats['consumer_stall_time'])
+    logs['batches_per_second'] = batches / elapsed if elapsed else 0.
+    if self.verbose > 0:
+      print('Epoch %05d: queue occupancy %.1f%%, producer stall %.3fs, '
+            'consumer stall %.3fs, %.1f batches/s' %
+            (epoch + 1, 100. * logs['queue_occupancy'],
+             logs['producer_stall_time'], logs['consumer_stall_time'],
+             logs['batches_per_second']))
+
+  def on_train_end(self, logs=None):
+    self.enqueuer = None
+
+
+@tf_export('keras.callbacks.BatchProfiler')
+class BatchProfiler(Callback):
+  """Callback that records where the time of every training batch goes.
+
+  For each batch of `fit` and `fit_generator`, the profiler records:
+
+      data_wait_time: time spent preparing or waiting for the batch
+          (slicing the input arrays or fetching it from the generator),
+          i.e. since the previous batch, or the epoch, ended.
+      step_time: time spent running the training step.
+      callback_time: time spent in `on_batch_begin` and `on_batch_end` of
+          all callbacks (including this one).
+      samples_per_second: batch size divided by the sum of the above.
+
+  The per-batch records are kept in `records`, the epoch totals (and the
+  epoch throughput) are added to the epoch logs, and at the end of
+  training the records are written to `filepath`, either as a Chrome
+  trace (open it in `chrome://tracing`) or as a CSV file.
+
+  Example:
+
+  ```python
+  profiler = BatchProfiler('/tmp/fit_trace.json')
+  model.fit(x, y, callbacks=[profiler])
+  ```
+
+  Arguments:
+      filepath: path of the file to write at the end of training, or
+          `None` to only keep the records in memory.
+      output_format: one of `'chrome_trace'` or `'csv'`. If `None`, it is
+          `'csv'` when `filepath` ends with `.csv`, and `'chrome_trace'`
+          otherwise.
+
+  Raises:
+      ValueError: In case of invalid `output_format`.
+  """
+
+  def __init__(self, filepath=None, output_format=None):
+    super(BatchProfiler, self).__init__()
+    if output_format is None:
+      if filepath is not None and filepath.lower().endswith('.csv'):
+        output_format = 'csv'
+      else:
+        output_format = 'chrome_trace'
+    if output_format not in ('chrome_trace', 'csv'):
+      raise ValueError('Unknown `output_format`: ' + str(output_format))
+    self.filepath = filepath
+    self.output_format = output_format
+    self.records = []
+    self._epoch = 0
+    self._epoch_records = []
+
+  def on_train_begin(self, logs=None):
+    self.records = []
+
+  def on_epoch_begin(self, epoch, logs=None):
+    self._epoch = epoch
+    self._epoch_records = []
+
+  def _record_batch(self, timing):
+    record = dict(timing)
+    record['epoch'] = self._epoch
+    record['callback_time'] = (
+        record['batch_begin_callback_time'] +
+        record['batch_end_callback_time'])
+    total_time = (
+        record['data_wait_time'] + record['step_time'] +
+        record['callback_time'])
+    record['samples_per_second'] = (
+        record['size'] / total_time if total_time > 0 else 0.)
+    self.records.append(record)
+    self._epoch_records.append(record)
+
+  def on_epoch_end(self, epoch, logs=None):
+    if logs is None or not self._epoch_records:
+      return
+    totals = {}
+    for key in ['data_wait_time', 'step_time', 'callback_time', 'size']:
+      totals[key] = sum(r[key] for r in self._epoch_records)
+    logs['data_wait_time'] = totals['data_wait_time']
+    logs['step_time'] = totals['step_time']
+    logs['callback_time'] = totals['callback_time']
+    total_time = (
+        totals['data_wait_time'] + totals['step_time'] +
+        totals['callback_time'])
+    logs['samples_per_second'] = (
+        totals['size'] / total_time if total_time > 0 else 0.)
+
+  def on_train_end(self, logs=None):
+    if self.filepath is None:
+      return
+    if self.output_format == 'csv':
+      self._write_csv()
+    else:
+      self._write_chrome_trace()
+
+  def _write_csv(self):
+    fieldnames = ['epoch', 'batch', 'size', 'data_wait_time', 'step_time',
+                  'callback_time', 'samples_per_second']
+    file_flags = 'b' if six.PY2 and os.name == 'nt' else ''
+    with open(self.filepath, 'w' + file_flags) as f:
+      writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction='ignore')
+      writer.writeheader()
+      for record in self.records:
+        writer.writerow(record)
+
+  def _write_chrome_trace(self):
+    # Complete events ('X'), timestamps and durations in microseconds.
+    phases = [('data_wait', 'data_wait_time'),
+              ('on_batch_begin', 'batch_begin_callback_time'),
+              ('train_step', 'step_time'),
+              ('on_batch_end', 'batch_end_callback_time')]
+    t0 = self.records[0]['start_time'] if self.records else 0.
+    events = []
+    for record in self.records:
+      ts = record['start_time'] - t0
+      args = {'epoch': record['epoch'], 'batch': record['batch'],
+              'size': record['size']}
+      for name, key in phases:
+        events.append({'name': name, 'cat': 'keras', 'ph': 'X', 'pid': 0,
+                       'tid': 0, 'ts': ts * 1e6, 'dur': record[key] * 1e6,
+                       'args': args})
+        ts += record[key]
+    with open(self.filepath, 'w') as f:
+      json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+
 @tf_export('keras.callbacks.LambdaCallback')
 class LambdaCallback(Callback):
   r"""Callback for creating simple, custom callbacks on-the-fly.
@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import csv
+import json
 import os
 import re
 import shutil
@@ -645,6 +646,122 @@ class KerasCallbacksTest(test.TestCase):
       assert len(loss) == 1
       assert loss[0] == np.inf
 
+  def test_EnqueuerMonitor(self):
+    with self.test_session():
+      np.random.seed(1337)
+      (x_train, y_train), _ = testing_utils.get_test_data(
+          train_samples=TRAIN_SAMPLES,
+          test_samples=TEST_SAMPLES,
+          input_shape=(INPUT_DIM,),
+          num_classes=NUM_CLASSES)
+      y_train = keras.utils.to_categorical(y_train)
+      model = keras.models.Sequential()
+      model.add(
+          keras.layers.Dense(
+              NUM_HIDDEN, input_dim=INPUT_DIM, activation='relu'))
+      model.add(keras.layers.Dense(NUM_CLASSES, activation='softmax'))
+      model.compile(loss='categorical_crossentropy', optimizer='sgd')
+
+      def data_generator():
+        i = 0
+        max_batch_index = len(x_train) // BATCH_SIZE
+        while 1:
+          yield (x_train[i * BATCH_SIZE: (i + 1) * BATCH_SIZE],
+                 y_train[i * BATCH_SIZE: (i + 1) * BATCH_SIZE])
+          i += 1
+          i %= max_batch_index
+
+      monitor = keras.callbacks.EnqueuerMonitor()
+      history = model.fit_generator(
+          data_generator(), len(x_train) // BATCH_SIZE, epochs=2,
+          callbacks=[monitor])
+      for key in ['queue_occupancy', 'producer_stall_time',
+                  'consumer_stall_time', 'batches_per_second']:
+        self.assertEqual(len(history.history[key]), 2)
+        for value in history.history[key]:
+          self.assertGreaterEqual(value, 0)
+      self.assertLessEqual(max(history.history['queue_occupancy']), 1)
+
+      # A `Sequence` is fed by an `OrderedEnqueuer`, which is monitored too.
+      class DataSequence(keras.utils.Sequence):
+
+        def __len__(self):
+          return len(x_train) // BATCH_SIZE
+
+        def __getitem__(self, i):
+          return (x_train[i * BATCH_SIZE: (i + 1) * BATCH_SIZE],
+                  y_train[i * BATCH_SIZE: (i + 1) * BATCH_SIZE])
+
+      history = model.fit_generator(
+          DataSequence(), epochs=1,
+          callbacks=[keras.callbacks.EnqueuerMonitor()])
+      self.assertEqual(len(history.history['batches_per_second']), 1)
+
+      # Without an enqueuer, nothing is reported.
+      history = model.fit_generator(
+          data_generator(), len(x_train) // BATCH_SIZE, epochs=1,
+          workers=0, callbacks=[keras.callbacks.EnqueuerMonitor()])
+      self.assertNotIn('queue_occupancy', history.history)
+
+  def test_BatchProfiler(self):
+    tmpdir = self.get_temp_dir()
+    self.addCleanup(shutil.rmtree, tmpdir)
+    with self.test_session():
+      np.random.seed(1337)
+      (x_train, y_train), _ = testing_utils.get_test_data(
+          train_samples=TRAIN_SAMPLES,
+          test_samples=TEST_SAMPLES,
+          input_shape=(INPUT_DIM,),
+          num_classes=NUM_CLASSES)
+      y_train = keras.utils.to_categorical(y_train)
+      model = keras.models.Sequential()
+      model.add(
+          keras.layers.Dense(
+              NUM_HIDDEN, input_dim=INPUT_DIM, activation='relu'))
+      model.add(keras.layers.Dense(NUM_CLASSES, activation='softmax'))
+      model.compile(loss='categorical_crossentropy', optimizer='sgd')
+      num_batches = TRAIN_SAMPLES // BATCH_SIZE
+
+      # Chrome trace from `fit`.
+      trace_path = os.path.join(tmpdir, 'trace.json')
+      profiler = keras.callbacks.BatchProfiler(trace_path)
+      history = model.fit(x_train, y_train, batch_size=BATCH_SIZE, epochs=2,
+                          callbacks=[profiler])
+      self.assertEqual(len(profiler.records), 2 * num_batches)
+      for record in profiler.records:
+        self.assertEqual(record['size'], BATCH_SIZE)
+        self.assertGreaterEqual(record['data_wait_time'], 0)
+        self.assertGreater(record['step_time'], 0)
+        self.assertGreater(record['samples_per_second'], 0)
+      for key in ['data_wait_time', 'step_time', 'callback_time',
+                  'samples_per_second']:
+        self.assertEqual(len(history.history[key]), 2)
+      with open(trace_path) as f:
+        events = json.load(f)['traceEvents']
+      self.assertEqual(len(events), 4 * 2 * num_batches)
+      self.assertEqual(
+          set(e['name'] for e in events),
+          set(['data_wait', 'on_batch_begin', 'train_step', 'on_batch_end']))
+
+      # CSV from `fit_generator`.
+      def data_generator():
+        i = 0
+        while 1:
+          yield (x_train[i * BATCH_SIZE: (i + 1) * BATCH_SIZE],
+                 y_train[i * BATCH_SIZE: (i + 1) * BATCH_SIZE])
+          i = (i + 1) % num_batches
+
+      csv_path = os.path.join(tmpdir, 'profile.csv')
+      model.fit_generator(data_generator(), num_batches, epochs=1,
+                          callbacks=[keras.callbacks.BatchProfiler(csv_path)])
+      with open(csv_path) as f:
+        rows = list(csv.DictReader(f))
+      self.assertEqual(len(rows), num_batches)
+      self.assertEqual(int(rows[0]['size']), BATCH_SIZE)
+
+      with self.assertRaises(ValueError):
+        keras.callbacks.BatchProfiler(trace_path, output_format='pprof')
+
   def test_TensorBoard(self):
     np.random.seed(1337)
 
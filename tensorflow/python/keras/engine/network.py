@@ -1235,7 +1235,12 @@ class Network(base_layer.Layer):
       output_tensors.append(layer_output_tensors[tensor_index])
     return cls(inputs=input_tensors, outputs=output_tensors, name=name)
 
-  def save(self, filepath, overwrite=True, include_optimizer=True):
+  def save(self,
+           filepath,
+           overwrite=True,
+           include_optimizer=True,
+           streaming=False,
+           compression=None):
     """Saves the model to a single HDF5 file.
 
     The savefile includes:
@@ -1257,6 +1262,10 @@ class Network(base_layer.Layer):
         overwrite: Whether to silently overwrite any existing file at the
             target location, or provide the user with a manual prompt.
         include_optimizer: If True, save optimizer's state together.
+        streaming: If True, weights are fetched and written one tensor at a
+            time, to reduce peak memory usage for large models.
+        compression: Optional HDF5 compression filter for the weight
+            datasets (e.g. `'gzip'` or `'lzf'`).
 
     Example:
 
@@ -1275,9 +1284,15 @@ class Network(base_layer.Layer):
       raise NotImplementedError
 
     from tensorflow.python.keras.models import save_model  # pylint: disable=g-import-not-at-top
-    save_model(self, filepath, overwrite, include_optimizer)
-
-  def save_weights(self, filepath, overwrite=True, save_format=None):
+    save_model(self, filepath, overwrite, include_optimizer, streaming,
+               compression)
+
+  def save_weights(self,
+                   filepath,
+                   overwrite=True,
+                   save_format=None,
+                   streaming=False,
+                   compression=None):
     """Saves all layer weights.
 
     Either saves in HDF5 or in TensorFlow format based on the `save_format`
@@ -1313,6 +1328,11 @@ class Network(base_layer.Layer):
         save_format: Either 'tf' or 'h5'. A `filepath` ending in '.h5' or
             '.keras' will default to HDF5 if `save_format` is `None`. Otherwise
             `None` defaults to 'tf'.
+        streaming: HDF5 only. If True, weights are fetched and written one
+            tensor at a time, so that peak memory stays close to the size of
+            the largest weight.
+        compression: HDF5 only. Optional compression filter for the weight
+            datasets (e.g. `'gzip'` or `'lzf'`, see `h5py`).
 
     Raises:
         ImportError: If h5py is not available when attempting to save in HDF5
@@ -1356,7 +1376,8 @@ class Network(base_layer.Layer):
         return
     if save_format == 'h5':
       with h5py.File(filepath, 'w') as f:
-        saving.save_weights_to_hdf5_group(f, self.layers)
+        saving.save_weights_to_hdf5_group(
+            f, self.layers, streaming=streaming, compression=compression)
     else:
       if context.executing_eagerly():
         session = None
@@ -1364,7 +1385,11 @@ class Network(base_layer.Layer):
         session = backend.get_session()
       self._checkpointable_saver.save(filepath, session=session)
 
-  def load_weights(self, filepath, by_name=False):
+  def load_weights(self,
+                   filepath,
+                   by_name=False,
+                   streaming=False,
+                   layer_names=None):
     """Loads all layer weights, either from a TensorFlow or an HDF5 weight file.
 
     If `by_name` is False weights are loaded based on the network's
@@ -1391,6 +1416,12 @@ class Network(base_layer.Layer):
         by_name: Boolean, whether to load weights by name or by topological
             order. Only topological loading is supported for weight files in
             TensorFlow format.
+        streaming: HDF5 only. Boolean, whether to read and assign the weights
+            one layer at a time instead of all at once, to reduce peak memory
+            usage.
+        layer_names: HDF5 only. Optional list of layer names. If given, only
+            the weights of these layers are read and loaded, by name (this
+            implies `by_name=True`), and the rest of the file is not read.
 
     Returns:
         When loading a weight file in TensorFlow format, returns the same status
@@ -1416,11 +1447,11 @@ class Network(base_layer.Layer):
         save_format = 'h5'
     if save_format == 'tf':
       status = self._checkpointable_saver.restore(filepath)
-      if by_name:
+      if by_name or layer_names is not None:
         raise NotImplementedError(
             'Weights may only be loaded based on topology into Models when '
-            'loading TensorFlow-formatted weights (got by_name=True to '
-            'load_weights).')
+            'loading TensorFlow-formatted weights (got by_name=True or '
+            'layer_names to load_weights).')
       if not context.executing_eagerly():
         session = backend.get_session()
         finalizer = functools.partial(status.run_restore_ops, session=session)
@@ -1442,10 +1473,17 @@ class Network(base_layer.Layer):
     with h5py.File(filepath, 'r') as f:
       if 'layer_names' not in f.attrs and 'model_weights' in f:
         f = f['model_weights']
-      if by_name:
-        saving.load_weights_from_hdf5_group_by_name(f, self.layers)
+      if layer_names is not None:
+        layer_names = set(layer_names)
+        layers = [layer for layer in self.layers if layer.name in layer_names]
+        saving.load_weights_from_hdf5_group_by_name(
+            f, layers, streaming=streaming)
+      elif by_name:
+        saving.load_weights_from_hdf5_group_by_name(
+            f, self.layers, streaming=streaming)
       else:
-        saving.load_weights_from_hdf5_group(f, self.layers)
+        saving.load_weights_from_hdf5_group(
+            f, self.layers, streaming=streaming)
 
   def _post_build_cleanup(self):
     super(Network, self)._post_build_cleanup()
@@ -48,7 +48,12 @@ except ImportError:
 
 
 @tf_export('keras.models.save_model')
-def save_model(model, filepath, overwrite=True, include_optimizer=True):
+def save_model(model,
+               filepath,
+               overwrite=True,
+               include_optimizer=True,
+               streaming=False,
+               compression=None):
   """Saves a model to a HDF5 file.
 
   The saved model contains:
@@ -69,6 +74,12 @@ def save_model(model, filepath, overwrite=True, include_optimizer=True):
           model at the target location, or instead
           ask the user with a manual prompt.
       include_optimizer: If True, save optimizer's state together.
+      streaming: If True, weights are fetched from the backend and written
+          one tensor at a time, so that peak memory stays close to the size
+          of the largest weight instead of the largest layer.
+      compression: Optional HDF5 compression filter for the weight
+          datasets (e.g. `'gzip'` or `'lzf'`, see `h5py`). Compressed
+          datasets are chunked.
 
   Raises:
       ImportError: if h5py is not available.
@@ -104,7 +115,11 @@ def save_model(model, filepath, overwrite=True, include_optimizer=True):
 
     model_weights_group = f.create_group('model_weights')
     model_layers = model.layers
-    save_weights_to_hdf5_group(model_weights_group, model_layers)
+    save_weights_to_hdf5_group(
+        model_weights_group,
+        model_layers,
+        streaming=streaming,
+        compression=compression)
 
     if include_optimizer and model.optimizer:
       if isinstance(model.optimizer, optimizers.TFOptimizer):
@@ -136,20 +151,17 @@ def save_model(model, filepath, overwrite=True, include_optimizer=True):
         symbolic_weights = getattr(model.optimizer, 'weights')
         if symbolic_weights:
           optimizer_weights_group = f.create_group('optimizer_weights')
-          weight_values = K.batch_get_value(symbolic_weights)
           weight_names = []
-          for w, val in zip(symbolic_weights, weight_values):
+          for w in symbolic_weights:
             name = str(w.name)
             weight_names.append(name.encode('utf8'))
           optimizer_weights_group.attrs['weight_names'] = weight_names
-          for name, val in zip(weight_names, weight_values):
-            param_dset = optimizer_weights_group.create_dataset(
-                name, val.shape, dtype=val.dtype)
-            if not val.shape:
-              # scalar
-              param_dset[()] = val
-            else:
-              param_dset[:] = val
+          _save_weight_values(
+              optimizer_weights_group,
+              weight_names,
+              symbolic_weights,
+              streaming=streaming,
+              compression=compression)
     f.flush()
   finally:
     if opened_new_file:
@@ -157,7 +169,7 @@ def save_model(model, filepath, overwrite=True, include_optimizer=True):
 
 
 @tf_export('keras.models.load_model')
-def load_model(filepath, custom_objects=None, compile=True):  # pylint: disable=redefined-builtin
+def load_model(filepath, custom_objects=None, compile=True, streaming=False):  # pylint: disable=redefined-builtin
   """Loads a model saved via `save_model`.
 
   Arguments:
@@ -169,6 +181,9 @@ def load_model(filepath, custom_objects=None, compile=True):  # pylint: disable=
           considered during deserialization.
       compile: Boolean, whether to compile the model
           after loading.
+      streaming: Boolean, whether to read and assign the weights layer by
+          layer (and the optimizer weights one at a time) instead of all
+          at once, to reduce peak memory usage.
 
   Returns:
       A Keras model instance. If an optimizer was found
@@ -229,7 +244,8 @@ def load_model(filepath, custom_objects=None, compile=True):  # pylint: disable=
     model = model_from_config(model_config, custom_objects=custom_objects)
 
     # set weights
-    load_weights_from_hdf5_group(f['model_weights'], model.layers)
+    load_weights_from_hdf5_group(
+        f['model_weights'], model.layers, streaming=streaming)
 
     if compile:
       # instantiate optimizer
@@ -270,7 +286,10 @@ def load_model(filepath, custom_objects=None, compile=True):  # pylint: disable=
             optimizer_weights_group[n] for n in optimizer_weight_names
         ]
         try:
-          model.optimizer.set_weights(optimizer_weight_values)
+          if streaming:
+            _stream_optimizer_weights(model.optimizer, optimizer_weight_values)
+          else:
+            model.optimizer.set_weights(optimizer_weight_values)
         except ValueError:
           logging.warning('Error in loading the saved optimizer '
                           'state. As a result, your model is '
@@ -704,12 +723,84 @@ def _convert_rnn_weights(layer, weights):
   return weights
 
 
-def save_weights_to_hdf5_group(f, layers):
+def _stream_optimizer_weights(optimizer, datasets):
+  """Sets the weights of an optimizer one HDF5 dataset at a time.
+
+  Arguments:
+      optimizer: a Keras optimizer.
+      datasets: list of HDF5 datasets, in the order of `optimizer.weights`.
+
+  Raises:
+      ValueError: in case of mismatch in the number or shapes of weights,
+          checked before any weight is set.
+  """
+  params = optimizer.weights
+  if len(params) != len(datasets):
+    raise ValueError('Length of the specified weight list (' +
+                     str(len(datasets)) +
+                     ') does not match the number of weights '
+                     'of the optimizer (' + str(len(params)) + ')')
+  for p, dset in zip(params, datasets):
+    if K.int_shape(p) != dset.shape:
+      raise ValueError('Optimizer weight shape ' + str(K.int_shape(p)) +
+                       ' not compatible with '
+                       'provided weight shape ' + str(dset.shape))
+  for p, dset in zip(params, datasets):
+    K.set_value(p, np.asarray(dset))
+
+
+def _create_weight_dataset(group, name, val, compression=None, chunks=None):
+  """Writes a weight value to a new dataset of `group`."""
+  if not val.shape:
+    # scalar, which can neither be chunked nor compressed.
+    param_dset = group.create_dataset(name, val.shape, dtype=val.dtype)
+    param_dset[()] = val
+  else:
+    param_dset = group.create_dataset(
+        name,
+        val.shape,
+        dtype=val.dtype,
+        compression=compression,
+        chunks=chunks)
+    param_dset[:] = val
+
+
+def _save_weight_values(group,
+                        weight_names,
+                        symbolic_weights,
+                        streaming=False,
+                        compression=None,
+                        chunks=None):
+  """Fetches weight values and writes them to datasets of `group`."""
+  if streaming:
+    # Only one weight value is alive at any time.
+    for name, w in zip(weight_names, symbolic_weights):
+      _create_weight_dataset(
+          group, name, K.get_value(w), compression=compression, chunks=chunks)
+  else:
+    weight_values = K.batch_get_value(symbolic_weights)
+    for name, val in zip(weight_names, weight_values):
+      _create_weight_dataset(
+          group, name, val, compression=compression, chunks=chunks)
+
+
+def save_weights_to_hdf5_group(f,
+                               layers,
+                               streaming=False,
+                               compression=None,
+                               chunks=None):
   """Saves the weights of a list of layers to a HDF5 group.
 
   Arguments:
       f: HDF5 group.
       layers: List of layer instances.
+      streaming: Whether to fetch and write weights one tensor at a time
+          instead of one layer at a time.
+      compression: Optional HDF5 compression filter for the weight
+          datasets, e.g. `'gzip'` or `'lzf'`.
+      chunks: Optional chunk shape for the (non-scalar) weight datasets,
+          or `True` to let `h5py` choose one. Compressed datasets are
+          always chunked.
   """
   from tensorflow.python.keras import __version__ as keras_version  # pylint: disable=g-import-not-at-top
 
@@ -721,30 +812,33 @@ def save_weights_to_hdf5_group(f, layers):
   for layer in layers:
     g = f.create_group(layer.name)
     symbolic_weights = layer.weights
-    weight_values = K.batch_get_value(symbolic_weights)
     weight_names = []
-    for i, (w, val) in enumerate(zip(symbolic_weights, weight_values)):
+    for i, w in enumerate(symbolic_weights):
       if hasattr(w, 'name') and w.name:
         name = str(w.name)
       else:
         name = 'param_' + str(i)
       weight_names.append(name.encode('utf8'))
     save_attributes_to_hdf5_group(g, 'weight_names', weight_names)
-    for name, val in zip(weight_names, weight_values):
-      param_dset = g.create_dataset(name, val.shape, dtype=val.dtype)
-      if not val.shape:
-        # scalar
-        param_dset[()] = val
-      else:
-        param_dset[:] = val
+    _save_weight_values(
+        g,
+        weight_names,
+        symbolic_weights,
+        streaming=streaming,
+        compression=compression,
+        chunks=chunks)
 
 
-def load_weights_from_hdf5_group(f, layers):
+def load_weights_from_hdf5_group(f, layers, streaming=False):
   """Implements topological (order-based) weight loading.
 
   Arguments:
       f: A pointer to a HDF5 group.
       layers: a list of target layers.
+      streaming: Whether to read and assign weights one layer at a time,
+          instead of reading all of them before a single assignment. This
+          bounds peak memory by the largest layer, but if an error is
+          raised, the layers before the faulty one are already loaded.
 
   Raises:
       ValueError: in case of mismatch between provided layers
@@ -798,20 +892,27 @@ def load_weights_from_hdf5_group(f, layers):
                        str(len(symbolic_weights)) +
                        ' weights, but the saved weights have ' +
                        str(len(weight_values)) + ' elements.')
-    weight_value_tuples += zip(symbolic_weights, weight_values)
+    if streaming:
+      K.batch_set_value(list(zip(symbolic_weights, weight_values)))
+    else:
+      weight_value_tuples += zip(symbolic_weights, weight_values)
   K.batch_set_value(weight_value_tuples)
 
 
-def load_weights_from_hdf5_group_by_name(f, layers):
+def load_weights_from_hdf5_group_by_name(f, layers, streaming=False):
   """Implements name-based weight loading.
 
   (instead of topological weight loading).
 
-  Layers that have no matching name are skipped.
+  Layers that have no matching name are skipped, and the weights of
+  saved layers that match none of `layers` are not read, so loading a few
+  layers from a large file is cheap.
 
   Arguments:
       f: A pointer to a HDF5 group.
       layers: a list of target layers.
+      streaming: Whether to read and assign weights one saved layer at a
+          time, instead of reading all of them before a single assignment.
 
   Raises:
       ValueError: in case of mismatch between provided layers
@@ -839,11 +940,13 @@ def load_weights_from_hdf5_group_by_name(f, layers):
   # which provides a speedup in TensorFlow.
   weight_value_tuples = []
   for k, name in enumerate(layer_names):
+    if name not in index:
+      continue
     g = f[name]
     weight_names = load_attributes_from_hdf5_group(g, 'weight_names')
     weight_values = [np.asarray(g[weight_name]) for weight_name in weight_names]
 
-    for layer in index.get(name, []):
+    for layer in index[name]:
       symbolic_weights = layer.weights
       weight_values = preprocess_weights_for_loading(
           layer, weight_values, original_keras_version, original_backend)
@@ -864,6 +967,9 @@ def load_weights_from_hdf5_group_by_name(f, layers):
 
         else:
           weight_value_tuples.append((symbolic_weights[i], weight_values[i]))
+    if streaming:
+      K.batch_set_value(weight_value_tuples)
+      weight_value_tuples = []
   K.batch_set_value(weight_value_tuples)
 
 
@@ -248,6 +248,53 @@ class TestWeightSavingAndLoading(test.TestCase, parameterized.TestCase):
 
       self.assertAllClose(y, ref_y)
 
+  def test_streaming_compressed_weight_loading(self):
+    if h5py is None:
+      return
+
+    temp_dir = self.get_temp_dir()
+    self.addCleanup(shutil.rmtree, temp_dir)
+    h5_path = os.path.join(temp_dir, 'test.h5')
+
+    num_hidden = 5
+    input_dim = 3
+    batch_size = 5
+    num_classes = 2
+
+    def make_model():
+      model = keras.models.Sequential()
+      model.add(keras.layers.Dense(num_hidden, input_dim=input_dim, name='d1'))
+      model.add(keras.layers.Dense(num_classes, name='d2'))
+      return model
+
+    with self.test_session():
+      model = make_model()
+      x = np.random.random((batch_size, input_dim))
+      ref_y = model.predict(x)
+      ref_weights = model.get_weights()
+
+      model.save_weights(h5_path, streaming=True, compression='gzip')
+      with h5py.File(h5_path, 'r') as f:
+        kernel_name = saving.load_attributes_from_hdf5_group(
+            f['d1'], 'weight_names')[0]
+        dset = f['d1'][kernel_name]
+        self.assertEqual(dset.compression, 'gzip')
+        self.assertIsNotNone(dset.chunks)
+
+      for by_name in [False, True]:
+        model = make_model()
+        model.load_weights(h5_path, by_name=by_name, streaming=True)
+        self.assertAllClose(model.predict(x), ref_y)
+
+      # Partial loading: only `d2` is restored.
+      model = make_model()
+      d1_weights = model.layers[0].get_weights()
+      model.load_weights(h5_path, layer_names=['d2'])
+      for w, ref_w in zip(model.layers[0].get_weights(), d1_weights):
+        self.assertAllClose(w, ref_w)
+      for w, ref_w in zip(model.layers[1].get_weights(), ref_weights[2:]):
+        self.assertAllClose(w, ref_w)
+
   def test_sequential_weight_loading_group_name_with_incorrect_length(self):
     if h5py is None:
       return
@@ -364,6 +411,34 @@ class TestWholeModelSaving(test.TestCase):
       out2 = new_model.predict(x)
       self.assertAllClose(out, out2, atol=1e-05)
 
+  def test_sequential_model_saving_streaming(self):
+    if h5py is None:
+      self.skipTest('h5py required to run this test')
+
+    with self.test_session():
+      model = keras.models.Sequential()
+      model.add(keras.layers.Dense(2, input_shape=(3,)))
+      model.add(keras.layers.Dense(3))
+      model.compile(loss=keras.losses.MSE,
+                    optimizer=keras.optimizers.Adam(lr=0.0001))
+      x = np.random.random((1, 3))
+      y = np.random.random((1, 3))
+      model.train_on_batch(x, y)
+
+      out = model.predict(x)
+      fd, fname = tempfile.mkstemp('.h5')
+      model.save(fname, streaming=True, compression='lzf')
+
+      new_model = keras.models.load_model(fname, streaming=True)
+      os.close(fd)
+      os.remove(fname)
+
+      out2 = new_model.predict(x)
+      self.assertAllClose(out, out2, atol=1e-05)
+      for w, new_w in zip(model.optimizer.get_weights(),
+                          new_model.optimizer.get_weights()):
+        self.assertAllClose(w, new_w)
+
   def test_sequential_model_saving_without_compile(self):
     if h5py is None:
       self.skipTest('h5py required to run this test')
@@ -1147,6 +1147,7 @@ class Model(Network):
           initial_epoch=0,
           steps_per_epoch=None,
           validation_steps=None,
+          read_ahead=0,
           **kwargs):
     """Trains the model for a fixed number of epochs (iterations on a dataset).
 
@@ -1202,9 +1203,13 @@ class Model(Network):
               - tuple `(x_val, y_val, val_sample_weights)` of Numpy arrays
               - dataset or a dataset iterator
         shuffle: Boolean (whether to shuffle the training data
-            before each epoch) or str (for 'batch').
+            before each epoch) or str (for 'batch' or 'block').
             'batch' is a special option for dealing with the
             limitations of HDF5 data; it shuffles in batch-sized chunks.
+            'block' is meant for memory-mapped Numpy arrays (`np.memmap`):
+            it shuffles the order of blocks of 16 batches, and samples
+            within each block, then sorts the indices of every batch, so
+            that the data is read almost sequentially.
             Has no effect when `steps_per_epoch` is not `None`.
         class_weight: Optional dictionary mapping class indices (integers)
             to a weight (float) value, used for weighting the loss function
@@ -1237,6 +1242,11 @@ class Model(Network):
         validation_steps: Only relevant if `steps_per_epoch`
             is specified. Total number of steps (batches of samples)
             to validate before stopping.
+        read_ahead: Integer. Only relevant for Numpy array inputs, in graph
+            mode. Number of batches to slice from the inputs in advance, on
+            a background thread, while the model trains on the current one.
+            If 0, batches are sliced on demand. Not supported in eager
+            execution.
         **kwargs: Used for backwards compatibility.
 
     Returns:
@@ -1248,7 +1258,8 @@ class Model(Network):
     Raises:
         RuntimeError: If the model was never compiled.
         ValueError: In case of mismatch between the provided input data
-            and what the model expects.
+            and what the model expects, or if `read_ahead` is set in eager
+            execution.
     """
     # TODO(fchollet): this method may be creating reference cycles, which would
     # lead to accumulating garbage in memory when called in a loop. Investigate.
@@ -1264,6 +1275,9 @@ class Model(Network):
       epochs = kwargs.pop('nb_epoch')
     if kwargs:
       raise TypeError('Unrecognized keyword arguments: ' + str(kwargs))
+    if read_ahead and context.executing_eagerly():
+      raise ValueError('`read_ahead` is not supported in eager execution; '
+                       'got read_ahead=%s.' % read_ahead)
 
     # Validate and standardize user data.
     x, y, sample_weights = self._standardize_user_data(
@@ -1360,7 +1374,8 @@ class Model(Network):
           shuffle=shuffle,
           initial_epoch=initial_epoch,
           steps_per_epoch=steps_per_epoch,
-          validation_steps=validation_steps)
+          validation_steps=validation_steps,
+          read_ahead=read_ahead)
 
   def evaluate(self,
                x=None,
@@ -1445,7 +1460,7 @@ class Model(Network):
           self, inputs=x, targets=y, sample_weights=sample_weights,
           batch_size=batch_size, verbose=verbose, steps=steps)
 
-  def predict(self, x, batch_size=None, verbose=0, steps=None):
+  def predict(self, x, batch_size=None, verbose=0, steps=None, read_ahead=0):
     """Generates output predictions for the input samples.
 
     Computation is done in batches.
@@ -1467,6 +1482,11 @@ class Model(Network):
         steps: Total number of steps (batches of samples)
             before declaring the prediction round finished.
             Ignored with the default value of `None`.
+        read_ahead: Integer. Only relevant for Numpy array inputs, in graph
+            mode. Number of batches to read from the inputs in advance, on
+            a background thread, while the model processes the current one.
+            If 0, batches are read on demand. Not supported in eager
+            execution.
 
     Returns:
         Numpy array(s) of predictions.
@@ -1475,11 +1495,15 @@ class Model(Network):
         ValueError: In case of mismatch between the provided
             input data and the model's expectations,
             or in case a stateful model receives a number of samples
-            that is not a multiple of the batch size.
+            that is not a multiple of the batch size,
+            or if `read_ahead` is set in eager execution.
     """
     # Backwards compatibility.
     if batch_size is None and steps is None:
       batch_size = 32
+    if read_ahead and context.executing_eagerly():
+      raise ValueError('`read_ahead` is not supported in eager execution; '
+                       'got read_ahead=%s.' % read_ahead)
 
     # Validate and standardize user data.
     x, _, _ = self._standardize_user_data(
@@ -1490,7 +1514,12 @@ class Model(Network):
           self, x, batch_size=batch_size, verbose=verbose, steps=steps)
     else:
       return training_arrays.predict_loop(
-          self, x, batch_size=batch_size, verbose=verbose, steps=steps)
+          self,
+          x,
+          batch_size=batch_size,
+          verbose=verbose,
+          steps=steps,
+          read_ahead=read_ahead)
 
   def train_on_batch(self, x, y=None, sample_weight=None, class_weight=None):
     """Runs a single gradient update on a single batch of data.
@@ -53,7 +53,8 @@ def fit_loop(model,
              callback_metrics=None,
              initial_epoch=0,
              steps_per_epoch=None,
-             validation_steps=None):
+             validation_steps=None,
+             read_ahead=0):
   """Abstract fit function for arrays of data.
 
   Arguments:
@@ -68,7 +69,9 @@ def fit_loop(model,
       val_inputs: List of input arrays.
       val_targets: List of target arrays.
       val_sample_weights: Optional list of sample weight arrays.
-      shuffle: Whether to shuffle the data at the beginning of each epoch
+      shuffle: Whether to shuffle the data at the beginning of each epoch,
+          or 'batch' to shuffle batch-sized chunks, or 'block' to shuffle
+          with `training_utils.block_shuffle`.
       callback_metrics: List of strings, the display names of the metrics
           passed to the callbacks. They should be the
           concatenation of list the display names of the outputs of
@@ -81,6 +84,9 @@ def fit_loop(model,
       validation_steps: Number of steps to run validation for
           (only if doing validation from data tensors).
           Ignored with the default value of `None`.
+      read_ahead: Number of batches to slice from the input arrays in
+          advance, on a background thread, while the current batch is
+          being trained on.
 
   Returns:
       `History` object.
@@ -187,6 +193,18 @@ def fit_loop(model,
     if issparse is not None and issparse(ins[i]) and not K.is_sparse(feed[i]):
       indices_for_conversion_to_dense.append(i)
 
+  def slice_batch(batch_ids):
+    try:
+      if isinstance(ins[-1], int):
+        # Do not slice the training phase flag.
+        return slice_arrays(ins[:-1], batch_ids) + [ins[-1]]
+      else:
+        return slice_arrays(ins, batch_ids)
+    except TypeError:
+      raise TypeError('TypeError while preparing batch. '
+                      'If using HDF5 input data, '
+                      'pass shuffle="batch".')
+
   for epoch in range(initial_epoch, epochs):
     # Reset stateful metrics
     for m in model.stateful_metric_functions:
@@ -237,26 +255,25 @@ def fit_loop(model,
       # Sample-wise fit loop.
       if shuffle == 'batch':
         index_array = training_utils.batch_shuffle(index_array, batch_size)
+      elif shuffle == 'block':
+        # Shuffle from the identity every epoch to keep the blocks contiguous.
+        index_array = training_utils.block_shuffle(
+            np.arange(num_train_samples), batch_size)
       elif shuffle:
         np.random.shuffle(index_array)
 
       batches = make_batches(num_train_samples, batch_size)
+      batches_ins = training_utils.iterate_with_read_ahead(
+          slice_batch,
+          [index_array[batch_start:batch_end]
+           for batch_start, batch_end in batches],
+          read_ahead=read_ahead)
 
       for batch_index, (batch_start, batch_end) in enumerate(batches):
-        batch_ids = index_array[batch_start:batch_end]
-        try:
-          if isinstance(ins[-1], int):
-            # Do not slice the training phase flag.
-            ins_batch = slice_arrays(ins[:-1], batch_ids) + [ins[-1]]
-          else:
-            ins_batch = slice_arrays(ins, batch_ids)
-        except TypeError:
-          raise TypeError('TypeError while preparing batch. '
-                          'If using HDF5 input data, '
-                          'pass shuffle="batch".')
+        ins_batch = next(batches_ins)
         batch_logs = {}
         batch_logs['batch'] = batch_index
-        batch_logs['size'] = len(batch_ids)
+        batch_logs['size'] = batch_end - batch_start
         callbacks.on_batch_begin(batch_index, batch_logs)
         for i in indices_for_conversion_to_dense:
           ins_batch[i] = ins_batch[i].toarray()
@@ -285,6 +302,7 @@ def fit_loop(model,
             # Same labels assumed.
             for l, o in zip(out_labels, val_outs):
               epoch_logs['val_' + l] = o
+      batches_ins.close()
     callbacks.on_epoch_end(epoch, epoch_logs)
     if callback_model.stop_training:
       break
@@ -292,7 +310,12 @@ def fit_loop(model,
   return model.history
 
 
-def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
+def predict_loop(model,
+                 inputs,
+                 batch_size=32,
+                 verbose=0,
+                 steps=None,
+                 read_ahead=0):
   """Abstract method to loop over some data in batches.
 
   Arguments:
@@ -303,6 +326,9 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
       steps: Total number of steps (batches of samples)
           before declaring `_predict_loop` finished.
           Ignored with the default value of `None`.
+      read_ahead: Number of batches to slice from the input arrays in
+          advance, on a background thread, while the current batch is
+          being processed.
 
   Returns:
       Array of predictions (if the model has a single output)
@@ -360,14 +386,28 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
     # Sample-based predictions.
     outs = []
     batches = make_batches(num_samples, batch_size)
-    index_array = np.arange(num_samples)
-    for batch_index, (batch_start, batch_end) in enumerate(batches):
-      batch_ids = index_array[batch_start:batch_end]
+
+    def slice_batch(batch):
+      # Batches are contiguous: slice them instead of gathering indices,
+      # which reads memory-mapped inputs sequentially.
+      batch_start, batch_end = batch
       if ins and isinstance(ins[-1], int):
         # Do not slice the training phase flag.
-        ins_batch = slice_arrays(ins[:-1], batch_ids) + [ins[-1]]
+        ins_batch = slice_arrays(ins[:-1], batch_start, batch_end) + [ins[-1]]
       else:
-        ins_batch = slice_arrays(ins, batch_ids)
+        ins_batch = slice_arrays(ins, batch_start, batch_end)
+      if read_ahead:
+        # Slices are views, e.g. of memory-mapped arrays: read them now, on
+        # the background thread.
+        ins_batch = [
+            np.array(x) if isinstance(x, np.ndarray) else x for x in ins_batch
+        ]
+      return ins_batch
+
+    batches_ins = training_utils.iterate_with_read_ahead(
+        slice_batch, batches, read_ahead=read_ahead)
+    for batch_index, (batch_start, batch_end) in enumerate(batches):
+      ins_batch = next(batches_ins)
       for i in indices_for_conversion_to_dense:
         ins_batch[i] = ins_batch[i].toarray()
 
@@ -383,6 +423,7 @@ def predict_loop(model, inputs, batch_size=32, verbose=0, steps=None):
         outs[i][batch_start:batch_end] = batch_out
       if verbose == 1:
         progbar.update(batch_end)
+    batches_ins.close()
     if len(outs) == 1:
       return outs[0]
     return outs
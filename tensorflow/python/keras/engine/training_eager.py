@@ -349,7 +349,8 @@ def batch_fit_loop(model,
       val_targets: Target data for validation.
       val_sample_weights: Sample weight data for validation.
       callbacks: List of callbacks to be called during training.
-      shuffle: Whether to shuffle the data at the beginning of each epoch.
+      shuffle: Whether to shuffle the data at the beginning of each epoch,
+          or 'batch' or 'block' (see `Model.fit`).
       num_train_samples: Integer number of training samples.
       do_validation: Boolean value indicating whether we should do validation.
   """
@@ -357,6 +358,8 @@ def batch_fit_loop(model,
   # here and in batch_test_loop, batch_predict_loop.
   if shuffle == 'batch':
     index_array = model._batch_shuffle(index_array, batch_size)
+  elif shuffle == 'block':
+    index_array = training_utils.block_shuffle(index_array, batch_size)
   elif shuffle:
     np.random.shuffle(index_array)
 
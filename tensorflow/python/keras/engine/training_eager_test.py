@@ -403,6 +403,22 @@ class TrainingTest(test.TestCase):
     model.train_on_batch(inputs, targets)
     model.test_on_batch(inputs, targets)
 
+  def test_block_shuffle_and_read_ahead(self):
+    x = keras.layers.Input(shape=(3,), name='input')
+    y = keras.layers.Dense(4, name='dense')(x)
+    model = keras.Model(x, y)
+    model.compile(RMSPropOptimizer(learning_rate=0.001), 'mse')
+
+    inputs = np.zeros((10, 3))
+    targets = np.zeros((10, 4))
+    model.fit(inputs, targets, epochs=2, batch_size=2, verbose=0,
+              shuffle='block')
+    with self.assertRaisesRegexp(ValueError, 'read_ahead'):
+      model.fit(inputs, targets, epochs=1, batch_size=2, verbose=0,
+                read_ahead=2)
+    with self.assertRaisesRegexp(ValueError, 'read_ahead'):
+      model.predict(inputs, batch_size=2, read_ahead=2)
+
   def test_generator_methods(self):
     model = keras.Sequential()
     model.add(keras.layers.Dense(4, input_shape=(3,)))
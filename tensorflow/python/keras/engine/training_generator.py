@@ -153,6 +153,9 @@ def fit_generator(model,
             wait_time=wait_time)
       enqueuer.start(workers=workers, max_queue_size=max_queue_size)
       output_generator = enqueuer.get()
+      for cbk in callbacks:
+        if isinstance(cbk, cbks.EnqueuerMonitor):
+          cbk.set_enqueuer(enqueuer)
     else:
       if is_sequence:
         output_generator = iter(generator)
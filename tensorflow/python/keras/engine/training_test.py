@@ -321,6 +321,28 @@ class TrainingTest(test.TestCase):
       })
       self.assertEqual(len(out), 2)
 
+  def test_fit_predict_on_memmap_arrays(self):
+    temp_dir = self.get_temp_dir()
+    with self.test_session():
+      model = keras.models.Sequential()
+      model.add(keras.layers.Dense(4, input_shape=(3,)))
+      model.compile('rmsprop', 'mse')
+
+      x = np.memmap(os.path.join(temp_dir, 'x.dat'), dtype='float32',
+                    mode='w+', shape=(100, 3))
+      x[:] = np.random.random((100, 3))
+      y = np.random.random((100, 4))
+
+      model.fit(x, y, batch_size=8, epochs=2, shuffle='block', read_ahead=2,
+                verbose=0)
+      model.fit(x, y, batch_size=8, epochs=1, shuffle=True, read_ahead=1,
+                verbose=0)
+
+      ref_out = model.predict(np.array(x), batch_size=8)
+      out = model.predict(x, batch_size=8, read_ahead=3)
+      self.assertAllClose(out, ref_out)
+      del x
+
   def test_invalid_loss_or_metrics(self):
     num_classes = 5
     train_samples = 1000
@@ -1117,6 +1139,36 @@ class TestTrainingUtils(test.TestCase):
     with self.assertRaises(ValueError):
       keras.engine.training_utils.check_array_lengths([a_np], [b_np], None)
 
+  def test_block_shuffle(self):
+    for num_samples in [0, 7, 100, 1037]:
+      for batch_size in [1, 4, 32]:
+        index_array = keras.engine.training_utils.block_shuffle(
+            np.arange(num_samples), batch_size, block_batches=4)
+        self.assertAllEqual(np.sort(index_array), np.arange(num_samples))
+        for start in range(0, num_samples, batch_size):
+          batch = index_array[start:start + batch_size]
+          # Sorted, and drawn from a single block.
+          self.assertTrue(np.all(np.diff(batch) >= 0))
+          self.assertLess(batch[-1] - batch[0], 4 * batch_size)
+
+  def test_iterate_with_read_ahead(self):
+    for read_ahead in [0, 1, 3]:
+      results = keras.engine.training_utils.iterate_with_read_ahead(
+          lambda x: x * 2, range(10), read_ahead=read_ahead)
+      self.assertEqual(list(results), list(range(0, 20, 2)))
+
+    def fail_on_five(x):
+      if x == 5:
+        raise KeyError(x)
+      return x
+
+    results = keras.engine.training_utils.iterate_with_read_ahead(
+        fail_on_five, range(10), read_ahead=2)
+    for i in range(5):
+      self.assertEqual(next(results), i)
+    with self.assertRaises(KeyError):
+      next(results)
+
   def test_slice_arrays(self):
     input_a = np.random.random((10, 3))
     slice_arrays(input_a, 0)
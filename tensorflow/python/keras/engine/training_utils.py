@@ -18,7 +18,10 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 import copy
+import itertools
+from multiprocessing.pool import ThreadPool
 
 import numpy as np
 
@@ -404,6 +407,79 @@ def batch_shuffle(index_array, batch_size):
   return np.append(index_array, last_batch)
 
 
+def block_shuffle(index_array, batch_size, block_batches=16):
+  """Shuffles an array in a block-wise fashion, preserving read locality.
+
+  The array is split in blocks of `block_batches` batches, the order of
+  the blocks is shuffled, samples are shuffled within each block, and the
+  indices within each batch are sorted. Every batch hence reads a few
+  increasing offsets of one contiguous region of the data, which keeps
+  reads from memory-mapped (`np.memmap`) arrays close to sequential.
+  The last block may be incomplete, and stays last.
+
+  Arguments:
+      index_array: array of indices to be shuffled.
+      batch_size: integer.
+      block_batches: integer, number of batches per block.
+
+  Returns:
+      The `index_array` array, shuffled in a block-wise fashion.
+  """
+  block_size = batch_size * block_batches
+  num_full_blocks = len(index_array) // block_size
+  blocks = [
+      index_array[i * block_size:(i + 1) * block_size]
+      for i in np.random.permutation(num_full_blocks)
+  ]
+  last_block = index_array[num_full_blocks * block_size:]
+  if len(last_block):
+    blocks.append(last_block)
+  shuffled = []
+  for block in blocks:
+    block = np.random.permutation(block)
+    num_full_batches = len(block) // batch_size
+    head = block[:num_full_batches * batch_size].reshape((-1, batch_size))
+    shuffled.append(np.sort(head, axis=1).ravel())
+    shuffled.append(np.sort(block[num_full_batches * batch_size:]))
+  if not shuffled:
+    return index_array
+  return np.concatenate(shuffled)
+
+
+def iterate_with_read_ahead(fn, items, read_ahead=0):
+  """Yields `fn(item)` for each item, computing results ahead of time.
+
+  Arguments:
+      fn: function to apply to each item, e.g. one slicing a batch of input
+          arrays.
+      items: iterable of arguments of `fn`.
+      read_ahead: integer, number of results to compute in advance on a
+          background thread, while the caller processes the current one.
+          If 0, results are computed on demand in the calling thread.
+
+  Yields:
+      `fn(item)` for each item of `items`, in order. Exceptions raised by
+      `fn` are raised when the corresponding result is due.
+  """
+  if not read_ahead:
+    for item in items:
+      yield fn(item)
+    return
+  pool = ThreadPool(1)
+  try:
+    items = iter(items)
+    pending = collections.deque(
+        pool.apply_async(fn, (item,))
+        for item in itertools.islice(items, read_ahead))
+    while pending:
+      result = pending.popleft().get()
+      for item in itertools.islice(items, 1):
+        pending.append(pool.apply_async(fn, (item,)))
+      yield result
+  finally:
+    pool.terminate()
+
+
 def weighted_masked_objective(fn):
   """Adds support for masking and sample-weighting to an objective function.
 
@@ -22,7 +22,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
-from functools import partial
+import collections
+import hashlib
 import multiprocessing.pool
 import os
 import re
@@ -227,11 +228,19 @@ def random_channel_shift(x, intensity, channel_axis=0):
   Returns:
       Numpy image tensor.
   """
+  num_channels = x.shape[channel_axis]
+  shifts = [np.random.uniform(-intensity, intensity)
+            for _ in range(num_channels)]
+  return _apply_channel_shift(x, shifts, channel_axis)
+
+
+def _apply_channel_shift(x, shifts, channel_axis=0):
+  """Adds one shift per channel, clipping to the input's value range."""
   x = np.rollaxis(x, channel_axis, 0)
   min_x, max_x = np.min(x), np.max(x)
   channel_images = [
-      np.clip(x_channel + np.random.uniform(-intensity, intensity), min_x,
-              max_x) for x_channel in x
+      np.clip(x_channel + shift, min_x, max_x)
+      for x_channel, shift in zip(x, shifts)
   ]
   x = np.stack(channel_images, axis=0)
   x = np.rollaxis(x, 0, channel_axis + 1)
@@ -256,10 +265,15 @@ def random_brightness(x, brightness_range):
     raise ValueError('`brightness_range should be tuple or list of two floats. '
                      'Received arg: ', brightness_range)
 
+  u = np.random.uniform(brightness_range[0], brightness_range[1])
+  return _apply_brightness(x, u)
+
+
+def _apply_brightness(x, brightness):
+  """Adjusts the brightness of a 3D Numpy image tensor by a fixed factor."""
   x = array_to_img(x)
   x = ImageEnhance.Brightness(x)
-  u = np.random.uniform(brightness_range[0], brightness_range[1])
-  x = x.enhance(u)
+  x = x.enhance(brightness)
   x = img_to_array(x)
   return x
 
@@ -311,6 +325,105 @@ def apply_transform(x,
   return x
 
 
+def _map_fill_indices(indices, size, fill_mode):
+  """Maps out-of-range pixel indices back into `[0, size)` for `fill_mode`."""
+  if fill_mode == 'reflect':
+    indices = np.mod(indices, 2 * size)
+    return np.where(indices >= size, 2 * size - 1 - indices, indices)
+  # 'nearest', and 'constant' whose outside points are overwritten later.
+  return np.clip(indices, 0, size - 1)
+
+
+def apply_transform_batch(x,
+                          transform_matrices,
+                          channel_axis=3,
+                          fill_mode='nearest',
+                          cval=0.):
+  """Apply one image transformation matrix to each image of a batch.
+
+  Vectorized counterpart of calling `apply_transform` on every image: all
+  images are resampled at once with bilinear interpolation (same as the
+  `order=1` spline of `apply_transform`), instead of one scipy call per
+  image and channel. With `fill_mode='wrap'` the images are still transformed
+  one at a time by `apply_transform`, because scipy's 'wrap' mode does not
+  simply tile the image and is not reproduced here.
+
+  Arguments:
+      x: 4D numpy array, batch of images.
+      transform_matrices: Numpy array of shape `(batch_size, 3, 3)`, one
+          geometric transformation per image.
+      channel_axis: Index of axis for channels in the input tensor
+          (1 or 3).
+      fill_mode: Points outside the boundaries of the input
+          are filled according to the given mode
+          (one of `{'constant', 'nearest', 'reflect', 'wrap'}`).
+      cval: Value used for points outside the boundaries
+          of the input if `mode='constant'`.
+
+  Returns:
+      The transformed version of the input batch.
+
+  Raises:
+      ValueError: if `fill_mode` is not supported.
+  """
+  if fill_mode not in {'constant', 'nearest', 'reflect', 'wrap'}:
+    raise ValueError('Invalid fill_mode:', fill_mode,
+                     '; expected one of "constant", "nearest", "reflect" '
+                     'or "wrap".')
+  if not np.issubdtype(x.dtype, np.floating):
+    x = x.astype(K.floatx())
+  if fill_mode == 'wrap':
+    return np.stack([
+        apply_transform(image, matrix, channel_axis - 1, fill_mode, cval)
+        for image, matrix in zip(x, transform_matrices)
+    ])
+  # Work on a channels-last batch.
+  x = np.moveaxis(x, channel_axis, 3)
+  n, h, w, channels = x.shape
+  transform_matrices = np.asarray(transform_matrices, dtype=np.float64)
+
+  # Input coordinates sampled by every output pixel, shape `(n, h, w)`.
+  rows = np.arange(h, dtype=np.float64).reshape(1, h, 1)
+  cols = np.arange(w, dtype=np.float64).reshape(1, 1, w)
+  m = transform_matrices.reshape(n, 9, 1, 1)
+  in_rows = m[:, 0] * rows + m[:, 1] * cols + m[:, 2]
+  in_cols = m[:, 3] * rows + m[:, 4] * cols + m[:, 5]
+
+  row0 = np.floor(in_rows)
+  col0 = np.floor(in_cols)
+  row_weight = (in_rows - row0).astype(x.dtype)[..., np.newaxis]
+  col_weight = (in_cols - col0).astype(x.dtype)[..., np.newaxis]
+  index_dtype = np.int32 if n * h * w < 2**31 else np.int64
+  row0 = row0.astype(index_dtype)
+  col0 = col0.astype(index_dtype)
+
+  # Gather the four neighbours of every sample from the flattened batch.
+  # Each pixel is viewed as one opaque item so a gather copies all of its
+  # channels at once.
+  pixels = np.ascontiguousarray(x).reshape(n * h * w, channels)
+  pixels = pixels.view(np.dtype((np.void, channels * x.itemsize))).ravel()
+  offsets = (np.arange(n, dtype=index_dtype) * h * w).reshape(n, 1, 1)
+  top = _map_fill_indices(row0, h, fill_mode) * w + offsets
+  bottom = _map_fill_indices(row0 + 1, h, fill_mode) * w + offsets
+  left = _map_fill_indices(col0, w, fill_mode)
+  right = _map_fill_indices(col0 + 1, w, fill_mode)
+
+  def gather(indices):
+    return pixels.take(indices).view(x.dtype).reshape((n, h, w, channels))
+
+  upper = gather(top + left)
+  upper += col_weight * (gather(top + right) - upper)
+  lower = gather(bottom + left)
+  lower += col_weight * (gather(bottom + right) - lower)
+  upper += row_weight * (lower - upper)
+
+  if fill_mode == 'constant':
+    outside = ((in_rows < 0) | (in_rows > h - 1) |
+               (in_cols < 0) | (in_cols > w - 1))
+    upper[outside] = cval
+  return np.moveaxis(upper, 3, channel_axis)
+
+
 @tf_export('keras.preprocessing.image.flip_axis')
 def flip_axis(x, axis):
   x = np.asarray(x).swapaxes(axis, 0)
@@ -517,6 +630,11 @@ class ImageDataGenerator(object):
           If you never set it, then it will be "channels_last".
       validation_split: float, fraction of images reserved for validation
           (strictly between 0 and 1).
+      batch_augmentation: boolean, whether the iterators returned by `flow`
+          and `flow_from_directory` augment each batch with a single
+          `random_transform_batch` call instead of calling `random_transform`
+          image by image. Both draw the same random parameters for a given
+          seed.
 
   Examples:
       Example of using `.flow(x, y)`:
@@ -627,7 +745,8 @@ class ImageDataGenerator(object):
                rescale=None,
                preprocessing_function=None,
                data_format=None,
-               validation_split=0.0):
+               validation_split=0.0,
+               batch_augmentation=False):
     if data_format is None:
       data_format = K.image_data_format()
     self.featurewise_center = featurewise_center
@@ -649,6 +768,7 @@ class ImageDataGenerator(object):
     self.vertical_flip = vertical_flip
     self.rescale = rescale
     self.preprocessing_function = preprocessing_function
+    self.batch_augmentation = batch_augmentation
 
     if data_format not in {'channels_last', 'channels_first'}:
       raise ValueError(
@@ -770,7 +890,10 @@ class ImageDataGenerator(object):
                           save_format='png',
                           follow_links=False,
                           subset=None,
-                          interpolation='nearest'):
+                          interpolation='nearest',
+                          decode_workers=1,
+                          cache=None,
+                          cache_max_bytes=None):
     """Generates batches of augmented/normalized data given directory path.
 
     Arguments:
@@ -823,6 +946,15 @@ class ImageDataGenerator(object):
             If PIL version 1.1.3 or newer is installed, `"lanczos"` is also
             supported. If PIL version 3.4.0 or newer is installed, `"box"` and
             `"hamming"` are also supported. By default, `"nearest"` is used.
+        decode_workers: number of threads loading and resizing the images
+            of a batch in parallel (default: 1).
+        cache: optional cache of the decoded and resized images: `"memory"`
+            for an in-memory cache (private to each process), or the path
+            of a directory for an on-disk cache that persists across runs
+            and processes. Epochs after the first skip image decoding.
+        cache_max_bytes: optional bound on the size of `cache`, in bytes,
+            enforced separately by each process. Temporary `*.tmp` files
+            left in an on-disk cache by killed workers are not removed.
 
     Returns:
         A DirectoryIterator yielding tuples of `(x, y)` where `x` is a
@@ -846,7 +978,10 @@ class ImageDataGenerator(object):
         save_format=save_format,
         follow_links=follow_links,
         subset=subset,
-        interpolation=interpolation)
+        interpolation=interpolation,
+        decode_workers=decode_workers,
+        cache=cache,
+        cache_max_bytes=cache_max_bytes)
 
   def standardize(self, x):
     """Apply the normalization configuration to a batch of inputs.
@@ -894,29 +1029,21 @@ class ImageDataGenerator(object):
                         'first by calling `.fit(numpy_data)`.')
     return x
 
-  def random_transform(self, x, seed=None):
-    """Randomly augment a single image tensor.
+  def _get_random_transform(self, img_shape):
+    """Draws the random parameters of the augmentation of one image.
 
     Arguments:
-        x: 3D tensor, single image.
-        seed: random seed.
+        img_shape: shape of the image, without the batch axis.
 
     Returns:
-        A randomly transformed version of the input (same shape).
-
-    Raises:
-        ImportError: if Scipy is not available.
+        A dict of transformation parameters. The draws are made in the
+        order `random_transform` has always made them, so the same seed
+        yields the same augmentation.
     """
-    if ndi is None:
-      raise ImportError('Scipy is required for image transformations.')
-    # x is a single image, so it doesn't have image number at index 0
     img_row_axis = self.row_axis - 1
     img_col_axis = self.col_axis - 1
     img_channel_axis = self.channel_axis - 1
 
-    if seed is not None:
-      np.random.seed(seed)
-
     # use composition of homographies
     # to generate final transform that needs to be applied
     if self.rotation_range:
@@ -933,7 +1060,7 @@ class ImageDataGenerator(object):
         tx = np.random.uniform(-self.height_shift_range,
                                self.height_shift_range)
       if np.max(self.height_shift_range) < 1:
-        tx *= x.shape[img_row_axis]
+        tx *= img_shape[img_row_axis]
     else:
       tx = 0
 
@@ -944,7 +1071,7 @@ class ImageDataGenerator(object):
       except ValueError:  # floating point
         ty = np.random.uniform(-self.width_shift_range, self.width_shift_range)
       if np.max(self.width_shift_range) < 1:
-        ty *= x.shape[img_col_axis]
+        ty *= img_shape[img_col_axis]
     else:
       ty = 0
 
@@ -958,6 +1085,42 @@ class ImageDataGenerator(object):
     else:
       zx, zy = np.random.uniform(self.zoom_range[0], self.zoom_range[1], 2)
 
+    channel_shifts = None
+    if self.channel_shift_range != 0:
+      channel_shifts = [
+          np.random.uniform(-self.channel_shift_range, self.channel_shift_range)
+          for _ in range(img_shape[img_channel_axis])
+      ]
+
+    flip_horizontal = self.horizontal_flip and np.random.random() < 0.5
+    flip_vertical = self.vertical_flip and np.random.random() < 0.5
+
+    brightness = None
+    if self.brightness_range is not None:
+      if len(self.brightness_range) != 2:
+        raise ValueError('`brightness_range should be tuple or list of two '
+                         'floats. Received arg: ', self.brightness_range)
+      brightness = np.random.uniform(self.brightness_range[0],
+                                     self.brightness_range[1])
+
+    return {
+        'theta': theta,
+        'tx': tx,
+        'ty': ty,
+        'shear': shear,
+        'zx': zx,
+        'zy': zy,
+        'channel_shifts': channel_shifts,
+        'flip_horizontal': flip_horizontal,
+        'flip_vertical': flip_vertical,
+        'brightness': brightness,
+    }
+
+  def _get_transform_matrix(self, params, img_shape):
+    """Builds the affine matrix of `params`, or None for the identity."""
+    theta, tx, ty = params['theta'], params['tx'], params['ty']
+    shear, zx, zy = params['shear'], params['zx'], params['zy']
+
     transform_matrix = None
     if theta != 0:
       rotation_matrix = np.array([[np.cos(theta), -np.sin(theta), 0],
@@ -982,8 +1145,37 @@ class ImageDataGenerator(object):
           transform_matrix, zoom_matrix)
 
     if transform_matrix is not None:
-      h, w = x.shape[img_row_axis], x.shape[img_col_axis]
+      h = img_shape[self.row_axis - 1]
+      w = img_shape[self.col_axis - 1]
       transform_matrix = transform_matrix_offset_center(transform_matrix, h, w)
+    return transform_matrix
+
+  def random_transform(self, x, seed=None):
+    """Randomly augment a single image tensor.
+
+    Arguments:
+        x: 3D tensor, single image.
+        seed: random seed.
+
+    Returns:
+        A randomly transformed version of the input (same shape).
+
+    Raises:
+        ImportError: if Scipy is not available.
+    """
+    if ndi is None:
+      raise ImportError('Scipy is required for image transformations.')
+    # x is a single image, so it doesn't have image number at index 0
+    img_row_axis = self.row_axis - 1
+    img_col_axis = self.col_axis - 1
+    img_channel_axis = self.channel_axis - 1
+
+    if seed is not None:
+      np.random.seed(seed)
+
+    params = self._get_random_transform(x.shape)
+    transform_matrix = self._get_transform_matrix(params, x.shape)
+    if transform_matrix is not None:
       x = apply_transform(
           x,
           transform_matrix,
@@ -991,18 +1183,68 @@ class ImageDataGenerator(object):
           fill_mode=self.fill_mode,
           cval=self.cval)
 
-    if self.channel_shift_range != 0:
-      x = random_channel_shift(x, self.channel_shift_range, img_channel_axis)
-    if self.horizontal_flip:
-      if np.random.random() < 0.5:
-        x = flip_axis(x, img_col_axis)
+    if params['channel_shifts'] is not None:
+      x = _apply_channel_shift(x, params['channel_shifts'], img_channel_axis)
+    if params['flip_horizontal']:
+      x = flip_axis(x, img_col_axis)
 
-    if self.vertical_flip:
-      if np.random.random() < 0.5:
-        x = flip_axis(x, img_row_axis)
+    if params['flip_vertical']:
+      x = flip_axis(x, img_row_axis)
+
+    if params['brightness'] is not None:
+      x = _apply_brightness(x, params['brightness'])
+
+    return x
+
+  def random_transform_batch(self, x, seed=None):
+    """Randomly augment a batch of image tensors.
+
+    Draws the parameters of every image exactly like successive calls to
+    `random_transform` would, then applies them to the whole batch at once
+    with `apply_transform_batch` and vectorized channel shifts and flips.
+
+    Arguments:
+        x: 4D tensor, batch of images.
+        seed: random seed.
+
+    Returns:
+        A randomly transformed version of the input (same shape).
+    """
+    if seed is not None:
+      np.random.seed(seed)
+    x = np.array(x, dtype=K.floatx())
+    img_shape = x.shape[1:]
+    params = [self._get_random_transform(img_shape) for _ in range(len(x))]
+
+    matrices = [self._get_transform_matrix(p, img_shape) for p in params]
+    transformed = [i for i, m in enumerate(matrices) if m is not None]
+    if transformed:
+      x[transformed] = apply_transform_batch(
+          x[transformed],
+          np.stack([matrices[i] for i in transformed]),
+          self.channel_axis,
+          fill_mode=self.fill_mode,
+          cval=self.cval)
+
+    if self.channel_shift_range != 0:
+      broadcast_shape = [len(x), 1, 1, 1]
+      broadcast_shape[self.channel_axis] = x.shape[self.channel_axis]
+      shifts = np.reshape([p['channel_shifts'] for p in params],
+                          broadcast_shape)
+      min_x = np.min(x, axis=(1, 2, 3), keepdims=True)
+      max_x = np.max(x, axis=(1, 2, 3), keepdims=True)
+      x = np.clip(x + shifts, min_x, max_x).astype(K.floatx())
+
+    flip_horizontal = np.array([p['flip_horizontal'] for p in params])
+    if flip_horizontal.any():
+      x[flip_horizontal] = flip_axis(x[flip_horizontal], self.col_axis)
+    flip_vertical = np.array([p['flip_vertical'] for p in params])
+    if flip_vertical.any():
+      x[flip_vertical] = flip_axis(x[flip_vertical], self.row_axis)
 
     if self.brightness_range is not None:
-      x = random_brightness(x, self.brightness_range)
+      for i, p in enumerate(params):
+        x[i] = _apply_brightness(x[i], p['brightness'])
 
     return x
 
@@ -1251,13 +1493,20 @@ class NumpyArrayIterator(Iterator):
                                              seed)
 
   def _get_batches_of_transformed_samples(self, index_array):
-    batch_x = np.zeros(
-        tuple([len(index_array)] + list(self.x.shape)[1:]), dtype=K.floatx())
-    for i, j in enumerate(index_array):
-      x = self.x[j]
-      x = self.image_data_generator.random_transform(x.astype(K.floatx()))
-      x = self.image_data_generator.standardize(x)
-      batch_x[i] = x
+    if self.image_data_generator.batch_augmentation:
+      batch_x = self.image_data_generator.random_transform_batch(
+          self.x[index_array])
+      for i in range(len(batch_x)):
+        batch_x[i] = self.image_data_generator.standardize(batch_x[i])
+    else:
+      batch_x = np.zeros(
+          tuple([len(index_array)] + list(self.x.shape)[1:]),
+          dtype=K.floatx())
+      for i, j in enumerate(index_array):
+        x = self.x[j]
+        x = self.image_data_generator.random_transform(x.astype(K.floatx()))
+        x = self.image_data_generator.standardize(x)
+        batch_x[i] = x
     if self.save_to_dir:
       for i, j in enumerate(index_array):
         img = array_to_img(batch_x[i], self.data_format, scale=True)
@@ -1307,41 +1556,13 @@ def _iter_valid_files(directory, white_list_formats, follow_links):
 
   for root, _, files in _recursive_list(directory):
     for fname in sorted(files):
-      for extension in white_list_formats:
-        if fname.lower().endswith('.tiff'):
-          logging.warning(
-              'Using \'.tiff\' files with multiple bands will cause '
-              'distortion. Please verify your output.')
-        if fname.lower().endswith('.' + extension):
-          yield root, fname
-
-
-def _count_valid_files_in_directory(directory, white_list_formats, split,
-                                    follow_links):
-  """Count files with extension in `white_list_formats` contained in directory.
-
-  Arguments:
-      directory: absolute path to the directory
-          containing files to be counted
-      white_list_formats: set of strings containing allowed extensions for
-          the files to be counted.
-      split: tuple of floats (e.g. `(0.2, 0.6)`) to only take into
-          account a certain fraction of files in each directory.
-          E.g.: `segment=(0.6, 1.0)` would only account for last 40 percent
-          of images in each directory.
-      follow_links: boolean.
-
-  Returns:
-      the count of files with extension in `white_list_formats` contained in
-      the directory.
-  """
-  num_files = len(
-      list(_iter_valid_files(directory, white_list_formats, follow_links)))
-  if split:
-    start, stop = int(split[0] * num_files), int(split[1] * num_files)
-  else:
-    start, stop = 0, num_files
-  return stop - start
+      extension = os.path.splitext(fname)[1][1:].lower()
+      if extension == 'tiff':
+        logging.warning(
+            'Using \'.tiff\' files with multiple bands will cause '
+            'distortion. Please verify your output.')
+      if extension in white_list_formats:
+        yield root, fname
 
 
 def _list_valid_filenames_in_directory(directory, white_list_formats, split,
@@ -1369,12 +1590,11 @@ def _list_valid_filenames_in_directory(directory, white_list_formats, split,
   """
   dirname = os.path.basename(directory)
   if split:
-    num_files = len(
-        list(_iter_valid_files(directory, white_list_formats, follow_links)))
-    start, stop = int(split[0] * num_files), int(split[1] * num_files)
     valid_files = list(
-        _iter_valid_files(directory, white_list_formats,
-                          follow_links))[start:stop]
+        _iter_valid_files(directory, white_list_formats, follow_links))
+    num_files = len(valid_files)
+    start, stop = int(split[0] * num_files), int(split[1] * num_files)
+    valid_files = valid_files[start:stop]
   else:
     valid_files = _iter_valid_files(directory, white_list_formats, follow_links)
 
@@ -1390,6 +1610,110 @@ def _list_valid_filenames_in_directory(directory, white_list_formats, split,
   return classes, filenames
 
 
+class _DecodedImageCache(object):
+  """Bounded LRU cache of decoded and resized `uint8` images.
+
+  Entries are keyed by `(path, target_size, interpolation, color_mode)`.
+  The in-memory cache is private to the process using it; the on-disk
+  cache stores one `.npy` file per image, is reused across runs and can be
+  shared by the worker processes of `use_multiprocessing=True`.
+
+  Arguments:
+      cache: `'memory'` for an in-memory cache, otherwise the path of the
+          directory holding the on-disk cache.
+      max_bytes: optional bound on the total size of the cached arrays.
+          Least recently used entries are evicted first. The bound is
+          enforced by each process on the entries it has seen, so a shared
+          on-disk cache can grow past it. Temporary `*.tmp` files left by
+          killed writers are not removed.
+  """
+
+  def __init__(self, cache, max_bytes=None):
+    self.max_bytes = max_bytes
+    self.cache_dir = None if cache == 'memory' else cache
+    self._lock = threading.Lock()
+    # Maps a key to its array (in memory) or its file size (on disk).
+    self._entries = collections.OrderedDict()
+    self._num_bytes = 0
+    if self.cache_dir is not None:
+      if not os.path.isdir(self.cache_dir):
+        os.makedirs(self.cache_dir)
+      # Pick up the entries left by previous runs, oldest first.
+      filenames = [f for f in os.listdir(self.cache_dir) if f.endswith('.npy')]
+      paths = sorted((os.path.join(self.cache_dir, f) for f in filenames),
+                     key=os.path.getmtime)
+      for path in paths:
+        size = os.path.getsize(path)
+        self._entries[os.path.basename(path)[:-4]] = size
+        self._num_bytes += size
+      self._evict()
+
+  def _filename(self, key):
+    return hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+
+  def _evict(self):
+    while (self.max_bytes is not None and self._num_bytes > self.max_bytes and
+           self._entries):
+      name, value = self._entries.popitem(last=False)
+      if self.cache_dir is None:
+        self._num_bytes -= value.nbytes
+      else:
+        self._num_bytes -= value
+        try:
+          os.remove(os.path.join(self.cache_dir, name + '.npy'))
+        except OSError:
+          pass
+
+  def get(self, key):
+    """Returns the cached array for `key`, or None."""
+    if self.cache_dir is None:
+      with self._lock:
+        value = self._entries.pop(key, None)
+        if value is not None:
+          self._entries[key] = value
+        return value
+    name = self._filename(key)
+    try:
+      value = np.load(os.path.join(self.cache_dir, name + '.npy'))
+    except (IOError, OSError, ValueError):
+      # Missing, evicted by another process or partially written.
+      return None
+    with self._lock:
+      if name in self._entries:
+        self._entries[name] = self._entries.pop(name)
+      else:
+        # Written by another process sharing the directory.
+        self._entries[name] = value.nbytes
+        self._num_bytes += value.nbytes
+        self._evict()
+    return value
+
+  def put(self, key, value):
+    """Caches the array `value` under `key`."""
+    if self.max_bytes is not None and value.nbytes > self.max_bytes:
+      return
+    if self.cache_dir is None:
+      with self._lock:
+        if key not in self._entries:
+          self._entries[key] = value
+          self._num_bytes += value.nbytes
+          self._evict()
+      return
+    name = self._filename(key)
+    path = os.path.join(self.cache_dir, name + '.npy')
+    # Write then rename so readers never see a partial file.
+    tmp_path = '%s.%d.%d.tmp' % (path, os.getpid(),
+                                 threading.current_thread().ident)
+    with open(tmp_path, 'wb') as f:
+      np.save(f, value)
+    os.rename(tmp_path, path)
+    with self._lock:
+      if name not in self._entries:
+        self._entries[name] = os.path.getsize(path)
+        self._num_bytes += self._entries[name]
+        self._evict()
+
+
 @tf_export('keras.preprocessing.image.DirectoryIterator')
 class DirectoryIterator(Iterator):
   """Iterator capable of reading images from a directory on disk.
@@ -1434,6 +1758,17 @@ class DirectoryIterator(Iterator):
           If PIL version 1.1.3 or newer is installed, "lanczos" is also
           supported. If PIL version 3.4.0 or newer is installed, "box" and
           "hamming" are also supported. By default, "nearest" is used.
+      decode_workers: Integer, number of threads loading and resizing the
+          images of a batch in parallel (PIL releases the GIL while
+          decoding). Default: 1.
+      cache: Optional cache of the decoded and resized images, so that only
+          the first epoch pays for decoding: `"memory"` for an in-memory
+          cache (private to each process), or the path of a directory for
+          an on-disk cache that persists across runs and processes.
+      cache_max_bytes: Optional bound on the size of `cache`, in bytes.
+          Least recently used images are evicted first. The bound is
+          enforced separately by each process, and temporary `*.tmp` files
+          left in an on-disk cache by killed workers are not removed.
   """
 
   def __init__(self,
@@ -1452,7 +1787,10 @@ class DirectoryIterator(Iterator):
                save_format='png',
                follow_links=False,
                subset=None,
-               interpolation='nearest'):
+               interpolation='nearest',
+               decode_workers=1,
+               cache=None,
+               cache_max_bytes=None):
     if data_format is None:
       data_format = K.image_data_format()
     self.directory = directory
@@ -1484,6 +1822,13 @@ class DirectoryIterator(Iterator):
     self.save_prefix = save_prefix
     self.save_format = save_format
     self.interpolation = interpolation
+    self.decode_workers = decode_workers
+    self._decode_pool = None
+    self._decode_pool_pid = None
+    if cache is not None:
+      self.cache = _DecodedImageCache(cache, cache_max_bytes)
+    else:
+      self.cache = None
 
     if subset is not None:
       validation_split = self.image_data_generator.validation_split
@@ -1500,9 +1845,6 @@ class DirectoryIterator(Iterator):
 
     white_list_formats = {'png', 'jpg', 'jpeg', 'bmp', 'ppm', 'tif', 'tiff'}
 
-    # first, count the number of samples and classes
-    self.samples = 0
-
     if not classes:
       classes = []
       for subdir in sorted(os.listdir(directory)):
@@ -1511,56 +1853,81 @@ class DirectoryIterator(Iterator):
     self.num_classes = len(classes)
     self.class_indices = dict(zip(classes, range(len(classes))))
 
+    # build an index of the images in the different class subfolders, walking
+    # each of them once
     pool = multiprocessing.pool.ThreadPool()
-    function_partial = partial(
-        _count_valid_files_in_directory,
-        white_list_formats=white_list_formats,
-        follow_links=follow_links,
-        split=split)
-    self.samples = sum(
-        pool.map(function_partial,
-                 (os.path.join(directory, subdir) for subdir in classes)))
-
-    print('Found %d images belonging to %d classes.' % (self.samples,
-                                                        self.num_classes))
-
-    # second, build an index of the images in the different class subfolders
     results = []
-
-    self.filenames = []
-    self.classes = np.zeros((self.samples,), dtype='int32')
-    i = 0
     for dirpath in (os.path.join(directory, subdir) for subdir in classes):
       results.append(
           pool.apply_async(_list_valid_filenames_in_directory,
                            (dirpath, white_list_formats, split,
                             self.class_indices, follow_links)))
+    all_classes = []
+    self.filenames = []
     for res in results:
       classes, filenames = res.get()
-      self.classes[i:i + len(classes)] = classes
+      all_classes += classes
       self.filenames += filenames
-      i += len(classes)
+    self.classes = np.array(all_classes, dtype='int32')
+    self.samples = len(self.filenames)
 
     pool.close()
     pool.join()
+
+    print('Found %d images belonging to %d classes.' % (self.samples,
+                                                        self.num_classes))
     super(DirectoryIterator, self).__init__(self.samples, batch_size, shuffle,
                                             seed)
 
+  def _load_image(self, j):
+    """Loads image `j` as a `uint8` array, going through the cache if any."""
+    path = os.path.join(self.directory, self.filenames[j])
+    key = (path, self.target_size, self.interpolation, self.color_mode)
+    if self.cache is not None:
+      x = self.cache.get(key)
+      if x is not None:
+        return x
+    img = load_img(
+        path,
+        grayscale=self.color_mode == 'grayscale',
+        target_size=self.target_size,
+        interpolation=self.interpolation)
+    x = np.asarray(img, dtype=np.uint8)
+    if self.cache is not None:
+      self.cache.put(key, x)
+    return x
+
+  def _load_images(self, index_array):
+    """Loads the images of a batch, in parallel if `decode_workers > 1`."""
+    if self.decode_workers <= 1:
+      return [self._load_image(j) for j in index_array]
+    # Pools do not survive a fork: each worker process makes its own.
+    if self._decode_pool is None or self._decode_pool_pid != os.getpid():
+      self._decode_pool = multiprocessing.pool.ThreadPool(self.decode_workers)
+      self._decode_pool_pid = os.getpid()
+    return self._decode_pool.map(self._load_image, index_array)
+
+  def __del__(self):
+    # Let the threads of the decode pool exit. The pool is not joined, since
+    # the last reference to the iterator may be dropped by one of them.
+    pool = getattr(self, '_decode_pool', None)
+    if pool is not None and self._decode_pool_pid == os.getpid():
+      pool.close()
+
   def _get_batches_of_transformed_samples(self, index_array):
     batch_x = np.zeros((len(index_array),) + self.image_shape, dtype=K.floatx())
-    grayscale = self.color_mode == 'grayscale'
+    batch_augmentation = self.image_data_generator.batch_augmentation
     # build batch of image data
-    for i, j in enumerate(index_array):
-      fname = self.filenames[j]
-      img = load_img(
-          os.path.join(self.directory, fname),
-          grayscale=grayscale,
-          target_size=self.target_size,
-          interpolation=self.interpolation)
+    for i, img in enumerate(self._load_images(index_array)):
       x = img_to_array(img, data_format=self.data_format)
-      x = self.image_data_generator.random_transform(x)
-      x = self.image_data_generator.standardize(x)
+      if not batch_augmentation:
+        x = self.image_data_generator.random_transform(x)
+        x = self.image_data_generator.standardize(x)
       batch_x[i] = x
+    if batch_augmentation:
+      batch_x = self.image_data_generator.random_transform_batch(batch_x)
+      for i in range(len(batch_x)):
+        batch_x[i] = self.image_data_generator.standardize(batch_x[i])
     # optionally save augmented images to disk for debugging purposes
     if self.save_to_dir:
       for i, j in enumerate(index_array):
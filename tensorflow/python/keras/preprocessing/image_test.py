@@ -18,6 +18,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import gc
+import multiprocessing.pool
 import os
 import shutil
 import tempfile
@@ -278,6 +280,48 @@ class TestImage(test.TestCase):
     x1, y1 = dir_seq[5]
     self.assertTrue((x1 == 0).all())
 
+  def test_directory_iterator_decode_workers_and_cache(self):
+    if PIL is None:
+      return  # Skip test if PIL is not available.
+
+    temp_dir = tempfile.mkdtemp(prefix='test_images')
+    self.addCleanup(shutil.rmtree, temp_dir)
+    for cl in range(2):
+      os.mkdir(os.path.join(temp_dir, 'class-{}'.format(cl)))
+    count = 0
+    for test_images in _generate_test_images():
+      for im in test_images:
+        im.save(os.path.join(temp_dir, 'class-{}'.format(count % 2),
+                             'image-{}.png'.format(count)))
+        count += 1
+
+    generator = keras.preprocessing.image.ImageDataGenerator()
+    kwargs = dict(target_size=(10, 10), shuffle=False, batch_size=4)
+    expected = generator.flow_from_directory(temp_dir, **kwargs)
+    cache_dir = os.path.join(temp_dir, 'cache')
+    for options in [{'decode_workers': 3},
+                    {'cache': 'memory'},
+                    {'cache': 'memory', 'cache_max_bytes': 1000},
+                    {'cache': cache_dir, 'decode_workers': 2}]:
+      kwargs.update(options)
+      dir_seq = generator.flow_from_directory(
+          temp_dir, classes=['class-0', 'class-1'], **kwargs)
+      self.assertEqual(dir_seq.filenames, expected.filenames)
+      # The second epoch reads from the cache.
+      for _ in range(2):
+        for i in range(len(dir_seq)):
+          x, y = dir_seq[i]
+          expected_x, expected_y = expected[i]
+          self.assertAllEqual(x, expected_x)
+          self.assertAllEqual(y, expected_y)
+    self.assertEqual(len(os.listdir(cache_dir)), count)
+
+    # The decode pool is closed along with its iterator.
+    pool = dir_seq._decode_pool
+    del dir_seq
+    gc.collect()
+    self.assertNotEqual(multiprocessing.pool.RUN, pool._state)
+
   def directory_iterator_with_validation_split_test_helper(
       self, validation_split):
     if PIL is None:
@@ -420,6 +464,42 @@ class TestImage(test.TestCase):
         transformed[i] = generator.random_transform(im)
       transformed = generator.standardize(transformed)
 
+  def test_random_transform_batch(self):
+    x = np.random.random((8, 20, 20, 3)).astype('float32') * 255
+    for data_format in ['channels_last', 'channels_first']:
+      if data_format == 'channels_first':
+        x = np.transpose(x, (0, 3, 1, 2))
+      for fill_mode in ['nearest', 'constant', 'reflect', 'wrap']:
+        generator = keras.preprocessing.image.ImageDataGenerator(
+            rotation_range=90.,
+            width_shift_range=0.1,
+            height_shift_range=2,
+            shear_range=0.5,
+            zoom_range=0.2,
+            channel_shift_range=10.,
+            fill_mode=fill_mode,
+            cval=0.5,
+            horizontal_flip=True,
+            vertical_flip=True,
+            data_format=data_format)
+        np.random.seed(1)
+        expected = np.stack([generator.random_transform(im) for im in x])
+        transformed = generator.random_transform_batch(x, seed=1)
+        self.assertAllClose(expected, transformed, atol=1e-3)
+
+  def test_image_data_generator_batch_augmentation(self):
+    images = np.random.random((10, 20, 20, 3))
+    kwargs = dict(rotation_range=30., zoom_range=0.2, horizontal_flip=True,
+                  samplewise_center=True)
+    generator = keras.preprocessing.image.ImageDataGenerator(**kwargs)
+    batch_generator = keras.preprocessing.image.ImageDataGenerator(
+        batch_augmentation=True, **kwargs)
+    x, y = generator.flow(images, np.arange(10), batch_size=4, seed=3)[1]
+    batch_x, batch_y = batch_generator.flow(
+        images, np.arange(10), batch_size=4, seed=3)[1]
+    self.assertAllEqual(y, batch_y)
+    self.assertAllClose(x, batch_x, atol=1e-5)
+
   def test_img_transforms(self):
     x = np.random.random((3, 200, 200))
     _ = keras.preprocessing.image.random_rotation(x, 20)
@@ -118,6 +118,89 @@ def pad_sequences(sequences,
   return x
 
 
+@tf_export('keras.preprocessing.sequence.pad_ragged_sequences')
+def pad_ragged_sequences(values,
+                         offsets,
+                         maxlen=None,
+                         dtype='int32',
+                         padding='pre',
+                         truncating='pre',
+                         value=0.):
+  """Pads sequences stored as one flat array plus offsets.
+
+  Same as `pad_sequences`, but the sequences are given in a ragged (CSR-like)
+  layout: sequence `i` is `values[offsets[i]:offsets[i + 1]]`. The padded
+  array is filled with vectorized index arithmetic instead of a Python loop
+  over the sequences.
+
+  For example, `[[1], [1, 2], [1, 2, 3]]` is
+  `values=[1, 1, 2, 1, 2, 3]`, `offsets=[0, 1, 3, 6]`.
+
+  Arguments:
+      values: Numpy array of shape `(total_length,) + sample_shape`, the
+          concatenated sequences.
+      offsets: 1D integer array of length `num_samples + 1`, non-decreasing,
+          starting at 0 and ending at `total_length`.
+      maxlen: Int, maximum length of all sequences.
+      dtype: Type of the output sequences.
+      padding: String, 'pre' or 'post':
+          pad either before or after each sequence.
+      truncating: String, 'pre' or 'post':
+          remove values from sequences larger than
+          `maxlen`, either at the beginning or at the end of the sequences.
+      value: Float, padding value.
+
+  Returns:
+      x: Numpy array with shape `(num_samples, maxlen) + sample_shape`
+
+  Raises:
+      ValueError: In case of invalid values for `truncating` or `padding`,
+          or in case of invalid `offsets`.
+  """
+  if padding not in {'pre', 'post'}:
+    raise ValueError('Padding type "%s" not understood' % padding)
+  if truncating not in {'pre', 'post'}:
+    raise ValueError('Truncating type "%s" not understood' % truncating)
+  values = np.asarray(values)
+  offsets = np.asarray(offsets, dtype=np.int64)
+  if (offsets.ndim != 1 or not offsets.size or offsets[0] != 0 or
+      offsets[-1] != len(values) or np.any(np.diff(offsets) < 0)):
+    raise ValueError('`offsets` must be a non-decreasing 1D array going from '
+                     '0 to len(values) = %d. Got: %s' % (len(values), offsets))
+
+  lengths = np.diff(offsets)
+  num_samples = len(lengths)
+  if maxlen is None:
+    maxlen = int(lengths.max()) if num_samples else 0
+  sample_shape = values.shape[1:]
+
+  x = np.empty((num_samples, maxlen) + sample_shape, dtype=dtype)
+  # Cast the padding value exactly like `pad_sequences` does.
+  x.fill((np.ones(()) * value).astype(dtype))
+
+  kept = np.minimum(lengths, maxlen)
+  if truncating == 'pre':
+    src_starts = offsets[1:] - kept
+  else:
+    src_starts = offsets[:-1]
+  if padding == 'pre':
+    dst_starts = maxlen - kept
+  else:
+    dst_starts = np.zeros_like(kept)
+
+  # The kept elements are numbered 0..total-1 sequence after sequence; each
+  # sequence maps that range to its source and destination by a constant
+  # shift.
+  total = int(kept.sum())
+  kept_starts = np.cumsum(kept) - kept
+  dst_starts += np.arange(num_samples, dtype=np.int64) * maxlen
+  kept_indices = np.arange(total, dtype=np.int64)
+  src = kept_indices + np.repeat(src_starts - kept_starts, kept)
+  dst = kept_indices + np.repeat(dst_starts - kept_starts, kept)
+  x.reshape((num_samples * maxlen,) + sample_shape)[dst] = values[src]
+  return x
+
+
 @tf_export('keras.preprocessing.sequence.make_sampling_table')
 def make_sampling_table(size, sampling_factor=1e-5):
   """Generates a word rank-based probabilistic sampling table.
@@ -305,6 +388,21 @@ class TimeseriesGenerator(Sequence):
           in reverse chronological order.
       batch_size: Number of timeseries samples in each batch
           (except maybe the last one).
+      strided: Boolean: if `True`, `data` is converted to a Numpy array
+          (without copying it if it already is one, e.g. a `np.memmap`)
+          and each batch is gathered with a single fancy-index lookup
+          into a strided window view of it, instead of copying the
+          windows one by one. Only the timesteps used by the batch are
+          read, so memory-mapped arrays larger than RAM are supported.
+          Batches keep the dtype of `data` instead of being cast to
+          float64.
+      multi_series: Boolean: if `True`, `data` and `targets` hold many
+          independent series stacked along axis 0, and axis 1 is the
+          time dimension (e.g. `data.shape == (num_series, timesteps,
+          features)`). `start_index` and `end_index` apply to every
+          series, windows never cross series boundaries, and batches
+          draw samples from all series (series-major when `shuffle` is
+          `False`). Implies `strided=True`.
 
   Returns:
       A [Sequence](/utils/#sequence) instance.
@@ -343,7 +441,28 @@ class TimeseriesGenerator(Sequence):
                end_index=None,
                shuffle=False,
                reverse=False,
-               batch_size=128):
+               batch_size=128,
+               strided=False,
+               multi_series=False):
+    self.strided = strided or multi_series
+    self.multi_series = multi_series
+    if self.strided:
+      data = np.asarray(data)
+      targets = np.asarray(targets)
+    if multi_series:
+      if data.ndim < 2 or targets.ndim < 2:
+        raise ValueError('With `multi_series=True`, `data` and `targets` '
+                         'should have at least 2 dimensions '
+                         '(series, timesteps, ...). Got: data.shape=%s, '
+                         'targets.shape=%s' % (data.shape, targets.shape))
+      if data.shape[:2] != targets.shape[:2]:
+        raise ValueError('With `multi_series=True`, `data` and `targets` '
+                         'should have the same number of series and '
+                         'timesteps. Got: data.shape=%s, targets.shape=%s' %
+                         (data.shape, targets.shape))
+      num_timesteps = data.shape[1]
+    else:
+      num_timesteps = len(data)
     self.data = data
     self.targets = targets
     self.length = length
@@ -351,7 +470,7 @@ class TimeseriesGenerator(Sequence):
     self.stride = stride
     self.start_index = start_index + length
     if end_index is None:
-      end_index = len(data) - 1
+      end_index = num_timesteps - 1
     self.end_index = end_index
     self.shuffle = shuffle
     self.reverse = reverse
@@ -364,11 +483,73 @@ class TimeseriesGenerator(Sequence):
                        (self.start_index, self.end_index))
 
   def __len__(self):
+    if self.multi_series:
+      return int(
+          np.ceil(self.data.shape[0] * self._rows_per_series() /
+                  self.batch_size))
     length = int(
         np.ceil((self.end_index - self.start_index + 1) /
                 (self.batch_size * self.stride)))
     return length if length >= 0 else 0
 
+  def _rows_per_series(self):
+    return max(0, int(np.ceil((self.end_index - self.start_index + 1) /
+                              self.stride)))
+
+  def _window_view(self):
+    """Returns a read-only view of all the windows of `self.data`.
+
+    Window `w` (along the time axis) holds the timesteps
+    `data[w], data[w + sampling_rate], ...` needed by the sample whose
+    current step is `w + length`. No data is copied or read.
+    """
+    time_axis = 1 if self.multi_series else 0
+    data = self.data
+    num_steps = len(range(0, self.length, self.sampling_rate))
+    num_windows = max(
+        0, data.shape[time_axis] - (num_steps - 1) * self.sampling_rate)
+    time_stride = data.strides[time_axis]
+    shape = (data.shape[:time_axis] + (num_windows, num_steps) +
+             data.shape[time_axis + 1:])
+    strides = (data.strides[:time_axis] +
+               (time_stride, time_stride * self.sampling_rate) +
+               data.strides[time_axis + 1:])
+    return np.lib.stride_tricks.as_strided(
+        data, shape=shape, strides=strides, writeable=False)
+
+  def _get_strided_batch(self, index):
+    windows = self._window_view()
+    if self.multi_series:
+      if self.shuffle:
+        series = np.random.randint(
+            0, self.data.shape[0], size=self.batch_size)
+        rows = np.random.randint(
+            self.start_index, self.end_index + 1, size=self.batch_size)
+      else:
+        rows_per_series = self._rows_per_series()
+        samples = np.arange(
+            self.batch_size * index,
+            min(self.batch_size * (index + 1),
+                self.data.shape[0] * rows_per_series))
+        series = samples // rows_per_series
+        rows = self.start_index + (samples % rows_per_series) * self.stride
+      samples = windows[series, rows - self.length]
+      targets = self.targets[series, rows]
+    else:
+      if self.shuffle:
+        rows = np.random.randint(
+            self.start_index, self.end_index + 1, size=self.batch_size)
+      else:
+        i = self.start_index + self.batch_size * self.stride * index
+        rows = np.arange(
+            i, min(i + self.batch_size * self.stride, self.end_index + 1),
+            self.stride)
+      samples = windows[rows - self.length]
+      targets = self.targets[rows]
+    if self.reverse:
+      return samples[:, ::-1, ...], targets
+    return samples, targets
+
   def _empty_batch(self, num_rows):
     samples_shape = [num_rows, self.length // self.sampling_rate]
     samples_shape.extend(self.data.shape[1:])
@@ -377,6 +558,8 @@ class TimeseriesGenerator(Sequence):
     return np.empty(samples_shape), np.empty(targets_shape)
 
   def __getitem__(self, index):
+    if self.strided:
+      return self._get_strided_batch(index)
     if self.shuffle:
       rows = np.random.randint(
           self.start_index, self.end_index + 1, size=self.batch_size)
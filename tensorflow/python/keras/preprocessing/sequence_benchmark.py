@@ -0,0 +1,68 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark for pad_sequences vs. pad_ragged_sequences."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import time
+
+import numpy as np
+
+from tensorflow.python.keras.preprocessing import sequence
+from tensorflow.python.platform import test
+
+
+class PadSequencesBenchmark(test.Benchmark):
+  """Benchmark the Python loop of pad_sequences against the ragged path."""
+
+  def _run(self, name, fn, num_sequences, num_iters):
+    fn()  # warm up.
+    start_time = time.time()
+    for _ in range(num_iters):
+      fn()
+    duration = (time.time() - start_time) / num_iters
+    print('%s num_sequences:%d - %f secs - %f sequences/sec' %
+          (name, num_sequences, duration, num_sequences / duration))
+    self.report_benchmark(
+        iters=num_iters,
+        wall_time=duration,
+        name='%s_num_sequences_%d' % (name, num_sequences))
+
+  def benchmark_pad_sequences(self):
+    rng = np.random.RandomState(0)
+    for num_sequences in [10000, 100000, 1000000]:
+      lengths = rng.randint(1, 50, size=num_sequences)
+      offsets = np.concatenate([[0], np.cumsum(lengths)])
+      values = rng.randint(1, 20000, size=offsets[-1]).astype(np.int32)
+      sequences = [
+          values[start:stop].tolist()
+          for start, stop in zip(offsets[:-1], offsets[1:])
+      ]
+      for padding, truncating in [('pre', 'pre'), ('post', 'post')]:
+        kwargs = dict(maxlen=32, padding=padding, truncating=truncating)
+        suffix = '_padding_%s_truncating_%s' % (padding, truncating)
+        self._run('pad_sequences' + suffix,
+                  lambda: sequence.pad_sequences(sequences, **kwargs),  # pylint: disable=cell-var-from-loop
+                  num_sequences, num_iters=3)
+        self._run('pad_ragged_sequences' + suffix,
+                  lambda: sequence.pad_ragged_sequences(  # pylint: disable=g-long-lambda,cell-var-from-loop
+                      values, offsets, **kwargs),
+                  num_sequences, num_iters=3)
+
+
+if __name__ == '__main__':
+  test.main()
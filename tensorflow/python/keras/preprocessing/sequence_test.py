@@ -18,6 +18,7 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
 from math import ceil
 
 import numpy as np
@@ -76,6 +77,37 @@ class TestSequence(test.TestCase):
     self.assertAllClose(b, [[[1, 1], [1, 1], [1, 1]], [[1, 1], [2, 1], [2, 2]],
                             [[3, 1], [3, 2], [3, 3]]])
 
+  def test_pad_ragged_sequences(self):
+    a = [[1], [1, 2], [1, 2, 3], []]
+    values = [1, 1, 2, 1, 2, 3]
+    offsets = [0, 1, 3, 6, 6]
+    for maxlen in [None, 2, 3, 5]:
+      for padding in ['pre', 'post']:
+        for truncating in ['pre', 'post']:
+          for dtype, value in [('int32', 0.), ('float32', -1.5)]:
+            expected = keras.preprocessing.sequence.pad_sequences(
+                a, maxlen=maxlen, dtype=dtype, padding=padding,
+                truncating=truncating, value=value)
+            b = keras.preprocessing.sequence.pad_ragged_sequences(
+                values, offsets, maxlen=maxlen, dtype=dtype, padding=padding,
+                truncating=truncating, value=value)
+            self.assertEqual(b.dtype, expected.dtype)
+            self.assertAllEqual(b, expected)
+
+    # test vector samples
+    b = keras.preprocessing.sequence.pad_ragged_sequences(
+        [[1, 1], [2, 1], [2, 2]], [0, 1, 3], maxlen=3, padding='post')
+    self.assertAllClose(b, [[[1, 1], [0, 0], [0, 0]],
+                            [[2, 1], [2, 2], [0, 0]]])
+
+    with self.assertRaises(ValueError):
+      keras.preprocessing.sequence.pad_ragged_sequences(values, [0, 2, 1, 6])
+    with self.assertRaises(ValueError):
+      keras.preprocessing.sequence.pad_ragged_sequences(values, [0, 1, 5])
+    with self.assertRaises(ValueError):
+      keras.preprocessing.sequence.pad_ragged_sequences(
+          values, offsets, padding='foo')
+
   def test_make_sampling_table(self):
     a = keras.preprocessing.sequence.make_sampling_table(3)
     self.assertAllClose(
@@ -233,6 +265,69 @@ class TestSequence(test.TestCase):
       self.assertEqual(expected_sequences, actual_sequences)
       self.assertEqual(expected_batches, actual_batches)
 
+  def test_TimeseriesGenerator_strided(self):
+    data = np.random.random_sample((50, 3, 2))
+    targets = np.random.random_sample((50, 4))
+    for length, sampling_rate in [(1, 1), (10, 2), (9, 3)]:
+      for stride in [1, 3]:
+        for reverse in [False, True]:
+          kwargs = dict(length=length, sampling_rate=sampling_rate,
+                        stride=stride, reverse=reverse, start_index=2,
+                        end_index=45, batch_size=4)
+          expected = keras.preprocessing.sequence.TimeseriesGenerator(
+              data, targets, **kwargs)
+          data_gen = keras.preprocessing.sequence.TimeseriesGenerator(
+              data, targets, strided=True, **kwargs)
+          self.assertEqual(len(data_gen), len(expected))
+          for i in range(len(data_gen)):
+            self.assertAllClose(data_gen[i][0], expected[i][0])
+            self.assertAllClose(data_gen[i][1], expected[i][1])
+
+    # Memory-mapped data keeps its dtype and is not copied up front.
+    path = os.path.join(self.get_temp_dir(), 'timeseries.dat')
+    mm = np.memmap(path, dtype='float32', mode='w+', shape=(50, 2))
+    mm[:] = np.arange(100).reshape((50, 2))
+    mm.flush()
+    mm = np.memmap(path, dtype='float32', mode='r', shape=(50, 2))
+    data_gen = keras.preprocessing.sequence.TimeseriesGenerator(
+        mm, mm[:, 0], length=10, sampling_rate=2, batch_size=2, strided=True)
+    x, y = data_gen[1]
+    self.assertEqual(x.dtype, np.float32)
+    self.assertAllClose(x[:, :, 0], [[4, 8, 12, 16, 20], [6, 10, 14, 18, 22]])
+    self.assertAllClose(y, [24, 26])
+    del mm, data_gen, x, y
+
+  def test_TimeseriesGenerator_multi_series(self):
+    data = np.random.random_sample((5, 30, 2))
+    targets = np.random.random_sample((5, 30))
+    kwargs = dict(length=6, sampling_rate=2, stride=3, start_index=1,
+                  end_index=27, batch_size=4)
+    data_gen = keras.preprocessing.sequence.TimeseriesGenerator(
+        data, targets, multi_series=True, **kwargs)
+    x = np.concatenate([data_gen[i][0] for i in range(len(data_gen))])
+    y = np.concatenate([data_gen[i][1] for i in range(len(data_gen))])
+
+    # Same samples as one generator per series, in series-major order.
+    expected_x, expected_y = [], []
+    for k in range(5):
+      g = keras.preprocessing.sequence.TimeseriesGenerator(
+          data[k], targets[k], **kwargs)
+      expected_x.extend(g[i][0] for i in range(len(g)))
+      expected_y.extend(g[i][1] for i in range(len(g)))
+    self.assertEqual(len(data_gen), int(ceil(len(y) / 4.)))
+    self.assertAllClose(x, np.concatenate(expected_x))
+    self.assertAllClose(y, np.concatenate(expected_y))
+
+    data_gen = keras.preprocessing.sequence.TimeseriesGenerator(
+        data, targets, multi_series=True, shuffle=True, **kwargs)
+    x, y = data_gen[0]
+    self.assertEqual(x.shape, (4, 3, 2))
+    self.assertEqual(y.shape, (4,))
+
+    with self.assertRaises(ValueError):
+      keras.preprocessing.sequence.TimeseriesGenerator(
+          data, targets[:4], length=6, multi_series=True)
+
 
 if __name__ == '__main__':
   test.main()
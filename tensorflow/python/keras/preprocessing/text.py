@@ -18,18 +18,28 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import collections
 from collections import OrderedDict
 from hashlib import md5
+import itertools
+import json
+import multiprocessing
 import string
 import sys
 
 import numpy as np
+import six
 from six.moves import range  # pylint: disable=redefined-builtin
 from six.moves import zip  # pylint: disable=redefined-builtin
 
 from tensorflow.python.platform import tf_logging as logging
 from tensorflow.python.util.tf_export import tf_export
 
+try:
+  import scipy.sparse as sp
+except ImportError:
+  sp = None
+
 
 if sys.version_info < (3,):
   maketrans = string.maketrans
@@ -149,6 +159,120 @@ def hashing_trick(text,
   return [(hash_function(w) % (n - 1) + 1) for w in seq]
 
 
+def _count_words(texts, char_level, filters, lower, split):
+  """Counts the words of a chunk of texts for `Tokenizer.fit_on_texts`.
+
+  Arguments:
+      texts: list of strings or lists of tokens.
+      char_level: whether every character is a token.
+      filters: characters to filter out.
+      lower: whether to convert the texts to lowercase.
+      split: separator for word splitting.
+
+  Returns:
+      A tuple `(num_texts, word_counts, word_docs)` where `word_counts` is
+      an `OrderedDict` in order of first occurrence and `word_docs` maps a
+      word to the number of texts containing it.
+  """
+  word_counts = OrderedDict()
+  word_docs = {}
+  for text in texts:
+    if char_level or isinstance(text, list):
+      seq = text
+    else:
+      seq = text_to_word_sequence(text, filters, lower, split)
+    for w in seq:
+      if w in word_counts:
+        word_counts[w] += 1
+      else:
+        word_counts[w] = 1
+    for w in set(seq):
+      if w in word_docs:
+        word_docs[w] += 1
+      else:
+        word_docs[w] = 1
+  return len(texts), word_counts, word_docs
+
+
+def _iter_chunks(iterable, chunk_size):
+  """Yields successive lists of at most `chunk_size` items of `iterable`."""
+  iterator = iter(iterable)
+  while True:
+    chunk = list(itertools.islice(iterator, chunk_size))
+    if not chunk:
+      return
+    yield chunk
+
+
+def _encode_word(word):
+  if isinstance(word, six.text_type):
+    return word.encode('utf-8')
+  return word
+
+
+class _CompactVocabulary(collections.Mapping):
+  """Read-only mapping from words to indices backed by flat arrays.
+
+  The words are stored sorted, as one UTF-8 byte string plus an array of
+  offsets, next to an `int32` array of indices. Lookups are binary searches.
+  This takes a fraction of the memory of a `dict` for large vocabularies, at
+  the cost of slower lookups.
+
+  Arguments:
+      keys: bytes, the concatenated UTF-8 encoded sorted words.
+      offsets: int64 array of length `len(ids) + 1`; word `i` is
+          `keys[offsets[i]:offsets[i + 1]]`.
+      ids: int32 array, the index of each word.
+  """
+
+  def __init__(self, keys, offsets, ids):
+    self._keys = keys
+    self._offsets = offsets
+    self._ids = ids
+
+  @classmethod
+  def from_dict(cls, word_index):
+    items = sorted((_encode_word(w), i) for w, i in word_index.items())
+    keys = b''.join(k for k, _ in items)
+    offsets = np.zeros(len(items) + 1, dtype=np.int64)
+    np.cumsum([len(k) for k, _ in items], out=offsets[1:])
+    ids = np.array([i for _, i in items], dtype=np.int32)
+    return cls(keys, offsets, ids)
+
+  def _key(self, i):
+    return self._keys[self._offsets[i]:self._offsets[i + 1]]
+
+  def _find(self, word):
+    """Returns the position of `word` in the sorted words, or -1."""
+    key = _encode_word(word)
+    lo, hi = 0, len(self._ids)
+    while lo < hi:
+      mid = (lo + hi) // 2
+      if self._key(mid) < key:
+        lo = mid + 1
+      else:
+        hi = mid
+    if lo < len(self._ids) and self._key(lo) == key:
+      return lo
+    return -1
+
+  def __getitem__(self, word):
+    i = self._find(word)
+    if i < 0:
+      raise KeyError(word)
+    return int(self._ids[i])
+
+  def __contains__(self, word):
+    return self._find(word) >= 0
+
+  def __iter__(self):
+    for i in range(len(self._ids)):
+      yield self._key(i).decode('utf-8')
+
+  def __len__(self):
+    return len(self._ids)
+
+
 @tf_export('keras.preprocessing.text.Tokenizer')
 class Tokenizer(object):
   """Text tokenization utility class.
@@ -206,7 +330,7 @@ class Tokenizer(object):
     self.oov_token = oov_token
     self.index_docs = {}
 
-  def fit_on_texts(self, texts):
+  def fit_on_texts(self, texts, workers=1, chunk_size=10000):
     """Updates internal vocabulary based on a list of texts.
 
     In the case where texts contains lists, we assume each entry of the lists
@@ -218,23 +342,31 @@ class Tokenizer(object):
         texts: can be a list of strings,
             a generator of strings (for memory-efficiency),
             or a list of list of strings.
+        workers: number of processes counting words in parallel. `texts`
+            is read in chunks of `chunk_size` texts, each chunk is counted by
+            a worker and the counts are merged in order, so the resulting
+            vocabulary is the same as with a single worker.
+        chunk_size: number of texts per chunk.
     """
-    for text in texts:
-      self.document_count += 1
-      if self.char_level or isinstance(text, list):
-        seq = text
-      else:
-        seq = text_to_word_sequence(text, self.filters, self.lower, self.split)
-      for w in seq:
-        if w in self.word_counts:
-          self.word_counts[w] += 1
-        else:
-          self.word_counts[w] = 1
-      for w in set(seq):
-        if w in self.word_docs:
-          self.word_docs[w] += 1
-        else:
-          self.word_docs[w] = 1
+    count_args = (self.char_level, self.filters, self.lower, self.split)
+    chunks = _iter_chunks(texts, chunk_size)
+    if workers <= 1:
+      for chunk in chunks:
+        self._merge_counts(*_count_words(chunk, *count_args))
+    else:
+      pool = multiprocessing.Pool(workers)
+      try:
+        # Keep a bounded number of chunks in flight so that `texts` can be
+        # streamed.
+        pending = collections.deque()
+        for chunk in chunks:
+          pending.append(pool.apply_async(_count_words, (chunk,) + count_args))
+          if len(pending) >= 2 * workers:
+            self._merge_counts(*pending.popleft().get())
+        while pending:
+          self._merge_counts(*pending.popleft().get())
+      finally:
+        pool.terminate()
 
     wcounts = list(self.word_counts.items())
     wcounts.sort(key=lambda x: x[1], reverse=True)
@@ -252,6 +384,20 @@ class Tokenizer(object):
     for w, c in list(self.word_docs.items()):
       self.index_docs[self.word_index[w]] = c
 
+  def _merge_counts(self, num_texts, word_counts, word_docs):
+    """Adds the output of `_count_words` to the internal counts."""
+    self.document_count += num_texts
+    for w, c in word_counts.items():
+      if w in self.word_counts:
+        self.word_counts[w] += c
+      else:
+        self.word_counts[w] = c
+    for w, c in word_docs.items():
+      if w in self.word_docs:
+        self.word_docs[w] += c
+      else:
+        self.word_docs[w] = c
+
   def fit_on_sequences(self, sequences):
     """Updates internal vocabulary based on a list of sequences.
 
@@ -324,33 +470,39 @@ class Tokenizer(object):
             vect.append(i)
       yield vect
 
-  def texts_to_matrix(self, texts, mode='binary'):
+  def texts_to_matrix(self, texts, mode='binary', sparse=False):
     """Convert a list of texts to a Numpy matrix.
 
     Arguments:
         texts: list of strings.
         mode: one of "binary", "count", "tfidf", "freq".
+        sparse: whether to return a `scipy.sparse.csr_matrix` instead of a
+            dense Numpy matrix.
 
     Returns:
-        A Numpy matrix.
+        A Numpy matrix, or a scipy CSR matrix if `sparse` is True.
     """
     sequences = self.texts_to_sequences(texts)
-    return self.sequences_to_matrix(sequences, mode=mode)
+    return self.sequences_to_matrix(sequences, mode=mode, sparse=sparse)
 
-  def sequences_to_matrix(self, sequences, mode='binary'):
+  def sequences_to_matrix(self, sequences, mode='binary', sparse=False):
     """Converts a list of sequences into a Numpy matrix.
 
     Arguments:
         sequences: list of sequences
             (a sequence is a list of integer word indices).
         mode: one of "binary", "count", "tfidf", "freq"
+        sparse: whether to return a `scipy.sparse.csr_matrix` instead of a
+            dense Numpy matrix. Only the non-zero entries are computed and
+            stored.
 
     Returns:
-        A Numpy matrix.
+        A Numpy matrix, or a scipy CSR matrix if `sparse` is True.
 
     Raises:
         ValueError: In case of invalid `mode` argument,
             or if the Tokenizer requires to be fit to sample data.
+        ImportError: if `sparse` is True and scipy is not available.
     """
     if not self.num_words:
       if self.word_index:
@@ -365,6 +517,9 @@ class Tokenizer(object):
       raise ValueError('Fit the Tokenizer on some data '
                        'before using tfidf mode.')
 
+    if sparse:
+      return self._sequences_to_sparse_matrix(sequences, num_words, mode)
+
     x = np.zeros((len(sequences), num_words))
     for i, seq in enumerate(sequences):
       if not seq:
@@ -394,3 +549,130 @@ class Tokenizer(object):
         else:
           raise ValueError('Unknown vectorization mode:', mode)
     return x
+
+  def _sequences_to_sparse_matrix(self, sequences, num_words, mode):
+    """Vectorized, sparse implementation of `sequences_to_matrix`."""
+    if sp is None:
+      raise ImportError('Scipy is required for sparse matrices.')
+    if mode not in {'binary', 'count', 'tfidf', 'freq'}:
+      raise ValueError('Unknown vectorization mode:', mode)
+    lengths = np.array([len(seq) for seq in sequences], dtype=np.int64)
+    cols = np.fromiter(
+        itertools.chain.from_iterable(sequences),
+        dtype=np.int64,
+        count=int(lengths.sum()))
+    rows = np.repeat(np.arange(len(sequences)), lengths)
+    keep = cols < num_words
+    x = sp.coo_matrix(
+        (np.ones(np.count_nonzero(keep)), (rows[keep], cols[keep])),
+        shape=(len(sequences), num_words)).tocsr()
+    # Summing the duplicate entries gives the count of each word.
+    x.sum_duplicates()
+    if mode == 'freq':
+      x.data /= np.repeat(lengths, np.diff(x.indptr))
+    elif mode == 'binary':
+      x.data[:] = 1
+    elif mode == 'tfidf':
+      # Use weighting scheme 2 in
+      # https://en.wikipedia.org/wiki/Tf%E2%80%93idf
+      indices, inverse = np.unique(x.indices, return_inverse=True)
+      docs = np.array([self.index_docs.get(j, 0) for j in indices],
+                      dtype=np.float64)
+      idf = np.log(1 + self.document_count / (1 + docs))
+      x.data = (1 + np.log(x.data)) * idf[inverse]
+    return x
+
+  def save(self, filepath):
+    """Saves the configuration and vocabulary to a NumPy `.npz` file.
+
+    The vocabulary and counts are stored as flat arrays rather than as
+    JSON, so that large vocabularies can be saved and loaded quickly. Use
+    `load_tokenizer` to load the file.
+
+    Arguments:
+        filepath: path of the file to write.
+    """
+    word_index = getattr(self, 'word_index', {})
+    words = list(word_index)
+    vocabulary = _CompactVocabulary.from_dict(
+        dict(zip(words, range(len(words)))))
+    # `order` maps the sorted words back to `words`.
+    order = vocabulary._ids  # pylint: disable=protected-access
+    words = [words[i] for i in order]
+    first_seen = dict(zip(self.word_counts, range(len(self.word_counts))))
+    index_docs = sorted(self.index_docs.items())
+    config = {
+        'num_words': self.num_words,
+        'filters': self.filters,
+        'lower': self.lower,
+        'split': self.split,
+        'char_level': self.char_level,
+        'oov_token': self.oov_token,
+        'document_count': self.document_count,
+        'fitted': hasattr(self, 'word_index'),
+    }
+    with open(filepath, 'wb') as f:
+      np.savez(
+          f,
+          config=np.array(json.dumps(config)),
+          keys=np.frombuffer(vocabulary._keys, dtype=np.uint8),  # pylint: disable=protected-access
+          offsets=vocabulary._offsets,  # pylint: disable=protected-access
+          ids=np.array([word_index[w] for w in words], dtype=np.int32),
+          counts=np.array([self.word_counts.get(w, 0) for w in words],
+                          dtype=np.int64),
+          docs=np.array([self.word_docs.get(w, 0) for w in words],
+                        dtype=np.int64),
+          first_seen=np.array([first_seen.get(w, -1) for w in words],
+                              dtype=np.int64),
+          index_docs_keys=np.array([k for k, _ in index_docs], dtype=np.int64),
+          index_docs_values=np.array([v for _, v in index_docs],
+                                     dtype=np.int64))
+
+
+@tf_export('keras.preprocessing.text.load_tokenizer')
+def load_tokenizer(filepath, restore_counts=True):
+  """Loads a `Tokenizer` saved with `Tokenizer.save`.
+
+  The `word_index` of the returned tokenizer is a read-only mapping backed
+  by the sorted words and an `int32` array of indices, which takes much less
+  memory than a `dict`.
+
+  Arguments:
+      filepath: path of the `.npz` file.
+      restore_counts: whether to also restore `word_counts` and `word_docs`,
+          which are only needed to keep fitting the tokenizer. When False
+          they are left empty and the vocabulary stays compact.
+
+  Returns:
+      A `Tokenizer`.
+  """
+  with open(filepath, 'rb') as f:
+    data = np.load(f)
+    config = json.loads(six.text_type(data['config']))
+    keys = data['keys'].tobytes()
+    offsets = data['offsets']
+    ids = data['ids']
+    counts = data['counts']
+    docs = data['docs']
+    first_seen = data['first_seen']
+    index_docs_keys = data['index_docs_keys']
+    index_docs_values = data['index_docs_values']
+
+  fitted = config.pop('fitted')
+  document_count = config.pop('document_count')
+  tokenizer = Tokenizer(**config)
+  tokenizer.document_count = document_count
+  tokenizer.index_docs = dict(
+      zip(index_docs_keys.tolist(), index_docs_values.tolist()))
+  vocabulary = _CompactVocabulary(keys, offsets, ids)
+  if fitted:
+    tokenizer.word_index = vocabulary
+  if restore_counts:
+    words = list(vocabulary)
+    for i in np.argsort(first_seen, kind='mergesort'):
+      if first_seen[i] >= 0:
+        tokenizer.word_counts[words[i]] = int(counts[i])
+    for w, c in zip(words, docs.tolist()):
+      if c:
+        tokenizer.word_docs[w] = c
+  return tokenizer
@@ -19,6 +19,8 @@ from __future__ import absolute_import
 from __future__ import division
 from __future__ import print_function
 
+import os
+
 import numpy as np
 
 from tensorflow.python import keras
@@ -62,6 +64,70 @@ class TestText(test.TestCase):
       matrix = tokenizer.texts_to_matrix(texts, mode)
       self.assertEqual(matrix.shape, (3, 10))
 
+  def test_tokenizer_parallel_fit(self):
+    texts = [
+        'The cat sat on the mat.',
+        'The dog sat on the log.',
+        'Dogs and cats living together.'
+    ] * 10
+    tokenizer = keras.preprocessing.text.Tokenizer()
+    tokenizer.fit_on_texts(texts)
+    parallel_tokenizer = keras.preprocessing.text.Tokenizer()
+    parallel_tokenizer.fit_on_texts(iter(texts), workers=2, chunk_size=4)
+
+    self.assertEqual(list(tokenizer.word_counts.items()),
+                     list(parallel_tokenizer.word_counts.items()))
+    self.assertEqual(tokenizer.word_docs, parallel_tokenizer.word_docs)
+    self.assertEqual(tokenizer.word_index, parallel_tokenizer.word_index)
+    self.assertEqual(tokenizer.document_count,
+                     parallel_tokenizer.document_count)
+
+  def test_tokenizer_sparse_matrix(self):
+    texts = [
+        'The cat sat on the mat.',
+        'The dog sat on the log.',
+        '',
+        'Dogs and cats living together.'
+    ]
+    tokenizer = keras.preprocessing.text.Tokenizer(num_words=8)
+    tokenizer.fit_on_texts(texts)
+    for mode in ['binary', 'count', 'tfidf', 'freq']:
+      matrix = tokenizer.texts_to_matrix(texts, mode, sparse=True)
+      self.assertEqual(matrix.format, 'csr')
+      self.assertAllClose(matrix.toarray(),
+                          tokenizer.texts_to_matrix(texts, mode))
+    with self.assertRaises(ValueError):
+      tokenizer.texts_to_matrix(texts, 'foo', sparse=True)
+
+  def test_tokenizer_save_and_load(self):
+    texts = [
+        u'The cat sat on the mat.',
+        u'The dog sat on the log.',
+        u'ali veli kırk dokuz elli'
+    ]
+    tokenizer = keras.preprocessing.text.Tokenizer(num_words=10,
+                                                   oov_token='<unk>')
+    tokenizer.fit_on_texts(texts)
+    filepath = os.path.join(self.get_temp_dir(), 'tokenizer.npz')
+    tokenizer.save(filepath)
+
+    loaded = keras.preprocessing.text.load_tokenizer(filepath)
+    self.assertEqual(dict(loaded.word_index), tokenizer.word_index)
+    self.assertEqual(list(loaded.word_counts.items()),
+                     list(tokenizer.word_counts.items()))
+    self.assertEqual(loaded.word_docs, tokenizer.word_docs)
+    self.assertEqual(loaded.index_docs, tokenizer.index_docs)
+    self.assertEqual(loaded.document_count, tokenizer.document_count)
+    self.assertEqual(loaded.oov_token, '<unk>')
+    self.assertEqual(loaded.texts_to_sequences(texts + [u'unknown kırk']),
+                     tokenizer.texts_to_sequences(texts + [u'unknown kırk']))
+
+    compact = keras.preprocessing.text.load_tokenizer(
+        filepath, restore_counts=False)
+    self.assertEqual(len(compact.word_counts), 0)
+    self.assertEqual(compact.word_index[u'kırk'], tokenizer.word_index[u'kırk'])
+    self.assertNotIn('unknown', compact.word_index)
+
   def test_hashing_trick_hash(self):
     text = 'The cat sat on the mat.'
     encoded = keras.preprocessing.text.hashing_trick(text, 5)
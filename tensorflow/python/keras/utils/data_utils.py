@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 from abc import abstractmethod
+import collections
 from contextlib import closing
 import hashlib
 import multiprocessing
@@ -406,13 +407,21 @@ class Sequence(object):
 
 # Global variables to be shared across processes
 _SHARED_SEQUENCES = {}
+# Shared-memory slabs of the `OrderedEnqueuer`s using `use_shared_memory`.
+_SHARED_SLABS = {}
 # We use a Value to provide unique id to different processes.
 _SEQUENCE_COUNTER = None
 
+# Arrays written into a shared-memory slab start on this byte boundary.
+_SLAB_ALIGNMENT = 64
 
-def init_pool(seqs):
+
+def init_pool(seqs, slabs=None):
   global _SHARED_SEQUENCES
+  global _SHARED_SLABS
   _SHARED_SEQUENCES = seqs
+  if slabs is not None:
+    _SHARED_SLABS = slabs
 
 
 def get_index(uid, i):
@@ -432,6 +441,149 @@ def get_index(uid, i):
   return _SHARED_SEQUENCES[uid][i]
 
 
+# Placeholder for an array stored in a shared-memory slab.
+_SlabArraySpec = collections.namedtuple('_SlabArraySpec',
+                                        ['offset', 'shape', 'dtype'])
+
+
+def _is_slab_array(x):
+  return isinstance(x, np.ndarray) and not x.dtype.hasobject
+
+
+def _slab_nbytes(batch):
+  """Returns the number of slab bytes needed to hold the arrays of `batch`."""
+  if _is_slab_array(batch):
+    return batch.nbytes + _SLAB_ALIGNMENT
+  if isinstance(batch, (list, tuple)):
+    return sum(_slab_nbytes(x) for x in batch)
+  if isinstance(batch, dict):
+    return sum(_slab_nbytes(x) for x in batch.values())
+  return 0
+
+
+def _write_to_slab(batch, slab):
+  """Copies the NumPy arrays of `batch` into `slab`.
+
+  Arguments:
+      batch: a NumPy array, or a (nested) list, tuple or dict of them.
+          Any other leaf is left as is.
+      slab: flat `uint8` NumPy array backed by shared memory.
+
+  Returns:
+      `batch` with every array replaced by a `_SlabArraySpec`, or `None`
+      if the arrays do not fit in `slab`.
+  """
+  if _slab_nbytes(batch) > slab.size:
+    return None
+  offset = [0]
+
+  def _write(x):
+    if _is_slab_array(x):
+      start = -(-offset[0] // _SLAB_ALIGNMENT) * _SLAB_ALIGNMENT
+      end = start + x.nbytes
+      slab[start:end].view(x.dtype).reshape(x.shape)[...] = x
+      offset[0] = end
+      return _SlabArraySpec(start, x.shape, x.dtype)
+    if type(x) in (list, tuple):
+      return type(x)(_write(y) for y in x)
+    if isinstance(x, dict):
+      return {k: _write(v) for k, v in x.items()}
+    return x
+
+  return _write(batch)
+
+
+def _read_from_slab(spec, slab):
+  """Rebuilds a batch written by `_write_to_slab` as views into `slab`."""
+  if isinstance(spec, _SlabArraySpec):
+    dtype = np.dtype(spec.dtype)
+    end = spec.offset + dtype.itemsize * int(np.prod(spec.shape))
+    return slab[spec.offset:end].view(dtype).reshape(spec.shape)
+  if type(spec) in (list, tuple):
+    return type(spec)(_read_from_slab(x, slab) for x in spec)
+  if isinstance(spec, dict):
+    return {k: _read_from_slab(v, slab) for k, v in spec.items()}
+  return spec
+
+
+def get_index_to_slab(uid, i, slot):
+  """Writes the value from the Sequence `uid` at index `i` to shared memory.
+
+  Arguments:
+      uid: int, Sequence identifier
+      i: index
+      slot: index of the shared-memory slab of `uid` to write into.
+
+  Returns:
+      A tuple `(in_slab, value)`. If `in_slab` is True, `value` describes
+      where the arrays of the batch live in the slab (see `_read_from_slab`),
+      otherwise the batch did not fit and `value` is the batch itself.
+  """
+  batch = _SHARED_SEQUENCES[uid][i]
+  slab = np.frombuffer(_SHARED_SLABS[uid][slot], dtype=np.uint8)
+  spec = _write_to_slab(batch, slab)
+  if spec is None:
+    return False, batch
+  return True, spec
+
+
+def _queue_stats(start_time, num_batches, occupancy_sum, max_queue_size,
+                 queue_size, producer_stall_time, consumer_stall_time):
+  """Returns the dict of statistics of an enqueuer's `get_stats()`."""
+  elapsed = time.time() - start_time if start_time is not None else 0.
+  if num_batches and max_queue_size:
+    mean_occupancy = occupancy_sum / (num_batches * max_queue_size)
+  else:
+    mean_occupancy = 0.
+  return {
+      'batches': num_batches,
+      'batches_per_second': num_batches / elapsed if elapsed else 0.,
+      'queue_size': queue_size,
+      'max_queue_size': max_queue_size,
+      'mean_queue_occupancy': mean_occupancy,
+      'producer_stall_time': producer_stall_time,
+      'consumer_stall_time': consumer_stall_time,
+  }
+
+
+class _SlabRing(object):
+  """Ring of preallocated shared-memory slabs.
+
+  Each in-flight batch of an `OrderedEnqueuer` owns one slab (slot) from the
+  time it is submitted to a worker until the consumer asks for the following
+  batch.
+
+  Arguments:
+      num_slots: number of slabs.
+      slot_bytes: size of each slab, in bytes.
+  """
+
+  def __init__(self, num_slots, slot_bytes):
+    self.slot_bytes = slot_bytes
+    self.slabs = [
+        multiprocessing.RawArray('b', slot_bytes) for _ in range(num_slots)
+    ]
+    self._views = [np.frombuffer(slab, dtype=np.uint8) for slab in self.slabs]
+    self._free_slots = queue.Queue()
+    for slot in range(num_slots):
+      self._free_slots.put(slot)
+
+  def acquire(self, stop_signal):
+    """Blocks until a slot is free; returns None if `stop_signal` is set."""
+    while not stop_signal.is_set():
+      try:
+        return self._free_slots.get(block=True, timeout=0.1)
+      except queue.Empty:
+        pass
+    return None
+
+  def release(self, slot):
+    self._free_slots.put(slot)
+
+  def read(self, slot, spec):
+    return _read_from_slab(spec, self._views[slot])
+
+
 @tf_export('keras.utils.SequenceEnqueuer')
 class SequenceEnqueuer(object):
   """Base class to enqueue inputs.
@@ -503,11 +655,29 @@ class OrderedEnqueuer(SequenceEnqueuer):
       sequence: A `keras.utils.data_utils.Sequence` object.
       use_multiprocessing: use multiprocessing if True, otherwise threading
       shuffle: whether to shuffle the data at the beginning of each epoch
+      use_shared_memory: only used with `use_multiprocessing=True`. If True,
+          workers copy the NumPy arrays of each batch into preallocated
+          shared-memory slabs instead of pickling them back to the main
+          process, and `get()` yields views into those slabs. A yielded
+          batch is only valid until the next batch is requested; copy it
+          if it needs to outlive that. Batches that do not fit in a slab
+          fall back to pickling.
+      shared_memory_slot_bytes: size in bytes of each shared-memory slab.
+          Defaults to the size of the first batch of the Sequence, which
+          `start()` computes by evaluating `sequence[0]` in the main
+          process. Set it when that is expensive or has side effects.
   """
 
-  def __init__(self, sequence, use_multiprocessing=False, shuffle=False):
+  def __init__(self,
+               sequence,
+               use_multiprocessing=False,
+               shuffle=False,
+               use_shared_memory=False,
+               shared_memory_slot_bytes=None):
     self.sequence = sequence
     self.use_multiprocessing = use_multiprocessing
+    self.use_shared_memory = use_shared_memory and use_multiprocessing
+    self.shared_memory_slot_bytes = shared_memory_slot_bytes
 
     global _SEQUENCE_COUNTER
     if _SEQUENCE_COUNTER is None:
@@ -534,6 +704,16 @@ class OrderedEnqueuer(SequenceEnqueuer):
     self.queue = None
     self.run_thread = None
     self.stop_signal = None
+    self.slab_ring = None
+    self.max_queue_size = 0
+    self._producer_stall_time = 0.
+    self._reset_stats()
+
+  def _reset_stats(self):
+    self._start_time = None
+    self._num_batches = 0
+    self._occupancy_sum = 0.
+    self._consumer_stall_time = 0.
 
   def is_running(self):
     return self.stop_signal is not None and not self.stop_signal.is_set()
@@ -546,13 +726,26 @@ class OrderedEnqueuer(SequenceEnqueuer):
         max_queue_size: queue size
             (when full, workers could block on `put()`)
     """
-    if self.use_multiprocessing:
+    if self.use_shared_memory:
+      slot_bytes = self.shared_memory_slot_bytes
+      if slot_bytes is None:
+        slot_bytes = _slab_nbytes(self.sequence[0])
+      # One slab per queued batch, plus the one the consumer is reading.
+      self.slab_ring = _SlabRing(max_queue_size + 1, max(slot_bytes, 1))
+      _SHARED_SLABS[self.uid] = self.slab_ring.slabs
+      self.executor_fn = lambda seqs: multiprocessing.Pool(  # pylint: disable=g-long-lambda
+          workers, initializer=init_pool, initargs=(seqs, _SHARED_SLABS))
+    elif self.use_multiprocessing:
       self.executor_fn = lambda seqs: multiprocessing.Pool(  # pylint: disable=g-long-lambda
           workers, initializer=init_pool, initargs=(seqs,))
     else:
        # We do not need the init since it's threads.
       self.executor_fn = lambda _: ThreadPool(workers)
     self.workers = workers
+    self.max_queue_size = max_queue_size
+    self._reset_stats()
+    self._producer_stall_time = 0.
+    self._start_time = time.time()
     self.queue = queue.Queue(max_queue_size)
     self.stop_signal = threading.Event()
     self.run_thread = threading.Thread(target=self._run)
@@ -578,8 +771,19 @@ class OrderedEnqueuer(SequenceEnqueuer):
         for i in sequence:
           if self.stop_signal.is_set():
             return
-          self.queue.put(
-              executor.apply_async(get_index, (self.uid, i)), block=True)
+          start = time.time()
+          if self.slab_ring is not None:
+            slot = self.slab_ring.acquire(self.stop_signal)
+            if slot is None:
+              return
+            self.queue.put(
+                (executor.apply_async(get_index_to_slab, (self.uid, i, slot)),
+                 slot),
+                block=True)
+          else:
+            self.queue.put(
+                executor.apply_async(get_index, (self.uid, i)), block=True)
+          self._producer_stall_time += time.time() - start
 
         # Done with the current epoch, waiting for the final batches
         self._wait_queue()
@@ -602,15 +806,37 @@ class OrderedEnqueuer(SequenceEnqueuer):
         `(inputs, targets)` or
         `(inputs, targets, sample_weights)`.
     """
+    slab_ring = self.slab_ring
+    slot = None
     try:
       while self.is_running():
-        inputs = self.queue.get(block=True).get()
+        if slot is not None:
+          # The consumer is done with the batch living in this slab.
+          slab_ring.release(slot)
+          slot = None
+        start = time.time()
+        occupancy = self.queue.qsize()
+        if slab_ring is not None:
+          future, slot = self.queue.get(block=True)
+          in_slab, inputs = future.get()
+          if in_slab:
+            inputs = slab_ring.read(slot, inputs)
+        else:
+          inputs = self.queue.get(block=True).get()
+        self._consumer_stall_time += time.time() - start
         self.queue.task_done()
         if inputs is not None:
+          self._num_batches += 1
+          self._occupancy_sum += occupancy
           yield inputs
     except Exception as e:  # pylint: disable=broad-except
       self.stop()
       six.raise_from(StopIteration(e), e)
+    finally:
+      # Return the slab of the last batch, including when fetching it failed
+      # or the consumer closed this generator.
+      if slot is not None:
+        slab_ring.release(slot)
 
   def _send_sequence(self):
     """Send current Sequence to all workers."""
@@ -632,6 +858,26 @@ class OrderedEnqueuer(SequenceEnqueuer):
       self.queue.not_full.notify()
     self.run_thread.join(timeout)
     _SHARED_SEQUENCES[self.uid] = None
+    _SHARED_SLABS.pop(self.uid, None)
+    self.slab_ring = None
+
+  def get_stats(self):
+    """Returns queue and throughput statistics since `start()`.
+
+    The queue holds the pending batches, in order. The producer stall time
+    is time spent waiting for a free slot in the full queue (and, with
+    `use_shared_memory`, for a free slab) before submitting the next batch
+    to the workers. The consumer stall time is time spent by `get()`
+    waiting for the next batch to be ready.
+
+    Returns:
+        A dict with the same keys as `GeneratorEnqueuer.get_stats()`.
+    """
+    return _queue_stats(
+        self._start_time, self._num_batches, self._occupancy_sum,
+        self.max_queue_size,
+        self.queue.qsize() if self.queue is not None else 0,
+        self._producer_stall_time, self._consumer_stall_time)
 
 
 @tf_export('keras.utils.GeneratorEnqueuer')
@@ -643,10 +889,15 @@ class GeneratorEnqueuer(SequenceEnqueuer):
 
   Used in `fit_generator`, `evaluate_generator`, `predict_generator`.
 
+  Workers and consumer block on the queue instead of polling it, and the
+  enqueuer keeps track of how long each side was stalled waiting on the
+  other; see `get_stats()`.
+
   Arguments:
       generator: a generator function which yields data
       use_multiprocessing: use multiprocessing if True, otherwise threading
-      wait_time: time to sleep in-between calls to `put()`
+      wait_time: maximum time to block on the queue before checking
+          whether the enqueuer was stopped.
       random_seed: Initial seed for workers,
           will be incremented by one for each worker.
   """
@@ -673,42 +924,72 @@ class GeneratorEnqueuer(SequenceEnqueuer):
     self._manager = None
     self.queue = None
     self.seed = seed
+    self._producer_stall_time = None
+    self._reset_stats()
+
+  def _reset_stats(self):
+    self._start_time = None
+    self._num_batches = 0
+    self._occupancy_sum = 0.
+    self._consumer_stall_time = 0.
+
+  def _put(self, item):
+    """Puts `item` in the queue, blocking while the queue is full.
+
+    Arguments:
+        item: the `(success, value)` tuple to enqueue.
+
+    Returns:
+        Whether `item` was enqueued; `False` if the enqueuer was stopped
+        while waiting for a free slot.
+    """
+    try:
+      self.queue.put(item, block=False)
+      return True
+    except queue.Full:
+      pass
+    start = time.time()
+    try:
+      while not self._stop_event.is_set():
+        try:
+          self.queue.put(item, block=True, timeout=self.wait_time)
+          return True
+        except queue.Full:
+          pass
+      return False
+    finally:
+      with self._producer_stall_time.get_lock():
+        self._producer_stall_time.value += time.time() - start
 
   def _data_generator_task(self):
     if self._use_multiprocessing is False:
       while not self._stop_event.is_set():
-        with self.genlock:
-          try:
-            if (self.queue is not None and
-                self.queue.qsize() < self.max_queue_size):
-              # On all OSes, avoid **SYSTEMATIC** error
-              # in multithreading mode:
-              # `ValueError: generator already executing`
-              # => Serialize calls to
-              # infinite iterator/generator's next() function
-              generator_output = next(self._generator)
-              self.queue.put((True, generator_output))
-            else:
-              time.sleep(self.wait_time)
-          except StopIteration:
-            break
-          except Exception as e:  # pylint: disable=broad-except
-            # Can't pickle tracebacks.
-            # As a compromise, print the traceback and pickle None instead.
-            if not hasattr(e, '__traceback__'):
-              setattr(e, '__traceback__', sys.exc_info()[2])
-            self.queue.put((False, e))
-            self._stop_event.set()
+        try:
+          with self.genlock:
+            # On all OSes, avoid **SYSTEMATIC** error
+            # in multithreading mode:
+            # `ValueError: generator already executing`
+            # => Serialize calls to
+            # infinite iterator/generator's next() function
+            generator_output = next(self._generator)
+          if not self._put((True, generator_output)):
             break
+        except StopIteration:
+          break
+        except Exception as e:  # pylint: disable=broad-except
+          # Can't pickle tracebacks.
+          # As a compromise, print the traceback and pickle None instead.
+          if not hasattr(e, '__traceback__'):
+            setattr(e, '__traceback__', sys.exc_info()[2])
+          self._put((False, e))
+          self._stop_event.set()
+          break
     else:
       while not self._stop_event.is_set():
         try:
-          if (self.queue is not None and
-              self.queue.qsize() < self.max_queue_size):
-            generator_output = next(self._generator)
-            self.queue.put((True, generator_output))
-          else:
-            time.sleep(self.wait_time)
+          generator_output = next(self._generator)
+          if not self._put((True, generator_output)):
+            break
         except StopIteration:
           break
         except Exception as e:  # pylint: disable=broad-except
@@ -716,7 +997,7 @@ class GeneratorEnqueuer(SequenceEnqueuer):
           # As a compromise, print the traceback and pickle None instead.
           traceback.print_exc()
           setattr(e, '__traceback__', None)
-          self.queue.put((False, e))
+          self._put((False, e))
           self._stop_event.set()
           break
 
@@ -730,6 +1011,9 @@ class GeneratorEnqueuer(SequenceEnqueuer):
     """
     try:
       self.max_queue_size = max_queue_size
+      self._reset_stats()
+      self._producer_stall_time = multiprocessing.Value('d', 0.)
+      self._start_time = time.time()
       if self._use_multiprocessing:
         self._manager = multiprocessing.Manager()
         self.queue = self._manager.Queue(maxsize=max_queue_size)
@@ -791,6 +1075,33 @@ class GeneratorEnqueuer(SequenceEnqueuer):
     self._stop_event = None
     self.queue = None
 
+  def get_stats(self):
+    """Returns queue and throughput statistics since `start()`.
+
+    Stall times are cumulative: the producer stall time is summed over
+    all workers, and is time spent waiting for a free slot in a full
+    queue, while the consumer stall time is time spent by `get()` waiting
+    on an empty queue. A high consumer stall time means the input
+    pipeline is the bottleneck; a high producer stall time means the
+    consumer (e.g. the training step) is.
+
+    Returns:
+        A dict with keys `batches` (number of batches consumed),
+        `batches_per_second`, `queue_size`, `max_queue_size`,
+        `mean_queue_occupancy` (average fraction of the queue that was
+        filled when a batch was consumed), `producer_stall_time` and
+        `consumer_stall_time` (in seconds).
+    """
+    if self._producer_stall_time is None:
+      producer_stall_time = 0.
+    else:
+      producer_stall_time = self._producer_stall_time.value
+    return _queue_stats(
+        self._start_time, self._num_batches, self._occupancy_sum,
+        getattr(self, 'max_queue_size', 0),
+        self.queue.qsize() if self.queue is not None else 0,
+        producer_stall_time, self._consumer_stall_time)
+
   def get(self):
     """Creates a generator to extract data from the queue.
 
@@ -802,20 +1113,25 @@ class GeneratorEnqueuer(SequenceEnqueuer):
         `(inputs, targets, sample_weights)`.
     """
     while self.is_running():
-      if not self.queue.empty():
-        success, value = self.queue.get()
-        # Rethrow any exceptions found in the queue
-        if not success:
-          six.reraise(value.__class__, value, value.__traceback__)
-        # Yield regular values
-        if value is not None:
-          yield value
-      else:
+      start = time.time()
+      occupancy = self.queue.qsize()
+      try:
+        success, value = self.queue.get(block=True, timeout=self.wait_time)
+      except queue.Empty:
+        self._consumer_stall_time += time.time() - start
         all_finished = all([not thread.is_alive() for thread in self._threads])
         if all_finished and self.queue.empty():
-          raise StopIteration()
-        else:
-          time.sleep(self.wait_time)
+          return
+        continue
+      self._consumer_stall_time += time.time() - start
+      # Rethrow any exceptions found in the queue
+      if not success:
+        six.reraise(value.__class__, value, value.__traceback__)
+      # Yield regular values
+      if value is not None:
+        self._num_batches += 1
+        self._occupancy_sum += occupancy
+        yield value
 
     # Make sure to rethrow the first exception in the queue, if any
     while not self.queue.empty():
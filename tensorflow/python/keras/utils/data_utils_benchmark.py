@@ -0,0 +1,89 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Benchmark for the batch transports of `OrderedEnqueuer`."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import time
+
+import numpy as np
+
+from tensorflow.python.keras.utils import data_utils
+from tensorflow.python.platform import test
+
+
+class ImageBatchSequence(data_utils.Sequence):
+  """Sequence of constant float32 image batches."""
+
+  def __init__(self, batch_size, image_shape, num_batches):
+    self.batch = (np.ones((batch_size,) + image_shape, dtype=np.float32),
+                  np.zeros((batch_size, 1), dtype=np.float32))
+    self.num_batches = num_batches
+
+  def __getitem__(self, index):
+    return self.batch
+
+  def __len__(self):
+    return self.num_batches
+
+
+class OrderedEnqueuerBenchmark(test.Benchmark):
+  """Benchmark pickling vs. shared-memory batch transport."""
+
+  def _run_enqueuer(self, use_shared_memory, batch_size, num_batches,
+                    workers=4, max_queue_size=10):
+    sequence = ImageBatchSequence(batch_size, (224, 224, 3), num_batches)
+    enqueuer = data_utils.OrderedEnqueuer(
+        sequence,
+        use_multiprocessing=True,
+        use_shared_memory=use_shared_memory)
+    enqueuer.start(workers=workers, max_queue_size=max_queue_size)
+    output = enqueuer.get()
+    # Warm up: let the pool spin up and fill the queue.
+    next(output)
+    start_time = time.time()
+    for _ in range(num_batches - 1):
+      x, _ = next(output)
+      # Touch the batch like a training step would.
+      x.sum()
+    duration = time.time() - start_time
+    enqueuer.stop()
+
+    transport = 'shared_memory' if use_shared_memory else 'pickle'
+    batches_per_sec = (num_batches - 1) / duration
+    print('%s batch_size:%d - %f batches/sec - %f GB/sec' %
+          (transport, batch_size, batches_per_sec,
+           batches_per_sec * sequence.batch[0].nbytes / 1e9))
+    self.report_benchmark(
+        iters=num_batches - 1,
+        wall_time=duration / (num_batches - 1),
+        name='ordered_enqueuer_%s_batch_size_%d' % (transport, batch_size))
+
+  def benchmark_ordered_enqueuer_transport(self):
+    for batch_size in [8, 32, 64]:
+      for use_shared_memory in [False, True]:
+        self._run_enqueuer(use_shared_memory, batch_size, num_batches=100)
+
+
+if __name__ == '__main__':
+  # See data_utils_test.py: keep multiprocessing socket paths short.
+  for var in ('TMPDIR', 'TMP', 'TEMP'):
+    if var in os.environ:
+      del os.environ[var]
+
+  test.main()
@@ -22,6 +22,7 @@ from itertools import cycle
 import os
 import tarfile
 import threading
+import time
 import unittest
 import zipfile
 
@@ -201,6 +202,56 @@ class TestEnqueuers(test.TestCase):
     with self.assertRaises(IndexError):
       next(gen_output)
 
+  def test_generator_enqueuer_fail_threads_with_full_queue(self):
+    def failing_generator():
+      yield np.zeros((2, 3))
+      raise IndexError('failed')
+
+    enqueuer = keras.utils.data_utils.GeneratorEnqueuer(
+        failing_generator(), use_multiprocessing=False)
+    enqueuer.start(1, 1)
+    # The worker fills the queue, then waits to enqueue its error. Stopping
+    # the enqueuer must not wait for the consumer to make room.
+    time.sleep(0.2)
+    enqueuer.stop()
+    self.assertFalse(enqueuer.is_running())
+
+  def test_generator_enqueuer_stats(self):
+    def slow_generator():
+      while True:
+        time.sleep(0.01)
+        yield np.zeros((2, 3))
+
+    enqueuer = keras.utils.data_utils.GeneratorEnqueuer(
+        slow_generator(), use_multiprocessing=False)
+    enqueuer.start(1, 5)
+    gen_output = enqueuer.get()
+    for _ in range(10):
+      next(gen_output)
+    stats = enqueuer.get_stats()
+    enqueuer.stop()
+    self.assertEqual(stats['batches'], 10)
+    self.assertEqual(stats['max_queue_size'], 5)
+    self.assertGreater(stats['batches_per_second'], 0)
+    # The consumer is faster than the producer: it waits, the producer
+    # never finds the queue full.
+    self.assertGreater(stats['consumer_stall_time'], 0)
+    self.assertLess(stats['mean_queue_occupancy'], 0.5)
+
+    enqueuer = keras.utils.data_utils.GeneratorEnqueuer(
+        create_generator_from_sequence_threads(TestSequence([3, 20, 20, 3])),
+        use_multiprocessing=False)
+    enqueuer.start(2, 5)
+    gen_output = enqueuer.get()
+    for _ in range(10):
+      next(gen_output)
+      time.sleep(0.01)
+    stats = enqueuer.get_stats()
+    enqueuer.stop()
+    # The producers are faster than the consumer: they wait on a full queue.
+    self.assertGreater(stats['producer_stall_time'], 0)
+    self.assertGreater(stats['mean_queue_occupancy'], 0.5)
+
   def test_ordered_enqueuer_threads(self):
     enqueuer = keras.utils.data_utils.OrderedEnqueuer(
         TestSequence([3, 200, 200, 3]), use_multiprocessing=False)
@@ -212,6 +263,23 @@ class TestEnqueuers(test.TestCase):
     self.assertEqual(acc, list(range(100)))
     enqueuer.stop()
 
+  def test_ordered_enqueuer_stats(self):
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        TestSequence([3, 20, 20, 3]), use_multiprocessing=False)
+    enqueuer.start(2, 5)
+    gen_output = enqueuer.get()
+    for _ in range(10):
+      next(gen_output)
+      time.sleep(0.01)
+    stats = enqueuer.get_stats()
+    enqueuer.stop()
+    self.assertEqual(stats['batches'], 10)
+    self.assertEqual(stats['max_queue_size'], 5)
+    self.assertGreater(stats['batches_per_second'], 0)
+    # The workers are faster than the consumer: the queue is mostly full.
+    self.assertGreater(stats['producer_stall_time'], 0)
+    self.assertGreater(stats['mean_queue_occupancy'], 0.5)
+
   def test_ordered_enqueuer_processes(self):
     enqueuer = keras.utils.data_utils.OrderedEnqueuer(
         TestSequence([3, 200, 200, 3]), use_multiprocessing=True)
@@ -223,6 +291,44 @@ class TestEnqueuers(test.TestCase):
     self.assertEqual(acc, list(range(100)))
     enqueuer.stop()
 
+  def test_ordered_enqueuer_processes_shared_memory(self):
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        TestSequence([3, 200, 200, 3]), use_multiprocessing=True,
+        use_shared_memory=True)
+    enqueuer.start(3, 10)
+    gen_output = enqueuer.get()
+    acc = []
+    for _ in range(200):
+      acc.append(next(gen_output)[0, 0, 0, 0])
+    self.assertEqual(acc[:100], list(range(100)))
+    self.assertEqual(acc[100:], list([k * 5 for k in range(100)]))
+    enqueuer.stop()
+
+  def test_ordered_enqueuer_shared_memory_fallback(self):
+    # Slabs too small for a batch: batches are pickled back instead.
+    enqueuer = keras.utils.data_utils.OrderedEnqueuer(
+        TestSequence([3, 200, 200, 3]), use_multiprocessing=True,
+        use_shared_memory=True, shared_memory_slot_bytes=16)
+    enqueuer.start(3, 10)
+    gen_output = enqueuer.get()
+    acc = []
+    for _ in range(100):
+      acc.append(next(gen_output)[0, 0, 0, 0])
+    self.assertEqual(acc, list(range(100)))
+    enqueuer.stop()
+
+  def test_shared_memory_slab_round_trip(self):
+    slab = np.zeros(1024, dtype=np.uint8)
+    batch = (np.arange(12, dtype=np.float32).reshape(3, 4),
+             {'ids': np.arange(5), 'name': 'batch'}, [None])
+    spec = keras.utils.data_utils._write_to_slab(batch, slab)
+    out = keras.utils.data_utils._read_from_slab(spec, slab)
+    self.assertAllEqual(out[0], batch[0])
+    self.assertAllEqual(out[1]['ids'], batch[1]['ids'])
+    self.assertEqual(out[1]['name'], 'batch')
+    self.assertEqual(out[2], [None])
+    self.assertIsNone(keras.utils.data_utils._write_to_slab(batch, slab[:64]))
+
   def test_ordered_enqueuer_fail_threads(self):
     enqueuer = keras.utils.data_utils.OrderedEnqueuer(
         FaultSequence(), use_multiprocessing=False)
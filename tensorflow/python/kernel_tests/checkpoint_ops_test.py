@@ -436,6 +436,31 @@ class LoadAndRemapMatrixWithMaxRowsTest(test.TestCase):
         partitioner=partitioned_variables.fixed_size_partitioner(3),
         max_rows_in_memory=-1)
 
+  def test_loading_rows_far_apart(self):
+    """Tests loading rows that are read in separate ranges."""
+    # 300000 rows of 4 bytes each, so that the first and last rows are more
+    # than 1MB apart and are not read in one range.
+    num_rows = 300000
+    np_value = np.arange(num_rows, dtype=np.float32).reshape([num_rows, 1])
+    with ops.Graph().as_default():
+      matrix = variables.Variable(np_value, name='matrix')
+      with self.test_session() as sess:
+        ckpt_path = os.path.join(test.get_temp_dir(), 'far_apart_ckpt')
+        variables.global_variables_initializer().run()
+        saver.Saver([matrix]).save(sess, ckpt_path)
+        for max_rows_in_memory in (-1, 1):
+          remapped_matrix = gen_checkpoint_ops.load_and_remap_matrix(
+              ckpt_path=ckpt_path,
+              old_tensor_name='matrix',
+              row_remapping=[num_rows - 1, -1, 0, 150000, 1],
+              col_remapping=[],
+              initializing_values=[42],
+              num_rows=5,
+              num_cols=1,
+              max_rows_in_memory=max_rows_in_memory)
+          self.assertAllClose([[num_rows - 1], [42], [0], [150000], [1]],
+                              remapped_matrix.eval())
+
 
 if __name__ == '__main__':
   test.main()
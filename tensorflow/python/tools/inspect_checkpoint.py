@@ -36,7 +36,9 @@ def print_tensors_in_checkpoint_file(file_name, tensor_name, all_tensors,
   If no `tensor_name` is provided, prints the tensor names and shapes
   in the checkpoint file.
 
-  If `tensor_name` is provided, prints the content of the tensor.
+  If `tensor_name` is provided, prints the content of the tensor.  Tensors of
+  V2 checkpoints are memory mapped where possible, so that printing a summary
+  of a large tensor only reads the elements that are shown.
 
   Args:
     file_name: Name of the checkpoint file.
@@ -51,12 +53,12 @@ def print_tensors_in_checkpoint_file(file_name, tensor_name, all_tensors,
       for key in sorted(var_to_shape_map):
         print("tensor_name: ", key)
         if all_tensors:
-          print(reader.get_tensor(key))
+          print(reader.get_tensor_view(key))
     elif not tensor_name:
       print(reader.debug_string().decode("utf-8"))
     else:
       print("tensor_name: ", tensor_name)
-      print(reader.get_tensor(tensor_name))
+      print(reader.get_tensor_view(tensor_name))
   except Exception as e:  # pylint: disable=broad-except
     print(str(e))
     if "corrupted compressed block contents" in str(e):
@@ -19,6 +19,7 @@ from __future__ import division
 from __future__ import print_function
 
 import os
+import threading
 import time
 
 import numpy as np
@@ -27,7 +28,9 @@ import six
 from tensorflow.core.framework.summary_pb2 import Summary
 from tensorflow.core.protobuf import config_pb2
 from tensorflow.core.util.event_pb2 import SessionLog
+from tensorflow.python.client import session as session_lib
 from tensorflow.python.client import timeline
+from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import errors
 from tensorflow.python.framework import meta_graph
 from tensorflow.python.framework import ops
@@ -377,6 +380,154 @@ class CheckpointSaverListener(object):
     pass
 
 
+# The types of the ops that write tensors to a checkpoint, and the index of
+# their first input that is a saved tensor.
+_SAVE_OP_FIRST_TENSOR_INPUT = {"Save": 2, "SaveSlices": 3, "SaveV2": 3}
+# The types of saved tensors whose values cannot be fetched into host memory
+# and fed back, such as the serialized state of a `Dataset` iterator.
+_UNSNAPSHOTTABLE_DTYPES = (dtypes.variant, dtypes.resource)
+
+
+def _get_saved_tensors(graph, saver_def):
+  """Returns the tensors whose values are written by a `Saver`.
+
+  Args:
+    graph: The `Graph` of the `Saver`.
+    saver_def: The `SaverDef` of the `Saver`.
+
+  Returns:
+    A list of the distinct tensors that are inputs of the save ops that run
+    when `saver_def.save_tensor_name` is evaluated.
+  """
+  tensors = []
+  visited = set()
+  pending = [graph.as_graph_element(saver_def.save_tensor_name).op]
+  while pending:
+    op = pending.pop()
+    if op in visited:
+      continue
+    visited.add(op)
+    if op.type in _SAVE_OP_FIRST_TENSOR_INPUT:
+      for tensor in op.inputs[_SAVE_OP_FIRST_TENSOR_INPUT[op.type]:]:
+        if tensor not in tensors:
+          tensors.append(tensor)
+    else:
+      pending.extend(tensor.op for tensor in op.inputs)
+      pending.extend(op.control_inputs)
+  return tensors
+
+
+class _SnapshotSession(session_lib.SessionInterface):
+  """A session that feeds a snapshot of the saved tensors to every run."""
+
+  def __init__(self, session, snapshot):
+    self._session = session
+    self._snapshot = snapshot
+
+  @property
+  def graph(self):
+    return self._session.graph
+
+  @property
+  def graph_def(self):
+    return self._session.graph_def
+
+  @property
+  def sess_str(self):
+    return self._session.sess_str
+
+  def run(self, fetches, feed_dict=None, options=None, run_metadata=None):
+    feeds = dict(self._snapshot)
+    if feed_dict:
+      feeds.update(feed_dict)
+    return self._session.run(
+        fetches, feed_dict=feeds, options=options, run_metadata=run_metadata)
+
+  def partial_run_setup(self, fetches, feeds=None):
+    raise NotImplementedError("partial_run_setup is not supported.")
+
+  def partial_run(self, handle, fetches, feed_dict=None):
+    raise NotImplementedError("partial_run is not supported.")
+
+
+class _AsyncCheckpointWriter(object):
+  """Writes checkpoints from host memory snapshots on a background thread.
+
+  `save()` only copies the values of the saved tensors into host memory; the
+  `Saver` then writes them from a background thread, with the snapshot fed in
+  place of the live values. Checkpoints are written one at a time in the order
+  in which they were requested, so the checkpoint state always ends up
+  pointing at the latest one.
+  """
+
+  def __init__(self, saver, save_path, max_in_flight_saves, saved_tensors):
+    self._saver = saver
+    self._save_path = save_path
+    self._saved_tensors = saved_tensors
+    # Bounds the number of snapshots held in memory.
+    self._in_flight = threading.Semaphore(max_in_flight_saves)
+    self._queue = six.moves.queue.Queue()
+    self._lock = threading.Lock()
+    self._finished = []
+    self._thread = threading.Thread(target=self._run)
+    self._thread.daemon = True
+    self._thread.start()
+
+  def save(self, session, step):
+    """Takes a snapshot of the saved tensors and schedules writing it.
+
+    Blocks while `max_in_flight_saves` checkpoints are still being written.
+
+    Args:
+      session: The `Session` to read the saved tensors with.
+      step: The global step of the checkpoint.
+    """
+    self._in_flight.acquire()
+    values = session.run(self._saved_tensors)
+    self._queue.put((session, step, dict(zip(self._saved_tensors, values))))
+
+  def pop_finished(self):
+    """Returns the `(step, error)` pairs of newly finished saves.
+
+    The pairs are in the order of the saves, and `error` is `None` for the
+    successful ones.
+    """
+    with self._lock:
+      finished, self._finished = self._finished, []
+    return finished
+
+  def wait(self):
+    """Blocks until all scheduled checkpoints are written."""
+    self._queue.join()
+
+  def close(self):
+    self.wait()
+    self._queue.put(None)
+    self._thread.join()
+
+  def _run(self):
+    while True:
+      item = self._queue.get()
+      if item is None:
+        self._queue.task_done()
+        return
+      session, step, snapshot = item
+      error = None
+      try:
+        self._saver.save(
+            _SnapshotSession(session, snapshot),
+            self._save_path,
+            global_step=step)
+      except Exception as e:  # pylint: disable=broad-except
+        error = e
+      # Release the snapshot before allowing another one to be taken.
+      item = snapshot = None
+      with self._lock:
+        self._finished.append((step, error))
+      self._in_flight.release()
+      self._queue.task_done()
+
+
 @tf_export("train.CheckpointSaverHook")
 class CheckpointSaverHook(session_run_hook.SessionRunHook):
   """Saves checkpoints every N steps or seconds."""
@@ -388,7 +539,9 @@ class CheckpointSaverHook(session_run_hook.SessionRunHook):
                saver=None,
                checkpoint_basename="model.ckpt",
                scaffold=None,
-               listeners=None):
+               listeners=None,
+               async_save=False,
+               max_in_flight_saves=1):
     """Initializes a `CheckpointSaverHook`.
 
     Args:
@@ -401,14 +554,29 @@ class CheckpointSaverHook(session_run_hook.SessionRunHook):
       listeners: List of `CheckpointSaverListener` subclass instances.
         Used for callbacks that run immediately before or after this hook saves
         the checkpoint.
+      async_save: `bool`, if `True`, the values of the saved variables are
+        copied into host memory and written to the checkpoint on a background
+        thread while training continues. The `after_save` callbacks of the
+        listeners run in the first `after_run` (or in `end`) after the
+        checkpoint is written.
+      max_in_flight_saves: `int`, with `async_save`, the maximum number of
+        snapshots held in host memory, including the one being written. A save
+        blocks training until fewer snapshots are held. With the default of 1,
+        a save waits for the previous checkpoint to be written before taking
+        its snapshot; use 2 to take a snapshot while the previous one is still
+        being written, at the cost of twice the host memory.
 
     Raises:
       ValueError: One of `save_steps` or `save_secs` should be set.
       ValueError: At most one of saver or scaffold should be set.
+      ValueError: If `max_in_flight_saves` is not positive.
     """
     logging.info("Create CheckpointSaverHook.")
     if saver is not None and scaffold is not None:
       raise ValueError("You cannot provide both saver and scaffold.")
+    if max_in_flight_saves < 1:
+      raise ValueError("max_in_flight_saves must be positive; got %s." %
+                       max_in_flight_saves)
     self._saver = saver
     self._checkpoint_dir = checkpoint_dir
     self._save_path = os.path.join(checkpoint_dir, checkpoint_basename)
@@ -417,6 +585,9 @@ class CheckpointSaverHook(session_run_hook.SessionRunHook):
                                     every_steps=save_steps)
     self._listeners = listeners or []
     self._steps_per_run = 1
+    self._async_save = async_save
+    self._max_in_flight_saves = max_in_flight_saves
+    self._async_writer = None
 
   def _set_steps_per_run(self, steps_per_run):
     self._steps_per_run = steps_per_run
@@ -463,22 +634,71 @@ class CheckpointSaverHook(session_run_hook.SessionRunHook):
         self._timer.update_last_triggered_step(global_step)
         if self._save(run_context.session, global_step):
           run_context.request_stop()
+    if self._async_writer is not None:
+      if self._finish_async_saves(run_context.session):
+        run_context.request_stop()
 
   def end(self, session):
     last_step = session.run(self._global_step_tensor)
     if last_step != self._timer.last_triggered_step():
       self._save(session, last_step)
+    if self._async_writer is not None:
+      self._async_writer.wait()
+      self._finish_async_saves(session)
+      self._async_writer.close()
+      self._async_writer = None
     for l in self._listeners:
       l.end(session, last_step)
 
   def _save(self, session, step):
     """Saves the latest checkpoint, returns should_stop."""
+    if self._async_save and self._async_writer is None:
+      self._create_async_writer(session)
+    if self._async_save:
+      logging.info("Snapshotting checkpoint for %d to save into %s.", step,
+                   self._save_path)
+      for l in self._listeners:
+        l.before_save(session, step)
+      self._async_writer.save(session, step)
+      return False
+
     logging.info("Saving checkpoints for %d into %s.", step, self._save_path)
 
     for l in self._listeners:
       l.before_save(session, step)
 
     self._get_saver().save(session, self._save_path, global_step=step)
+    return self._after_save(session, step)
+
+  def _create_async_writer(self, session):
+    """Creates the writer of asynchronous saves, or disables them."""
+    saver = self._get_saver()
+    saved_tensors = _get_saved_tensors(session.graph, saver.saver_def)
+    unsnapshottable = [
+        tensor.name for tensor in saved_tensors
+        if tensor.dtype.base_dtype in _UNSNAPSHOTTABLE_DTYPES
+    ]
+    if unsnapshottable:
+      logging.warning(
+          "Saving checkpoints synchronously, since the values of %s cannot be "
+          "copied into host memory.", ", ".join(unsnapshottable))
+      self._async_save = False
+      return
+    self._async_writer = _AsyncCheckpointWriter(
+        saver, self._save_path, self._max_in_flight_saves, saved_tensors)
+
+  def _finish_async_saves(self, session):
+    """Runs the callbacks of written asynchronous saves, returns should_stop."""
+    should_stop = False
+    for step, error in self._async_writer.pop_finished():
+      if error is not None:
+        raise error
+      if self._after_save(session, step):
+        should_stop = True
+    return should_stop
+
+  def _after_save(self, session, step):
+    """Runs the callbacks of a written checkpoint, returns should_stop."""
     self._summary_writer.add_session_log(
         SessionLog(
             status=SessionLog.CHECKPOINT, checkpoint_path=self._save_path),
@@ -48,6 +48,7 @@ from tensorflow.python.summary import summary as summary_lib
 from tensorflow.python.summary.writer import writer_cache
 from tensorflow.python.training import basic_session_run_hooks
 from tensorflow.python.training import monitored_session
+from tensorflow.python.training import saver as saver_lib
 from tensorflow.python.training import session_run_hook
 from tensorflow.python.training import training_util
 
@@ -449,6 +450,96 @@ class CheckpointSaverHookTest(test.TestCase):
           'end': 1
       }, listener.get_counts())
 
+  def test_raise_when_max_in_flight_saves_is_not_positive(self):
+    with self.assertRaises(ValueError):
+      basic_session_run_hooks.CheckpointSaverHook(
+          self.model_dir, save_steps=1, async_save=True, max_in_flight_saves=0)
+
+  def test_async_save_calls_listeners_and_writes_latest_checkpoint(self):
+    with ops.Graph().as_default():
+      scaffold = monitored_session.Scaffold()
+      global_step = variables.get_or_create_global_step()
+      train_op = training_util._increment_global_step(1)
+      listener = MockCheckpointSaverListener()
+      hook = basic_session_run_hooks.CheckpointSaverHook(
+          self.model_dir,
+          save_steps=1,
+          scaffold=scaffold,
+          listeners=[listener],
+          async_save=True)
+      with monitored_session.SingularMonitoredSession(
+          hooks=[hook],
+          scaffold=scaffold,
+          checkpoint_dir=self.model_dir) as sess:
+        for _ in range(5):
+          sess.run(train_op)
+        global_step_val = sess.raw_session().run(global_step)
+      listener_counts = listener.get_counts()
+    self.assertEqual(5, global_step_val)
+    self.assertEqual({
+        'begin': 1,
+        'before_save': 6,
+        'after_save': 6,
+        'end': 1
+    }, listener_counts)
+    self.assertEqual(
+        os.path.join(self.model_dir, 'model.ckpt-5'),
+        saver_lib.latest_checkpoint(self.model_dir))
+    self.assertEqual(5,
+                     checkpoint_utils.load_variable(self.model_dir,
+                                                    global_step.name))
+
+  def test_async_save_writes_snapshot(self):
+    with self.graph.as_default():
+      var = variable_scope.get_variable('var', initializer=1.0)
+      resource_var = variable_scope.get_variable(
+          'resource_var', initializer=2.0, use_resource=True)
+      update_op = control_flow_ops.group(
+          state_ops.assign_add(var, 10.0),
+          resource_var.assign_add(10.0))
+      saver = saver_lib.Saver()
+      writer = basic_session_run_hooks._AsyncCheckpointWriter(
+          saver, os.path.join(self.model_dir, 'model.ckpt'), 1,
+          basic_session_run_hooks._get_saved_tensors(self.graph,
+                                                     saver.saver_def))
+      with session_lib.Session() as sess:
+        sess.run(variables_lib.global_variables_initializer())
+        writer.save(sess, 1)
+        # The update may run before or after the checkpoint is written, but
+        # the checkpoint always holds the values at the time of `save()`.
+        sess.run(update_op)
+        writer.close()
+        self.assertEqual([(1, None)], writer.pop_finished())
+        self.assertEqual([11.0, 12.0], sess.run([var, resource_var]))
+    self.assertEqual(1.0, checkpoint_utils.load_variable(self.model_dir, 'var'))
+    self.assertEqual(2.0,
+                     checkpoint_utils.load_variable(self.model_dir,
+                                                    'resource_var'))
+
+  def test_async_save_of_iterator_state_is_synchronous(self):
+    with self.graph.as_default():
+      iterator = dataset_ops.Dataset.range(10).make_initializable_iterator()
+      get_next = iterator.get_next()
+      saver = saver_lib.Saver([self.global_step, iterator])
+      hook = basic_session_run_hooks.CheckpointSaverHook(
+          self.model_dir, save_steps=1, saver=saver, async_save=True)
+      hook.begin()
+      self.scaffold.finalize()
+      with session_lib.Session() as sess:
+        sess.run([self.scaffold.init_op, iterator.initializer])
+        self.assertEqual(0, sess.run(get_next))
+        # The serialized iterator state cannot be fetched and fed back, so
+        # the checkpoint is written before the hook returns.
+        hook.after_create_session(sess, None)
+        self.assertIsNone(hook._async_writer)
+        checkpoint = saver_lib.latest_checkpoint(self.model_dir)
+        self.assertEqual(os.path.join(self.model_dir, 'model.ckpt-0'),
+                         checkpoint)
+        self.assertEqual(1, sess.run(get_next))
+        saver.restore(sess, checkpoint)
+        self.assertEqual(1, sess.run(get_next))
+        hook.end(sess)
+
   def test_listener_with_monitored_session(self):
     with ops.Graph().as_default():
       scaffold = monitored_session.Scaffold()
@@ -18,6 +18,7 @@ from __future__ import division
 from __future__ import print_function
 
 import math
+import weakref
 
 from tensorflow.python.framework import dtypes
 from tensorflow.python.framework import ops
@@ -43,7 +44,8 @@ def _load_and_remap_matrix(ckpt_path,
                            new_col_vocab_file=None,
                            num_row_oov_buckets=0,
                            num_col_oov_buckets=0,
-                           max_rows_in_memory=-1):
+                           max_rows_in_memory=-1,
+                           full_row_remapping=None):
   """Loads a 2-D (matrix) `Tensor` from checkpoint.
 
   Generates 1D-remappings for rows and columns using the
@@ -106,6 +108,11 @@ def _load_and_remap_matrix(ckpt_path,
       the checkpoint at once. If less than or equal to 0, the entire matrix will
       be loaded into memory. Setting this arg trades increased disk reads for
       lower memory usage.
+    full_row_remapping: Optional 1-D `int64` `Tensor` holding the row
+      remapping of the whole new row vocabulary, as generated by
+      `GenerateVocabRemapping` with a `new_vocab_offset` of 0. If given, the
+      rows of this partition are sliced from it instead of reading the row
+      vocab files again.
 
   Returns:
     A Tensor of shape `[num_rows_to_load + num_row_oov_buckets,
@@ -147,7 +154,12 @@ def _load_and_remap_matrix(ckpt_path,
         "instead.")
 
   num_rows_present = num_rows_to_load
-  if remap_rows:
+  if remap_rows and full_row_remapping is not None:
+    row_remapping = array_ops.slice(full_row_remapping, [new_row_vocab_offset],
+                                    [num_rows_to_load])
+    num_rows_present = math_ops.reduce_sum(
+        math_ops.cast(math_ops.greater_equal(row_remapping, 0), dtypes.int32))
+  elif remap_rows:
     row_remapping, num_rows_present = (
         gen_checkpoint_ops.generate_vocab_remapping(
             new_vocab_file=new_row_vocab_file,
@@ -338,6 +350,25 @@ def _load_and_remap_matrix_initializer(ckpt_path,
         "initializer must be callable, instead of being {} of type {}.".format(
             initializer, type(initializer)))
 
+  # The row remapping of the whole new vocabulary is generated once per graph
+  # and sliced for each partition, so that the vocab files are read and hashed
+  # once rather than once per partition.
+  full_row_remappings = weakref.WeakKeyDictionary()
+
+  def _get_full_row_remapping():
+    if not (old_row_vocab_file and new_row_vocab_file):
+      return None
+    graph = ops.get_default_graph()
+    if graph not in full_row_remappings:
+      full_row_remappings[graph], _ = (
+          gen_checkpoint_ops.generate_vocab_remapping(
+              new_vocab_file=new_row_vocab_file,
+              old_vocab_file=old_row_vocab_file,
+              new_vocab_offset=0,
+              num_new_vocab=new_row_vocab_size,
+              old_vocab_size=old_row_vocab_size))
+    return full_row_remappings[graph]
+
   def _initializer(shape, dtype=dtypes.float32, partition_info=None):
     """Variable initializer.
 
@@ -410,7 +441,9 @@ def _load_and_remap_matrix_initializer(ckpt_path,
         new_col_vocab_file=new_col_vocab_file,
         num_row_oov_buckets=row_oov_buckets_to_use,
         num_col_oov_buckets=num_col_oov_buckets,
-        max_rows_in_memory=max_rows_in_memory)
+        max_rows_in_memory=max_rows_in_memory,
+        full_row_remapping=(_get_full_row_remapping()
+                            if partition_info is not None else None))
 
   return _initializer
 
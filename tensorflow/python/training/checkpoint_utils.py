@@ -29,6 +29,7 @@ from tensorflow.python.ops import variable_scope as vs
 from tensorflow.python.ops import variables
 from tensorflow.python.platform import gfile
 from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.training import delta_checkpoint
 from tensorflow.python.training import saver
 from tensorflow.python.util.tf_export import tf_export
 
@@ -50,7 +51,8 @@ def load_checkpoint(ckpt_dir_or_file):
       file.
 
   Returns:
-    `CheckpointReader` object.
+    `CheckpointReader` object, or a `DeltaCheckpointReader` with the same
+    reading methods if the checkpoint is a delta checkpoint.
 
   Raises:
     ValueError: If `ckpt_dir_or_file` resolves to a directory with no
@@ -60,6 +62,8 @@ def load_checkpoint(ckpt_dir_or_file):
   if filename is None:
     raise ValueError("Couldn't find 'checkpoint' file or checkpoints in "
                      "given directory %s" % ckpt_dir_or_file)
+  if delta_checkpoint.is_delta_checkpoint(filename):
+    return delta_checkpoint.DeltaCheckpointReader(filename)
   return pywrap_tensorflow.NewCheckpointReader(filename)
 
 
@@ -0,0 +1,562 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Delta checkpoints, which only store the changed rows of large variables.
+
+A delta checkpoint is a regular V2 checkpoint bundle plus a `<prefix>.delta`
+file holding the name of its parent checkpoint. For each tracked variable the
+bundle holds the indices and values of the rows that changed since the parent
+was written; every other variable is stored in full. Following the parents
+leads to a full checkpoint, and the value of a variable is the value in that
+full checkpoint with the rows of each delta applied in order.
+
+`Saver.restore()` and `tf.train.load_variable()` read delta checkpoints
+transparently, and `compact_checkpoint()` rewrites a chain of deltas as a full
+checkpoint.
+"""
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os.path
+import uuid
+
+import numpy as np
+
+from tensorflow.python import pywrap_tensorflow
+from tensorflow.python.client import session as session_lib
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.framework import tensor_util
+from tensorflow.python.lib.io import file_io
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import gen_io_ops
+from tensorflow.python.ops import io_ops
+from tensorflow.python.ops import resource_variable_ops
+from tensorflow.python.ops import state_ops
+from tensorflow.python.ops import variables
+from tensorflow.python.platform import tf_logging as logging
+from tensorflow.python.training import adadelta
+from tensorflow.python.training import adagrad
+from tensorflow.python.training import adagrad_da
+from tensorflow.python.training import ftrl
+from tensorflow.python.training import gradient_descent
+from tensorflow.python.training import momentum
+from tensorflow.python.training import proximal_adagrad
+from tensorflow.python.training import proximal_gradient_descent
+from tensorflow.python.training import rmsprop
+from tensorflow.python.training import saveable_object
+from tensorflow.python.training import saver as saver_lib
+from tensorflow.python.training import training_util
+from tensorflow.python.util import compat
+
+# Suffix of the file that marks a delta checkpoint and names its parent.
+_DELTA_SUFFIX = ".delta"
+# Suffixes of the keys of the changed rows of a tracked variable.
+_ROWS_SUFFIX = "/.DELTA_ROWS"
+_VALUES_SUFFIX = "/.DELTA_VALUES"
+# Optimizers whose update for an `IndexedSlices` gradient only changes the
+# gradient's rows of the variable and of its slots. Others, like the default
+# `AdamOptimizer`, may update every row.
+_ROW_LOCAL_OPTIMIZERS = (
+    adadelta.AdadeltaOptimizer,
+    adagrad.AdagradOptimizer,
+    adagrad_da.AdagradDAOptimizer,
+    ftrl.FtrlOptimizer,
+    gradient_descent.GradientDescentOptimizer,
+    momentum.MomentumOptimizer,
+    proximal_adagrad.ProximalAdagradOptimizer,
+    proximal_gradient_descent.ProximalGradientDescentOptimizer,
+    rmsprop.RMSPropOptimizer,
+)
+
+
+def is_delta_checkpoint(checkpoint_prefix):
+  """Returns whether `checkpoint_prefix` is a delta checkpoint."""
+  return file_io.file_exists(
+      compat.as_str(checkpoint_prefix) + _DELTA_SUFFIX)
+
+
+def get_checkpoint_chain(checkpoint_prefix):
+  """Returns the checkpoints needed to read `checkpoint_prefix`.
+
+  Args:
+    checkpoint_prefix: The prefix of a full or delta checkpoint.
+
+  Returns:
+    A list of checkpoint prefixes, starting with a full checkpoint, followed
+    by the deltas applied to it up to `checkpoint_prefix`.
+  """
+  chain = [compat.as_str(checkpoint_prefix)]
+  while is_delta_checkpoint(chain[-1]):
+    parent = compat.as_str(
+        file_io.read_file_to_string(chain[-1] + _DELTA_SUFFIX)).strip()
+    chain.append(os.path.join(os.path.dirname(chain[-1]), parent))
+  chain.reverse()
+  return chain
+
+
+class DeltaCheckpointReader(object):
+  """Reads a chain of delta checkpoints like a `CheckpointReader`.
+
+  The values returned by `get_tensor()` are those of the full checkpoint at
+  the start of the chain, with the changed rows of the deltas applied.
+  """
+
+  def __init__(self, checkpoint_prefix):
+    self._readers = [
+        pywrap_tensorflow.NewCheckpointReader(prefix)
+        for prefix in get_checkpoint_chain(checkpoint_prefix)
+    ]
+
+  def has_tensor(self, name):
+    return self._readers[0].has_tensor(name)
+
+  def get_variable_to_shape_map(self):
+    return self._readers[0].get_variable_to_shape_map()
+
+  def get_variable_to_dtype_map(self):
+    return self._readers[0].get_variable_to_dtype_map()
+
+  def changed_tensor_names(self):
+    """Returns the names of the tensors that are stored in some delta."""
+    names = set()
+    for reader in self._readers[1:]:
+      for name in reader.get_variable_to_shape_map():
+        if name.endswith(_ROWS_SUFFIX):
+          names.add(name[:-len(_ROWS_SUFFIX)])
+        elif not name.endswith(_VALUES_SUFFIX):
+          names.add(name)
+    return names
+
+  def get_tensor(self, name):
+    """Returns the value of the tensor `name` at the end of the chain."""
+    # Finds the last checkpoint storing the full value, and the deltas after
+    # it.
+    deltas = []
+    value = None
+    for reader in reversed(self._readers):
+      if reader.has_tensor(name + _ROWS_SUFFIX):
+        deltas.append(reader)
+      elif reader.has_tensor(name):
+        value = reader.get_tensor(name)
+        break
+    if value is None:
+      # Raises the error of a missing tensor.
+      return self._readers[0].get_tensor(name)
+    if deltas and not value.flags.writeable:
+      value = value.copy()
+    for reader in reversed(deltas):
+      value[reader.get_tensor(name + _ROWS_SUFFIX)] = reader.get_tensor(
+          name + _VALUES_SUFFIX)
+    return value
+
+  def get_tensor_view(self, name):
+    """Returns a read-only view of the tensor `name` at the end of the chain.
+
+    Tensors that are not stored in any delta are memory mapped from the full
+    checkpoint, as by `CheckpointReader.get_tensor_view()`. Changed tensors
+    are merged in memory, as by `get_tensor()`.
+    """
+    if name not in self.changed_tensor_names():
+      return self._readers[0].get_tensor_view(name)
+    value = self.get_tensor(name)
+    value.flags.writeable = False
+    return value
+
+  def get_slice(self, name, begin, size):
+    """Reads a slice of the tensor `name` at the end of the chain.
+
+    `begin` and `size` are as for `CheckpointReader.get_slice()`. Only the
+    rows in the slice are read for tensors that are not stored in any delta.
+
+    Raises:
+      ValueError: If the slice is not within the tensor.
+    """
+    if name not in self.changed_tensor_names():
+      return self._readers[0].get_slice(name, begin, size)
+    value = self.get_tensor(name)
+    begin, size = list(begin), list(size)
+    if len(begin) != len(size) or len(begin) > value.ndim:
+      raise ValueError("begin %s and size %s do not match the shape %s of %s" %
+                       (begin, size, value.shape, compat.as_str(name)))
+    slices = []
+    for dim, dim_size in enumerate(value.shape):
+      start = begin[dim] if dim < len(begin) else 0
+      length = size[dim] if dim < len(size) else -1
+      if length == -1:
+        length = dim_size - start
+      if start < 0 or length < 0 or start + length > dim_size:
+        raise ValueError("Slice with begin %s and size %s is out of bounds for "
+                         "%s of shape %s" %
+                         (begin, size, compat.as_str(name), value.shape))
+      slices.append(slice(start, start + length))
+    return np.array(value[tuple(slices)])
+
+
+def _apply_slice_spec(value, slice_spec):
+  """Returns the slice of `value` described by a `SaveSliceInfo.spec`."""
+  if not slice_spec:
+    return value
+  index = []
+  for dim in slice_spec.split()[-1].split(":"):
+    if dim == "-":
+      index.append(slice(None))
+    else:
+      start, length = [int(x) for x in dim.split(",")]
+      index.append(slice(start, start + length))
+  return value[tuple(index)]
+
+
+def _get_restore_ops(graph, saver_def):
+  """Returns the `RestoreV2` ops run by the restore op of a `Saver`."""
+  restore_ops = []
+  visited = set()
+  pending = [graph.as_graph_element(saver_def.restore_op_name)]
+  while pending:
+    op = pending.pop()
+    if op in visited:
+      continue
+    visited.add(op)
+    if op.type == "RestoreV2":
+      restore_ops.append(op)
+    else:
+      pending.extend(tensor.op for tensor in op.inputs)
+      pending.extend(op.control_inputs)
+  return restore_ops
+
+
+def restore(sess, saver_def, checkpoint_prefix):
+  """Runs the restore op of a `Saver` on a delta checkpoint.
+
+  The restore op reads the full checkpoint at the start of the chain, and the
+  tensors that changed in a delta are fed with their merged values. This only
+  uses existing ops, so it works on finalized graphs.
+
+  Args:
+    sess: The `Session` to restore the variables in.
+    saver_def: The `SaverDef` of the `Saver`.
+    checkpoint_prefix: The prefix of a delta checkpoint.
+  """
+  chain = get_checkpoint_chain(checkpoint_prefix)
+  reader = DeltaCheckpointReader(checkpoint_prefix)
+  changed = reader.changed_tensor_names()
+  feed_dict = {saver_def.filename_tensor_name: chain[0]}
+  # The slices of a partitioned variable share the merged value.
+  values = {}
+  for op in _get_restore_ops(sess.graph, saver_def):
+    names = tensor_util.constant_value(op.inputs[1])
+    slice_specs = tensor_util.constant_value(op.inputs[2])
+    for output, name, slice_spec in zip(op.outputs, names, slice_specs):
+      name = compat.as_str(name)
+      if name in changed:
+        if name not in values:
+          values[name] = reader.get_tensor(name)
+        feed_dict[output] = _apply_slice_spec(values[name],
+                                              compat.as_str(slice_spec))
+  sess.run(saver_def.restore_op_name, feed_dict)
+
+
+def compact_checkpoint(checkpoint_prefix, output_prefix):
+  """Writes the values of a chain of delta checkpoints as a full checkpoint.
+
+  The tensors are written one at a time to temporary checkpoints, which are
+  then merged, so only one tensor is held in memory at a time.
+
+  Args:
+    checkpoint_prefix: The prefix of a full or delta checkpoint.
+    output_prefix: The prefix of the full checkpoint to write.
+
+  Returns:
+    `output_prefix`.
+  """
+  reader = DeltaCheckpointReader(checkpoint_prefix)
+  dtype_map = reader.get_variable_to_dtype_map()
+  names = sorted(dtype_map)
+  temp_dir = "%s_temp_%s" % (output_prefix, uuid.uuid4().hex)
+  with ops.Graph().as_default():
+    prefix = array_ops.placeholder(dtypes.string, [])
+    values = [array_ops.placeholder(dtype_map[name]) for name in names]
+    save_ops = [
+        io_ops.save_v2(prefix, [name], [""], [value])
+        for name, value in zip(names, values)
+    ]
+    prefixes = array_ops.placeholder(dtypes.string, [None])
+    merge_op = gen_io_ops.merge_v2_checkpoints(
+        prefixes, output_prefix, delete_old_dirs=True)
+    with session_lib.Session() as sess:
+      temp_prefixes = []
+      for i, name in enumerate(names):
+        temp_prefixes.append(os.path.join(temp_dir, "part-%d" % i))
+        sess.run(save_ops[i], {
+            prefix: temp_prefixes[-1],
+            values[i]: reader.get_tensor(name)
+        })
+      sess.run(merge_op, {prefixes: temp_prefixes})
+  meta_graph_filename = checkpoint_prefix + ".meta"
+  if file_io.file_exists(meta_graph_filename):
+    file_io.copy(meta_graph_filename, output_prefix + ".meta", overwrite=True)
+  if is_delta_checkpoint(output_prefix):
+    file_io.delete_file(output_prefix + _DELTA_SUFFIX)
+  return output_prefix
+
+
+class _ChangedRowsSaveable(saveable_object.SaveableObject):
+  """Saves the indices and values of the rows marked in `dirty`."""
+
+  def __init__(self, variable, dirty, name):
+    rows = array_ops.reshape(array_ops.where(dirty), [-1])
+    if isinstance(variable, resource_variable_ops.ResourceVariable):
+      values = variable.sparse_read(rows)
+    else:
+      values = array_ops.gather(variable, rows)
+    specs = [
+        saveable_object.SaveSpec(rows, "", name + _ROWS_SUFFIX),
+        saveable_object.SaveSpec(values, "", name + _VALUES_SUFFIX),
+    ]
+    super(_ChangedRowsSaveable, self).__init__(variable, specs, name)
+
+  def restore(self, restored_tensors, restored_shapes):
+    # Deltas are restored by `restore()`, which merges them with their full
+    # checkpoint.
+    return control_flow_ops.no_op()
+
+
+class DeltaCheckpointSaver(object):
+  """Saves full checkpoints, and delta checkpoints in between.
+
+  For each tracked variable, typically a large embedding table, the saver
+  keeps a flag per row that is set by the ops returned by `mark_dirty()` or
+  `track_gradients()`. A delta checkpoint only stores the flagged rows of the
+  tracked variables, and the flags are cleared after every save. After
+  `max_delta_chain_length` deltas, the next save writes a full checkpoint.
+
+  ```python
+  saver = DeltaCheckpointSaver([embeddings], max_delta_chain_length=10)
+  grads_and_vars = optimizer.compute_gradients(loss)
+  train_op = control_flow_ops.group(
+      optimizer.apply_gradients(grads_and_vars),
+      saver.track_gradients(grads_and_vars, optimizer))
+  ...
+  saver.save(sess, os.path.join(model_dir, "model.ckpt"), global_step=step)
+  ```
+
+  The checkpoints can be restored with a regular `Saver` over the same
+  variables. No training step may run concurrently with `save()`, or the rows
+  it changes may be missing from the next delta.
+
+  Delta checkpoints only help if each step changes a few rows. Optimizers like
+  `AdamOptimizer` apply a sparse gradient by decaying the slots of every row
+  and then updating every row of the variable, so `track_gradients()` marks
+  all rows of the variables they train and each delta holds them in full.
+  """
+
+  def __init__(self,
+               tracked_variables,
+               var_list=None,
+               max_delta_chain_length=10,
+               max_chains_to_keep=2,
+               sharded=False):
+    """Creates a `DeltaCheckpointSaver`.
+
+    Args:
+      tracked_variables: A list of the `Variable`s whose changed rows are saved
+        in delta checkpoints. They must not be partitioned, and must have a
+        static number of rows.
+      var_list: The variables to save, as for `Saver`. Defaults to all
+        saveable objects.
+      max_delta_chain_length: The maximum number of delta checkpoints written
+        after each full checkpoint.
+      max_chains_to_keep: The number of full checkpoints, with their deltas,
+        to keep. Older checkpoints are deleted.
+      sharded: Whether to shard the checkpoints, as for `Saver`.
+
+    Raises:
+      ValueError: If a tracked variable is not saved by the saver, or does not
+        have a static number of rows.
+      ValueError: If `max_delta_chain_length` or `max_chains_to_keep` are not
+        positive.
+    """
+    if max_delta_chain_length < 1:
+      raise ValueError("max_delta_chain_length must be positive; got %s." %
+                       max_delta_chain_length)
+    if max_chains_to_keep < 1:
+      raise ValueError("max_chains_to_keep must be positive; got %s." %
+                       max_chains_to_keep)
+    self._max_delta_chain_length = max_delta_chain_length
+    self._max_chains_to_keep = max_chains_to_keep
+    if var_list is None:
+      var_list = variables._all_saveable_objects()  # pylint: disable=protected-access
+    if isinstance(var_list, dict):
+      names_to_saveables = dict(var_list)
+    else:
+      names_to_saveables = saver_lib.BaseSaverBuilder.OpListToDict(
+          var_list, convert_variable_to_tensor=False)
+    saved_names = {
+        id(value): name for name, value in names_to_saveables.items()
+    }
+
+    self._saver = saver_lib.Saver(var_list=var_list, sharded=sharded)
+    self._dirty = {}
+    delta_var_list = dict(names_to_saveables)
+    with ops.name_scope("delta_checkpoint"):
+      for variable in tracked_variables:
+        name = saved_names.get(id(variable))
+        if name is None:
+          raise ValueError(
+              "Tracked variable %s is not saved as a whole by the saver." %
+              variable.name)
+        num_rows = variable.get_shape()[0].value
+        if num_rows is None:
+          raise ValueError("Tracked variable %s does not have a static number "
+                           "of rows." % variable.name)
+        with ops.colocate_with(variable.op):
+          dirty = variables.Variable(
+              array_ops.zeros([num_rows], dtypes.bool),
+              trainable=False,
+              collections=[ops.GraphKeys.LOCAL_VARIABLES],
+              name="dirty_rows")
+          delta_var_list[name] = _ChangedRowsSaveable(variable, dirty, name)
+        self._dirty[variable] = dirty
+      self._delta_saver = saver_lib.Saver(
+          var_list=delta_var_list, sharded=sharded)
+      self._clear_dirty_op = control_flow_ops.group(*[
+          state_ops.assign(dirty, array_ops.zeros_like(dirty))
+          for dirty in self._dirty.values()
+      ])
+    # The checkpoints written since the last full checkpoint, in order, for
+    # each kept full checkpoint.
+    self._chains = []
+
+  def mark_dirty(self, variable, indices):
+    """Returns an op that marks rows of a tracked variable as changed.
+
+    Args:
+      variable: A tracked `Variable`.
+      indices: A `Tensor` of the indices of the changed rows.
+
+    Returns:
+      An `Operation`.
+    """
+    dirty = self._dirty[variable]
+    return state_ops.scatter_update(
+        dirty, indices, array_ops.ones_like(indices, dtype=dtypes.bool)).op
+
+  def track_gradients(self, grads_and_vars, optimizer=None,
+                      row_local_updates=None):
+    """Returns an op that marks the rows changed by applying gradients.
+
+    Rows with an `IndexedSlices` gradient are marked in the tracked variables,
+    and in their tracked slot variables of `optimizer`. A dense gradient, or an
+    optimizer whose sparse updates are not row-local, marks every row.
+
+    Args:
+      grads_and_vars: A list of `(gradient, variable)` pairs, as returned by
+        `Optimizer.compute_gradients()`.
+      optimizer: An optional `Optimizer` whose slot variables are tracked.
+      row_local_updates: Whether applying an `IndexedSlices` gradient only
+        changes its rows of the variable and of the slots of `optimizer`.
+        Defaults to `True` for the core optimizers known to do so (for example
+        `AdagradOptimizer`, `MomentumOptimizer` and `FtrlOptimizer`) and when
+        `optimizer` is `None`, and to `False` otherwise, such as for
+        `AdamOptimizer`.
+
+    Returns:
+      An `Operation`.
+    """
+    if row_local_updates is None:
+      row_local_updates = (
+          optimizer is None or isinstance(optimizer, _ROW_LOCAL_OPTIMIZERS))
+    mark_ops = []
+    for grad, variable in grads_and_vars:
+      if grad is None:
+        continue
+      tracked = [variable]
+      if optimizer is not None:
+        for slot_name in optimizer.get_slot_names():
+          tracked.append(optimizer.get_slot(variable, slot_name))
+      for v in tracked:
+        if v not in self._dirty:
+          continue
+        if isinstance(grad, ops.IndexedSlices) and row_local_updates:
+          mark_ops.append(self.mark_dirty(v, grad.indices))
+        else:
+          dirty = self._dirty[v]
+          mark_ops.append(
+              state_ops.assign(dirty, array_ops.ones_like(dirty)).op)
+    return control_flow_ops.group(*mark_ops)
+
+  def save(self, sess, save_path, global_step=None, write_meta_graph=True):
+    """Saves a full or a delta checkpoint.
+
+    Args:
+      sess: The `Session` to save the variables from.
+      save_path: The prefix of the checkpoint files, as for `Saver.save()`.
+      global_step: If provided, the global step number is appended to
+        `save_path`.
+      write_meta_graph: Whether to write the `MetaGraphDef` of a regular
+        `Saver` over the saved variables.
+
+    Returns:
+      The prefix of the written checkpoint.
+    """
+    if global_step is not None:
+      if not isinstance(global_step, compat.integral_types):
+        global_step = training_util.global_step(sess, global_step)
+      checkpoint_file = "%s-%d" % (save_path, global_step)
+    else:
+      checkpoint_file = save_path
+
+    if (not self._chains or
+        len(self._chains[-1]) > self._max_delta_chain_length):
+      path = self._saver.save(
+          sess, checkpoint_file, write_meta_graph=False, write_state=False)
+      if is_delta_checkpoint(path):
+        file_io.delete_file(path + _DELTA_SUFFIX)
+      self._chains.append([path])
+    else:
+      path = self._delta_saver.save(
+          sess, checkpoint_file, write_meta_graph=False, write_state=False)
+      file_io.atomic_write_string_to_file(
+          path + _DELTA_SUFFIX, os.path.basename(self._chains[-1][-1]))
+      self._chains[-1].append(path)
+    sess.run(self._clear_dirty_op)
+
+    while len(self._chains) > self._max_chains_to_keep:
+      for prefix in self._chains.pop(0):
+        logging.info("Deleting checkpoint %s.", prefix)
+        saver_lib.remove_checkpoint(prefix)
+        if is_delta_checkpoint(prefix):
+          file_io.delete_file(prefix + _DELTA_SUFFIX)
+    saver_lib.update_checkpoint_state(
+        os.path.dirname(path),
+        path,
+        all_model_checkpoint_paths=[p for chain in self._chains for p in chain])
+
+    if write_meta_graph:
+      with sess.graph.as_default():
+        self._saver.export_meta_graph(path + ".meta")
+    return path
+
+  def restore(self, sess, save_path):
+    """Restores a full or delta checkpoint, and continues its chain.
+
+    Args:
+      sess: The `Session` to restore the variables in.
+      save_path: The prefix of the checkpoint to restore.
+    """
+    self._saver.restore(sess, save_path)
+    sess.run(self._clear_dirty_op)
+    self._chains = [get_checkpoint_chain(save_path)]
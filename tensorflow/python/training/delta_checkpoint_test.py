@@ -0,0 +1,225 @@
+# Copyright 2018 The TensorFlow Authors. All Rights Reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ==============================================================================
+"""Tests for delta checkpoints."""
+
+from __future__ import absolute_import
+from __future__ import division
+from __future__ import print_function
+
+import os
+import numpy as np
+
+from tensorflow.python import pywrap_tensorflow
+from tensorflow.python.framework import dtypes
+from tensorflow.python.framework import ops
+from tensorflow.python.ops import array_ops
+from tensorflow.python.ops import control_flow_ops
+from tensorflow.python.ops import embedding_ops
+from tensorflow.python.ops import math_ops
+from tensorflow.python.ops import resource_variable_ops
+from tensorflow.python.ops import state_ops
+from tensorflow.python.ops import variables
+from tensorflow.python.platform import test
+from tensorflow.python.training import adagrad
+from tensorflow.python.training import adam
+from tensorflow.python.training import checkpoint_utils
+from tensorflow.python.training import delta_checkpoint
+from tensorflow.python.training import saver as saver_lib
+
+
+class DeltaCheckpointTest(test.TestCase):
+
+  def _prefix(self):
+    return os.path.join(self.get_temp_dir(), "model.ckpt")
+
+  def testDeltaChain(self):
+    with ops.Graph().as_default():
+      emb = variables.Variable(np.zeros([10, 3], np.float32), name="emb")
+      res = resource_variable_ops.ResourceVariable(
+          np.zeros([4, 2], np.float32), name="res")
+      dense = variables.Variable([1.0, 2.0], name="dense")
+      saver = delta_checkpoint.DeltaCheckpointSaver(
+          [emb, res], max_delta_chain_length=2)
+      plain_saver = saver_lib.Saver([emb, res, dense])
+
+      rows = array_ops.placeholder(dtypes.int64, [None])
+      update_op = control_flow_ops.group(
+          state_ops.scatter_add(emb, rows,
+                                array_ops.ones([array_ops.size(rows), 3])),
+          saver.mark_dirty(emb, rows),
+          res.assign_add([[0.0, 0.0], [0.0, 0.0], [1.0, 1.0], [0.0, 0.0]]),
+          saver.mark_dirty(res, [2]),
+          dense.assign_add([1.0, 1.0]))
+
+      with self.test_session() as sess:
+        sess.run([
+            variables.global_variables_initializer(),
+            variables.local_variables_initializer()
+        ])
+        path0 = saver.save(sess, self._prefix(), global_step=0)
+        self.assertFalse(delta_checkpoint.is_delta_checkpoint(path0))
+
+        sess.run(update_op, {rows: [1, 3]})
+        path1 = saver.save(sess, self._prefix(), global_step=1)
+        self.assertTrue(delta_checkpoint.is_delta_checkpoint(path1))
+        reader = pywrap_tensorflow.NewCheckpointReader(path1)
+        self.assertFalse(reader.has_tensor("emb"))
+        self.assertAllEqual([1, 3], reader.get_tensor("emb/.DELTA_ROWS"))
+        self.assertAllEqual([2], reader.get_tensor("res/.DELTA_ROWS"))
+        self.assertAllEqual([2.0, 3.0], reader.get_tensor("dense"))
+
+        sess.run(update_op, {rows: [3, 5]})
+        path2 = saver.save(sess, self._prefix(), global_step=2)
+        self.assertEqual([path0, path1, path2],
+                         delta_checkpoint.get_checkpoint_chain(path2))
+        expected_emb, expected_res = sess.run([emb, res])
+        self.assertAllEqual([0, 1, 0, 2, 0, 1, 0, 0, 0, 0], expected_emb[:, 0])
+
+        # The chain is full, so the next checkpoint is a full one.
+        sess.run(update_op, {rows: [0]})
+        path3 = saver.save(sess, self._prefix(), global_step=3)
+        self.assertFalse(delta_checkpoint.is_delta_checkpoint(path3))
+        self.assertEqual(path3, saver_lib.latest_checkpoint(
+            self.get_temp_dir()))
+
+        self.assertAllEqual(expected_emb,
+                            checkpoint_utils.load_variable(path2, "emb"))
+        self.assertAllEqual(expected_res,
+                            checkpoint_utils.load_variable(path2, "res"))
+        self.assertAllEqual([3.0, 4.0],
+                            checkpoint_utils.load_variable(path2, "dense"))
+        delta_reader = checkpoint_utils.load_checkpoint(path2)
+        self.assertAllEqual(expected_emb[1:4],
+                            delta_reader.get_slice("emb", [1], [3]))
+        self.assertAllEqual([4.0], delta_reader.get_slice("dense", [1], [1]))
+        self.assertAllEqual([3.0, 4.0], delta_reader.get_tensor_view("dense"))
+
+        plain_saver.restore(sess, path2)
+        self.assertAllEqual(expected_emb, sess.run(emb))
+        self.assertAllEqual(expected_res, sess.run(res))
+        self.assertAllEqual([3.0, 4.0], sess.run(dense))
+
+    compacted = delta_checkpoint.compact_checkpoint(
+        path2, self._prefix() + "-compacted")
+    self.assertFalse(delta_checkpoint.is_delta_checkpoint(compacted))
+    reader = pywrap_tensorflow.NewCheckpointReader(compacted)
+    self.assertAllEqual(expected_emb, reader.get_tensor("emb"))
+    self.assertAllEqual(expected_res, reader.get_tensor("res"))
+    self.assertAllEqual([3.0, 4.0], reader.get_tensor("dense"))
+    self.assertFalse(reader.has_tensor("emb/.DELTA_ROWS"))
+
+  def testOldChainsAreDeleted(self):
+    with ops.Graph().as_default():
+      emb = variables.Variable(np.zeros([4, 2], np.float32), name="emb")
+      saver = delta_checkpoint.DeltaCheckpointSaver(
+          [emb], max_delta_chain_length=1, max_chains_to_keep=1)
+      with self.test_session() as sess:
+        sess.run([
+            variables.global_variables_initializer(),
+            variables.local_variables_initializer()
+        ])
+        paths = [
+            saver.save(sess, self._prefix(), global_step=step)
+            for step in range(4)
+        ]
+    self.assertFalse(saver_lib.checkpoint_exists(paths[0]))
+    self.assertFalse(saver_lib.checkpoint_exists(paths[1]))
+    self.assertTrue(delta_checkpoint.is_delta_checkpoint(paths[3]))
+    state = saver_lib.get_checkpoint_state(self.get_temp_dir())
+    self.assertEqual(paths[3], state.model_checkpoint_path)
+    self.assertEqual(paths[2:], list(state.all_model_checkpoint_paths))
+
+  def testTrackGradients(self):
+    with ops.Graph().as_default():
+      emb = variables.Variable(np.ones([6, 2], np.float32), name="emb")
+      loss = math_ops.reduce_sum(embedding_ops.embedding_lookup(emb, [1, 4]))
+      optimizer = adagrad.AdagradOptimizer(0.1)
+      grads_and_vars = optimizer.compute_gradients(loss)
+      apply_op = optimizer.apply_gradients(grads_and_vars)
+      accumulator = optimizer.get_slot(emb, "accumulator")
+      saver = delta_checkpoint.DeltaCheckpointSaver([emb, accumulator])
+      train_op = control_flow_ops.group(
+          apply_op, saver.track_gradients(grads_and_vars, optimizer))
+
+      with self.test_session() as sess:
+        sess.run([
+            variables.global_variables_initializer(),
+            variables.local_variables_initializer()
+        ])
+        saver.save(sess, self._prefix(), global_step=0)
+        sess.run(train_op)
+        path = saver.save(sess, self._prefix(), global_step=1)
+        expected_emb, expected_accumulator = sess.run([emb, accumulator])
+
+    reader = pywrap_tensorflow.NewCheckpointReader(path)
+    self.assertAllEqual([1, 4], reader.get_tensor("emb/.DELTA_ROWS"))
+    self.assertAllEqual([1, 4],
+                        reader.get_tensor(accumulator.op.name + "/.DELTA_ROWS"))
+    self.assertAllEqual(expected_emb,
+                        checkpoint_utils.load_variable(path, "emb"))
+    self.assertAllEqual(
+        expected_accumulator,
+        checkpoint_utils.load_variable(path, accumulator.op.name))
+
+  def testTrackGradientsWithAdam(self):
+    with ops.Graph().as_default():
+      emb = variables.Variable(np.ones([6, 2], np.float32), name="emb")
+      loss = math_ops.reduce_sum(embedding_ops.embedding_lookup(emb, [1, 4]))
+      optimizer = adam.AdamOptimizer(0.1)
+      grads_and_vars = optimizer.compute_gradients(loss)
+      apply_op = optimizer.apply_gradients(grads_and_vars)
+      m = optimizer.get_slot(emb, "m")
+      saver = delta_checkpoint.DeltaCheckpointSaver([emb, m])
+      train_op = control_flow_ops.group(
+          apply_op, saver.track_gradients(grads_and_vars, optimizer))
+
+      with self.test_session() as sess:
+        sess.run([
+            variables.global_variables_initializer(),
+            variables.local_variables_initializer()
+        ])
+        saver.save(sess, self._prefix(), global_step=0)
+        # After the first step `m` is non-zero in rows 1 and 4, so the second
+        # step changes the other rows of `emb` too.
+        sess.run(train_op)
+        saver.save(sess, self._prefix(), global_step=1)
+        sess.run(train_op)
+        path = saver.save(sess, self._prefix(), global_step=2)
+        expected_emb, expected_m = sess.run([emb, m])
+
+    # Adam updates every row, so every row is marked.
+    reader = pywrap_tensorflow.NewCheckpointReader(path)
+    self.assertAllEqual(range(6), reader.get_tensor("emb/.DELTA_ROWS"))
+    self.assertAllEqual(range(6),
+                        reader.get_tensor(m.op.name + "/.DELTA_ROWS"))
+    self.assertAllClose(expected_emb,
+                        checkpoint_utils.load_variable(path, "emb"))
+    self.assertAllClose(expected_m, checkpoint_utils.load_variable(
+        path, m.op.name))
+
+  def testInvalidArguments(self):
+    with ops.Graph().as_default():
+      emb = variables.Variable(np.zeros([4, 2], np.float32), name="emb")
+      other = variables.Variable(np.zeros([4, 2], np.float32), name="other")
+      with self.assertRaisesRegexp(ValueError, "is not saved"):
+        delta_checkpoint.DeltaCheckpointSaver([other], var_list=[emb])
+      with self.assertRaises(ValueError):
+        delta_checkpoint.DeltaCheckpointSaver([emb], max_delta_chain_length=0)
+      with self.assertRaises(ValueError):
+        delta_checkpoint.DeltaCheckpointSaver([emb], max_chains_to_keep=0)
+
+
+if __name__ == "__main__":
+  test.main()
@@ -829,6 +829,98 @@ class BulkSaverBuilder(BaseSaverBuilder):
       return io_ops.restore_v2(filename_tensor, names, slices, dtypes)
 
 
+class ParallelRestoreSaverBuilder(BulkSaverBuilder):
+  """SaverBuilder that restores saveables in several concurrent groups.
+
+  Saveables are split into `num_restore_groups` groups of roughly equal size
+  in bytes, and each group is read by its own `RestoreV2` op.  The groups are
+  read concurrently, and the variables of a group are assigned as soon as
+  that group has been read, which overlaps assignment with the reads of the
+  remaining groups.  Within each group, reads are ordered by their location
+  in the checkpoint data files.
+  """
+
+  def __init__(self, write_version=saver_pb2.SaverDef.V2,
+               num_restore_groups=8):
+    if num_restore_groups < 1:
+      raise ValueError("num_restore_groups must be at least 1, got %d" %
+                       num_restore_groups)
+    super(ParallelRestoreSaverBuilder, self).__init__(write_version)
+    self._num_restore_groups = num_restore_groups
+
+  def bulk_restore(self, filename_tensor, saveables, preferred_shard,
+                   restore_sequentially):
+    if restore_sequentially or self._num_restore_groups == 1:
+      return super(ParallelRestoreSaverBuilder, self).bulk_restore(
+          filename_tensor, saveables, preferred_shard, restore_sequentially)
+
+    # Greedily assigns the largest saveables first, each to the group with
+    # the fewest bytes so far.
+    groups = [[] for _ in range(min(self._num_restore_groups,
+                                    len(saveables)))]
+    group_bytes = [0] * len(groups)
+    saveable_bytes = [_estimate_restore_bytes(saveable)
+                      for saveable in saveables]
+    for index in sorted(range(len(saveables)),
+                        key=lambda index: saveable_bytes[index],
+                        reverse=True):
+      group = group_bytes.index(min(group_bytes))
+      groups[group].append(index)
+      group_bytes[group] += saveable_bytes[index]
+
+    restored = {}
+    for group in groups:
+      restore_specs = []
+      for index in sorted(group):
+        for spec in saveables[index].specs:
+          restore_specs.append((spec.name, spec.slice_spec, spec.dtype))
+      names, slices, dtypes = zip(*restore_specs)
+      # Load all tensors onto CPU 0 for compatibility with existing code.
+      with ops.device("cpu:0"):
+        tensors = io_ops.restore_v2(filename_tensor, names, slices, dtypes)
+      for index in sorted(group):
+        num_specs = len(saveables[index].specs)
+        restored[index], tensors = tensors[:num_specs], tensors[num_specs:]
+
+    all_tensors = []
+    for index in range(len(saveables)):
+      all_tensors.extend(restored[index])
+    return all_tensors
+
+
+def _estimate_restore_bytes(saveable):
+  """Returns the number of bytes read to restore `saveable`, if known."""
+  total = 0
+  for spec in saveable.specs:
+    num_elements = spec.tensor.get_shape().num_elements()
+    if num_elements is not None:
+      total += num_elements * max(spec.dtype.size, 1)
+  return total
+
+
+def _checkpoint_data_bytes(save_path):
+  """Returns the total size of the data files of a V2 checkpoint, or None."""
+  try:
+    data_files = file_io.get_matching_files(save_path + ".data-?????-of-?????")
+    if not data_files:
+      return None
+    return sum(file_io.stat(data_file).length for data_file in data_files)
+  except errors.OpError:
+    return None
+
+
+def _log_restore_throughput(save_path, duration_secs):
+  """Logs how long restoring `save_path` took, and how fast it was read."""
+  data_bytes = _checkpoint_data_bytes(compat.as_text(save_path))
+  if data_bytes is None or duration_secs <= 0:
+    logging.info("Restored %s in %.2f seconds.", compat.as_text(save_path),
+                 duration_secs)
+  else:
+    logging.info("Restored %d bytes from %s in %.2f seconds (%.1f MB/s).",
+                 data_bytes, compat.as_text(save_path), duration_secs,
+                 data_bytes / duration_secs / (1 << 20))
+
+
 def _get_saver_or_default():
   """Returns the saver from SAVERS collection, or creates a default one.
 
@@ -1721,8 +1813,16 @@ class Saver(object):
       if context.executing_eagerly():
         self._build_eager(save_path, build_save=False, build_restore=True)
       else:
-        sess.run(self.saver_def.restore_op_name,
-                 {self.saver_def.filename_tensor_name: save_path})
+        # pylint: disable=g-import-not-at-top
+        from tensorflow.python.training import delta_checkpoint
+        # pylint: enable=g-import-not-at-top
+        if delta_checkpoint.is_delta_checkpoint(save_path):
+          delta_checkpoint.restore(sess, self.saver_def, save_path)
+        else:
+          start_time = time.time()
+          sess.run(self.saver_def.restore_op_name,
+                   {self.saver_def.filename_tensor_name: save_path})
+          _log_restore_throughput(save_path, time.time() - start_time)
     except errors.NotFoundError as err:
       # There are three common conditions that might cause this error:
       # 0. The file is missing. We ignore here, as this is checked above.
@@ -1047,6 +1047,54 @@ class SaveRestoreShardedTestV2(SaveRestoreShardedTest):
   _WRITE_VERSION = saver_pb2.SaverDef.V2
 
 
+class ParallelRestoreTest(test.TestCase):
+
+  def _build(self, sess, initial_value_offset):
+    all_vars = {}
+    for device in range(2):
+      with sess.graph.device("/cpu:%d" % device):
+        for i in range(3):
+          name = "v%d_%d" % (device, i)
+          all_vars[name] = variables.Variable(
+              np.full([i + 1, 4], 10 * device + i + initial_value_offset,
+                      np.float32),
+              name=name)
+    return all_vars
+
+  def testRestoreFromShardedCheckpoint(self):
+    save_path = os.path.join(self.get_temp_dir(), "parallel_restore")
+    config = config_pb2.ConfigProto(device_count={"CPU": 2})
+    with session.Session(graph=ops_lib.Graph(), config=config) as sess:
+      all_vars = self._build(sess, initial_value_offset=0)
+      save = saver_module.Saver(all_vars, sharded=True)
+      variables.global_variables_initializer().run()
+      save.save(sess, save_path)
+      expected = sess.run(all_vars)
+
+    # Two devices write two data file shards.
+    self.assertEqual(2, len(gfile.Glob(save_path + ".data-*")))
+
+    for sharded in (True, False):
+      with session.Session(graph=ops_lib.Graph(), config=config) as sess:
+        all_vars = self._build(sess, initial_value_offset=100)
+        restore = saver_module.Saver(
+            all_vars,
+            sharded=sharded,
+            builder=saver_module.ParallelRestoreSaverBuilder(
+                num_restore_groups=2))
+        num_restore_ops = len([
+            op for op in sess.graph.get_operations() if op.type == "RestoreV2"
+        ])
+        self.assertEqual(4 if sharded else 2, num_restore_ops)
+        restore.restore(sess, save_path)
+        for name, value in sess.run(all_vars).items():
+          self.assertAllEqual(expected[name], value)
+
+  def testInvalidNumRestoreGroups(self):
+    with self.assertRaisesRegexp(ValueError, "num_restore_groups"):
+      saver_module.ParallelRestoreSaverBuilder(num_restore_groups=0)
+
+
 class MaxToKeepTest(test.TestCase):
 
   def _get_test_dir(self, dirname):
@@ -2542,6 +2590,42 @@ class CheckpointReaderTest(test.TestCase):
                                    "v3 not found in checkpoint"):
         reader.get_tensor("v3")
 
+  def testGetSliceAndView(self):
+    value = np.arange(60, dtype=np.float32).reshape([5, 4, 3])
+    strings = np.array([b"a", b"bc", b"def"], dtype=object)
+    with ops_lib.Graph().as_default():
+      v0 = variables.Variable(value, name="v0")
+      v1 = variables.Variable(strings, name="v1")
+      v2 = variables.Variable(np.zeros([0, 2], np.int64), name="v2")
+      save = saver_module.Saver(
+          [v0, v1, v2], write_version=self._WRITE_VERSION)
+      save_path = os.path.join(self.get_temp_dir(),
+                               "ckpt_for_get_slice" + str(self._WRITE_VERSION))
+      with self.test_session() as sess:
+        sess.run(variables.global_variables_initializer())
+        save.save(sess, save_path)
+
+    reader = pywrap_tensorflow.NewCheckpointReader(save_path)
+    self.assertAllEqual(value[1:3], reader.get_slice("v0", [1], [2]))
+    self.assertAllEqual(value[2:, 1:3, :1],
+                        reader.get_slice("v0", [2, 1, 0], [-1, 2, 1]))
+    self.assertAllEqual(value[4:4], reader.get_slice("v0", [4], [0]))
+    self.assertAllEqual(strings[1:], reader.get_slice("v1", [1], [-1]))
+    self.assertAllEqual(
+        np.zeros([0, 1]), reader.get_slice("v2", [0, 1], [0, 1]))
+    with self.assertRaisesRegexp(ValueError, "out of bounds"):
+      reader.get_slice("v0", [4], [2])
+    with self.assertRaisesRegexp(ValueError, "do not match"):
+      reader.get_slice("v0", [0, 0, 0, 0], [1, 1, 1, 1])
+    with self.assertRaises(errors.NotFoundError):
+      reader.get_slice("v3", [0], [1])
+
+    view = reader.get_tensor_view("v0")
+    self.assertAllEqual(value, view)
+    self.assertEqual(self._WRITE_VERSION == saver_pb2.SaverDef.V2,
+                     isinstance(view, np.memmap))
+    self.assertAllEqual(strings, reader.get_tensor_view("v1"))
+
   def testNonexistentPath(self):
     with self.assertRaisesRegexp(errors.NotFoundError,
                                  "Unsuccessful TensorSliceReader"):
@@ -208,6 +208,24 @@ def _warm_start_var_with_vocab(var,
     # Assume tensor name remains the same.
     prev_tensor_name = _infer_var_name(var)
 
+  # The partitions of `var` only differ in their first dimension, so they share
+  # one initializer, which generates the vocab remapping once for all of them.
+  # The partitions are then loaded by independent ops, each reading only the
+  # rows of the checkpoint it needs, which the runtime can run in parallel.
+  # TODO(eddz): Support cases where class vocabularies need remapping too.
+  init = checkpoint_ops._load_and_remap_matrix_initializer(
+      ckpt_path=checkpoint_utils._get_checkpoint_filename(prev_ckpt),
+      old_tensor_name=prev_tensor_name,
+      new_row_vocab_size=current_vocab_size,
+      new_col_vocab_size=var[0].get_shape().as_list()[1],
+      old_row_vocab_size=previous_vocab_size,
+      old_row_vocab_file=prev_vocab_path,
+      new_row_vocab_file=current_vocab_path,
+      old_col_vocab_file=None,
+      new_col_vocab_file=None,
+      num_row_oov_buckets=current_oov_buckets,
+      num_col_oov_buckets=0,
+      initializer=initializer)
   for v in var:
     v_shape = v.get_shape().as_list()
     slice_info = v._get_save_slice_info()
@@ -217,20 +235,6 @@ def _warm_start_var_with_vocab(var,
           full_shape=slice_info.full_shape,
           var_offset=slice_info.var_offset)
 
-    # TODO(eddz): Support cases where class vocabularies need remapping too.
-    init = checkpoint_ops._load_and_remap_matrix_initializer(
-        ckpt_path=checkpoint_utils._get_checkpoint_filename(prev_ckpt),
-        old_tensor_name=prev_tensor_name,
-        new_row_vocab_size=current_vocab_size,
-        new_col_vocab_size=v_shape[1],
-        old_row_vocab_size=previous_vocab_size,
-        old_row_vocab_file=prev_vocab_path,
-        new_row_vocab_file=current_vocab_path,
-        old_col_vocab_file=None,
-        new_col_vocab_file=None,
-        num_row_oov_buckets=current_oov_buckets,
-        num_col_oov_buckets=0,
-        initializer=initializer)
     new_init_val = ops.convert_to_tensor(
         init(shape=v_shape, partition_info=partition_info))
     v._initializer_op = state_ops.assign(v, new_init_val)
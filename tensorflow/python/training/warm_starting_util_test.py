@@ -297,6 +297,11 @@ class WarmStartingUtilTest(test.TestCase):
             partitioner=lambda shape, dtype: [2, 1])
         ws_util._warm_start_var_with_vocab(fruit_weights, new_vocab_path, 6,
                                            self.get_temp_dir(), prev_vocab_path)
+        # The partitions share one remapping of the vocabulary.
+        self.assertEqual(1, len([
+            op for op in g.get_operations()
+            if op.type == "GenerateVocabRemapping"
+        ]))
         sess.run(variables.global_variables_initializer())
         self.assertTrue(
             isinstance(fruit_weights, variables.PartitionedVariable))
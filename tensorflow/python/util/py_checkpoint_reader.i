@@ -18,6 +18,7 @@ limitations under the License.
 
 %{
 #include "tensorflow/c/checkpoint_reader.h"
+#include "tensorflow/core/lib/core/errors.h"
 #include "tensorflow/core/lib/core/status.h"
 #include "tensorflow/python/lib/core/ndarray_tensor.h"
 #include "tensorflow/python/lib/core/py_func.h"
@@ -119,12 +120,62 @@ static PyObject* CheckpointReader_GetTensor(
 }
 %}
 
-// Wrap this function.
+%{
+// Returns (data_filename, offset, dtype_enum, shape) for a tensor whose
+// contents can be read directly from the data files, see
+// CheckpointReader::GetTensorLocation().
+static PyObject* CheckpointReader_GetTensorLocation(
+      tensorflow::checkpoint::CheckpointReader* reader,
+      const string& name,
+      TF_Status* out_status) {
+  string data_filename;
+  tensorflow::int64 offset = 0;
+  tensorflow::int64 size = 0;
+  reader->GetTensorLocation(name, &data_filename, &offset, &size, out_status);
+  if (TF_GetCode(out_status) != TF_OK) {
+    Py_RETURN_NONE;
+  }
+  const auto& shapes = reader->GetVariableToShapeMap();
+  const auto& dtypes = reader->GetVariableToDataTypeMap();
+  const auto shape_it = shapes.find(name);
+  const auto dtype_it = dtypes.find(name);
+  if (shape_it == shapes.end() || dtype_it == dtypes.end()) {
+    Set_TF_Status_from_Status(
+        out_status,
+        tensorflow::errors::NotFound("Key ", name, " not found in checkpoint"));
+    Py_RETURN_NONE;
+  }
+  const tensorflow::TensorShape& shape = shape_it->second;
+  tensorflow::Safe_PyObjectPtr py_shape(
+      tensorflow::make_safe(PyTuple_New(shape.dims())));
+  if (!py_shape) {
+    return nullptr;
+  }
+  for (int i = 0; i < shape.dims(); ++i) {
+    PyObject* dim_value = PyLong_FromLongLong(shape.dim_size(i));
+    if (dim_value == nullptr) {
+      return nullptr;
+    }
+    PyTuple_SET_ITEM(py_shape.get(), i, dim_value);
+  }
+  return Py_BuildValue("(s#LiO)", data_filename.data(),
+                       static_cast<int>(data_filename.size()),
+                       static_cast<long long>(offset),
+                       static_cast<int>(dtype_it->second), py_shape.get());
+}
+%}
+
+// Wrap these functions.
 PyObject* CheckpointReader_GetTensor(
     tensorflow::checkpoint::CheckpointReader* reader,
     const string& name,
     TF_Status* out_status);
 
+PyObject* CheckpointReader_GetTensorLocation(
+    tensorflow::checkpoint::CheckpointReader* reader,
+    const string& name,
+    TF_Status* out_status);
+
 %ignoreall
 
 %unignore tensorflow;
@@ -137,6 +188,7 @@ PyObject* CheckpointReader_GetTensor(
 %rename("_GetVariableToDataTypeMap") tensorflow::checkpoint::CheckpointReader::GetVariableToDataTypeMap;
 %rename("_HasTensor") tensorflow::checkpoint::CheckpointReader::HasTensor;
 %unignore CheckpointReader_GetTensor;
+%unignore CheckpointReader_GetTensorLocation;
 
 %extend tensorflow::checkpoint::CheckpointReader {
 %insert("python") %{
@@ -155,6 +207,113 @@ PyObject* CheckpointReader_GetTensor(
       from tensorflow.python.util import compat
       return CheckpointReader_GetTensor(self, compat.as_bytes(tensor_str),
                                         status)
+
+  def _get_tensor_location(self, tensor_str):
+    """Returns where a tensor is stored as a flat buffer, or None."""
+    from tensorflow.python.framework import errors
+    from tensorflow.python.util import compat
+    try:
+      with errors.raise_exception_on_not_ok_status() as status:
+        return CheckpointReader_GetTensorLocation(
+            self, compat.as_bytes(tensor_str), status)
+    except errors.UnimplementedError:
+      return None
+
+  def get_tensor_view(self, tensor_str):
+    """Returns a read-only view of a tensor that is read on demand.
+
+    For an uncompressed entry of a V2 checkpoint on a local filesystem the
+    view is memory mapped from the data file, so only the pages that are
+    accessed are read.  Other tensors are read in full, as by `get_tensor()`.
+    Unlike `get_tensor()`, views do not verify the stored checksum.
+
+    Args:
+      tensor_str: Name of the tensor.
+
+    Returns:
+      A numpy array, possibly a read-only `numpy.memmap`.
+    """
+    import numpy as np
+    from tensorflow.python.framework import dtypes
+    from tensorflow.python.util import compat
+    location = self._get_tensor_location(tensor_str)
+    if location is None or "://" in compat.as_str(location[0]):
+      return self.get_tensor(tensor_str)
+    data_filename, offset, dtype_enum, shape = location
+    if not shape or not np.prod(shape):
+      return self.get_tensor(tensor_str)
+    return np.memmap(data_filename, mode="r", offset=offset, shape=shape,
+                     dtype=dtypes.DType(dtype_enum).as_numpy_dtype)
+
+  def get_slice(self, tensor_str, begin, size):
+    """Reads the slice of a tensor of the given `size` starting at `begin`.
+
+    `begin` and `size` follow `tf.slice`: they have one entry per leading
+    dimension, missing trailing entries select whole dimensions, and a size
+    of -1 selects all remaining elements of a dimension.  For an uncompressed
+    entry of a V2 checkpoint only the rows in the slice are read, by memory
+    mapping local data files and by one range read otherwise.
+
+    Args:
+      tensor_str: Name of the tensor.
+      begin: List of start indices.
+      size: List of slice sizes, or -1.
+
+    Returns:
+      A numpy array holding the slice.
+
+    Raises:
+      ValueError: If the slice is not within the tensor.
+    """
+    import numpy as np
+    from tensorflow.python.framework import dtypes
+    from tensorflow.python.lib.io import file_io
+    from tensorflow.python.util import compat
+    location = self._get_tensor_location(tensor_str)
+    if location is None:
+      value = self.get_tensor(tensor_str)
+      shape = value.shape
+    else:
+      shape = location[3]
+
+    begin, size = list(begin), list(size)
+    if len(begin) != len(size) or len(begin) > len(shape):
+      raise ValueError("begin %s and size %s do not match the shape %s of %s" %
+                       (begin, size, shape, compat.as_str(tensor_str)))
+    slices = []
+    for dim, dim_size in enumerate(shape):
+      start = begin[dim] if dim < len(begin) else 0
+      length = size[dim] if dim < len(size) else -1
+      if length == -1:
+        length = dim_size - start
+      if start < 0 or length < 0 or start + length > dim_size:
+        raise ValueError("Slice with begin %s and size %s is out of bounds for "
+                         "%s of shape %s" %
+                         (begin, size, compat.as_str(tensor_str), shape))
+      slices.append(slice(start, start + length))
+    if location is None:
+      return np.array(value[tuple(slices)])
+
+    data_filename, offset, dtype_enum, _ = location
+    dtype = np.dtype(dtypes.DType(dtype_enum).as_numpy_dtype)
+    if not shape:
+      return self.get_tensor(tensor_str)
+    rows = slices[0]
+    row_shape = list(shape[1:])
+    row_bytes = dtype.itemsize * int(np.prod(row_shape))
+    num_rows = rows.stop - rows.start
+    if not num_rows or not row_bytes:
+      return np.zeros([s.stop - s.start for s in slices], dtype)
+    start_offset = offset + rows.start * row_bytes
+    if "://" in compat.as_str(data_filename):
+      with file_io.FileIO(data_filename, "rb") as f:
+        f.seek(start_offset)
+        block = np.frombuffer(f.read(num_rows * row_bytes), dtype)
+      block = block.reshape([num_rows] + row_shape)
+    else:
+      block = np.memmap(data_filename, mode="r", offset=start_offset,
+                        shape=tuple([num_rows] + row_shape), dtype=dtype)
+    return np.array(block[(slice(None),) + tuple(slices[1:])])
 %}
 }
 